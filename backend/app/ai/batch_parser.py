@@ -0,0 +1,303 @@
+"""
+Batch Document Parser
+
+Parses every document of a bid package (plans, specs, addenda) concurrently
+and consolidates the extracted items into a single takeoff.
+
+Documents are routed by doc_type:
+- spec: SpecificationParser (text extraction + LLM)
+- plan, addendum, plan_and_spec: PlanParser (vision)
+
+All parsers draw from the shared LLM and CPU budgets, so a whole package runs
+at near-parallel speed without exceeding provider rate limits.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.ai.parsing.config import load_parsing_config
+from app.ai.plan_parser import plan_parser
+from app.ai.spec_parser import spec_parser
+
+logger = logging.getLogger(__name__)
+
+# Document types handled by the specification parser; everything else is a plan
+SPEC_DOC_TYPES = {"spec"}
+
+
+@dataclass
+class BatchDocument:
+    """A document queued for batch parsing"""
+    document_id: str
+    doc_type: str
+    file_path: Path
+    file_name: Optional[str] = None
+
+
+class BatchParser:
+    """
+    Parse a set of project documents concurrently and consolidate their items
+    """
+
+    def __init__(self, max_concurrent_documents: Optional[int] = None):
+        """
+        Initialize the batch parser
+
+        Args:
+            max_concurrent_documents: Maximum documents in flight (defaults to config)
+        """
+        config = load_parsing_config()
+        self.max_concurrent_documents = max_concurrent_documents or config.max_concurrent_documents
+
+    async def parse_documents(
+        self,
+        documents: List[BatchDocument],
+        max_pages: int = 5,
+        spec_max_pages: int = 50
+    ) -> Dict[str, Any]:
+        """
+        Parse documents concurrently and build a consolidated takeoff
+
+        Args:
+            documents: Documents to parse
+            max_pages: Maximum pages per plan document
+            spec_max_pages: Maximum pages per specification document
+
+        Returns:
+            Dictionary with per-document reports, per-document parsed data,
+            the consolidated takeoff and timing information
+        """
+        start_time = time.time()
+        semaphore = asyncio.Semaphore(self.max_concurrent_documents)
+
+        logger.info(
+            f"[BATCH PARSE] Parsing {len(documents)} documents "
+            f"({self.max_concurrent_documents} concurrent)"
+        )
+
+        async def run(document: BatchDocument) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+            async with semaphore:
+                return await self._parse_document(document, max_pages, spec_max_pages)
+
+        outcomes = await asyncio.gather(*(run(document) for document in documents))
+
+        reports = [report for report, _ in outcomes]
+        parsed = {
+            report["document_id"]: data
+            for report, data in outcomes
+            if data is not None and report["parser"] == "plan"
+        }
+        specifications = {
+            report["document_id"]: data
+            for report, data in outcomes
+            if data is not None and report["parser"] == "spec"
+        }
+
+        takeoff = self.consolidate(parsed)
+        processing_time = int((time.time() - start_time) * 1000)
+
+        logger.info(
+            f"[BATCH PARSE] Complete in {processing_time}ms: "
+            f"{sum(1 for r in reports if r['status'] == 'parsed')}/{len(reports)} documents parsed, "
+            f"{len(takeoff['bid_items'])} bid items, {len(takeoff['materials'])} materials "
+            f"({takeoff['duplicates_removed']} duplicates removed)"
+        )
+
+        return {
+            "documents": reports,
+            "parsed": parsed,
+            "specifications": specifications,
+            "takeoff": takeoff,
+            "processing_time_ms": processing_time,
+        }
+
+    async def _parse_document(
+        self,
+        document: BatchDocument,
+        max_pages: int,
+        spec_max_pages: int
+    ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        Parse one document with the parser matching its doc_type
+
+        Failures are captured in the report instead of aborting the batch.
+
+        Returns:
+            Tuple of (status report, parsed data or None)
+        """
+        start_time = time.time()
+        is_spec = document.doc_type in SPEC_DOC_TYPES
+
+        report = {
+            "document_id": document.document_id,
+            "file_name": document.file_name,
+            "doc_type": document.doc_type,
+            "parser": "spec" if is_spec else "plan",
+        }
+
+        try:
+            if is_spec:
+                result = await spec_parser.parse_specification(
+                    document.file_path, max_pages=spec_max_pages
+                )
+            else:
+                result = await plan_parser.parse_plan(document.file_path, max_pages=max_pages)
+        except Exception as e:
+            logger.error(f"[BATCH PARSE] {document.file_name or document.document_id} failed: {e}", exc_info=True)
+            result = {"success": False, "error": str(e)}
+
+        report["processing_time_ms"] = int((time.time() - start_time) * 1000)
+        report["method"] = result.get("method", "unknown")
+        report["pages_analyzed"] = result.get("pages_analyzed")
+
+        if not result.get("success", False):
+            report["status"] = "failed"
+            report["error"] = result.get("error", "Unknown error")
+            return report, None
+
+        data = result.get("data") or {}
+        report["status"] = "parsed"
+
+        if is_spec:
+            report["standards_found"] = len(data.get("standards", []) or [])
+            report["requirements_found"] = len(data.get("requirements", []) or [])
+        else:
+            report["bid_items_found"] = len(data.get("bid_items", []) or [])
+            report["materials_found"] = len(data.get("materials", []) or [])
+
+        return report, data
+
+    def consolidate(self, parsed: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Merge items from several documents into one takeoff
+
+        Items are keyed by normalized label and unit (and category for
+        materials). Within a document, quantities of the same item are
+        summed, as a single-document parse would save them all. The same item
+        often appears on multiple sheets of a package or is restated in an
+        addendum, so across documents quantities are not summed; the largest
+        document total wins.
+
+        Args:
+            parsed: Parsed data keyed by document ID
+
+        Returns:
+            Dictionary with bid_items, materials and duplicates_removed
+            (items dropped as restated in another document). Each item
+            carries source_document_id (the document whose quantity was
+            kept) and source_document_ids (every document it appeared in).
+        """
+        bid_items: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        materials: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        duplicates = 0
+
+        for document_id, data in parsed.items():
+            document_bid_items = self._sum_document_items(data.get("bid_items", []) or [], self._bid_item_key)
+            for key, item in document_bid_items.items():
+                duplicates += self._merge(bid_items, key, item, document_id)
+
+            document_materials = self._sum_document_items(data.get("materials", []) or [], self._material_key)
+            for key, mat in document_materials.items():
+                duplicates += self._merge(materials, key, mat, document_id)
+
+        return {
+            "bid_items": list(bid_items.values()),
+            "materials": list(materials.values()),
+            "duplicates_removed": duplicates,
+        }
+
+    def _bid_item_key(self, item: Dict[str, Any]) -> Tuple[str, ...]:
+        return (
+            self._normalize_key(item.get("item_number")) + "|" + self._normalize_key(item.get("description")),
+            self._normalize_key(item.get("unit")),
+        )
+
+    def _material_key(self, mat: Dict[str, Any]) -> Tuple[str, ...]:
+        return (
+            self._normalize_key(mat.get("name")),
+            self._normalize_key(mat.get("unit")),
+            self._normalize_key(mat.get("category")),
+        )
+
+    @staticmethod
+    def _sum_document_items(
+        items: List[Dict[str, Any]],
+        key_func: Callable[[Dict[str, Any]], Tuple[str, ...]]
+    ) -> Dict[Tuple[str, ...], Dict[str, Any]]:
+        """
+        Combine repeated items of one document, summing their quantities
+
+        The first occurrence keeps its other fields (source page, bbox).
+        """
+        combined: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+
+        for item in items:
+            key = key_func(item)
+            existing = combined.get(key)
+            if existing is None:
+                combined[key] = dict(item)
+                continue
+
+            total = BatchParser._quantity(existing) + BatchParser._quantity(item)
+            existing["quantity"] = int(total) if total.is_integer() else total
+
+        return combined
+
+    @staticmethod
+    def _merge(
+        merged: Dict[Tuple[str, ...], Dict[str, Any]],
+        key: Tuple[str, ...],
+        item: Dict[str, Any],
+        document_id: str
+    ) -> int:
+        """
+        Merge one item into the consolidated set
+
+        Returns:
+            1 if the item duplicated an existing one, otherwise 0
+        """
+        existing = merged.get(key)
+        if existing is None:
+            merged[key] = {
+                **item,
+                "source_document_id": document_id,
+                "source_document_ids": [document_id],
+            }
+            return 0
+
+        if document_id not in existing["source_document_ids"]:
+            existing["source_document_ids"].append(document_id)
+
+        if BatchParser._quantity(item) > BatchParser._quantity(existing):
+            sources = existing["source_document_ids"]
+            merged[key] = {
+                **item,
+                "source_document_id": document_id,
+                "source_document_ids": sources,
+            }
+
+        return 1
+
+    @staticmethod
+    def _quantity(item: Dict[str, Any]) -> float:
+        """Numeric quantity of an item (LLM output may contain strings or nulls)"""
+        try:
+            return float(str(item.get("quantity") or 0).replace(",", ""))
+        except ValueError:
+            return 0.0
+
+    @staticmethod
+    def _normalize_key(value: Any) -> str:
+        """Lowercase and collapse whitespace for duplicate detection"""
+        if value is None:
+            return ""
+        return re.sub(r"\s+", " ", str(value)).strip().lower()
+
+
+# Singleton instance
+batch_parser = BatchParser()
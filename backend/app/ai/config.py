@@ -2,6 +2,7 @@ from typing import Optional
 import anthropic
 import openai
 from app.core.config import settings
+from app.ai.parsing.utils.telemetry import telemetry
 
 # Initialize AI clients
 anthropic_client: Optional[anthropic.Anthropic] = None
@@ -13,14 +14,16 @@ def init_ai_clients():
     global anthropic_client, openai_client
 
     if settings.ANTHROPIC_API_KEY:
-        anthropic_client = anthropic.Anthropic(
-            api_key=settings.ANTHROPIC_API_KEY
-        )
+        anthropic_client = telemetry.instrument_client(anthropic.Anthropic(
+            api_key=settings.ANTHROPIC_API_KEY,
+            base_url=settings.ANTHROPIC_BASE_URL
+        ))
 
     if settings.OPENAI_API_KEY:
-        openai_client = openai.OpenAI(
-            api_key=settings.OPENAI_API_KEY
-        )
+        openai_client = telemetry.instrument_client(openai.OpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL
+        ))
 
 
 def is_ai_available() -> dict:
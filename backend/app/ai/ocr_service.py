@@ -24,30 +24,53 @@ class OCRService:
     def __init__(self):
         self.tesseract_available = TESSERACT_AVAILABLE
 
-    def extract_text_from_pdf(self, pdf_path: Path, max_pages: int = 10) -> List[str]:
+    def extract_text_from_pdf(
+        self,
+        pdf_path: Path,
+        max_pages: int = 10,
+        pages: Optional[List[int]] = None
+    ) -> List[str]:
         """
         Extract text from PDF pages using OCR
 
         Args:
             pdf_path: Path to PDF file
             max_pages: Maximum number of pages to process
+            pages: Specific 1-based page numbers to process (overrides max_pages)
 
         Returns:
-            List of text strings, one per page
+            List of text strings, one per page processed
         """
         if not self.tesseract_available:
             logger.warning("Tesseract not available, cannot perform OCR")
             return []
 
         try:
-            # Convert PDF to images
-            images = convert_from_path(pdf_path, first_page=1, last_page=max_pages)
+            from app.ai.parsing.utils.memory_budget import estimate_render_bytes, memory_budget
+            from app.ai.parsing.utils.pdf_pages import page_sizes
+
+            # Render one page at a time so only a single page image is held
+            # in memory (pdf2image renders at 200 DPI by default)
+            sizes = page_sizes(pdf_path)
+            if pages is not None:
+                page_indexes = [page - 1 for page in pages if 1 <= page <= len(sizes)]
+            else:
+                page_indexes = list(range(min(max_pages, len(sizes))))
 
             # Extract text from each page
             page_texts = []
-            for i, image in enumerate(images):
+            for i in page_indexes:
+                width, height = sizes[i]
                 try:
-                    text = pytesseract.image_to_string(image)
+                    with memory_budget.reserve(
+                        estimate_render_bytes(width, height, 200),
+                        f"OCR page {i+1}",
+                    ):
+                        images = convert_from_path(
+                            pdf_path, first_page=i + 1, last_page=i + 1, thread_count=1
+                        )
+                        text = pytesseract.image_to_string(images[0]) if images else ""
+                        del images
                     page_texts.append(text)
                     logger.info(f"Extracted text from page {i+1}: {len(text)} characters")
                 except Exception as e:
@@ -80,62 +103,71 @@ class OCRService:
             return None
 
         try:
-            # Convert single page to image
-            images = convert_from_path(pdf_path, first_page=page_num, last_page=page_num)
-
-            if not images:
-                return None
-
-            image = images[0]
-
-            # Convert RGBA/P to RGB for JPEG
-            if image.mode in ('RGBA', 'P', 'LA'):
-                rgb_image = Image.new('RGB', image.size, (255, 255, 255))
-                if image.mode == 'P':
-                    image = image.convert('RGBA')
-                rgb_image.paste(image, mask=image.split()[-1] if image.mode in ('RGBA', 'LA') else None)
-                image = rgb_image
-
-            # HIGH-QUALITY compression to preserve microscopic detail
-            # NOTE: For construction plans needing maximum detail, use Claude Tiling strategy instead
-            # This method should only be used for legacy/fallback scenarios
-            max_bytes = int(max_size_mb * 1024 * 1024)
-            quality = 95
-            min_quality = 85  # CHANGED: Don't go below 85 to preserve detail
-
-            while quality >= min_quality:
-                buffer = BytesIO()
-                image.save(buffer, format='JPEG', quality=quality, optimize=True)
-                size = buffer.tell()
-
-                # Check base64 size (base64 is ~133% of binary)
-                estimated_base64_size = size * 4 / 3
-
-                if estimated_base64_size <= max_bytes:
-                    buffer.seek(0)
-                    img_base64 = base64.b64encode(buffer.read()).decode('utf-8')
-                    actual_mb = len(img_base64) * 3 / 4 / 1024 / 1024
-                    logger.info(f"Page {page_num}: {actual_mb:.2f}MB at quality={quality}")
-                    return img_base64
-
-                quality -= 5  # CHANGED: Smaller steps to preserve quality
-
-            # If we get here, image is too large even at quality 85
-            # ERROR: Don't resize - that loses detail! Use tiling strategy instead
-            logger.error(
-                f"Page {page_num} exceeds size limit even at quality {min_quality}. "
-                f"Image size: {image.size}, estimated: {size/1024/1024:.1f}MB. "
-                f"For construction plans requiring microscopic detail, use Claude Tiling strategy instead "
-                f"which tiles BEFORE compression to preserve full resolution."
-            )
-
-            # Return None to force fallback to tiling strategy
-            return None
+            from app.ai.parsing.utils.memory_budget import estimate_render_bytes, memory_budget
+            from app.ai.parsing.utils.pdf_pages import page_size
+
+            width, height = page_size(pdf_path, page_num)
+            with memory_budget.reserve(estimate_render_bytes(width, height, 200), f"page {page_num}"):
+                return self._page_to_base64(pdf_path, page_num, max_size_mb)
 
         except Exception as e:
             logger.error(f"Failed to convert PDF page to image: {str(e)}")
             return None
 
+    def _page_to_base64(self, pdf_path: Path, page_num: int, max_size_mb: float) -> Optional[str]:
+        """Render and encode one page (caller holds the memory reservation)"""
+        # Convert single page to image
+        images = convert_from_path(pdf_path, first_page=page_num, last_page=page_num, thread_count=1)
+
+        if not images:
+            return None
+
+        image = images[0]
+
+        # Convert RGBA/P to RGB for JPEG
+        if image.mode in ('RGBA', 'P', 'LA'):
+            rgb_image = Image.new('RGB', image.size, (255, 255, 255))
+            if image.mode == 'P':
+                image = image.convert('RGBA')
+            rgb_image.paste(image, mask=image.split()[-1] if image.mode in ('RGBA', 'LA') else None)
+            image = rgb_image
+
+        # HIGH-QUALITY compression to preserve microscopic detail
+        # NOTE: For construction plans needing maximum detail, use Claude Tiling strategy instead
+        # This method should only be used for legacy/fallback scenarios
+        max_bytes = int(max_size_mb * 1024 * 1024)
+        quality = 95
+        min_quality = 85  # CHANGED: Don't go below 85 to preserve detail
+
+        while quality >= min_quality:
+            buffer = BytesIO()
+            image.save(buffer, format='JPEG', quality=quality, optimize=True)
+            size = buffer.tell()
+
+            # Check base64 size (base64 is ~133% of binary)
+            estimated_base64_size = size * 4 / 3
+
+            if estimated_base64_size <= max_bytes:
+                buffer.seek(0)
+                img_base64 = base64.b64encode(buffer.read()).decode('utf-8')
+                actual_mb = len(img_base64) * 3 / 4 / 1024 / 1024
+                logger.info(f"Page {page_num}: {actual_mb:.2f}MB at quality={quality}")
+                return img_base64
+
+            quality -= 5  # CHANGED: Smaller steps to preserve quality
+
+        # If we get here, image is too large even at quality 85
+        # ERROR: Don't resize - that loses detail! Use tiling strategy instead
+        logger.error(
+            f"Page {page_num} exceeds size limit even at quality {min_quality}. "
+            f"Image size: {image.size}, estimated: {size/1024/1024:.1f}MB. "
+            f"For construction plans requiring microscopic detail, use Claude Tiling strategy instead "
+            f"which tiles BEFORE compression to preserve full resolution."
+        )
+
+        # Return None to force fallback to tiling strategy
+        return None
+
     def get_pdf_page_count(self, pdf_path: Path) -> int:
         """
         Get the number of pages in a PDF
@@ -147,9 +179,8 @@ class OCRService:
             Number of pages, or 0 on error
         """
         try:
-            from PyPDF2 import PdfReader
-            reader = PdfReader(str(pdf_path))
-            return len(reader.pages)
+            from app.ai.parsing.utils.pdf_pages import page_count
+            return page_count(pdf_path)
         except Exception as e:
             logger.error(f"Failed to get page count: {str(e)}")
             return 0
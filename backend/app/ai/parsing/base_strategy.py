@@ -8,12 +8,13 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from datetime import datetime
 
 
 class StrategyType(Enum):
     """Enumeration of available parsing strategies"""
+    PDF_TABLE = "pdf_table"
     OPENAI_NATIVE = "openai_native"
     CLAUDE_TILING = "claude_tiling"
     DOCUMENT_AI = "document_ai"
@@ -147,7 +148,8 @@ class BaseParsingStrategy(ABC):
     async def parse(
         self,
         pdf_path: Path,
-        max_pages: int = 5
+        max_pages: int = 5,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> ParseResult:
         """
         Parse a PDF document and extract structured data
@@ -155,6 +157,7 @@ class BaseParsingStrategy(ABC):
         Args:
             pdf_path: Path to the PDF file
             max_pages: Maximum number of pages to process
+            progress_callback: Optional callback receiving stage and partial-item events
 
         Returns:
             ParseResult with success status and extracted data
@@ -180,13 +183,14 @@ class BaseParsingStrategy(ABC):
         Get the priority of this strategy (lower = higher priority)
 
         Priority order:
+        0. Native-text tables (local, vector PDFs with schedules/bid tabs)
         1. OpenAI Native (fast, good for small-medium docs)
         2. Document AI (best for scanned, large docs)
         3. Claude Tiling (universal, works for any size)
         4. Tesseract OCR (fallback, raw text only)
 
         Returns:
-            Priority level (1-4)
+            Priority level (0-4)
         """
         pass
 
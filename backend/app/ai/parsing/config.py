@@ -15,6 +15,8 @@ class ParsingConfig(BaseModel):
     # API Keys
     anthropic_api_key: Optional[str] = Field(None, description="Anthropic API key for Claude")
     openai_api_key: Optional[str] = Field(None, description="OpenAI API key")
+    anthropic_base_url: Optional[str] = Field(None, description="Override the Anthropic API endpoint (e.g. a local replay server)")
+    openai_base_url: Optional[str] = Field(None, description="Override the OpenAI API endpoint (e.g. a local replay server)")
 
     # Google Cloud Document AI
     google_credentials_path: Optional[str] = Field(None, description="Path to GCP credentials JSON")
@@ -23,6 +25,8 @@ class ParsingConfig(BaseModel):
     google_processor_id: Optional[str] = Field(None, description="Document AI processor ID")
 
     # Strategy toggles
+    enable_pdf_table_parsing: bool = Field(True, description="Enable native-text table strategy for vector PDFs")
+    table_page_vision_fraction: float = Field(0.3, description="Also send a table page to vision when at least this share of its words lies outside tables (1.0 = never)")
     enable_openai_parsing: bool = Field(True, description="Enable OpenAI native PDF strategy")
     enable_document_ai_parsing: bool = Field(False, description="Enable Google Document AI strategy")
     enable_claude_parsing: bool = Field(True, description="Enable Claude tiling strategy")
@@ -33,10 +37,26 @@ class ParsingConfig(BaseModel):
     tile_overlap_percent: float = Field(0.1, description="Overlap percentage for tiles (0.0-0.5)")
     coarse_scan_dpi: int = Field(100, description="DPI for coarse ROI detection scan (low-res is fine)")
     detail_scan_dpi: int = Field(300, description="DPI for detailed tile scanning (INCREASED to 300 for microscopic detail)")
+    enable_dpi_cascade: bool = Field(True, description="Read regions at cascade_scan_dpi first and refine uncertain items at detail_scan_dpi")
+    cascade_scan_dpi: int = Field(150, description="DPI for the first detail reading when the cascade is enabled")
+    refine_confidence_threshold: float = Field(0.6, description="Re-read items below this confidence at detail_scan_dpi")
+    refine_margin_points: int = Field(18, description="Context margin around refinement crops, in PDF points")
+    min_roi_confidence: float = Field(0.3, description="Drop coarse-scan regions below this confidence")
+    min_roi_area_percent: float = Field(0.2, description="Drop coarse-scan regions smaller than this percent of the page")
 
     # Processing limits
     max_concurrent_tiles: int = Field(5, description="Maximum concurrent tile processing")
     default_max_pages: int = Field(5, description="Default maximum pages to process")
+    max_concurrent_llm_calls: int = Field(4, description="Maximum concurrent LLM requests across all parses")
+    max_cpu_workers: int = Field(default_factory=lambda: os.cpu_count() or 2, description="Maximum concurrent rendering/OCR/text extraction jobs")
+    max_concurrent_documents: int = Field(8, description="Maximum documents parsed concurrently in a batch")
+    enable_memory_budget: bool = Field(True, description="Queue or refuse renders/payloads that would exceed memory_budget_mb")
+    memory_budget_mb: int = Field(1536, description="Memory available to page renders, image encodes and PDF payloads")
+    memory_wait_timeout_s: float = Field(300, description="How long work may queue for memory before failing")
+
+    # Caching
+    enable_response_cache: bool = Field(True, description="Reuse LLM responses for identical tiles/pages")
+    response_cache_size: int = Field(512, description="Maximum cached LLM responses (LRU)")
 
     # Claude settings
     claude_model: str = Field("claude-sonnet-4-5-20250929", description="Claude model to use (current: claude-sonnet-4-5-20250929 or claude-opus-4-5-20251101)")
@@ -47,6 +67,8 @@ class ParsingConfig(BaseModel):
     openai_model: str = Field("gpt-4o", description="OpenAI model to use")
     openai_max_tokens: int = Field(16000, description="Maximum tokens for OpenAI responses")
     openai_temperature: float = Field(0.0, description="Temperature for OpenAI (0.0-1.0)")
+    openai_chunk_pages: int = Field(5, description="Pages per page-subset PDF sent to OpenAI")
+    openai_max_chunk_mb: float = Field(20.0, description="Maximum size of one page-subset PDF sent to OpenAI")
 
     # Deduplication settings
     fuzzy_match_threshold: int = Field(85, description="Fuzzy match threshold (0-100)")
@@ -57,6 +79,10 @@ class ParsingConfig(BaseModel):
     log_strategy_selection: bool = Field(True, description="Log strategy selection details")
     log_processing_time: bool = Field(True, description="Log processing time metrics")
 
+    # Telemetry
+    enable_telemetry: bool = Field(True, description="Record per-stage spans, timings breakdown and /metrics")
+    enable_opentelemetry: bool = Field(False, description="Mirror parsing spans into OpenTelemetry (needs opentelemetry-api)")
+
     class Config:
         env_prefix = ""
 
@@ -72,6 +98,8 @@ def load_parsing_config() -> ParsingConfig:
         # API Keys
         anthropic_api_key=os.getenv("ANTHROPIC_API_KEY"),
         openai_api_key=os.getenv("OPENAI_API_KEY"),
+        anthropic_base_url=os.getenv("ANTHROPIC_BASE_URL") or None,
+        openai_base_url=os.getenv("OPENAI_BASE_URL") or None,
 
         # Google Cloud
         google_credentials_path=os.getenv("GOOGLE_APPLICATION_CREDENTIALS"),
@@ -80,6 +108,8 @@ def load_parsing_config() -> ParsingConfig:
         google_processor_id=os.getenv("GOOGLE_PROCESSOR_ID"),
 
         # Strategy toggles
+        enable_pdf_table_parsing=os.getenv("ENABLE_PDF_TABLE_PARSING", "true").lower() == "true",
+        table_page_vision_fraction=float(os.getenv("TABLE_PAGE_VISION_FRACTION", "0.3")),
         enable_openai_parsing=os.getenv("ENABLE_OPENAI_PARSING", "true").lower() == "true",
         enable_document_ai_parsing=os.getenv("ENABLE_DOCUMENT_AI_PARSING", "false").lower() == "true",
         enable_claude_parsing=os.getenv("ENABLE_CLAUDE_PARSING", "true").lower() == "true",
@@ -90,10 +120,26 @@ def load_parsing_config() -> ParsingConfig:
         tile_overlap_percent=float(os.getenv("TILE_OVERLAP_PERCENT", "0.1")),
         coarse_scan_dpi=int(os.getenv("COARSE_SCAN_DPI", "100")),
         detail_scan_dpi=int(os.getenv("DETAIL_SCAN_DPI", "200")),
+        enable_dpi_cascade=os.getenv("ENABLE_DPI_CASCADE", "true").lower() == "true",
+        cascade_scan_dpi=int(os.getenv("CASCADE_SCAN_DPI", "150")),
+        refine_confidence_threshold=float(os.getenv("REFINE_CONFIDENCE_THRESHOLD", "0.6")),
+        refine_margin_points=int(os.getenv("REFINE_MARGIN_POINTS", "18")),
+        min_roi_confidence=float(os.getenv("MIN_ROI_CONFIDENCE", "0.3")),
+        min_roi_area_percent=float(os.getenv("MIN_ROI_AREA_PERCENT", "0.2")),
 
         # Processing limits
         max_concurrent_tiles=int(os.getenv("MAX_CONCURRENT_TILES", "5")),
         default_max_pages=int(os.getenv("DEFAULT_MAX_PAGES", "5")),
+        max_concurrent_llm_calls=int(os.getenv("MAX_CONCURRENT_LLM_CALLS", "4")),
+        max_cpu_workers=int(os.getenv("MAX_CPU_WORKERS", str(os.cpu_count() or 2))),
+        max_concurrent_documents=int(os.getenv("MAX_CONCURRENT_DOCUMENTS", "8")),
+        enable_memory_budget=os.getenv("ENABLE_MEMORY_BUDGET", "true").lower() == "true",
+        memory_budget_mb=int(os.getenv("MEMORY_BUDGET_MB", "1536")),
+        memory_wait_timeout_s=float(os.getenv("MEMORY_WAIT_TIMEOUT_S", "300")),
+
+        # Caching
+        enable_response_cache=os.getenv("ENABLE_RESPONSE_CACHE", "true").lower() == "true",
+        response_cache_size=int(os.getenv("RESPONSE_CACHE_SIZE", "512")),
 
         # Claude settings
         claude_model=os.getenv("CLAUDE_MODEL", "claude-sonnet-4-5-20250929"),
@@ -104,6 +150,8 @@ def load_parsing_config() -> ParsingConfig:
         openai_model=os.getenv("OPENAI_MODEL", "gpt-4o"),
         openai_max_tokens=int(os.getenv("OPENAI_MAX_TOKENS", "16000")),
         openai_temperature=float(os.getenv("OPENAI_TEMPERATURE", "0.0")),
+        openai_chunk_pages=int(os.getenv("OPENAI_CHUNK_PAGES", "5")),
+        openai_max_chunk_mb=float(os.getenv("OPENAI_MAX_CHUNK_MB", "20")),
 
         # Deduplication
         fuzzy_match_threshold=int(os.getenv("FUZZY_MATCH_THRESHOLD", "85")),
@@ -113,6 +161,10 @@ def load_parsing_config() -> ParsingConfig:
         log_level=os.getenv("LOG_LEVEL", "INFO"),
         log_strategy_selection=os.getenv("LOG_STRATEGY_SELECTION", "true").lower() == "true",
         log_processing_time=os.getenv("LOG_PROCESSING_TIME", "true").lower() == "true",
+
+        # Telemetry
+        enable_telemetry=os.getenv("ENABLE_TELEMETRY", "true").lower() == "true",
+        enable_opentelemetry=os.getenv("ENABLE_OPENTELEMETRY", "false").lower() == "true",
     )
 
     return config
@@ -2,13 +2,52 @@
 Output Normalizer
 
 Ensures all parsing strategies return consistent schema regardless of source.
+
+Units are mapped to canonical forms through an alias table.
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+import re
+from functools import lru_cache
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+from .utils.telemetry import telemetry
 
 logger = logging.getLogger(__name__)
 
+# Canonical unit -> spellings seen in plans and model output (lowercase,
+# periods removed). Canonical forms follow the material catalog ("RL",
+# "BDL") so parsed units compare equal to catalog units.
+UNIT_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "EA": ("ea", "each", "pc", "pcs", "piece", "pieces", "no", "nos", "unit", "units"),
+    "LF": ("lf", "lin ft", "linear ft", "linear foot", "linear feet", "ft", "feet", "foot"),
+    "SF": ("sf", "sq ft", "sqft", "square foot", "square feet", "ft2"),
+    "SY": ("sy", "sq yd", "sqyd", "square yard", "square yards", "yd2"),
+    "CY": ("cy", "cu yd", "cuyd", "cubic yard", "cubic yards", "yd3"),
+    "CF": ("cf", "cu ft", "cubic foot", "cubic feet", "ft3"),
+    "LS": ("ls", "lump sum", "lumpsum", "lump"),
+    "TON": ("ton", "tons", "tn"),
+    "LB": ("lb", "lbs", "pound", "pounds"),
+    "GAL": ("gal", "gals", "gallon", "gallons"),
+    "HR": ("hr", "hrs", "hour", "hours"),
+    "DAY": ("day", "days"),
+    "AC": ("ac", "acre", "acres"),
+    "SQ": ("sq", "square", "squares"),
+    "BF": ("bf", "board foot", "board feet"),
+    "MBF": ("mbf",),
+    "BAG": ("bag", "bags"),
+    "BOX": ("box", "boxes", "bx"),
+    "RL": ("rl", "roll", "rolls"),
+    "BDL": ("bdl", "bundle", "bundles"),
+    "SHT": ("sht", "sh", "sheet", "sheets"),
+}
+
+_UNIT_LOOKUP = {
+    alias: canonical
+    for canonical, aliases in UNIT_ALIASES.items()
+    for alias in aliases + (canonical.lower(),)
+}
+
 
 class OutputNormalizer:
     """
@@ -16,6 +55,7 @@ class OutputNormalizer:
     """
 
     @staticmethod
+    @telemetry.traced("output.normalize")
     def normalize(data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Normalize parsed data to standard schema
@@ -50,6 +90,57 @@ class OutputNormalizer:
 
         return normalized
 
+    @staticmethod
+    def normalize_partial(data: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Normalize a partial (in-flight) extraction result
+
+        Only the item lists are normalized, so this can be applied to each tile,
+        page or streamed batch as it completes.
+
+        Args:
+            data: Partial data with any of bid_items, materials, specifications
+
+        Returns:
+            Dictionary with normalized bid_items, materials and specifications lists
+        """
+        if not data:
+            data = {}
+
+        return {
+            "bid_items": OutputNormalizer._normalize_bid_items(
+                data.get("bid_items", [])
+            ),
+            "materials": OutputNormalizer._normalize_materials(
+                data.get("materials", [])
+            ),
+            "specifications": OutputNormalizer._normalize_specifications(
+                data.get("specifications", [])
+            ),
+        }
+
+    @staticmethod
+    def normalize_stream(
+        batches: Iterable[Dict[str, Any]]
+    ) -> Iterator[Dict[str, List[Dict[str, Any]]]]:
+        """
+        Normalize an incremental stream of partial results
+
+        Each batch (a tile, page or streamed group of items) is normalized as
+        it arrives, so results can be delivered progressively. Batches that
+        contain no items are skipped.
+
+        Args:
+            batches: Partial data with any of bid_items, materials, specifications
+
+        Yields:
+            Normalized bid_items, materials and specifications of each batch
+        """
+        for batch in batches:
+            normalized = OutputNormalizer.normalize_partial(batch)
+            if any(normalized.values()):
+                yield normalized
+
     @staticmethod
     def _empty_schema() -> Dict[str, Any]:
         """Return empty schema structure"""
@@ -73,12 +164,13 @@ class OutputNormalizer:
         - item_number: str
         - description: str
         - quantity: float
-        - unit: str
+        - unit: str (canonical, e.g. "EA", "SF")
         - unit_price: float (optional)
+        - source_page, source_bbox (optional, when the strategy located the item)
         """
         normalized = []
 
-        for item in items:
+        for item in items or []:
             if not item or not isinstance(item, dict):
                 continue
 
@@ -93,14 +185,16 @@ class OutputNormalizer:
                 "quantity": OutputNormalizer._normalize_number(
                     item.get("quantity") or item.get("qty") or item.get("amount")
                 ),
-                "unit": OutputNormalizer._normalize_string(
+                "unit": OutputNormalizer.canonical_unit(OutputNormalizer._normalize_string(
                     item.get("unit") or item.get("units") or item.get("uom")
-                ),
+                )),
                 "unit_price": OutputNormalizer._normalize_number(
                     item.get("unit_price") or item.get("price") or item.get("cost")
                 ),
             }
 
+            normalized_item.update(OutputNormalizer._source_location(item))
+
             # Only include if has meaningful data
             if normalized_item["item_number"] or normalized_item["description"]:
                 normalized.append(normalized_item)
@@ -118,7 +212,7 @@ class OutputNormalizer:
         """
         normalized = []
 
-        for spec in specs:
+        for spec in specs or []:
             if not spec or not isinstance(spec, dict):
                 continue
 
@@ -170,12 +264,13 @@ class OutputNormalizer:
         Standard fields:
         - name: str
         - quantity: float
-        - unit: str
+        - unit: str (canonical, e.g. "EA", "SF")
         - specification: str (optional)
+        - source_page, source_bbox (optional, when the strategy located the item)
         """
         normalized = []
 
-        for material in materials:
+        for material in materials or []:
             if not material or not isinstance(material, dict):
                 continue
 
@@ -186,20 +281,53 @@ class OutputNormalizer:
                 "quantity": OutputNormalizer._normalize_number(
                     material.get("quantity") or material.get("qty") or material.get("amount")
                 ),
-                "unit": OutputNormalizer._normalize_string(
+                "unit": OutputNormalizer.canonical_unit(OutputNormalizer._normalize_string(
                     material.get("unit") or material.get("units") or material.get("uom")
-                ),
+                )),
                 "specification": OutputNormalizer._normalize_string(
                     material.get("specification") or material.get("spec") or material.get("spec_code")
                 ),
             }
 
+            normalized_material.update(OutputNormalizer._source_location(material))
+
             # Only include if has name
             if normalized_material["name"]:
                 normalized.append(normalized_material)
 
         return normalized
 
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def canonical_unit(unit: Optional[str]) -> Optional[str]:
+        """
+        Map a unit spelling to its canonical form
+
+        "each" -> "EA", "sq ft" -> "SF", "Lump Sum" -> "LS". Unknown units
+        are returned stripped but otherwise unchanged. Results are cached,
+        since a payload repeats a handful of spellings.
+        """
+        if unit is None:
+            return None
+
+        stripped = unit.strip()
+        key = re.sub(r"\s+", " ", stripped.lower().replace(".", " ")).strip()
+        return _UNIT_LOOKUP.get(key, _UNIT_LOOKUP.get(key.replace(" ", ""), stripped or None))
+
+    @staticmethod
+    def _source_location(item: Dict[str, Any]) -> Dict[str, Any]:
+        """Source page and box (PDF points) of an item, if the strategy provided them"""
+        location = {}
+
+        if isinstance(item.get("source_page"), int):
+            location["source_page"] = item["source_page"]
+
+        bbox = item.get("source_bbox")
+        if isinstance(bbox, dict) and all(k in bbox for k in ("x", "y", "width", "height")):
+            location["source_bbox"] = {k: bbox[k] for k in ("x", "y", "width", "height")}
+
+        return location
+
     @staticmethod
     def _normalize_string(value: Any) -> Optional[str]:
         """Normalize value to string or None"""
@@ -0,0 +1,263 @@
+"""
+Parsing Prompts
+
+Stable instruction prompts used by the plan parsers. Each prompt is sent as a
+system prompt marked with an Anthropic prompt-cache breakpoint, so repeated
+calls (every tile of every page, every plan upload) reuse the cached prefix
+and only the per-call images are billed and processed as fresh input.
+
+Bump PROMPT_VERSION whenever a prompt's wording changes; it is part of every
+local response cache key, so stale responses are never reused.
+"""
+
+from typing import Any, Dict, List
+
+# Version of the prompt set below (part of response cache keys)
+PROMPT_VERSION = "2025.4"
+
+
+def cached_system_prompt(prompt: str) -> List[Dict[str, Any]]:
+    """
+    Build an Anthropic system prompt block with a cache breakpoint
+
+    Prompts shorter than the model's minimum cacheable length are accepted by
+    the API and simply not cached.
+
+    Args:
+        prompt: Instruction text
+
+    Returns:
+        List of system content blocks for messages.create(system=...)
+    """
+    return [{
+        "type": "text",
+        "text": prompt,
+        "cache_control": {"type": "ephemeral"},
+    }]
+
+
+# Lumber yard material takeoff using EXACT Stine catalog naming conventions
+# for accurate matching (PlanParser legacy Claude method)
+STINE_TAKEOFF_PROMPT = """
+You are a lumber yard estimator analyzing construction plan documents for STINE Home + Yard.
+Extract a COMPLETE material takeoff using STINE's EXACT product naming format.
+
+CRITICAL NAMING FORMAT - Use these EXACT patterns:
+LUMBER (use "Pine #2" prefix):
+- "Pine #2 (2x4-8 Nominal)" for 2x4 8-foot boards
+- "Pine #2 (2x4-10 Nominal)" for 2x4 10-foot boards  
+- "Pine #2 (2x4-12 Nominal)" for 2x4 12-foot boards
+- "Pine #2 (2x4-14 Nominal)" for 2x4 14-foot boards
+- "Pine #2 (2x4-16 Nominal)" for 2x4 16-foot boards
+- "Pine #2 (2x6-8 Nominal)" through "Pine #2 (2x6-20 Nominal)"
+- "Pine #2 (2x8-10 Nominal)" through "Pine #2 (2x8-16 Nominal)"
+- "Pine #2 (2x10-12 Nominal)" through "Pine #2 (2x10-16 Nominal)"
+- "Pine #2 (2x12-14 Nominal)" for headers/beams
+
+STUDS (use "Stud-" prefix):
+- "Stud- Spruce Pine Fir (2x4-116-5/8 Nominal)" for 9-foot studs
+- "Stud- Spruce, Pine, Fir (2x4-140-5/8 Nominal)" for 11-foot studs
+- "Stud Spruce (2x6-116-5/8 Nominal)" for 2x6 studs
+
+TREATED LUMBER:
+- "Pine #2 PRIME TREATED (2x4-14 Nominal)" for treated plates
+- "Pine #2 PRIME TREATED (2x6-14 Nominal)" for treated sills
+
+SHEATHING:
+- "OSB 7/16\" Rated Sheathing (48x96x7/16)" for wall sheathing
+- "OSB 7/16\" Radiant Barrier (48x96x7/16)" for roof sheathing
+- "OSB 10' Wind (48x121-1/8x7/16)" for 10-foot panels
+
+ROOFING:
+- "Roof Tamko Hert Wthrwd" for shingles (unit: BDL)
+- "Stine ProFelt Plus Synthetic Felt" for underlayment (unit: RL)
+- "Drip Edge 26ga" for drip edge
+- "Vent Ridge Shngle Over" for ridge vent
+
+SIDING:
+- "Hardie Lap Siding 6 1/4 Smooth" for lap siding
+- "Hardie Trim 4/4x3.5x12 Smooth" for trim
+- "Hardie Soffit Vented 16x12 Smooth" for vented soffit
+- "Hardie Soffit Non-Vented 16x12 Smooth" for solid soffit
+
+HARDWARE:
+- "Simpson 18 Ga. Galvanized Steel Hurricane Tie H2.5A" for hurricane ties
+- "Simpson ZMax LUS26Z Joist Hanger" for joist hangers
+- "Anchor Bolt HDG 5/8 10\"" for anchor bolts
+
+INSULATION:
+- "Insul R-13 125.94 SqFt 3-1/2x15" for R-13
+- "Insul R-30 58.67 Sq' 9.25x16" for R-30
+
+DRYWALL:
+- "Gypsum 4'x12'x1/2\" Reg" for regular drywall
+- "Gypsum 4'X8'X1/2\" Mold/Moist Resistant Purple" for moisture resistant
+
+Return ONLY valid JSON:
+{
+  "project_info": {"name": "", "lot_number": "", "builder": ""},
+  "materials": [
+    {"name": "Pine #2 (2x4-14 Nominal)", "quantity": 80, "unit": "ea", "category": "Walls"},
+    {"name": "Stud- Spruce Pine Fir (2x4-116-5/8 Nominal)", "quantity": 220, "unit": "ea", "category": "Walls"},
+    {"name": "OSB 7/16\" Radiant Barrier (48x96x7/16)", "quantity": 100, "unit": "ea", "category": "Sheathing"},
+    {"name": "Simpson 18 Ga. Galvanized Steel Hurricane Tie H2.5A", "quantity": 160, "unit": "ea", "category": "Hardware"}
+  ],
+  "bid_items": [],
+  "specifications": []
+}
+
+Extract ALL materials with quantities. A typical house has 50-150 line items.
+"""
+
+# Per-call instruction sent after the plan page images
+STINE_TAKEOFF_INSTRUCTION = "Extract the complete material takeoff from these plan pages."
+
+# Coarse pass: locate regions of interest on a low-resolution page
+ROI_DETECTION_PROMPT = """
+Analyze this construction plan page and identify regions of interest (ROI) that contain important information.
+
+Look for:
+- Bid item tables (with item numbers, descriptions, quantities)
+- Specification sections
+- Project information (name, location, dates)
+- Material lists or schedules
+
+For each region, provide a bounding box in this format:
+{
+  "regions": [
+    {
+      "label": "bid_items_table",
+      "x": 100,
+      "y": 200,
+      "width": 800,
+      "height": 600,
+      "confidence": 0.9
+    }
+  ]
+}
+
+Return ONLY the JSON. If no important regions found, return {"regions": []}.
+"""
+
+ROI_DETECTION_INSTRUCTION = "Identify the regions of interest on this page."
+
+# Detail pass: extract items from one high-resolution tile
+TILE_EXTRACTION_PROMPT = """
+Analyze this section of a construction plan. Extract ANY of the following you can see:
+
+**Materials/Items**: Lumber (2x4, 2x6, etc.), hardware, roofing, windows, doors, concrete, drywall, insulation, etc.
+**Quantities**: Counts, dimensions, areas (e.g., "100 SF", "24 EA", "12 LF")
+**Specifications**: Codes, standards, material grades, brands
+**Project Info**: Name, location, lot number, builder
+
+Return JSON in this EXACT format:
+{
+  "bid_items": [{"item_number": "1", "description": "2x4 studs", "quantity": 100, "unit": "EA", "bbox": {"x": 40, "y": 212, "width": 380, "height": 18}, "confidence": 0.95, "illegible": false}],
+  "materials": [{"name": "2x4 Pine Studs", "quantity": 100, "unit": "EA", "bbox": {"x": 512, "y": 96, "width": 240, "height": 22}, "confidence": 0.6, "illegible": true}],
+  "specifications": [{"code": "#2 Pine", "description": "Framing lumber grade"}],
+  "project_info": {"name": "Lot 195", "location": "Lafayette", "bid_date": null},
+  "unreadable_regions": [{"x": 300, "y": 410, "width": 120, "height": 30, "note": "dimension string too small to read"}]
+}
+
+IMPORTANT:
+- Extract materials/lumber from drawings, notes, schedules
+- Look for dimensions like "2x4", "2x6", quantities like "@ 16\" O.C."
+- Include window/door schedules
+- bbox is the pixel box around the text the item was read from, in THIS image (origin top-left)
+- confidence (0-1) is how sure you are the text and quantity were read correctly
+- Set illegible to true when any part of the item (e.g. a quantity or size) was too small or blurry to read
+- List text you can see but cannot read (dimension strings, small callouts) in unreadable_regions; do not guess it
+- Return ONLY JSON, no other text
+- If nothing found, return empty arrays but valid JSON
+"""
+
+TILE_EXTRACTION_INSTRUCTION = "Extract the items visible in this plan section."
+
+# Fallback when no ROI is detected: extract from whole low-resolution pages
+FULL_PAGE_EXTRACTION_PROMPT = """
+You are analyzing a construction plan document. Extract the following information:
+
+1. **Bid Items**: List all bid items with their item numbers, descriptions, quantities, and units.
+2. **Specifications**: List any specification codes or references (e.g., ASTM, AASHTO).
+3. **Project Details**: Extract project name, location, bid date if visible.
+4. **Materials**: List specific materials mentioned with quantities.
+
+Return the data in this JSON format:
+{
+  "bid_items": [
+    {
+      "item_number": "101",
+      "description": "Clearing and Grubbing",
+      "quantity": 1.0,
+      "unit": "LS"
+    }
+  ],
+  "specifications": [
+    {
+      "code": "ASTM C150",
+      "description": "Portland Cement"
+    }
+  ],
+  "project_info": {
+    "name": null,
+    "location": null,
+    "bid_date": null
+  },
+  "materials": [
+    {
+      "name": "Concrete",
+      "quantity": 500,
+      "unit": "CY"
+    }
+  ]
+}
+
+Be thorough but only include items explicitly mentioned. Use null or empty arrays if not found.
+"""
+
+FULL_PAGE_EXTRACTION_INSTRUCTION = "Extract the information from these plan pages."
+
+# OpenAI native PDF input
+NATIVE_PDF_EXTRACTION_PROMPT = """
+You are analyzing a construction plan document. Extract the following information:
+
+1. **Bid Items**: List all bid items with their item numbers, descriptions, quantities, and units.
+2. **Specifications**: List any specification codes or references (e.g., ASTM, AASHTO).
+3. **Project Details**: Extract project name, location, bid date if visible.
+4. **Materials**: List specific materials mentioned with quantities.
+
+Return the data in this JSON format:
+{
+  "bid_items": [
+    {
+      "item_number": "101",
+      "description": "Clearing and Grubbing",
+      "quantity": 1.0,
+      "unit": "LS",
+      "unit_price": null
+    }
+  ],
+  "specifications": [
+    {
+      "code": "ASTM C150",
+      "description": "Portland Cement"
+    }
+  ],
+  "project_info": {
+    "name": "Highway 90 Expansion",
+    "location": "Lafayette, LA",
+    "bid_date": "2024-03-15"
+  },
+  "materials": [
+    {
+      "name": "Concrete",
+      "quantity": 500,
+      "unit": "CY",
+      "specification": "ASTM C150"
+    }
+  ]
+}
+
+Be thorough but only include items explicitly mentioned in the documents.
+If information is not found, use null or empty arrays.
+"""
@@ -0,0 +1,229 @@
+"""
+Extraction Schema
+
+Pydantic models describing what the LLM extraction calls must return. The
+same models drive schema-constrained output (Claude tool use input schemas)
+and validation of every response, whichever provider produced it.
+
+Models are deliberately lenient: numbers written as strings ("1,200", "$4.50")
+are coerced, unparseable numbers become None, and unknown keys are kept, so a
+single odd value never discards an otherwise useful extraction.
+"""
+
+import re
+from typing import Any, List, Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+
+def _coerce_number(value: Any) -> Optional[float]:
+    """Coerce LLM number output to float, or None if it is not a number"""
+    if value is None or isinstance(value, bool):
+        return None
+
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    if isinstance(value, str):
+        cleaned = value.strip().replace(",", "").replace("$", "")
+        match = re.match(r"^-?\d+(\.\d+)?", cleaned)
+        if match:
+            return float(match.group(0))
+
+    return None
+
+
+def _coerce_string(value: Any) -> Optional[str]:
+    """Coerce scalar LLM output to string (item numbers often arrive as ints)"""
+    if value is None or isinstance(value, (dict, list)):
+        return None
+    return str(value)
+
+
+def _coerce_flag(value: Any) -> Optional[bool]:
+    """Coerce LLM yes/no output to bool, or None if it is not a flag"""
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return bool(value)
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "yes", "1")
+    return None
+
+
+def _coerce_box(value: Any) -> Optional[dict]:
+    """Drop malformed boxes instead of failing the whole item"""
+    return value if isinstance(value, dict) else None
+
+
+class ExtractionModel(BaseModel):
+    """Base for extraction models: coerces scalars and keeps unknown keys"""
+
+    class Config:
+        extra = "allow"
+
+
+# ---------------------------------------------------------------------------
+# Plan extraction (plan parser, tiles, full pages, OpenAI native PDF)
+# ---------------------------------------------------------------------------
+
+class ItemBox(ExtractionModel):
+    """Where an item was read, in pixels of the image it was read from"""
+    x: float = 0
+    y: float = 0
+    width: float = 0
+    height: float = 0
+
+    _numbers = field_validator("x", "y", "width", "height", mode="before")(
+        lambda value: _coerce_number(value) or 0
+    )
+
+
+_BBOX_DESCRIPTION = "Pixel box of the item's text in the image (origin top-left), when reading a single image"
+_CONFIDENCE_DESCRIPTION = "How sure the text and quantity were read correctly (0-1)"
+_ILLEGIBLE_DESCRIPTION = "True when part of the item was too small or blurry to read"
+
+
+class UnreadableRegion(ItemBox):
+    """Text the model could see but not read (e.g. a tiny dimension string)"""
+    note: Optional[str] = None
+
+    _strings = field_validator("note", mode="before")(_coerce_string)
+
+
+class ExtractedBidItem(ExtractionModel):
+    """A bid item row from a bid schedule"""
+    item_number: Optional[str] = None
+    description: Optional[str] = None
+    quantity: Optional[float] = None
+    unit: Optional[str] = None
+    unit_price: Optional[float] = None
+    bbox: Optional[ItemBox] = Field(None, description=_BBOX_DESCRIPTION)
+    confidence: Optional[float] = Field(None, description=_CONFIDENCE_DESCRIPTION)
+    illegible: Optional[bool] = Field(None, description=_ILLEGIBLE_DESCRIPTION)
+
+    _numbers = field_validator("quantity", "unit_price", "confidence", mode="before")(_coerce_number)
+    _strings = field_validator("item_number", "description", "unit", mode="before")(_coerce_string)
+    _bbox = field_validator("bbox", mode="before")(_coerce_box)
+    _flags = field_validator("illegible", mode="before")(_coerce_flag)
+
+
+class ExtractedMaterial(ExtractionModel):
+    """A material line of the takeoff"""
+    name: Optional[str] = None
+    quantity: Optional[float] = None
+    unit: Optional[str] = None
+    category: Optional[str] = None
+    specification: Optional[str] = None
+    bbox: Optional[ItemBox] = Field(None, description=_BBOX_DESCRIPTION)
+    confidence: Optional[float] = Field(None, description=_CONFIDENCE_DESCRIPTION)
+    illegible: Optional[bool] = Field(None, description=_ILLEGIBLE_DESCRIPTION)
+
+    _numbers = field_validator("quantity", "confidence", mode="before")(_coerce_number)
+    _strings = field_validator("name", "unit", "category", "specification", mode="before")(_coerce_string)
+    _bbox = field_validator("bbox", mode="before")(_coerce_box)
+    _flags = field_validator("illegible", mode="before")(_coerce_flag)
+
+
+class ExtractedSpecification(ExtractionModel):
+    """A specification code or standard reference"""
+    code: Optional[str] = None
+    description: Optional[str] = None
+
+    _strings = field_validator("code", "description", mode="before")(_coerce_string)
+
+
+class ExtractedProjectInfo(ExtractionModel):
+    """Project details from the title block"""
+    name: Optional[str] = None
+    location: Optional[str] = None
+    bid_date: Optional[str] = None
+
+    _strings = field_validator("name", "location", "bid_date", mode="before")(_coerce_string)
+
+
+class PlanExtraction(ExtractionModel):
+    """Items extracted from plan pages or tiles"""
+    bid_items: List[ExtractedBidItem] = Field(default_factory=list)
+    materials: List[ExtractedMaterial] = Field(default_factory=list)
+    specifications: List[ExtractedSpecification] = Field(default_factory=list)
+    project_info: ExtractedProjectInfo = Field(default_factory=ExtractedProjectInfo)
+    unreadable_regions: List[UnreadableRegion] = Field(default_factory=list)
+
+
+# ---------------------------------------------------------------------------
+# Coarse ROI detection
+# ---------------------------------------------------------------------------
+
+class DetectedRegion(ExtractionModel):
+    """A region of interest on a page, in pixels of the scanned image"""
+    label: str = "unknown"
+    x: float = 0
+    y: float = 0
+    width: Optional[float] = None
+    height: Optional[float] = None
+    confidence: float = 0.8
+
+    _label = field_validator("label", mode="before")(lambda value: _coerce_string(value) or "unknown")
+
+
+class RegionDetection(ExtractionModel):
+    """Regions of interest found by the coarse scan"""
+    regions: List[DetectedRegion] = Field(default_factory=list)
+
+
+# ---------------------------------------------------------------------------
+# Specification documents
+# ---------------------------------------------------------------------------
+
+class SpecStandard(ExtractionModel):
+    """A referenced standard (ASTM, AASHTO, ...)"""
+    code: Optional[str] = None
+    title: Optional[str] = None
+    context: Optional[str] = None
+
+    _strings = field_validator("code", "title", "context", mode="before")(_coerce_string)
+
+
+class SpecMaterial(ExtractionModel):
+    """A material requirement from PART 2 - PRODUCTS"""
+    name: Optional[str] = None
+    properties: Optional[str] = None
+    standard: Optional[str] = None
+    requirements: Optional[str] = None
+
+    _strings = field_validator("name", "properties", "standard", "requirements", mode="before")(_coerce_string)
+
+
+class SpecRequirement(ExtractionModel):
+    """An installation, quality control or testing requirement"""
+    type: Optional[str] = None
+    description: Optional[str] = None
+    details: Optional[str] = None
+
+    _strings = field_validator("type", "description", "details", mode="before")(_coerce_string)
+
+
+class SpecParts(ExtractionModel):
+    """Summaries of the three CSI section parts"""
+    part_1_general: Optional[str] = None
+    part_2_products: Optional[str] = None
+    part_3_execution: Optional[str] = None
+
+    _strings = field_validator("part_1_general", "part_2_products", "part_3_execution", mode="before")(_coerce_string)
+
+
+class SpecificationExtraction(ExtractionModel):
+    """Structured content of a specification section"""
+    division_number: Optional[str] = None
+    division_title: Optional[str] = None
+    section_number: Optional[str] = None
+    section_title: Optional[str] = None
+    parts: SpecParts = Field(default_factory=SpecParts)
+    standards: List[SpecStandard] = Field(default_factory=list)
+    materials: List[SpecMaterial] = Field(default_factory=list)
+    requirements: List[SpecRequirement] = Field(default_factory=list)
+
+    _strings = field_validator(
+        "division_number", "division_title", "section_number", "section_title", mode="before"
+    )(_coerce_string)
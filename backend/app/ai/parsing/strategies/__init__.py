@@ -2,17 +2,20 @@
 Document Parsing Strategies
 
 Contains implementations of different parsing strategies:
+- Native-Text Tables: pdfplumber table extraction for vector PDFs (no vision)
 - OpenAI Native PDF: Direct PDF upload to GPT-4 Vision
 - Claude Tiling: Map-reduce approach with intelligent tiling
 - Document AI: Google Cloud Document AI with targeted VLM
 - Tesseract OCR: Fallback OCR strategy
 """
 
+from .pdf_table_strategy import PDFTableStrategy
 from .openai_native_strategy import OpenAINativeStrategy
 from .claude_tiling_strategy import ClaudeTilingStrategy
 from .tesseract_ocr_strategy import TesseractOCRStrategy
 
 __all__ = [
+    "PDFTableStrategy",
     "OpenAINativeStrategy",
     "ClaudeTilingStrategy",
     "TesseractOCRStrategy",
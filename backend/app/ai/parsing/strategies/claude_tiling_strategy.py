@@ -3,24 +3,46 @@ Claude Tiling Strategy
 
 Implements a two-phase map-reduce approach:
 1. Coarse Pass: Low-res scan to identify regions of interest (ROI)
-2. Detail Pass: High-res tiling of important regions only
+2. Detail Pass: Tiling of important regions only, read at a moderate DPI
+   first and refined at high DPI only where the first reading was uncertain
 
 This fixes the 5MB image limit bug by ensuring no tile exceeds the size limit.
 """
 
 import asyncio
-import json
 import logging
 import time
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Type
 from fuzzywuzzy import fuzz
+from pydantic import BaseModel
 
 from anthropic import Anthropic
 
 from ..base_strategy import BaseParsingStrategy, ParseResult, DocumentMetrics, StrategyType
+from ..schema import PlanExtraction, RegionDetection
+from ..structured_output import (
+    PLAN_EXTRACTION_TOOL,
+    REGION_DETECTION_TOOL,
+    message_output_text,
+    parse_json_response,
+    tool_request_kwargs,
+)
 from ..utils.image_processor import ImageProcessor, TileInfo
-from ..utils.coordinate_mapper import CoordinateMapper, BoundingBox
+from ..utils.coordinate_mapper import CoordinateMapper, BoundingBox, CoverageMask, SpatialIndex
+from ..utils.progress import ProgressCallback, emit_items, emit_progress
+from ..utils.concurrency import cpu_budget, llm_budget
+from ..utils.response_cache import response_cache
+from ..utils.telemetry import telemetry
+from ..prompts import (
+    FULL_PAGE_EXTRACTION_INSTRUCTION,
+    FULL_PAGE_EXTRACTION_PROMPT,
+    ROI_DETECTION_INSTRUCTION,
+    ROI_DETECTION_PROMPT,
+    TILE_EXTRACTION_INSTRUCTION,
+    TILE_EXTRACTION_PROMPT,
+    cached_system_prompt,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +66,9 @@ class ClaudeTilingStrategy(BaseParsingStrategy):
         # Initialize Claude client
         api_key = config.get("anthropic_api_key")
         if api_key:
-            self.client = Anthropic(api_key=api_key)
+            self.client = telemetry.instrument_client(
+                Anthropic(api_key=api_key, base_url=config.get("anthropic_base_url"))
+            )
         else:
             self.client = None
 
@@ -58,9 +82,16 @@ class ClaudeTilingStrategy(BaseParsingStrategy):
         # Configuration
         self.coarse_dpi = config.get("coarse_scan_dpi", 100)
         self.detail_dpi = config.get("detail_scan_dpi", 200)
+        self.cascade_dpi = config.get("cascade_scan_dpi", 150)
+        self.cascade_enabled = config.get("enable_dpi_cascade", True) and self.cascade_dpi < self.detail_dpi
+        self.refine_confidence_threshold = config.get("refine_confidence_threshold", 0.6)
+        self.refine_margin_points = config.get("refine_margin_points", 18)
         self.tile_overlap = config.get("tile_overlap_percent", 0.1)
         self.max_concurrent = config.get("max_concurrent_tiles", 5)
         self.fuzzy_threshold = config.get("fuzzy_match_threshold", 85)
+        self.merge_iou_threshold = config.get("merge_iou_threshold", 0.5)
+        self.min_roi_confidence = config.get("min_roi_confidence", 0.3)
+        self.min_roi_area_percent = config.get("min_roi_area_percent", 0.2)
         self.model = config.get("claude_model", "claude-sonnet-4-5-20250929")
         self.max_tokens = config.get("claude_max_tokens", 16000)
         self.temperature = config.get("claude_temperature", 0.0)
@@ -78,13 +109,20 @@ class ClaudeTilingStrategy(BaseParsingStrategy):
         """Priority 3 - universal fallback"""
         return 3
 
-    async def parse(self, pdf_path: Path, max_pages: int = 5) -> ParseResult:
+    async def parse(
+        self,
+        pdf_path: Path,
+        max_pages: int = 5,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> ParseResult:
         """
         Parse PDF using two-phase tiling approach
 
         Args:
             pdf_path: Path to PDF file
             max_pages: Maximum pages to process
+            progress_callback: Optional callback receiving stage events and
+                per-tile partial items as each tile completes
 
         Returns:
             ParseResult with extracted data
@@ -92,54 +130,61 @@ class ClaudeTilingStrategy(BaseParsingStrategy):
         start_time = time.time()
         logger.info(f"Starting Claude tiling strategy for {pdf_path}")
 
-        try:
-            # Phase 1: Coarse scan for ROI detection
-            logger.info("Phase 1: Coarse scan for ROI detection")
-            roi_list = await self._coarse_scan(pdf_path, max_pages)
-
-            if not roi_list:
-                # No ROI detected, parse entire pages at low resolution
-                logger.warning("No ROI detected, parsing entire pages")
-                result_data = await self._parse_full_pages(pdf_path, max_pages)
-            else:
-                # Phase 2: Detail pass on ROI
-                logger.info(f"Phase 2: Detail pass on {len(roi_list)} ROI regions")
-                result_data = await self._detail_pass(pdf_path, roi_list)
-
-            # Calculate metrics
-            processing_time = int((time.time() - start_time) * 1000)
-
-            # Calculate confidence based on data completeness
-            confidence = self._calculate_confidence(result_data)
-
-            return ParseResult(
-                success=True,
-                data=result_data,
-                strategy_used=StrategyType.CLAUDE_TILING,
-                confidence_score=confidence,
-                pages_processed=max_pages,
-                processing_time_ms=processing_time,
-                metadata={
-                    "roi_regions": len(roi_list),
-                    "method": "tiling",
-                },
-            )
+        with telemetry.trace("parse.tiling") as parse_trace:
+            try:
+                # Phase 1: Coarse scan for ROI detection
+                logger.info("Phase 1: Coarse scan for ROI detection")
+                roi_list = await self._coarse_scan(pdf_path, max_pages, progress_callback)
+
+                if not roi_list:
+                    # No ROI detected, parse entire pages at low resolution
+                    logger.warning("No ROI detected, parsing entire pages")
+                    emit_progress(progress_callback, "stage", stage="full_page_scan")
+                    result_data = await self._parse_full_pages(pdf_path, max_pages)
+                    emit_items(progress_callback, result_data, source="full_page_scan")
+                else:
+                    # Phase 2: Detail pass on ROI
+                    logger.info(f"Phase 2: Detail pass on {len(roi_list)} ROI regions")
+                    result_data = await self._detail_pass(pdf_path, roi_list, progress_callback)
+
+                # Calculate metrics
+                processing_time = int((time.time() - start_time) * 1000)
+
+                # Calculate confidence based on data completeness
+                confidence = self._calculate_confidence(result_data)
+
+                return ParseResult(
+                    success=True,
+                    data=result_data,
+                    strategy_used=StrategyType.CLAUDE_TILING,
+                    confidence_score=confidence,
+                    pages_processed=max_pages,
+                    processing_time_ms=processing_time,
+                    metadata={
+                        "roi_regions": len(roi_list),
+                        "method": "tiling",
+                        "timings": parse_trace.breakdown(),
+                    },
+                )
 
-        except Exception as e:
-            logger.error(f"Claude tiling strategy failed: {e}", exc_info=True)
-            processing_time = int((time.time() - start_time) * 1000)
-
-            return ParseResult(
-                success=False,
-                error=str(e),
-                strategy_used=StrategyType.CLAUDE_TILING,
-                processing_time_ms=processing_time,
-            )
+            except Exception as e:
+                logger.error(f"Claude tiling strategy failed: {e}", exc_info=True)
+                processing_time = int((time.time() - start_time) * 1000)
+
+                return ParseResult(
+                    success=False,
+                    error=str(e),
+                    strategy_used=StrategyType.CLAUDE_TILING,
+                    processing_time_ms=processing_time,
+                    metadata={"timings": parse_trace.breakdown()},
+                )
 
+    @telemetry.traced("tiling.coarse_scan")
     async def _coarse_scan(
         self,
         pdf_path: Path,
-        max_pages: int
+        max_pages: int,
+        progress_callback: Optional[ProgressCallback] = None
     ) -> List[BoundingBox]:
         """
         Phase 1: Scan pages at low resolution to identify regions of interest
@@ -147,51 +192,29 @@ class ClaudeTilingStrategy(BaseParsingStrategy):
         Args:
             pdf_path: Path to PDF
             max_pages: Maximum pages to scan
+            progress_callback: Optional progress callback
 
         Returns:
-            List of bounding boxes for important regions
+            List of consolidated bounding boxes for important regions, in
+            pixels of the coarse rendering
         """
-        roi_prompt = """
-Analyze this construction plan page and identify regions of interest (ROI) that contain important information.
-
-Look for:
-- Bid item tables (with item numbers, descriptions, quantities)
-- Specification sections
-- Project information (name, location, dates)
-- Material lists or schedules
-
-For each region, provide a bounding box in this format:
-{
-  "regions": [
-    {
-      "label": "bid_items_table",
-      "x": 100,
-      "y": 200,
-      "width": 800,
-      "height": 600,
-      "confidence": 0.9
-    }
-  ]
-}
-
-Return ONLY the JSON. If no important regions found, return {"regions": []}.
-"""
-
         all_roi = []
 
         for page_num in range(1, min(max_pages + 1, 6)):
+            emit_progress(progress_callback, "stage", stage="coarse_scan", page=page_num)
+
             try:
                 # Convert page at low resolution
-                image, base64_data = self.image_processor.pdf_page_to_image(
+                image, base64_data = await cpu_budget.run(
+                    self.image_processor.pdf_page_to_image,
                     pdf_path,
                     page_num,
                     dpi=self.coarse_dpi,
                     target_size_mb=2.0  # Lower size for coarse scan
                 )
 
-                # Ask Claude to identify ROI
+                # Ask Claude to identify ROI (identical pages reuse the cached answer)
                 content = [
-                    {"type": "text", "text": roi_prompt},
                     {
                         "type": "image",
                         "source": {
@@ -199,35 +222,41 @@ Return ONLY the JSON. If no important regions found, return {"regions": []}.
                             "media_type": "image/jpeg",
                             "data": base64_data
                         }
-                    }
+                    },
+                    {"type": "text", "text": ROI_DETECTION_INSTRUCTION},
                 ]
 
-                message = self.client.messages.create(
-                    model=self.model,
+                roi_data = await self._create_message_json(
+                    "roi_detection",
+                    ROI_DETECTION_PROMPT,
+                    content,
+                    REGION_DETECTION_TOOL,
+                    RegionDetection,
                     max_tokens=2048,
-                    temperature=self.temperature,
-                    messages=[{"role": "user", "content": content}]
+                    cache_payloads=[base64_data],
                 )
 
-                response_text = message.content[0].text
-
-                # Parse ROI response
-                roi_data = self._parse_json_response(response_text)
-
+                page_roi = []
                 if roi_data and "regions" in roi_data:
                     for region in roi_data["regions"]:
                         bbox = BoundingBox(
                             x=region.get("x", 0),
                             y=region.get("y", 0),
-                            width=region.get("width", image.width),
-                            height=region.get("height", image.height),
+                            width=region.get("width") or image.width,
+                            height=region.get("height") or image.height,
                             page_number=page_num,
                             confidence=region.get("confidence", 0.8),
                             label=region.get("label", "unknown"),
                         )
-                        all_roi.append(bbox)
+                        page_roi.append(bbox)
 
-                logger.info(f"Page {page_num}: Found {len(roi_data.get('regions', []))} ROI regions")
+                consolidated = self._consolidate_rois(page_roi, image.width, image.height)
+                all_roi.extend(consolidated)
+
+                logger.info(
+                    f"Page {page_num}: Found {len(page_roi)} ROI regions, "
+                    f"{len(consolidated)} after consolidation"
+                )
 
             except Exception as e:
                 logger.warning(f"Failed to scan page {page_num}: {e}")
@@ -236,22 +265,81 @@ Return ONLY the JSON. If no important regions found, return {"regions": []}.
         logger.info(f"Coarse scan complete: {len(all_roi)} total ROI regions")
         return all_roi
 
+    def _consolidate_rois(
+        self,
+        rois: List[BoundingBox],
+        page_width: int,
+        page_height: int
+    ) -> List[BoundingBox]:
+        """
+        Clean up the regions of one page before the detail pass
+
+        The coarse scan often returns overlapping or nested regions (a
+        "bid_items_table" and a "material_list" over the same area). Regions
+        are clamped to the page, tiny and low-confidence regions are dropped,
+        and regions overlapping above merge_iou_threshold (or nested inside
+        another) are merged until no such pair remains.
+
+        Args:
+            rois: Regions of one page in coarse-scan pixels
+            page_width: Coarse image width
+            page_height: Coarse image height
+
+        Returns:
+            Consolidated regions, largest first
+        """
+        min_area = page_width * page_height * self.min_roi_area_percent / 100
+
+        kept = []
+        for roi in rois:
+            clamped = self.coord_mapper.clamp_bbox(roi, page_width, page_height)
+            if clamped is None or clamped.confidence < self.min_roi_confidence:
+                continue
+            kept.append(clamped)
+
+        kept = self.coord_mapper.filter_by_area(kept, min_area=int(min_area))
+
+        # Merging grows boxes, which can create new overlaps; repeat until stable
+        while True:
+            merged = self.coord_mapper.merge_overlapping_boxes(
+                kept,
+                iou_threshold=self.merge_iou_threshold,
+                containment_threshold=0.8,
+            )
+            if len(merged) == len(kept):
+                break
+            kept = merged
+
+        if len(kept) != len(rois):
+            logger.info(f"ROI consolidation: {len(rois)} regions -> {len(kept)}")
+
+        return sorted(kept, key=lambda b: b.area(), reverse=True)
+
+    @telemetry.traced("tiling.detail_pass")
     async def _detail_pass(
         self,
         pdf_path: Path,
-        roi_list: List[BoundingBox]
+        roi_list: List[BoundingBox],
+        progress_callback: Optional[ProgressCallback] = None
     ) -> Dict[str, Any]:
         """
         Phase 2: Process ROI at high resolution with tiling
 
+        With the DPI cascade enabled, regions are first read at
+        cascade_scan_dpi. Only items the model flags as illegible or reads
+        with low confidence, and text it reports as unreadable, are then
+        re-requested as tight crops at detail_scan_dpi.
+
         Args:
             pdf_path: Path to PDF
-            roi_list: List of ROI bounding boxes
+            roi_list: List of ROI bounding boxes (coarse-scan pixels)
+            progress_callback: Optional progress callback
 
         Returns:
             Aggregated parsed data
         """
         all_results = []
+        first_pass_dpi = self.cascade_dpi if self.cascade_enabled else self.detail_dpi
 
         # Group ROI by page
         by_page = {}
@@ -262,39 +350,23 @@ Return ONLY the JSON. If no important regions found, return {"regions": []}.
 
         # Process each page's ROI
         for page_num, page_rois in by_page.items():
-            logger.info(f"Processing page {page_num} with {len(page_rois)} ROI regions")
+            logger.info(f"Processing page {page_num} with {len(page_rois)} ROI regions at {first_pass_dpi} DPI")
+            emit_progress(
+                progress_callback, "stage",
+                stage="detail_pass", page=page_num, regions=len(page_rois), dpi=first_pass_dpi
+            )
 
             try:
-                # Convert page at high resolution
-                image, _ = self.image_processor.pdf_page_to_image(
-                    pdf_path,
-                    page_num,
-                    dpi=self.detail_dpi,
+                page_results = await self._extract_rois(
+                    pdf_path, page_num, page_rois, first_pass_dpi, progress_callback
                 )
 
-                # Process each ROI
-                for roi in page_rois:
-                    # Create tiles for this ROI
-                    tile_size = self.image_processor.calculate_tile_size(
-                        roi.width,
-                        roi.height,
-                        self.image_processor.max_size_bytes,
-                        dpi=self.detail_dpi
-                    )
-
-                    tiles = self.image_processor.create_tiles(
-                        image,
-                        page_num,
-                        tile_size,
-                        overlap_percent=self.tile_overlap,
-                        roi=roi
+                if self.cascade_enabled:
+                    page_results = await self._refine_page(
+                        pdf_path, page_num, page_results, progress_callback
                     )
 
-                    logger.info(f"Created {len(tiles)} tiles for ROI '{roi.label}'")
-
-                    # Process tiles with concurrency limit
-                    tile_results = await self._process_tiles_concurrent(tiles)
-                    all_results.extend(tile_results)
+                all_results.extend(page_results)
 
             except Exception as e:
                 logger.error(f"Failed to process page {page_num}: {e}")
@@ -302,19 +374,215 @@ Return ONLY the JSON. If no important regions found, return {"regions": []}.
 
         # Phase 3: Aggregate results
         logger.info("Phase 3: Aggregating and deduplicating results")
+        emit_progress(progress_callback, "stage", stage="aggregating", tiles=len(all_results))
         final_data = self._aggregate_results(all_results)
 
         return final_data
 
+    async def _extract_rois(
+        self,
+        pdf_path: Path,
+        page_num: int,
+        page_rois: List[BoundingBox],
+        dpi: int,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Tile and extract the regions of one page at a given resolution
+
+        Regions are scaled from coarse to the target resolution. A coverage
+        mask skips tiles whose pixels were already sent with another region,
+        so each part of a page is extracted once.
+
+        Args:
+            pdf_path: Path to PDF
+            page_num: Page number
+            page_rois: Regions of the page (coarse-scan pixels)
+            dpi: Rendering resolution
+            progress_callback: Optional progress callback
+
+        Returns:
+            Parsed results of each tile
+        """
+        image, _ = await cpu_budget.run(
+            self.image_processor.pdf_page_to_image, pdf_path, page_num, dpi=dpi
+        )
+
+        coverage = CoverageMask(image.width, image.height)
+        results = []
+
+        for coarse_roi in page_rois:
+            roi = self.coord_mapper.clamp_bbox(
+                self.coord_mapper.rescale_bbox(coarse_roi, self.coarse_dpi, dpi),
+                image.width,
+                image.height,
+            )
+            if roi is None:
+                continue
+
+            tiles = self._tile_region(image, page_num, roi, dpi, coverage)
+            logger.info(f"Created {len(tiles)} tiles for ROI '{roi.label}'")
+            if not tiles:
+                continue
+
+            # Process tiles with concurrency limit
+            results.extend(await self._process_tiles_concurrent(tiles, progress_callback, dpi))
+
+        return results
+
+    @telemetry.traced("tiling.refine")
+    async def _refine_page(
+        self,
+        pdf_path: Path,
+        page_num: int,
+        results: List[Dict[str, Any]],
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Re-read the uncertain parts of a page at detail resolution
+
+        Args:
+            pdf_path: Path to PDF
+            page_num: Page number
+            results: First-pass tile results of the page
+            progress_callback: Optional progress callback
+
+        Returns:
+            Refined tile results followed by the first-pass results, minus the
+            first-pass items a refined crop replaced
+        """
+        targets: List[BoundingBox] = []
+
+        for result in results:
+            tile_box = result["_tile_meta"]["box"]
+            for key in ("bid_items", "materials"):
+                for item in result.get(key, []) or []:
+                    if self._needs_refinement(item):
+                        item["_refine_box"] = item.get("_bbox") or tile_box
+                        targets.append(item["_refine_box"])
+            targets.extend(result.pop("_unreadable", []))
+
+        if not targets:
+            logger.info(f"Page {page_num}: first pass legible, no refinement needed")
+            return results
+
+        crops = self._refinement_crops(targets)
+        logger.info(
+            f"Page {page_num}: refining {len(targets)} uncertain readings "
+            f"in {len(crops)} crops at {self.detail_dpi} DPI"
+        )
+        emit_progress(
+            progress_callback, "stage",
+            stage="refinement", page=page_num, regions=len(crops), dpi=self.detail_dpi
+        )
+
+        image, _ = await cpu_budget.run(
+            self.image_processor.pdf_page_to_image, pdf_path, page_num, dpi=self.detail_dpi
+        )
+
+        refined_results = []
+        refined_crops = []
+
+        for crop in crops:
+            roi = self.coord_mapper.clamp_bbox(
+                self.coord_mapper.rescale_bbox(crop, 72, self.detail_dpi),
+                image.width,
+                image.height,
+            )
+            if roi is None:
+                continue
+
+            tiles = self._tile_region(image, page_num, roi, self.detail_dpi)
+            crop_results = await self._process_tiles_concurrent(tiles, progress_callback, self.detail_dpi)
+            if crop_results:
+                refined_results.extend(crop_results)
+                refined_crops.append(crop)
+
+        # Drop first-pass readings a high-resolution crop replaced
+        for result in results:
+            for key in ("bid_items", "materials"):
+                result[key] = [
+                    item for item in result.get(key, []) or []
+                    if not self._superseded(item, refined_crops)
+                ]
+
+        # Refined results first, so their values win when items are merged
+        return refined_results + results
+
+    def _tile_region(
+        self,
+        image: Any,
+        page_num: int,
+        roi: BoundingBox,
+        dpi: int,
+        coverage: Optional[CoverageMask] = None
+    ) -> List[TileInfo]:
+        """Split one region of a rendered page into size-limited tiles"""
+        tile_size = self.image_processor.calculate_tile_size(
+            roi.width,
+            roi.height,
+            self.image_processor.max_size_bytes,
+            dpi=dpi
+        )
+
+        return self.image_processor.create_tiles(
+            image,
+            page_num,
+            tile_size,
+            overlap_percent=self.tile_overlap,
+            roi=roi,
+            coverage=coverage,
+        )
+
+    def _needs_refinement(self, item: Dict[str, Any]) -> bool:
+        """Whether a first-pass item should be re-read at detail resolution"""
+        if item.get("illegible"):
+            return True
+
+        confidence = item.get("confidence")
+        return confidence is not None and confidence < self.refine_confidence_threshold
+
+    def _refinement_crops(self, targets: List[BoundingBox]) -> List[BoundingBox]:
+        """
+        Group uncertain boxes into crops for the refinement pass
+
+        Each box gets a margin so the surrounding context (units, leader
+        lines) is included, and overlapping boxes are combined so no area is
+        requested twice.
+
+        Args:
+            targets: Boxes in PDF points
+
+        Returns:
+            Crops in PDF points
+        """
+        crops = [target.expand(self.refine_margin_points) for target in targets]
+
+        while True:
+            merged = self.coord_mapper.merge_overlapping_boxes(crops, iou_threshold=1e-6)
+            if len(merged) == len(crops):
+                return merged
+            crops = merged
+
+    @staticmethod
+    def _superseded(item: Dict[str, Any], refined_crops: List[BoundingBox]) -> bool:
+        """Whether an uncertain first-pass item lies inside a refined crop"""
+        box = item.get("_refine_box")
+        return box is not None and any(crop.containment(box) >= 0.8 for crop in refined_crops)
+
     async def _process_tiles_concurrent(
         self,
-        tiles: List[TileInfo]
+        tiles: List[TileInfo],
+        progress_callback: Optional[ProgressCallback] = None,
+        dpi: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Process multiple tiles concurrently with rate limiting
 
         Args:
             tiles: List of tiles to process
+            progress_callback: Optional callback; receives each tile's items as it completes
+            dpi: Resolution the tiles were rendered at (defaults to detail DPI)
 
         Returns:
             List of parsed results from each tile
@@ -323,7 +591,15 @@ Return ONLY the JSON. If no important regions found, return {"regions": []}.
 
         async def process_with_semaphore(tile: TileInfo) -> Optional[Dict[str, Any]]:
             async with semaphore:
-                return await self._process_tile_with_claude(tile)
+                result = await self._process_tile_with_claude(tile, dpi or self.detail_dpi)
+
+            emit_items(
+                progress_callback, result,
+                source="tile", page=tile.page_number,
+                tile=tile.tile_number, total_tiles=tile.total_tiles,
+                dpi=dpi or self.detail_dpi,
+            )
+            return result
 
         tasks = [process_with_semaphore(tile) for tile in tiles]
         results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -340,44 +616,21 @@ Return ONLY the JSON. If no important regions found, return {"regions": []}.
 
     async def _process_tile_with_claude(
         self,
-        tile: TileInfo
+        tile: TileInfo,
+        dpi: int
     ) -> Optional[Dict[str, Any]]:
         """
         Process a single tile with Claude
 
         Args:
             tile: Tile to process
+            dpi: Resolution the tile was rendered at
 
         Returns:
             Parsed data from tile
         """
-        extraction_prompt = """
-Analyze this section of a construction plan. Extract ANY of the following you can see:
-
-**Materials/Items**: Lumber (2x4, 2x6, etc.), hardware, roofing, windows, doors, concrete, drywall, insulation, etc.
-**Quantities**: Counts, dimensions, areas (e.g., "100 SF", "24 EA", "12 LF")
-**Specifications**: Codes, standards, material grades, brands
-**Project Info**: Name, location, lot number, builder
-
-Return JSON in this EXACT format:
-{
-  "bid_items": [{"item_number": "1", "description": "2x4 studs", "quantity": 100, "unit": "EA"}],
-  "materials": [{"name": "2x4 Pine Studs", "quantity": 100, "unit": "EA"}],
-  "specifications": [{"code": "#2 Pine", "description": "Framing lumber grade"}],
-  "project_info": {"name": "Lot 195", "location": "Lafayette", "bid_date": null}
-}
-
-IMPORTANT:
-- Extract materials/lumber from drawings, notes, schedules
-- Look for dimensions like "2x4", "2x6", quantities like "@ 16\" O.C."
-- Include window/door schedules
-- Return ONLY JSON, no other text
-- If nothing found, return empty arrays but valid JSON
-"""
-
         try:
             content = [
-                {"type": "text", "text": extraction_prompt},
                 {
                     "type": "image",
                     "source": {
@@ -385,21 +638,20 @@ IMPORTANT:
                         "media_type": "image/jpeg",
                         "data": tile.base64_data
                     }
-                }
+                },
+                {"type": "text", "text": TILE_EXTRACTION_INSTRUCTION},
             ]
 
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                messages=[{"role": "user", "content": content}]
+            # Repeated details and typical sheets produce identical tiles
+            data = await self._create_message_json(
+                "tile_extraction",
+                TILE_EXTRACTION_PROMPT,
+                content,
+                PLAN_EXTRACTION_TOOL,
+                PlanExtraction,
+                cache_payloads=[tile.base64_data],
             )
 
-            response_text = message.content[0].text
-
-            # Parse response
-            data = self._parse_json_response(response_text)
-
             # DEBUG: Log what we got from Claude
             if data:
                 bid_count = len(data.get("bid_items", []))
@@ -411,16 +663,26 @@ IMPORTANT:
                 else:
                     logger.debug(f"Tile {tile.tile_number}: No items extracted (empty response)")
 
+                # Map item boxes from tile pixels to page coordinates
+                self._locate_items(data, tile, dpi)
+
                 # Add tile metadata
                 data["_tile_meta"] = {
                     "page": tile.page_number,
                     "tile": tile.tile_number,
                     "x": tile.x,
                     "y": tile.y,
+                    "dpi": dpi,
+                    "box": self.coord_mapper.pixels_to_points(
+                        BoundingBox(
+                            x=tile.x, y=tile.y, width=tile.width, height=tile.height,
+                            page_number=tile.page_number,
+                        ),
+                        dpi,
+                    ),
                 }
             else:
                 logger.warning(f"Tile {tile.tile_number}: Failed to parse JSON response")
-                logger.debug(f"Response text: {response_text[:500]}")
 
             return data
 
@@ -428,6 +690,50 @@ IMPORTANT:
             logger.error(f"Failed to process tile {tile.tile_number}: {e}")
             return None
 
+    def _locate_items(self, data: Dict[str, Any], tile: TileInfo, dpi: int) -> None:
+        """
+        Attach the source page and page-space box to each item of a tile
+
+        Boxes returned by the model are relative to the tile image. They are
+        clamped to the tile, offset into page pixels and converted to PDF
+        points, so boxes from different tiles (and resolutions) are directly
+        comparable. The box is kept as "_bbox" for deduplication and exposed
+        as "source_bbox" once items are merged. Unreadable regions reported by
+        the model are mapped the same way into "_unreadable".
+
+        Args:
+            data: Parsed tile data (modified in place)
+            tile: Tile the data was read from
+            dpi: Resolution the tile was rendered at
+        """
+        def to_page_points(box: Optional[Dict[str, Any]]) -> Optional[BoundingBox]:
+            if not box or box.get("width", 0) <= 0 or box.get("height", 0) <= 0:
+                return None
+
+            tile_box = self.coord_mapper.clamp_bbox(
+                BoundingBox(
+                    x=box["x"], y=box["y"], width=box["width"], height=box["height"],
+                    page_number=tile.page_number,
+                ),
+                tile.width,
+                tile.height,
+            )
+            if tile_box is None:
+                return None
+
+            page_box = self.coord_mapper.tile_to_page_coordinates(tile_box, tile.x, tile.y)
+            return self.coord_mapper.pixels_to_points(page_box, dpi)
+
+        for key in ("bid_items", "materials"):
+            for item in data.get(key, []) or []:
+                item["source_page"] = tile.page_number
+                page_box = to_page_points(item.pop("bbox", None))
+                if page_box is not None:
+                    item["_bbox"] = page_box
+
+        unreadable = [to_page_points(region) for region in data.pop("unreadable_regions", []) or []]
+        data["_unreadable"] = [box for box in unreadable if box is not None]
+
     async def _parse_full_pages(
         self,
         pdf_path: Path,
@@ -443,60 +749,22 @@ IMPORTANT:
         Returns:
             Parsed data
         """
-        extraction_prompt = """
-You are analyzing a construction plan document. Extract the following information:
-
-1. **Bid Items**: List all bid items with their item numbers, descriptions, quantities, and units.
-2. **Specifications**: List any specification codes or references (e.g., ASTM, AASHTO).
-3. **Project Details**: Extract project name, location, bid date if visible.
-4. **Materials**: List specific materials mentioned with quantities.
-
-Return the data in this JSON format:
-{
-  "bid_items": [
-    {
-      "item_number": "101",
-      "description": "Clearing and Grubbing",
-      "quantity": 1.0,
-      "unit": "LS"
-    }
-  ],
-  "specifications": [
-    {
-      "code": "ASTM C150",
-      "description": "Portland Cement"
-    }
-  ],
-  "project_info": {
-    "name": null,
-    "location": null,
-    "bid_date": null
-  },
-  "materials": [
-    {
-      "name": "Concrete",
-      "quantity": 500,
-      "unit": "CY"
-    }
-  ]
-}
-
-Be thorough but only include items explicitly mentioned. Use null or empty arrays if not found.
-"""
-
         try:
-            content = [{"type": "text", "text": extraction_prompt}]
+            content = []
+            page_images = []
 
             # Add pages as images
             for page_num in range(1, min(max_pages + 1, 6)):
                 try:
-                    _, base64_data = self.image_processor.pdf_page_to_image(
+                    _, base64_data = await cpu_budget.run(
+                        self.image_processor.pdf_page_to_image,
                         pdf_path,
                         page_num,
                         dpi=self.coarse_dpi,
                         target_size_mb=3.0
                     )
 
+                    page_images.append(base64_data)
                     content.append({
                         "type": "image",
                         "source": {
@@ -509,23 +777,25 @@ Be thorough but only include items explicitly mentioned. Use null or empty array
                 except Exception as e:
                     logger.warning(f"Failed to add page {page_num}: {e}")
 
+            content.append({"type": "text", "text": FULL_PAGE_EXTRACTION_INSTRUCTION})
+
             # Call Claude
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                messages=[{"role": "user", "content": content}]
+            data = await self._create_message_json(
+                "full_page_extraction",
+                FULL_PAGE_EXTRACTION_PROMPT,
+                content,
+                PLAN_EXTRACTION_TOOL,
+                PlanExtraction,
+                cache_payloads=page_images,
             )
 
-            response_text = message.content[0].text
-            data = self._parse_json_response(response_text)
-
             return data or {}
 
         except Exception as e:
             logger.error(f"Failed to parse full pages: {e}")
             return {}
 
+    @telemetry.traced("tiling.aggregate")
     def _aggregate_results(
         self,
         results: List[Dict[str, Any]]
@@ -565,7 +835,7 @@ Be thorough but only include items explicitly mentioned. Use null or empty array
                 project_infos.append(proj_info)
 
         # Deduplicate bid items
-        aggregated["bid_items"] = self._deduplicate_items(
+        aggregated["bid_items"] = self._deduplicate_located_items(
             all_bid_items,
             key_fields=["item_number", "description"]
         )
@@ -577,7 +847,7 @@ Be thorough but only include items explicitly mentioned. Use null or empty array
         )
 
         # Deduplicate materials
-        aggregated["materials"] = self._deduplicate_items(
+        aggregated["materials"] = self._deduplicate_located_items(
             all_materials,
             key_fields=["name"]
         )
@@ -594,6 +864,106 @@ Be thorough but only include items explicitly mentioned. Use null or empty array
 
         return aggregated
 
+    def _deduplicate_located_items(
+        self,
+        items: List[Dict[str, Any]],
+        key_fields: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Deduplicate items using their page boxes, in reading order
+
+        Items read twice from overlapping tiles have overlapping boxes, so
+        fuzzy matching is only done against the few items a spatial index
+        returns near each box. Located items restated elsewhere on the sheets
+        are then merged by exact key. Items without a box fall back to
+        pairwise fuzzy deduplication.
+
+        Args:
+            items: List of items (located items carry "_bbox")
+            key_fields: Fields to use for matching
+
+        Returns:
+            Deduplicated list; located items come first in reading order and
+            carry source_page and source_bbox (PDF points)
+        """
+        located = [item for item in items if item.get("_bbox") is not None]
+        unlocated = [item for item in items if item.get("_bbox") is None]
+
+        index = SpatialIndex.for_boxes([item["_bbox"] for item in located])
+        groups: List[List[Dict[str, Any]]] = []
+
+        for item in located:
+            box = item["_bbox"]
+            key = self._item_key(item, key_fields)
+
+            group_id = None
+            for candidate in index.query(box):
+                other_box = index.get(candidate)
+                overlaps = (
+                    box.intersection_over_union(other_box) >= self.merge_iou_threshold
+                    or box.containment(other_box) >= 0.8
+                )
+                if overlaps and fuzz.ratio(key, self._item_key(groups[candidate][0], key_fields)) >= self.fuzzy_threshold:
+                    group_id = candidate
+                    break
+
+            if group_id is None:
+                index.insert(box)
+                groups.append([item])
+            else:
+                groups[group_id].append(item)
+
+        # Reading order of the first sighting of each item
+        boxes = [group[0]["_bbox"] for group in groups]
+        group_for_box = {id(box): group for box, group in zip(boxes, groups)}
+        ordered = [group_for_box[id(box)] for box in self.coord_mapper.sort_boxes_reading_order(boxes)]
+
+        unique_items = []
+        by_key: Dict[str, Dict[str, Any]] = {}
+
+        for group in ordered:
+            merged_item = self._merge_items(group)
+            merged_item["source_bbox"] = {
+                "x": group[0]["_bbox"].x,
+                "y": group[0]["_bbox"].y,
+                "width": group[0]["_bbox"].width,
+                "height": group[0]["_bbox"].height,
+            }
+
+            key = self._item_key(merged_item, key_fields)
+            if not key:
+                continue
+
+            if key in by_key:
+                for field, value in merged_item.items():
+                    if by_key[key].get(field) in (None, ""):
+                        by_key[key][field] = value
+                continue
+
+            by_key[key] = merged_item
+            unique_items.append(merged_item)
+
+        unique_items.extend(
+            item for item in self._deduplicate_items(unlocated, key_fields)
+            if self._item_key(item, key_fields) not in by_key
+        )
+
+        logger.debug(
+            f"Deduplicated {len(items)} items into {len(unique_items)} "
+            f"({len(located)} located)"
+        )
+
+        return unique_items
+
+    @staticmethod
+    def _item_key(item: Dict[str, Any], key_fields: List[str]) -> str:
+        """Comparison key of an item from its key fields"""
+        return " ".join(
+            str(item.get(field)).lower().strip()
+            for field in key_fields
+            if item.get(field)
+        )
+
     def _deduplicate_items(
         self,
         items: List[Dict[str, Any]],
@@ -698,24 +1068,66 @@ Be thorough but only include items explicitly mentioned. Use null or empty array
 
         return merged
 
-    def _parse_json_response(self, text: str) -> Optional[Dict[str, Any]]:
-        """Parse JSON from Claude response, handling markdown code blocks"""
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            # Try extracting from markdown
-            if "```json" in text:
-                json_start = text.find("```json") + 7
-                json_end = text.find("```", json_start)
-                if json_end > json_start:
-                    json_str = text[json_start:json_end].strip()
-                    try:
-                        return json.loads(json_str)
-                    except json.JSONDecodeError:
-                        pass
-
-            logger.warning("Could not parse JSON from response")
-            return None
+    async def _create_message_json(
+        self,
+        prompt_name: str,
+        system_prompt: str,
+        content: List[Dict[str, Any]],
+        tool: Dict[str, Any],
+        schema: Type[BaseModel],
+        max_tokens: Optional[int] = None,
+        cache_payloads: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Send a request with a cached system prompt and return validated output
+
+        The instruction prompt is a prompt-cache breakpoint, so only the
+        per-call images are new input. Claude must answer through the given
+        tool, so the output always follows the extraction schema. Successfully
+        parsed responses are memoized locally by (prompt version, prompt,
+        model, image hash).
+
+        Args:
+            prompt_name: Prompt name used in the response cache key
+            system_prompt: Stable instruction prompt
+            content: Per-call user content (images + short instruction)
+            tool: Tool definition Claude must answer with
+            schema: Extraction model the output is validated against
+            max_tokens: Response token limit (defaults to configured maximum)
+            cache_payloads: Inputs that identify the request (base64 images)
+
+        Returns:
+            Validated data or None
+        """
+        cache_key = None
+        if cache_payloads:
+            cache_key = response_cache.make_key(prompt_name, self.model, *cache_payloads)
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                return parse_json_response(cached, schema)
+
+        with telemetry.span("llm.call", provider="anthropic", model=self.model, prompt=prompt_name) as span:
+            message = await llm_budget.run(
+                self.client.messages.create,
+                model=self.model,
+                max_tokens=max_tokens or self.max_tokens,
+                temperature=self.temperature,
+                system=cached_system_prompt(system_prompt),
+                messages=[{"role": "user", "content": content}],
+                **tool_request_kwargs(tool)
+            )
+            telemetry.record_llm_usage(span, message)
+
+        response_text = message_output_text(message, tool["name"])
+        data = parse_json_response(response_text, schema)
+
+        if data is None:
+            logger.debug(f"Response text: {response_text[:500]}")
+        elif cache_key and message.stop_reason != "max_tokens":
+            # Truncated responses are not memoized so the next parse retries them
+            response_cache.set(cache_key, response_text)
+
+        return data
 
     def _calculate_confidence(self, data: Dict[str, Any]) -> float:
         """Calculate confidence score based on data completeness"""
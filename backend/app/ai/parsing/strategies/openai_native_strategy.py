@@ -2,31 +2,47 @@
 OpenAI Native PDF Strategy
 
 Uses OpenAI's native PDF input support (GPT-4 Vision with PDF) for fast, direct PDF parsing
-without image conversion overhead.
+without image conversion overhead. Large documents are split into page-subset PDFs
+(copied, not re-rendered) that are sent concurrently and merged.
 
-Best for: Small-medium documents (<50MB, <10 pages, <300 DPI)
+Best for: Native or low-DPI documents of any length (<300 DPI)
 """
 
+import asyncio
 import base64
-import json
 import logging
 import time
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 
 from openai import OpenAI
 
 from ..base_strategy import BaseParsingStrategy, ParseResult, DocumentMetrics, StrategyType
+from ..utils.progress import ProgressCallback, emit_items, emit_progress
+from ..output_normalizer import OutputNormalizer
+from ..utils.concurrency import cpu_budget, llm_budget
+from ..utils.memory_budget import estimate_payload_bytes, memory_budget
+from ..utils.pdf_pages import page_count, page_subset_bytes, relevant_pages
+from ..utils.response_cache import response_cache
+from ..utils.telemetry import telemetry
+from ..prompts import NATIVE_PDF_EXTRACTION_PROMPT
+from ..schema import PlanExtraction
+from ..structured_output import OPENAI_JSON_MODE, parse_json_response
 
 logger = logging.getLogger(__name__)
 
+# Smallest reservation for reading a page subset: shared fonts and images
+# make a few pages cost more than their share of the file
+_MIN_SUBSET_RESERVATION = 4 * 1024 * 1024
+
 
 class OpenAINativeStrategy(BaseParsingStrategy):
     """
     OpenAI native PDF input strategy
 
     Uses GPT-4 Vision with direct PDF upload (no base64 conversion).
-    Handles PDFs up to 50MB efficiently.
+    Documents are sent as page-subset PDFs of up to openai_chunk_pages
+    pages and openai_max_chunk_mb each.
     """
 
     def _get_strategy_type(self) -> StrategyType:
@@ -38,7 +54,9 @@ class OpenAINativeStrategy(BaseParsingStrategy):
         # Initialize OpenAI client
         api_key = config.get("openai_api_key")
         if api_key:
-            self.client = OpenAI(api_key=api_key)
+            self.client = telemetry.instrument_client(
+                OpenAI(api_key=api_key, base_url=config.get("openai_base_url"))
+            )
         else:
             self.client = None
 
@@ -46,6 +64,8 @@ class OpenAINativeStrategy(BaseParsingStrategy):
         self.model = config.get("openai_model", "gpt-4o")
         self.max_tokens = config.get("openai_max_tokens", 16000)
         self.temperature = config.get("openai_temperature", 0.0)
+        self.chunk_pages = max(1, config.get("openai_chunk_pages", 5))
+        self.max_chunk_bytes = int(config.get("openai_max_chunk_mb", 20.0) * 1024 * 1024)
 
     def is_available(self) -> bool:
         """Check if OpenAI API is configured"""
@@ -57,14 +77,11 @@ class OpenAINativeStrategy(BaseParsingStrategy):
         Check if this strategy can handle the document
 
         Criteria:
-        - File size < 50MB
-        - Page count <= 10
+        - Average page fits in one page-subset PDF (< openai_max_chunk_mb)
         - Average DPI < 300 (or unknown)
         """
-        if metrics.file_size_mb >= 50:
-            return False
-
-        if metrics.page_count > 10:
+        average_page_bytes = metrics.file_size_mb * 1024 * 1024 / max(metrics.page_count, 1)
+        if average_page_bytes >= self.max_chunk_bytes:
             return False
 
         if metrics.average_dpi and metrics.average_dpi >= 300:
@@ -76,13 +93,19 @@ class OpenAINativeStrategy(BaseParsingStrategy):
         """Priority 1 - try first for small-medium documents"""
         return 1
 
-    async def parse(self, pdf_path: Path, max_pages: int = 5) -> ParseResult:
+    async def parse(
+        self,
+        pdf_path: Path,
+        max_pages: int = 5,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> ParseResult:
         """
         Parse PDF using OpenAI native PDF input
 
         Args:
             pdf_path: Path to PDF file
-            max_pages: Maximum pages to process (note: OpenAI processes all pages)
+            max_pages: Maximum pages to send (the most relevant pages are chosen)
+            progress_callback: Optional callback receiving stage and item events
 
         Returns:
             ParseResult with extracted data
@@ -91,92 +114,27 @@ class OpenAINativeStrategy(BaseParsingStrategy):
         logger.info(f"Starting OpenAI native PDF strategy for {pdf_path}")
 
         try:
-            # Read PDF as binary
-            with open(pdf_path, 'rb') as f:
-                pdf_data = f.read()
-
-            # Encode to base64
-            pdf_base64 = base64.b64encode(pdf_data).decode('utf-8')
-
-            # Create extraction prompt
-            prompt = """
-You are analyzing a construction plan document. Extract the following information:
-
-1. **Bid Items**: List all bid items with their item numbers, descriptions, quantities, and units.
-2. **Specifications**: List any specification codes or references (e.g., ASTM, AASHTO).
-3. **Project Details**: Extract project name, location, bid date if visible.
-4. **Materials**: List specific materials mentioned with quantities.
-
-Return the data in this JSON format:
-{
-  "bid_items": [
-    {
-      "item_number": "101",
-      "description": "Clearing and Grubbing",
-      "quantity": 1.0,
-      "unit": "LS",
-      "unit_price": null
-    }
-  ],
-  "specifications": [
-    {
-      "code": "ASTM C150",
-      "description": "Portland Cement"
-    }
-  ],
-  "project_info": {
-    "name": "Highway 90 Expansion",
-    "location": "Lafayette, LA",
-    "bid_date": "2024-03-15"
-  },
-  "materials": [
-    {
-      "name": "Concrete",
-      "quantity": 500,
-      "unit": "CY",
-      "specification": "ASTM C150"
-    }
-  ]
-}
-
-Be thorough but only include items explicitly mentioned in the documents.
-If information is not found, use null or empty arrays.
-"""
-
-            # Call OpenAI API with PDF
-            # Note: OpenAI's PDF support may vary by model and API version
-            # Using the image content type with PDF MIME type
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": prompt
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:application/pdf;base64,{pdf_base64}"
-                                }
-                            }
-                        ]
-                    }
-                ],
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
+            # Only the most relevant max_pages pages are sent, in chunks
+            pages = await cpu_budget.run(relevant_pages, pdf_path, max_pages)
+            chunks = [
+                pages[i:i + self.chunk_pages]
+                for i in range(0, len(pages), self.chunk_pages)
+            ]
+            logger.info(f"Sending pages {pages} in {len(chunks)} chunk(s)")
+
+            emit_progress(progress_callback, "stage", stage="openai_native", chunks=len(chunks))
+
+            # Chunks run concurrently (bounded by the LLM and memory budgets);
+            # every chunk is awaited before failing so budgets are released
+            outcomes = await asyncio.gather(
+                *(self._parse_chunk(pdf_path, chunk, progress_callback) for chunk in chunks),
+                return_exceptions=True,
             )
+            failures = [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+            if failures:
+                raise failures[0]
 
-            # Extract response
-            response_text = response.choices[0].message.content
-
-            # Parse JSON
-            parsed_data = self._parse_json_response(response_text)
-
-            if not parsed_data:
-                raise ValueError("Failed to parse JSON from response")
+            parsed_data = self._merge_chunks(outcomes)
 
             # Calculate metrics
             processing_time = int((time.time() - start_time) * 1000)
@@ -193,11 +151,13 @@ If information is not found, use null or empty arrays.
                 data=parsed_data,
                 strategy_used=StrategyType.OPENAI_NATIVE,
                 confidence_score=confidence,
-                pages_processed=max_pages,
+                pages_processed=len(pages),
                 processing_time_ms=processing_time,
                 metadata={
                     "model": self.model,
                     "method": "native_pdf",
+                    "pages": pages,
+                    "chunks": len(chunks),
                 },
             )
 
@@ -212,34 +172,167 @@ If information is not found, use null or empty arrays.
                 processing_time_ms=processing_time,
             )
 
-    def _parse_json_response(self, text: str) -> Optional[Dict[str, Any]]:
-        """Parse JSON from OpenAI response, handling markdown code blocks"""
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            # Try extracting from markdown
-            if "```json" in text:
-                json_start = text.find("```json") + 7
-                json_end = text.find("```", json_start)
-                if json_end > json_start:
-                    json_str = text[json_start:json_end].strip()
-                    try:
-                        return json.loads(json_str)
-                    except json.JSONDecodeError:
-                        pass
-            elif "```" in text:
-                # Try generic code block
-                json_start = text.find("```") + 3
-                json_end = text.find("```", json_start)
-                if json_end > json_start:
-                    json_str = text[json_start:json_end].strip()
-                    try:
-                        return json.loads(json_str)
-                    except json.JSONDecodeError:
-                        pass
-
-            logger.warning("Could not parse JSON from OpenAI response")
-            return None
+    async def _parse_chunk(
+        self,
+        pdf_path: Path,
+        pages: Sequence[int],
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Extract one page-subset PDF
+
+        A subset larger than openai_max_chunk_mb is split in half and each
+        half is extracted separately.
+
+        Args:
+            pdf_path: Path to PDF file
+            pages: Page numbers (1-indexed) of the chunk
+            progress_callback: Optional progress callback
+
+        Returns:
+            Validated extraction of the chunk
+        """
+        pdf_data = await cpu_budget.run(self._read_chunk, pdf_path, pages)
+
+        if len(pdf_data) > self.max_chunk_bytes:
+            if len(pages) == 1:
+                raise ValueError(
+                    f"Page {pages[0]} is {len(pdf_data) / 1024 / 1024:.1f}MB, "
+                    f"over the {self.max_chunk_bytes / 1024 / 1024:.0f}MB chunk limit"
+                )
+            del pdf_data
+            middle = len(pages) // 2
+            halves = await asyncio.gather(
+                self._parse_chunk(pdf_path, pages[:middle], progress_callback),
+                self._parse_chunk(pdf_path, pages[middle:], progress_callback),
+            )
+            return self._merge_chunks(halves)
+
+        # Identical PDFs (re-uploads, retries) reuse the cached response
+        cache_key = response_cache.make_key("native_pdf_extraction", self.model, pdf_data)
+        response_text = response_cache.get(cache_key)
+
+        cacheable = False
+
+        if response_text is None:
+            async with memory_budget.reserve_async(
+                estimate_payload_bytes(len(pdf_data)), f"{len(pdf_data) / 1024 / 1024:.0f}MB PDF payload"
+            ):
+                response_text, finish_reason = await self._extract(pdf_data)
+
+            # Items recovered from a truncated response are used for this
+            # parse but never replayed from the cache
+            cacheable = finish_reason != "length"
+            if not cacheable:
+                logger.warning(f"Response for pages {list(pages)} was truncated (max_tokens), not caching")
+        else:
+            logger.info(f"Pages {list(pages)} were parsed before, using cached response")
+
+        # Parse JSON and validate against the shared extraction schema
+        parsed_data = parse_json_response(response_text, PlanExtraction)
+
+        if not parsed_data:
+            raise ValueError(f"Failed to parse JSON from response for pages {list(pages)}")
+
+        if cacheable:
+            response_cache.set(cache_key, response_text)
+
+        # A single-page chunk pins every item to its source page
+        if len(pages) == 1:
+            for key in ("bid_items", "materials"):
+                for item in parsed_data.get(key) or []:
+                    item.setdefault("source_page", pages[0])
+
+        emit_items(progress_callback, parsed_data, source="openai_native", pages=list(pages))
+
+        return parsed_data
+
+    @staticmethod
+    def _read_chunk(pdf_path: Path, pages: Sequence[int]) -> bytes:
+        """
+        Bytes of a page-subset PDF, or of the file itself when the chunk
+        covers every page (blocking; run in a worker thread)
+        """
+        file_size = Path(pdf_path).stat().st_size
+        total_pages = page_count(pdf_path)
+        label = f"reading {Path(pdf_path).name}"
+
+        if len(pages) >= total_pages:
+            with memory_budget.reserve(file_size, label):
+                with open(pdf_path, 'rb') as f:
+                    return f.read()
+
+        # Concurrent chunks each reserve their share of the file, not all of it
+        estimate = min(file_size, max(file_size * len(pages) // max(total_pages, 1), _MIN_SUBSET_RESERVATION))
+        with memory_budget.reserve(estimate, label):
+            return page_subset_bytes(pdf_path, pages)
+
+    @staticmethod
+    def _merge_chunks(chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Merge chunk extractions in page order
+
+        Item lists are concatenated; project info keeps the first value
+        found for each field.
+        """
+        merged = {"bid_items": [], "specifications": [], "materials": [], "project_info": {}}
+
+        for chunk in chunks:
+            for key in ("bid_items", "specifications", "materials"):
+                merged[key].extend(chunk.get(key) or [])
+            for field, value in (chunk.get("project_info") or {}).items():
+                if value and not merged["project_info"].get(field):
+                    merged["project_info"][field] = value
+
+        return OutputNormalizer.normalize(merged)
+
+    async def _extract(self, pdf_data: bytes) -> Tuple[str, Optional[str]]:
+        """
+        Send a PDF to OpenAI and return the raw response text
+
+        Args:
+            pdf_data: PDF bytes
+
+        Returns:
+            Tuple of (response text, finish reason)
+        """
+        pdf_base64 = base64.b64encode(pdf_data).decode('utf-8')
+
+        # Call OpenAI API with PDF
+        # Note: OpenAI's PDF support may vary by model and API version
+        # Using the image content type with PDF MIME type.
+        # The instruction prompt goes first as a stable system message
+        # so OpenAI's automatic prompt caching can reuse the prefix.
+        with telemetry.span("llm.call", provider="openai", model=self.model, prompt="native_pdf_extraction") as span:
+            response = await llm_budget.run(
+                self.client.chat.completions.create,
+                model=self.model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": NATIVE_PDF_EXTRACTION_PROMPT
+                    },
+                    {
+                        "role": "user",
+                        "content": [
+                            {
+                                "type": "image_url",
+                                "image_url": {
+                                    "url": f"data:application/pdf;base64,{pdf_base64}"
+                                }
+                            }
+                        ]
+                    }
+                ],
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+                response_format=OPENAI_JSON_MODE,
+            )
+            telemetry.record_llm_usage(span, response)
+
+        # Extract response
+        choice = response.choices[0]
+        return choice.message.content, choice.finish_reason
 
     def _calculate_confidence(self, data: Dict[str, Any]) -> float:
         """Calculate confidence score based on data completeness"""
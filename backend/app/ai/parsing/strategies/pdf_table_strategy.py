@@ -0,0 +1,188 @@
+"""
+Native-Text Table Strategy
+
+Reads schedules, bid tabs and material lists straight from the text layer of
+vector (CAD-exported) PDFs with pdfplumber geometry. Runs locally in well
+under a second per document, with no rendering and no LLM calls.
+
+Highest priority: vision strategies only run for pages where this strategy
+finds no table structure (scanned documents, pages that are pure drawings)
+or where much of the sheet's text lies outside its tables.
+"""
+
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..base_strategy import BaseParsingStrategy, ParseResult, DocumentMetrics, StrategyType
+from ..schema import PlanExtraction
+from ..structured_output import validate_extraction
+from ..utils.concurrency import cpu_budget
+from ..utils.progress import ProgressCallback, emit_items, emit_progress
+from ..utils.table_extractor import PageTables, table_extractor
+
+logger = logging.getLogger(__name__)
+
+
+class PDFTableStrategy(BaseParsingStrategy):
+    """
+    Native-text table extraction strategy
+
+    Succeeds only when every processed page is covered by its tables, so
+    mixed documents fall through to the vision strategies. Callers that can
+    route individual pages use extract_pages() and send the pages for which
+    needs_vision() holds to a vision model.
+    """
+
+    def _get_strategy_type(self) -> StrategyType:
+        return StrategyType.PDF_TABLE
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.extractor = table_extractor
+
+    def is_available(self) -> bool:
+        """Check if pdfplumber is available"""
+        enabled = self.config.get("enable_pdf_table_parsing", True)
+        return enabled and self.extractor.pdfplumber_available
+
+    def needs_vision(self, page: PageTables) -> bool:
+        """
+        Whether a page still needs a vision model after table extraction
+
+        Pages without tables always do. A table page does when enough of
+        its text lies outside the tables (plan callouts, framing notes) to
+        suggest drawing content the tables do not cover.
+        """
+        if not page.has_structure:
+            return True
+        return page.non_table_fraction >= self.config.get("table_page_vision_fraction", 0.3)
+
+    def can_handle(self, metrics: DocumentMetrics) -> bool:
+        """Only documents with a text layer (scanned pages have no words to read)"""
+        return not metrics.is_scanned
+
+    def get_priority(self) -> int:
+        """Priority 0 - local and near-instant, always tried first"""
+        return 0
+
+    async def extract_pages(
+        self,
+        pdf_path: Path,
+        max_pages: Optional[int] = None,
+        pages: Optional[Sequence[int]] = None
+    ) -> List[PageTables]:
+        """
+        Extract tables page by page
+
+        Args:
+            pdf_path: Path to PDF file
+            max_pages: Maximum pages to scan
+            pages: Specific 1-based page numbers to scan (overrides max_pages)
+
+        Returns:
+            One PageTables per scanned page
+        """
+        return await cpu_budget.run(self.extractor.extract, pdf_path, max_pages, pages)
+
+    @staticmethod
+    def combine(page_tables: List[PageTables]) -> Dict[str, Any]:
+        """
+        Combine the tables of several pages into plan extraction data
+
+        Args:
+            page_tables: Output of extract_pages()
+
+        Returns:
+            Data validated against the plan extraction schema
+        """
+        data = {
+            "bid_items": [item for page in page_tables for item in page.bid_items],
+            "materials": [item for page in page_tables for item in page.materials],
+        }
+        return validate_extraction(data, PlanExtraction)
+
+    async def parse(
+        self,
+        pdf_path: Path,
+        max_pages: int = 5,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> ParseResult:
+        """
+        Parse PDF tables from the text layer
+
+        Args:
+            pdf_path: Path to PDF file
+            max_pages: Maximum pages to process
+            progress_callback: Optional callback receiving stage and item events
+
+        Returns:
+            ParseResult with extracted items; unsuccessful if any processed
+            page has no table structure
+        """
+        start_time = time.time()
+        logger.info(f"Starting native-text table strategy for {pdf_path}")
+
+        try:
+            emit_progress(progress_callback, "stage", stage="table_extraction")
+
+            page_tables = await self.extract_pages(pdf_path, max_pages)
+            structured = [page.page_number for page in page_tables if page.has_structure]
+            # Pages without tables, or with drawing content beside them
+            vision_pages = [page.page_number for page in page_tables if self.needs_vision(page)]
+
+            processing_time = int((time.time() - start_time) * 1000)
+            metadata = {
+                "method": "pdf_table",
+                "tables_found": sum(page.table_count for page in page_tables),
+                "structured_pages": structured,
+                "vision_pages": vision_pages,
+            }
+
+            if not structured or vision_pages:
+                logger.info(
+                    f"Native-text tables on {len(structured)}/{len(page_tables)} pages, "
+                    f"deferring to vision strategies (time={processing_time}ms)"
+                )
+                return ParseResult(
+                    success=False,
+                    error=f"Pages {vision_pages} need vision (no tables, or drawing content beside them)",
+                    strategy_used=StrategyType.PDF_TABLE,
+                    pages_processed=len(page_tables),
+                    processing_time_ms=processing_time,
+                    metadata=metadata,
+                )
+
+            data = self.combine(page_tables)
+            emit_items(progress_callback, data, source="pdf_table")
+
+            logger.info(
+                f"Native-text table extraction complete: "
+                f"{metadata['tables_found']} tables, "
+                f"{len(data['bid_items'])} bid items, "
+                f"{len(data['materials'])} materials, "
+                f"time={processing_time}ms"
+            )
+
+            return ParseResult(
+                success=True,
+                data=data,
+                strategy_used=StrategyType.PDF_TABLE,
+                # Text is read exactly; only the column assignment can be off
+                confidence_score=0.9,
+                pages_processed=len(page_tables),
+                processing_time_ms=processing_time,
+                metadata=metadata,
+            )
+
+        except Exception as e:
+            logger.error(f"Native-text table strategy failed: {e}", exc_info=True)
+            processing_time = int((time.time() - start_time) * 1000)
+
+            return ParseResult(
+                success=False,
+                error=str(e),
+                strategy_used=StrategyType.PDF_TABLE,
+                processing_time_ms=processing_time,
+            )
@@ -10,11 +10,13 @@ Returns raw text without structured extraction.
 import logging
 import time
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from app.ai.ocr_service import ocr_service
 
 from ..base_strategy import BaseParsingStrategy, ParseResult, DocumentMetrics, StrategyType
+from ..utils.concurrency import cpu_budget
+from ..utils.progress import ProgressCallback, emit_items, emit_progress
 
 logger = logging.getLogger(__name__)
 
@@ -47,13 +49,19 @@ class TesseractOCRStrategy(BaseParsingStrategy):
         """Priority 4 - final fallback"""
         return 4
 
-    async def parse(self, pdf_path: Path, max_pages: int = 5) -> ParseResult:
+    async def parse(
+        self,
+        pdf_path: Path,
+        max_pages: int = 5,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> ParseResult:
         """
         Parse PDF using Tesseract OCR
 
         Args:
             pdf_path: Path to PDF file
             max_pages: Maximum pages to process
+            progress_callback: Optional callback receiving stage and item events
 
         Returns:
             ParseResult with extracted text
@@ -62,8 +70,10 @@ class TesseractOCRStrategy(BaseParsingStrategy):
         logger.info(f"Starting Tesseract OCR strategy for {pdf_path}")
 
         try:
+            emit_progress(progress_callback, "stage", stage="ocr")
+
             # Extract text from pages
-            page_texts = self.ocr.extract_text_from_pdf(pdf_path, max_pages)
+            page_texts = await cpu_budget.run(self.ocr.extract_text_from_pdf, pdf_path, max_pages)
 
             if not page_texts:
                 raise ValueError("OCR failed to extract text from PDF")
@@ -73,6 +83,7 @@ class TesseractOCRStrategy(BaseParsingStrategy):
 
             # Try to extract some basic structure
             data = self._extract_basic_structure(combined_text)
+            emit_items(progress_callback, data, source="ocr")
 
             # Calculate metrics
             processing_time = int((time.time() - start_time) * 1000)
@@ -14,6 +14,9 @@ from typing import List, Dict, Any, Optional
 from .base_strategy import BaseParsingStrategy, ParseResult, DocumentMetrics
 from .output_normalizer import OutputNormalizer
 from .utils.pdf_analyzer import PDFAnalyzer
+from .utils.progress import ProgressCallback, emit_progress
+from .utils.telemetry import telemetry
+from .strategies.pdf_table_strategy import PDFTableStrategy
 from .strategies.openai_native_strategy import OpenAINativeStrategy
 from .strategies.claude_tiling_strategy import ClaudeTilingStrategy
 from .strategies.tesseract_ocr_strategy import TesseractOCRStrategy
@@ -39,6 +42,7 @@ class StrategySelector:
 
         # Initialize all strategies
         self.strategies: List[BaseParsingStrategy] = [
+            PDFTableStrategy(config),
             OpenAINativeStrategy(config),
             ClaudeTilingStrategy(config),
             TesseractOCRStrategy(config),
@@ -57,7 +61,8 @@ class StrategySelector:
     async def parse_with_fallback(
         self,
         pdf_path: Path,
-        max_pages: int = 5
+        max_pages: int = 5,
+        progress_callback: Optional[ProgressCallback] = None
     ) -> ParseResult:
         """
         Parse document with intelligent strategy selection and automatic fallback
@@ -65,12 +70,28 @@ class StrategySelector:
         Args:
             pdf_path: Path to PDF file
             max_pages: Maximum pages to process
+            progress_callback: Optional callback receiving stage and partial-item events
 
         Returns:
-            ParseResult from first successful strategy
+            ParseResult from first successful strategy, with the per-stage
+            breakdown of the parse in metadata["timings"]
         """
+        with telemetry.trace("parse", document=pdf_path.name, max_pages=max_pages) as parse_trace:
+            result = await self._run_strategy_chain(pdf_path, max_pages, progress_callback)
+
+        result.metadata["timings"] = parse_trace.breakdown()
+        return result
+
+    async def _run_strategy_chain(
+        self,
+        pdf_path: Path,
+        max_pages: int,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> ParseResult:
+        """Analyze the document and try each selected strategy until one succeeds"""
         # Step 1: Analyze document
         logger.info(f"Analyzing document: {pdf_path}")
+        emit_progress(progress_callback, "stage", stage="analyzing")
         metrics = self.analyzer.analyze(pdf_path)
 
         # Step 2: Build strategy chain
@@ -91,9 +112,15 @@ class StrategySelector:
             logger.info(
                 f"Attempting strategy {i + 1}/{len(chain)}: {strategy_name}"
             )
+            emit_progress(
+                progress_callback, "stage",
+                stage="strategy", strategy=strategy.strategy_type.value,
+                attempt=i + 1, total_attempts=len(chain),
+            )
 
             try:
-                result = await strategy.parse(pdf_path, max_pages)
+                with telemetry.span(f"strategy.{strategy.strategy_type.value}", attempt=i + 1):
+                    result = await strategy.parse(pdf_path, max_pages, progress_callback)
 
                 if result.success:
                     # Normalize output
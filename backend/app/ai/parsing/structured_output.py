@@ -0,0 +1,262 @@
+"""
+Structured Output
+
+Schema-constrained LLM extraction shared by every parser:
+- Claude: forced tool use, with the pydantic schema as the tool input schema
+- OpenAI: JSON mode (response_format={"type": "json_object"})
+
+All responses go through parse_json_response(), which validates against the
+shared schema. If a response is truncated or malformed, the parser salvages
+every complete item from the top-level arrays instead of discarding the call.
+"""
+
+import json
+import logging
+import typing
+from typing import Any, Dict, List, Optional, Type
+
+from pydantic import BaseModel, ValidationError
+
+from .schema import PlanExtraction, RegionDetection, SpecificationExtraction
+from .utils.incremental_json import IncrementalItemParser
+
+logger = logging.getLogger(__name__)
+
+# OpenAI chat completions argument enabling JSON mode
+OPENAI_JSON_MODE = {"type": "json_object"}
+
+
+def extraction_tool(name: str, schema: Type[BaseModel], description: str) -> Dict[str, Any]:
+    """
+    Build a Claude tool definition whose input schema is an extraction model
+
+    Args:
+        name: Tool name
+        schema: Pydantic model describing the tool input
+        description: What the tool records
+
+    Returns:
+        Tool definition for messages.create(tools=[...])
+    """
+    return {
+        "name": name,
+        "description": description,
+        "input_schema": schema.model_json_schema(),
+    }
+
+
+def tool_request_kwargs(tool: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Claude request arguments that force the model to answer through a tool
+
+    Args:
+        tool: Tool definition from extraction_tool()
+
+    Returns:
+        Dictionary with tools and tool_choice
+    """
+    return {
+        "tools": [tool],
+        "tool_choice": {"type": "tool", "name": tool["name"]},
+    }
+
+
+def message_output_text(message: Any, tool_name: Optional[str] = None) -> str:
+    """
+    Get the structured output of a Claude message as JSON text
+
+    Uses the input of the tool_use block when present, otherwise the text
+    blocks (for models or requests that answered in plain text).
+
+    Args:
+        message: Claude message
+        tool_name: Expected tool name (any tool_use block if None)
+
+    Returns:
+        JSON (or free) text of the response
+    """
+    texts = []
+
+    for block in message.content or []:
+        block_type = getattr(block, "type", None)
+        if block_type == "tool_use" and (tool_name is None or block.name == tool_name):
+            return json.dumps(block.input)
+        if block_type == "text":
+            texts.append(block.text)
+
+    if getattr(message, "stop_reason", None) == "max_tokens":
+        logger.warning("LLM response was truncated at max_tokens")
+
+    return "".join(texts)
+
+
+def parse_json_response(
+    text: Optional[str],
+    schema: Optional[Type[BaseModel]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Parse and validate JSON from an LLM response
+
+    Handles bare JSON, markdown code blocks and leading/trailing prose. If the
+    document is incomplete (truncated output), complete items are salvaged
+    from the schema's top-level arrays.
+
+    Args:
+        text: Raw response text
+        schema: Extraction model to validate against (no validation if None)
+
+    Returns:
+        Parsed (and validated) data, or None if nothing usable was found
+    """
+    if not text:
+        return None
+
+    data = _load_json(text)
+
+    if data is None and schema is not None:
+        data = _salvage_items(text, schema)
+        if data is not None:
+            logger.warning(
+                f"Recovered {sum(len(v) for v in data.values())} items from a truncated or malformed response"
+            )
+
+    if data is None:
+        logger.warning("Could not parse JSON from LLM response")
+        return None
+
+    if schema is None:
+        return data
+
+    return validate_extraction(data, schema)
+
+
+def validate_extraction(
+    data: Dict[str, Any],
+    schema: Type[BaseModel]
+) -> Optional[Dict[str, Any]]:
+    """
+    Validate extracted data against a schema, dropping only the invalid parts
+
+    Args:
+        data: Parsed JSON object
+        schema: Extraction model
+
+    Returns:
+        Validated data as a plain dictionary, or None if data is not an object
+    """
+    if not isinstance(data, dict):
+        return None
+
+    try:
+        return schema.model_validate(data).model_dump()
+    except ValidationError as e:
+        logger.warning(f"Extraction failed schema validation, keeping valid parts: {e.error_count()} errors")
+
+    cleaned: Dict[str, Any] = {}
+
+    for name, field in schema.model_fields.items():
+        if name not in data:
+            continue
+
+        value = data[name]
+        item_model = _list_item_model(field.annotation)
+
+        if item_model is not None and isinstance(value, list):
+            items = []
+            for item in value:
+                try:
+                    items.append(item_model.model_validate(item))
+                except ValidationError:
+                    continue
+            cleaned[name] = items
+            continue
+
+        try:
+            schema.model_validate({name: value})
+            cleaned[name] = value
+        except ValidationError:
+            continue
+
+    return schema.model_validate(cleaned).model_dump()
+
+
+def array_keys(schema: Type[BaseModel]) -> List[str]:
+    """Top-level fields of a schema that hold lists of items"""
+    return [
+        name for name, field in schema.model_fields.items()
+        if _list_item_model(field.annotation) is not None
+    ]
+
+
+def _load_json(text: str) -> Optional[Dict[str, Any]]:
+    """Decode a JSON object from response text, tolerating fences and prose"""
+    candidates = [text.strip()]
+
+    if "```" in text:
+        fence_start = text.find("```")
+        body_start = text.find("\n", fence_start)
+        fence_end = text.find("```", body_start + 1) if body_start != -1 else -1
+        if body_start != -1 and fence_end != -1:
+            candidates.append(text[body_start + 1:fence_end].strip())
+
+    first_brace = text.find("{")
+    last_brace = text.rfind("}")
+    if 0 <= first_brace < last_brace:
+        candidates.append(text[first_brace:last_brace + 1])
+
+    for candidate in candidates:
+        try:
+            data = json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(data, dict):
+            return data
+
+    return None
+
+
+def _salvage_items(text: str, schema: Type[BaseModel]) -> Optional[Dict[str, Any]]:
+    """Recover complete items from the schema's arrays in an incomplete document"""
+    keys = array_keys(schema)
+    if not keys:
+        return None
+
+    parser = IncrementalItemParser(keys)
+    parser.feed(text)
+
+    if not any(parser.items.values()):
+        return None
+
+    return {key: items for key, items in parser.items.items() if items}
+
+
+def _list_item_model(annotation: Any) -> Optional[Type[BaseModel]]:
+    """Item model of a List[Model] annotation, or None"""
+    if typing.get_origin(annotation) is not list:
+        return None
+
+    args = typing.get_args(annotation)
+    if args and isinstance(args[0], type) and issubclass(args[0], BaseModel):
+        return args[0]
+
+    return None
+
+
+# Claude tools for each extraction schema
+PLAN_EXTRACTION_TOOL = extraction_tool(
+    "record_plan_extraction",
+    PlanExtraction,
+    "Record the bid items, materials, specifications and project info found in the construction plan.",
+)
+
+REGION_DETECTION_TOOL = extraction_tool(
+    "record_regions",
+    RegionDetection,
+    "Record the regions of interest found on the construction plan page.",
+)
+
+SPECIFICATION_TOOL = extraction_tool(
+    "record_specification",
+    SpecificationExtraction,
+    "Record the structured content of the specification section.",
+)
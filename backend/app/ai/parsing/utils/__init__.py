@@ -1,19 +1,49 @@
 """
 Parsing Utilities
 
-Utilities for document analysis, image processing, coordinate mapping, and text extraction.
+Utilities for document analysis, image processing, coordinate mapping, text and table extraction, memory budgeting and telemetry.
 """
 
 from .pdf_analyzer import PDFAnalyzer, analyze_document
 from .image_processor import ImageProcessor
-from .coordinate_mapper import CoordinateMapper
+from .coordinate_mapper import CoordinateMapper, CoverageMask, SpatialIndex
 from .text_extraction import TextExtractor, text_extractor
+from .incremental_json import IncrementalItemParser
+from .concurrency import ResourceBudget, llm_budget, cpu_budget
+from .response_cache import ResponseCache, response_cache
+from .table_extractor import TableExtractor, PageTables, table_extractor
+from .telemetry import Telemetry, SpanExporter, telemetry
+from .memory_budget import MemoryBudget, MemoryBudgetExceeded, memory_budget
+from .pdf_pages import page_count, page_sizes, page_subset_bytes
+from .page_fingerprint import fingerprint_pages, match_pages
 
 __all__ = [
     "PDFAnalyzer",
     "analyze_document",
     "ImageProcessor",
     "CoordinateMapper",
+    "SpatialIndex",
+    "CoverageMask",
     "TextExtractor",
     "text_extractor",
+    "IncrementalItemParser",
+    "ResourceBudget",
+    "llm_budget",
+    "cpu_budget",
+    "ResponseCache",
+    "response_cache",
+    "TableExtractor",
+    "PageTables",
+    "table_extractor",
+    "Telemetry",
+    "SpanExporter",
+    "telemetry",
+    "MemoryBudget",
+    "MemoryBudgetExceeded",
+    "memory_budget",
+    "page_count",
+    "page_sizes",
+    "page_subset_bytes",
+    "fingerprint_pages",
+    "match_pages",
 ]
@@ -0,0 +1,85 @@
+"""
+Shared Resource Budgets
+
+Process-wide limits on concurrent LLM requests and CPU-heavy work (page
+rendering, OCR, text extraction). Every parser draws from the same budgets,
+so parsing many documents at once cannot exceed provider rate limits or
+oversubscribe the CPU.
+"""
+
+import asyncio
+import logging
+import time
+import weakref
+from typing import Any, Callable, TypeVar
+
+from ..config import load_parsing_config
+from .telemetry import telemetry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ResourceBudget:
+    """
+    Caps how many blocking calls of one kind run at the same time
+
+    Blocking callables are executed in worker threads once a slot is free, so
+    the event loop stays responsive while they wait or run.
+    """
+
+    def __init__(self, name: str, limit: int):
+        """
+        Initialize the budget
+
+        Args:
+            name: Budget name used in log messages
+            limit: Maximum number of concurrent calls
+        """
+        self.name = name
+        self.limit = max(1, limit)
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Semaphore for the running event loop (asyncio primitives are loop-bound)"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.limit)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking callable in a worker thread within the budget
+
+        Time spent waiting for a slot is recorded on the current span.
+
+        Args:
+            func: Blocking callable
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Return value of func
+        """
+        semaphore = self._semaphore()
+        if semaphore.locked():
+            logger.debug(f"Waiting for {self.name} budget ({self.limit} concurrent)")
+
+        queued = time.perf_counter()
+        async with semaphore:
+            telemetry.record_queue_wait(self.name, time.perf_counter() - queued)
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+
+_config = load_parsing_config()
+
+# Concurrent requests to Claude / OpenAI across all documents being parsed
+llm_budget = ResourceBudget("llm", _config.max_concurrent_llm_calls)
+
+# Concurrent page rendering, OCR and text extraction jobs
+cpu_budget = ResourceBudget("cpu", _config.max_cpu_workers)
@@ -5,9 +5,13 @@ Utilities for handling bounding boxes and coordinate transformations.
 """
 
 import logging
+from collections import defaultdict
 from dataclasses import dataclass
+from statistics import median
 from typing import List, Optional, Tuple, Dict, Any
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,6 +42,21 @@ class BoundingBox:
         """Calculate area of bounding box"""
         return self.width * self.height
 
+    def intersection_area(self, other: "BoundingBox") -> int:
+        """Area shared with another bounding box (0 on different pages)"""
+        if self.page_number != other.page_number:
+            return 0
+
+        x1 = max(self.x, other.x)
+        y1 = max(self.y, other.y)
+        x2 = min(self.x + self.width, other.x + other.width)
+        y2 = min(self.y + self.height, other.y + other.height)
+
+        if x2 < x1 or y2 < y1:
+            return 0
+
+        return (x2 - x1) * (y2 - y1)
+
     def intersection_over_union(self, other: "BoundingBox") -> float:
         """
         Calculate IoU (Intersection over Union) with another bounding box
@@ -48,25 +67,31 @@ class BoundingBox:
         Returns:
             IoU score (0.0-1.0)
         """
-        if self.page_number != other.page_number:
+        intersection = self.intersection_area(other)
+        if not intersection:
             return 0.0
 
-        # Calculate intersection
-        x1 = max(self.x, other.x)
-        y1 = max(self.y, other.y)
-        x2 = min(self.x + self.width, other.x + other.width)
-        y2 = min(self.y + self.height, other.y + other.height)
-
-        if x2 < x1 or y2 < y1:
-            return 0.0
-
-        intersection = (x2 - x1) * (y2 - y1)
-
         # Calculate union
         union = self.area() + other.area() - intersection
 
         return intersection / union if union > 0 else 0.0
 
+    def containment(self, other: "BoundingBox") -> float:
+        """
+        Fraction of the smaller box covered by the other
+
+        An item cut by a tile edge has a much smaller box than the same item
+        seen whole in the neighbouring tile, so IoU alone misses it.
+
+        Args:
+            other: Another BoundingBox
+
+        Returns:
+            Intersection over the smaller area (0.0-1.0)
+        """
+        smaller = min(self.area(), other.area())
+        return self.intersection_area(other) / smaller if smaller > 0 else 0.0
+
     def contains_point(self, x: int, y: int) -> bool:
         """Check if a point is inside the bounding box"""
         return (
@@ -95,6 +120,131 @@ class BoundingBox:
         )
 
 
+class SpatialIndex:
+    """
+    Uniform grid (bucket) index over bounding boxes
+
+    Each box is registered in every grid cell it touches, so finding the
+    boxes near a query box only looks at a few buckets instead of every box.
+    Boxes on different pages never share a bucket.
+    """
+
+    def __init__(self, cell_size: int = 256):
+        """
+        Initialize the index
+
+        Args:
+            cell_size: Grid cell edge length, roughly the typical box size
+        """
+        self.cell_size = max(1, int(cell_size))
+        self._cells: Dict[Tuple[int, int, int], List[int]] = defaultdict(list)
+        self._boxes: List[BoundingBox] = []
+
+    @classmethod
+    def for_boxes(cls, boxes: List[BoundingBox]) -> "SpatialIndex":
+        """Index sized for a set of boxes (cell size = median box extent)"""
+        extents = [max(b.width, b.height) for b in boxes if b.width > 0 and b.height > 0]
+        return cls(cell_size=int(median(extents)) if extents else 256)
+
+    def __len__(self) -> int:
+        return len(self._boxes)
+
+    def insert(self, bbox: BoundingBox) -> int:
+        """
+        Add a box to the index
+
+        Args:
+            bbox: Box to index
+
+        Returns:
+            ID of the box (insertion order)
+        """
+        box_id = len(self._boxes)
+        self._boxes.append(bbox)
+
+        for cell in self._cells_for(bbox):
+            self._cells[cell].append(box_id)
+
+        return box_id
+
+    def get(self, box_id: int) -> BoundingBox:
+        """Box registered under an ID"""
+        return self._boxes[box_id]
+
+    def query(self, bbox: BoundingBox) -> List[int]:
+        """
+        IDs of indexed boxes that may overlap a box
+
+        Candidates share at least one grid cell with the query box; callers
+        apply the exact overlap test.
+
+        Args:
+            bbox: Query box
+
+        Returns:
+            Candidate box IDs in insertion order
+        """
+        candidates = set()
+        for cell in self._cells_for(bbox):
+            candidates.update(self._cells.get(cell, ()))
+        return sorted(candidates)
+
+    def _cells_for(self, bbox: BoundingBox):
+        """Grid cells touched by a box"""
+        size = self.cell_size
+        x_start, x_end = int(bbox.x // size), int((bbox.x + max(bbox.width, 0)) // size)
+        y_start, y_end = int(bbox.y // size), int((bbox.y + max(bbox.height, 0)) // size)
+
+        for cell_x in range(x_start, x_end + 1):
+            for cell_y in range(y_start, y_end + 1):
+                yield (bbox.page_number, cell_x, cell_y)
+
+
+class CoverageMask:
+    """
+    Tracks which parts of a page have already been sent for extraction
+
+    The page is divided into small square cells; a region counts as covered
+    when nearly all of its cells were already part of an earlier tile.
+    """
+
+    def __init__(self, width: int, height: int, cell_size: int = 16):
+        """
+        Initialize an empty mask
+
+        Args:
+            width: Page width in pixels
+            height: Page height in pixels
+            cell_size: Mask resolution in pixels per cell
+        """
+        self.cell_size = max(1, cell_size)
+        self._mask = np.zeros(
+            (height // self.cell_size + 1, width // self.cell_size + 1),
+            dtype=bool,
+        )
+
+    def _cells(self, bbox: BoundingBox) -> Tuple[slice, slice]:
+        """Mask slices spanned by a box"""
+        size = self.cell_size
+        return (
+            slice(int(bbox.y // size), int((bbox.y + bbox.height) // size) + 1),
+            slice(int(bbox.x // size), int((bbox.x + bbox.width) // size) + 1),
+        )
+
+    def covered_fraction(self, bbox: BoundingBox) -> float:
+        """Fraction of a box already covered (0.0-1.0)"""
+        cells = self._mask[self._cells(bbox)]
+        return float(cells.mean()) if cells.size else 1.0
+
+    def add(self, bbox: BoundingBox) -> None:
+        """Mark a box as covered"""
+        self._mask[self._cells(bbox)] = True
+
+    def coverage(self) -> float:
+        """Fraction of the page covered so far"""
+        return float(self._mask.mean())
+
+
 class CoordinateMapper:
     """Handles coordinate transformations and bounding box operations"""
 
@@ -159,10 +309,84 @@ class CoordinateMapper:
             label=tile_bbox.label,
         )
 
+    @staticmethod
+    def pixels_to_points(bbox: BoundingBox, dpi: int) -> BoundingBox:
+        """
+        Convert a box from rendered-image pixels to PDF points (1/72 inch)
+
+        Points do not depend on the rendering DPI, so boxes from different
+        passes can be compared and persisted for highlighting in the viewer.
+
+        Args:
+            bbox: Box in pixels of an image rendered at dpi
+            dpi: Rendering resolution
+
+        Returns:
+            BoundingBox in PDF points (top-left origin)
+        """
+        return CoordinateMapper.rescale_bbox(bbox, dpi, 72)
+
+    @staticmethod
+    def rescale_bbox(bbox: BoundingBox, from_dpi: int, to_dpi: int) -> BoundingBox:
+        """
+        Convert a box between renderings of the same page at different DPI
+
+        Args:
+            bbox: Box in pixels of the from_dpi rendering
+            from_dpi: Resolution the box was measured at
+            to_dpi: Target resolution
+
+        Returns:
+            BoundingBox in pixels of the to_dpi rendering
+        """
+        scale = to_dpi / from_dpi
+
+        return BoundingBox(
+            x=int(round(bbox.x * scale)),
+            y=int(round(bbox.y * scale)),
+            width=max(1, int(round(bbox.width * scale))),
+            height=max(1, int(round(bbox.height * scale))),
+            page_number=bbox.page_number,
+            confidence=bbox.confidence,
+            label=bbox.label,
+        )
+
+    @staticmethod
+    def clamp_bbox(bbox: BoundingBox, width: int, height: int) -> Optional[BoundingBox]:
+        """
+        Clip a box to the page
+
+        Args:
+            bbox: Box to clip
+            width: Page width
+            height: Page height
+
+        Returns:
+            Clipped BoundingBox, or None if nothing of it is on the page
+        """
+        x1 = min(max(int(bbox.x), 0), width)
+        y1 = min(max(int(bbox.y), 0), height)
+        x2 = min(max(int(bbox.x + bbox.width), 0), width)
+        y2 = min(max(int(bbox.y + bbox.height), 0), height)
+
+        if x2 <= x1 or y2 <= y1:
+            return None
+
+        return BoundingBox(
+            x=x1,
+            y=y1,
+            width=x2 - x1,
+            height=y2 - y1,
+            page_number=bbox.page_number,
+            confidence=bbox.confidence,
+            label=bbox.label,
+        )
+
     @staticmethod
     def merge_overlapping_boxes(
         boxes: List[BoundingBox],
-        iou_threshold: float = 0.5
+        iou_threshold: float = 0.5,
+        containment_threshold: Optional[float] = None
     ) -> List[BoundingBox]:
         """
         Merge overlapping bounding boxes using IoU threshold
@@ -170,6 +394,8 @@ class CoordinateMapper:
         Args:
             boxes: List of bounding boxes
             iou_threshold: IoU threshold for merging (0.0-1.0)
+            containment_threshold: Also merge boxes whose smaller box is
+                covered at least this much (nested regions); None to disable
 
         Returns:
             List of merged bounding boxes
@@ -180,6 +406,11 @@ class CoordinateMapper:
         # Sort by confidence (descending)
         sorted_boxes = sorted(boxes, key=lambda b: b.confidence, reverse=True)
 
+        # Only boxes sharing a grid cell can overlap
+        index = SpatialIndex.for_boxes(sorted_boxes)
+        for box in sorted_boxes:
+            index.insert(box)
+
         merged = []
         used = set()
 
@@ -189,11 +420,16 @@ class CoordinateMapper:
 
             # Find overlapping boxes
             group = [box1]
-            for j, box2 in enumerate(sorted_boxes[i + 1:], start=i + 1):
-                if j in used:
+            for j in index.query(box1):
+                if j <= i or j in used:
                     continue
+                box2 = sorted_boxes[j]
 
-                if box1.intersection_over_union(box2) >= iou_threshold:
+                nested = (
+                    containment_threshold is not None
+                    and box1.containment(box2) >= containment_threshold
+                )
+                if nested or box1.intersection_over_union(box2) >= iou_threshold:
                     group.append(box2)
                     used.add(j)
 
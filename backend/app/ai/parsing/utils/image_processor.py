@@ -16,6 +16,11 @@ from pdf2image import convert_from_path
 from PIL import Image
 import numpy as np
 
+from .coordinate_mapper import BoundingBox, CoverageMask
+from .memory_budget import estimate_render_bytes, memory_budget
+from .pdf_pages import page_size
+from .telemetry import telemetry
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,6 +50,7 @@ class ImageProcessor:
         """
         self.max_size_bytes = int(max_size_mb * 1024 * 1024)
 
+    @telemetry.traced("image.render")
     def pdf_page_to_image(
         self,
         pdf_path: Path,
@@ -68,21 +74,28 @@ class ImageProcessor:
 
         logger.debug(f"Converting page {page_number} at {dpi} DPI")
 
-        # Convert PDF page to image
-        images = convert_from_path(
-            str(pdf_path),
-            first_page=page_number,
-            last_page=page_number,
-            dpi=dpi,
-        )
+        # Render and encode within the memory budget (a 24x36 sheet at
+        # 300 DPI decodes to ~230MB); poppler renders only this page
+        width_points, height_points = page_size(pdf_path, page_number)
+        with memory_budget.reserve(
+            estimate_render_bytes(width_points, height_points, dpi),
+            f"page {page_number} at {dpi} DPI",
+        ):
+            images = convert_from_path(
+                str(pdf_path),
+                first_page=page_number,
+                last_page=page_number,
+                dpi=dpi,
+                thread_count=1,
+            )
 
-        if not images:
-            raise ValueError(f"Could not convert page {page_number}")
+            if not images:
+                raise ValueError(f"Could not convert page {page_number}")
 
-        image = images[0]
+            image = images[0]
 
-        # Optimize image size
-        optimized_image, base64_data = self.optimize_image_size(image, target_bytes)
+            # Optimize image size
+            optimized_image, base64_data = self.optimize_image_size(image, target_bytes)
 
         actual_size = len(base64_data) * 3 / 4  # Base64 overhead
         logger.debug(
@@ -90,6 +103,7 @@ class ImageProcessor:
             f"size={actual_size/1024/1024:.2f}MB, "
             f"dimensions={optimized_image.size}"
         )
+        telemetry.annotate(page=page_number, dpi=dpi, encoded_bytes=len(base64_data))
 
         return optimized_image, base64_data
 
@@ -159,13 +173,16 @@ class ImageProcessor:
 
         return image, base64_data
 
+    @telemetry.traced("image.tiles")
     def create_tiles(
         self,
         image: Image.Image,
         page_number: int,
         tile_size: Tuple[int, int],
         overlap_percent: float = 0.1,
-        roi: Optional['BoundingBox'] = None
+        roi: Optional[BoundingBox] = None,
+        coverage: Optional[CoverageMask] = None,
+        max_covered: float = 0.9
     ) -> List[TileInfo]:
         """
         Split an image into overlapping tiles
@@ -176,6 +193,10 @@ class ImageProcessor:
             tile_size: (width, height) of each tile
             overlap_percent: Percentage of overlap between tiles (0.0-0.5)
             roi: Optional region of interest to tile (defaults to full image)
+            coverage: Optional mask of page areas already tiled; tiles that are
+                mostly covered are skipped (before encoding) and new tiles are
+                added to it
+            max_covered: Covered fraction above which a tile is skipped
 
         Returns:
             List of TileInfo objects
@@ -200,10 +221,23 @@ class ImageProcessor:
         tiles = []
         tile_number = 0
 
+        def already_covered(x: int, y: int, width: int, height: int) -> bool:
+            if coverage is None:
+                return False
+            box = BoundingBox(x=x, y=y, width=width, height=height, page_number=page_number)
+            if coverage.covered_fraction(box) >= max_covered:
+                return True
+            coverage.add(box)
+            return False
+
         # SPECIAL CASE: If the ROI is smaller than the tile size, use it as a single tile
         if region_width <= tile_width and region_height <= tile_height:
             logger.debug(f"ROI ({region_width}x{region_height}) fits in single tile")
 
+            if already_covered(x_start, y_start, region_width, region_height):
+                logger.info(f"ROI on page {page_number} already covered by earlier tiles, skipping")
+                return tiles
+
             # Optimize and encode the entire ROI
             _, base64_data = self.optimize_image_size(region_image, self.max_size_bytes)
 
@@ -221,6 +255,7 @@ class ImageProcessor:
 
             tiles.append(tile_info)
             logger.info(f"Created 1 tile (full ROI) for page {page_number}")
+            telemetry.annotate(page=page_number, tiles=1, encoded_bytes=len(base64_data))
             return tiles
 
         # NORMAL CASE: ROI is larger than tile size, split into tiles
@@ -238,6 +273,11 @@ class ImageProcessor:
                     logger.debug(f"Skipping tiny tile fragment at ({x},{y})")
                     continue
 
+                # Pixels already sent with another region's tiles
+                if already_covered(x_start + x, y_start + y, x_end - x, y_end - y):
+                    logger.debug(f"Skipping tile at ({x_start + x},{y_start + y}), already covered")
+                    continue
+
                 # Crop tile
                 tile_image = region_image.crop((x, y, x_end, y_end))
 
@@ -265,6 +305,11 @@ class ImageProcessor:
             tile.total_tiles = len(tiles)
 
         logger.info(f"Created {len(tiles)} tiles for page {page_number}")
+        telemetry.annotate(
+            page=page_number,
+            tiles=len(tiles),
+            encoded_bytes=sum(len(tile.base64_data) for tile in tiles),
+        )
 
         return tiles
 
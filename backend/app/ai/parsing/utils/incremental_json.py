@@ -0,0 +1,142 @@
+"""
+Incremental JSON Parsing
+
+Utilities for pulling complete items out of a JSON document while it is still
+being streamed from an LLM, so extracted items can be delivered before the
+full response has arrived.
+"""
+
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Top-level arrays that hold extracted items in the parsing schema
+DEFAULT_ARRAY_KEYS = ("bid_items", "materials", "specifications")
+
+
+class IncrementalItemParser:
+    """
+    Extracts complete objects from top-level item arrays of a streamed JSON document
+
+    Feed text chunks as they arrive; every call returns the items that were
+    completed by that chunk. Works on raw model output, including any leading
+    prose or markdown code fences before the opening brace.
+    """
+
+    def __init__(self, array_keys: Iterable[str] = DEFAULT_ARRAY_KEYS):
+        """
+        Initialize the parser
+
+        Args:
+            array_keys: Top-level keys whose array elements should be emitted
+        """
+        self.array_keys = set(array_keys)
+        self.items: Dict[str, List[Dict[str, Any]]] = {key: [] for key in self.array_keys}
+
+        self._text = ""
+        self._pos = 0
+
+        # Each stack entry: [container_char, current_key, key_of_container]
+        self._stack: List[List[Optional[str]]] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+
+        self._item_start: Optional[int] = None
+        self._item_key: Optional[str] = None
+        self._item_depth = 0
+
+    def feed(self, chunk: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Consume a chunk of streamed text
+
+        Args:
+            chunk: Next piece of the JSON document
+
+        Returns:
+            List of (array_key, item) tuples completed by this chunk
+        """
+        if not chunk:
+            return []
+
+        self._text += chunk
+        text = self._text
+        completed = []
+
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._last_string = text[self._string_start + 1:i]
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+
+            elif ch == ":":
+                if self._stack and self._stack[-1][0] == "{":
+                    self._stack[-1][1] = self._last_string
+
+            elif ch in "{[":
+                parent_key = None
+                if self._stack and self._stack[-1][0] == "{":
+                    parent_key = self._stack[-1][1]
+                self._stack.append([ch, None, parent_key])
+
+                if ch == "{" and self._item_start is None and self._is_item_position():
+                    self._item_start = i
+                    self._item_key = self._stack[-2][2]
+                    self._item_depth = len(self._stack) - 1
+
+            elif ch in "}]":
+                if self._stack:
+                    self._stack.pop()
+
+                if (
+                    ch == "}"
+                    and self._item_start is not None
+                    and len(self._stack) == self._item_depth
+                ):
+                    item = self._load_item(text[self._item_start:i + 1])
+                    if item is not None:
+                        self.items[self._item_key].append(item)
+                        completed.append((self._item_key, item))
+                    self._item_start = None
+                    self._item_key = None
+
+        self._pos = len(text)
+        return completed
+
+    def _is_item_position(self) -> bool:
+        """Check if the object just opened is a direct element of a tracked top-level array"""
+        if len(self._stack) != 3:
+            return False
+
+        root, array, _ = self._stack
+        return root[0] == "{" and array[0] == "[" and array[2] in self.array_keys
+
+    @staticmethod
+    def _load_item(raw: str) -> Optional[Dict[str, Any]]:
+        """Decode a single completed item, ignoring malformed fragments"""
+        try:
+            item = json.loads(raw)
+        except json.JSONDecodeError:
+            logger.debug(f"Skipping malformed streamed item: {raw[:100]}")
+            return None
+
+        return item if isinstance(item, dict) else None
+
+    @property
+    def text(self) -> str:
+        """Full text received so far"""
+        return self._text
@@ -0,0 +1,164 @@
+"""
+Memory Budget
+
+Process-wide cap on the memory held by page renders, image encodes and PDF
+payloads, so a 100+ sheet, 200 MB plan set cannot exhaust a small container.
+
+Work reserves its estimated peak before allocating. Reservations that do not
+fit wait until earlier work releases memory (queueing), and a reservation
+larger than the whole budget is refused outright. Reservations are taken in
+worker threads (rendering runs under the CPU budget), so the budget uses a
+threading condition rather than asyncio primitives.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator
+
+from ..config import load_parsing_config
+from .telemetry import telemetry
+
+logger = logging.getLogger(__name__)
+
+# Decoded RGB pixels plus the working copies made while converting/encoding
+_RENDER_COPIES = 2
+_BYTES_PER_PIXEL = 3
+
+
+class MemoryBudgetExceeded(Exception):
+    """Raised when work cannot fit in the memory budget"""
+    pass
+
+
+def estimate_render_bytes(width_points: float, height_points: float, dpi: int) -> int:
+    """
+    Estimate the peak memory of rendering and encoding one page
+
+    Args:
+        width_points: Page width in PDF points
+        height_points: Page height in PDF points
+        dpi: Render resolution
+
+    Returns:
+        Estimated bytes
+    """
+    scale = dpi / 72
+    pixels = (width_points * scale) * (height_points * scale)
+    return int(pixels * _BYTES_PER_PIXEL * _RENDER_COPIES)
+
+
+def estimate_payload_bytes(pdf_bytes: int) -> int:
+    """
+    Estimate the peak memory of sending a PDF payload to an LLM
+
+    Raw bytes, their base64 encoding and the serialized request body.
+    """
+    return int(pdf_bytes * (1 + 4 / 3 + 4 / 3))
+
+
+class MemoryBudget:
+    """
+    Byte-counting budget shared by all parses in the process
+    """
+
+    def __init__(self, limit_mb: float, wait_timeout_s: float = 300, enabled: bool = True):
+        """
+        Initialize the budget
+
+        Args:
+            limit_mb: Total memory available to reservations
+            wait_timeout_s: How long a reservation may queue before failing
+            enabled: When False, reservations are not counted
+        """
+        self.limit_bytes = int(limit_mb * 1024 * 1024)
+        self.wait_timeout_s = wait_timeout_s
+        self.enabled = enabled
+        self.used_bytes = 0
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def reserve(self, nbytes: int, label: str = "work") -> Iterator[None]:
+        """
+        Hold memory for the duration of a block
+
+        Args:
+            nbytes: Estimated peak bytes of the work
+            label: Description used in logs and errors
+
+        Raises:
+            MemoryBudgetExceeded: If the work is larger than the whole budget
+                or no memory was released within the wait timeout
+        """
+        held = self._acquire(nbytes, label)
+        try:
+            yield
+        finally:
+            self._release(held)
+
+    @asynccontextmanager
+    async def reserve_async(self, nbytes: int, label: str = "work") -> AsyncIterator[None]:
+        """
+        Hold memory for the duration of an async block
+
+        Waiting happens in a worker thread so a queued reservation does not
+        block the event loop. Arguments and errors as for reserve().
+        """
+        held = await asyncio.to_thread(self._acquire, nbytes, label)
+        try:
+            yield
+        finally:
+            self._release(held)
+
+    def _acquire(self, nbytes: int, label: str) -> int:
+        """Wait for and take a reservation, returning the bytes held"""
+        if not self.enabled or nbytes <= 0:
+            return 0
+
+        if nbytes > self.limit_bytes:
+            raise MemoryBudgetExceeded(
+                f"{label} needs {nbytes / 1024 / 1024:.0f}MB, "
+                f"more than the {self.limit_bytes / 1024 / 1024:.0f}MB memory budget"
+            )
+
+        queued = time.perf_counter()
+        with self._condition:
+            if self.used_bytes + nbytes > self.limit_bytes:
+                logger.info(
+                    f"Queueing {label} ({nbytes / 1024 / 1024:.0f}MB): "
+                    f"{self.used_bytes / 1024 / 1024:.0f}MB of "
+                    f"{self.limit_bytes / 1024 / 1024:.0f}MB in use"
+                )
+            fits = self._condition.wait_for(
+                lambda: self.used_bytes + nbytes <= self.limit_bytes,
+                timeout=self.wait_timeout_s,
+            )
+            if not fits:
+                raise MemoryBudgetExceeded(
+                    f"{label} waited {self.wait_timeout_s:.0f}s for "
+                    f"{nbytes / 1024 / 1024:.0f}MB of memory budget"
+                )
+            self.used_bytes += nbytes
+
+        telemetry.record_queue_wait("memory", time.perf_counter() - queued)
+        return nbytes
+
+    def _release(self, nbytes: int) -> None:
+        """Return a reservation and wake queued work"""
+        if not nbytes:
+            return
+        with self._condition:
+            self.used_bytes -= nbytes
+            self._condition.notify_all()
+
+
+_config = load_parsing_config()
+
+# Singleton instance
+memory_budget = MemoryBudget(
+    limit_mb=_config.memory_budget_mb,
+    wait_timeout_s=_config.memory_wait_timeout_s,
+    enabled=_config.enable_memory_budget,
+)
@@ -0,0 +1,218 @@
+"""
+Page Fingerprints
+
+Per-page fingerprints used to tell which sheets of an addendum differ from the
+plan set already parsed. Each page gets:
+
+- text_hash: SHA-256 of the whitespace-normalized text layer (None for scans)
+- phash: 64-bit difference hash of a low-resolution render, used to find the
+  prior sheet a page replaces (survives revision clouds and stamps)
+- detail_hash: 256-bit difference hash, used to decide whether a page without
+  a text layer changed
+
+Fingerprints are plain dictionaries so they can be stored as JSON.
+"""
+
+import hashlib
+import logging
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import PyPDF2
+from PIL import Image
+
+from .memory_budget import estimate_render_bytes, memory_budget
+from .pdf_pages import page_sizes
+from .telemetry import telemetry
+
+try:
+    from pdf2image import convert_from_path
+    PDF2IMAGE_AVAILABLE = True
+except ImportError:
+    PDF2IMAGE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Rendering resolution for perceptual hashes (a 24x36 sheet is ~860x1300 px)
+FINGERPRINT_DPI = 36
+
+# Hamming distance (of 64 bits) under which a page is the same sheet as a prior page
+MATCH_DISTANCE = 12
+
+# Hamming distance (of 256 bits) under which a page without text is unchanged
+UNCHANGED_DISTANCE = 6
+
+# Page statuses reported by match_pages()
+UNCHANGED = "unchanged"
+CHANGED = "changed"
+NEW = "new"
+
+
+def _difference_hash(image: Image.Image, size: int) -> str:
+    """Difference hash of a size x size grid, as hex"""
+    pixels = list(image.convert("L").resize((size + 1, size), Image.LANCZOS).getdata())
+
+    bits = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            bits = (bits << 1) | (left > right)
+
+    return f"{bits:0{size * size // 4}x}"
+
+
+def hamming_distance(first: str, second: str) -> int:
+    """Number of differing bits between two hex hashes"""
+    return bin(int(first, 16) ^ int(second, 16)).count("1")
+
+
+def _text_hash(text: Optional[str]) -> Optional[str]:
+    normalized = re.sub(r"\s+", " ", text or "").strip().lower()
+    if not normalized:
+        return None
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _render(pdf_path: Path, page_number: int, width: float, height: float) -> Optional[Image.Image]:
+    if not PDF2IMAGE_AVAILABLE:
+        return None
+
+    with memory_budget.reserve(
+        estimate_render_bytes(width, height, FINGERPRINT_DPI),
+        f"fingerprint page {page_number}",
+    ):
+        images = convert_from_path(
+            str(pdf_path),
+            first_page=page_number,
+            last_page=page_number,
+            dpi=FINGERPRINT_DPI,
+            thread_count=1,
+        )
+        return images[0] if images else None
+
+
+@telemetry.traced("pdf.fingerprint")
+def fingerprint_pages(pdf_path: Path) -> List[Dict[str, Any]]:
+    """
+    Fingerprint every page of a PDF
+
+    Args:
+        pdf_path: Path to PDF file
+
+    Returns:
+        One {"page", "text_hash", "phash", "detail_hash"} dictionary per page
+    """
+    sizes = page_sizes(pdf_path)
+    fingerprints = []
+
+    with open(pdf_path, "rb") as file:
+        reader = PyPDF2.PdfReader(file)
+
+        for index, (width, height) in enumerate(sizes):
+            page_number = index + 1
+
+            try:
+                text = reader.pages[index].extract_text()
+            except Exception as e:
+                logger.debug(f"No text on page {page_number}: {e}")
+                text = None
+
+            phash = detail_hash = None
+            try:
+                image = _render(pdf_path, page_number, width, height)
+                if image is not None:
+                    phash = _difference_hash(image, 8)
+                    detail_hash = _difference_hash(image, 16)
+            except Exception as e:
+                logger.warning(f"Could not render page {page_number} for fingerprinting: {e}")
+
+            fingerprints.append({
+                "page": page_number,
+                "text_hash": _text_hash(text),
+                "phash": phash,
+                "detail_hash": detail_hash,
+            })
+
+    telemetry.annotate(pages=len(fingerprints))
+    return fingerprints
+
+
+def _is_unchanged(page: Dict[str, Any], prior: Dict[str, Any]) -> bool:
+    if page.get("text_hash") and prior.get("text_hash"):
+        return page["text_hash"] == prior["text_hash"]
+
+    if page.get("detail_hash") and prior.get("detail_hash"):
+        return hamming_distance(page["detail_hash"], prior["detail_hash"]) <= UNCHANGED_DISTANCE
+
+    return False
+
+
+def match_pages(
+    fingerprints: Sequence[Dict[str, Any]],
+    prior_sets: Sequence[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Match pages to the pages of previously parsed documents
+
+    A page is unchanged when a prior page has the same text layer (or, for
+    scans, a near-identical detail hash). Otherwise it is a changed version
+    of the visually closest prior page within MATCH_DISTANCE, or new.
+
+    Args:
+        fingerprints: Fingerprints of the new document
+        prior_sets: {"document_id", "fingerprints"} per prior document, oldest
+            first; later documents win ties
+
+    Returns:
+        One {"page", "status", "prior_document_id", "prior_page", "distance"}
+        dictionary per page
+    """
+    prior_pages = [
+        (prior["document_id"], fingerprint)
+        for prior in prior_sets
+        for fingerprint in prior.get("fingerprints") or []
+    ]
+
+    matches = []
+    for page in fingerprints:
+        match = {
+            "page": page["page"],
+            "status": NEW,
+            "prior_document_id": None,
+            "prior_page": None,
+            "distance": None,
+        }
+
+        unchanged = [
+            (document_id, prior) for document_id, prior in prior_pages
+            if _is_unchanged(page, prior)
+        ]
+        if unchanged:
+            document_id, prior = unchanged[-1]
+            match.update(
+                status=UNCHANGED, prior_document_id=document_id,
+                prior_page=prior["page"], distance=0,
+            )
+            matches.append(match)
+            continue
+
+        best = None
+        if page.get("phash"):
+            for document_id, prior in prior_pages:
+                if not prior.get("phash"):
+                    continue
+                distance = hamming_distance(page["phash"], prior["phash"])
+                if distance <= MATCH_DISTANCE and (best is None or distance <= best[0]):
+                    best = (distance, document_id, prior["page"])
+
+        if best is not None:
+            match.update(
+                status=CHANGED, prior_document_id=best[1],
+                prior_page=best[2], distance=best[0],
+            )
+
+        matches.append(match)
+
+    return matches
@@ -8,10 +8,11 @@ import logging
 from pathlib import Path
 from typing import Optional
 import PyPDF2
-from pdf2image import convert_from_path
 from PIL import Image
 
 from ..base_strategy import DocumentMetrics
+from .pdf_pages import page_count as pdf_page_count, page_sizes
+from .telemetry import telemetry
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +23,7 @@ class PDFAnalyzer:
     def __init__(self):
         pass
 
+    @telemetry.traced("pdf.analyze")
     def analyze(self, pdf_path: Path) -> DocumentMetrics:
         """
         Analyze a PDF document and extract metrics
@@ -76,9 +78,7 @@ class PDFAnalyzer:
             Number of pages
         """
         try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                return len(pdf_reader.pages)
+            return pdf_page_count(pdf_path)
         except Exception as e:
             logger.error(f"Error getting page count: {e}")
             return 1
@@ -95,22 +95,17 @@ class PDFAnalyzer:
             Estimated average DPI or None if cannot determine
         """
         try:
-            # Convert first few pages to images
-            images = convert_from_path(
-                str(pdf_path),
-                first_page=1,
-                last_page=sample_pages,
-                dpi=72,  # Use low DPI for analysis
-            )
-
-            if not images:
+            # Page geometry gives the same figure as a 72 DPI render
+            # (1 point = 1 pixel) without rasterizing anything
+            sizes = page_sizes(pdf_path)[:sample_pages]
+
+            if not sizes:
                 return None
 
-            # Calculate DPI from image dimensions
+            # Calculate DPI from page dimensions
             # Standard letter size: 8.5" x 11"
             dpis = []
-            for img in images:
-                width, height = img.size
+            for width, height in sizes:
                 # Estimate based on width (8.5 inches for letter)
                 dpi_x = width / 8.5
                 # Estimate based on height (11 inches for letter)
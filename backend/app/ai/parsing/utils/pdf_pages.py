@@ -0,0 +1,149 @@
+"""
+PDF Page Utilities
+
+Page geometry and page-subset PDFs read through a file handle, so large plan
+sets are never loaded into memory whole (PyPDF2 reads the entire file into
+memory when given a path; given an open file it reads objects on demand).
+"""
+
+import io
+import logging
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+import PyPDF2
+
+logger = logging.getLogger(__name__)
+
+# Words that mark a sheet as carrying takeoff content (schedules, bid tabs,
+# material lists, general notes)
+TAKEOFF_KEYWORDS = (
+    "schedule", "bid", "item", "quantity", "qty", "material", "takeoff",
+    "estimate", "unit", "total", "spec", "note", "summary", "pipe", "concrete",
+)
+_KEYWORD_PATTERN = re.compile(r"\b(" + "|".join(TAKEOFF_KEYWORDS) + r")", re.IGNORECASE)
+
+# Page sizes of recently used documents, keyed by (path, size, mtime)
+_SIZE_CACHE_ENTRIES = 32
+_size_cache: "OrderedDict[Tuple[str, int, float], List[Tuple[float, float]]]" = OrderedDict()
+_size_cache_lock = threading.Lock()
+
+
+def page_sizes(pdf_path: Path) -> List[Tuple[float, float]]:
+    """
+    Width and height in points of every page
+
+    Args:
+        pdf_path: Path to PDF file
+
+    Returns:
+        (width, height) per page, rotation applied
+    """
+    stat = Path(pdf_path).stat()
+    key = (str(pdf_path), stat.st_size, stat.st_mtime)
+
+    with _size_cache_lock:
+        if key in _size_cache:
+            _size_cache.move_to_end(key)
+            return _size_cache[key]
+
+    sizes = []
+    with open(pdf_path, "rb") as file:
+        reader = PyPDF2.PdfReader(file)
+        for page in reader.pages:
+            box = page.mediabox
+            width, height = float(box.width), float(box.height)
+            if (page.get("/Rotate") or 0) % 180:
+                width, height = height, width
+            sizes.append((width, height))
+
+    with _size_cache_lock:
+        _size_cache[key] = sizes
+        while len(_size_cache) > _SIZE_CACHE_ENTRIES:
+            _size_cache.popitem(last=False)
+
+    return sizes
+
+
+def page_count(pdf_path: Path) -> int:
+    """Number of pages in a PDF"""
+    return len(page_sizes(pdf_path))
+
+
+def page_size(pdf_path: Path, page_number: int) -> Tuple[float, float]:
+    """
+    Width and height in points of one page
+
+    Args:
+        pdf_path: Path to PDF file
+        page_number: Page number (1-indexed)
+    """
+    return page_sizes(pdf_path)[page_number - 1]
+
+
+def page_subset_bytes(pdf_path: Path, pages: Sequence[int]) -> bytes:
+    """
+    Write a PDF containing only some pages of a document
+
+    Pages are copied as PDF objects (no re-rendering), so text layers and
+    vector content are preserved.
+
+    Args:
+        pdf_path: Path to PDF file
+        pages: Page numbers (1-indexed) in output order
+
+    Returns:
+        Bytes of the subset PDF
+    """
+    writer = PyPDF2.PdfWriter()
+
+    with open(pdf_path, "rb") as file:
+        reader = PyPDF2.PdfReader(file)
+        for page_number in pages:
+            writer.add_page(reader.pages[page_number - 1])
+
+        output = io.BytesIO()
+        writer.write(output)
+
+    return output.getvalue()
+
+
+def relevant_pages(pdf_path: Path, limit: int) -> List[int]:
+    """
+    Choose the pages most likely to carry takeoff content
+
+    Pages are ranked by takeoff keywords in their text layer and the best
+    `limit` are returned in document order. Documents without a text layer
+    (scans) give no signal, so their leading pages are used.
+
+    Args:
+        pdf_path: Path to PDF file
+        limit: Maximum number of pages to return
+
+    Returns:
+        Page numbers (1-indexed), ascending
+    """
+    total = page_count(pdf_path)
+    if total <= limit:
+        return list(range(1, total + 1))
+
+    scores = []
+    with open(pdf_path, "rb") as file:
+        reader = PyPDF2.PdfReader(file)
+        for index, page in enumerate(reader.pages):
+            try:
+                text = page.extract_text() or ""
+            except Exception as e:
+                logger.debug(f"No text on page {index + 1}: {e}")
+                text = ""
+            scores.append((len(_KEYWORD_PATTERN.findall(text)), index + 1))
+
+    if not any(score for score, _ in scores):
+        return list(range(1, limit + 1))
+
+    # Highest score first, earlier pages winning ties
+    ranked = sorted(scores, key=lambda entry: (-entry[0], entry[1]))
+    return sorted(page_number for _, page_number in ranked[:limit])
@@ -0,0 +1,66 @@
+"""
+Parse Progress Events
+
+Helpers for reporting incremental parsing progress (stage changes and partial
+extraction results) to an optional caller-supplied callback.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from ..output_normalizer import OutputNormalizer
+
+logger = logging.getLogger(__name__)
+
+# Receives one event dict per call, e.g. {"event": "stage", "stage": "coarse_scan", ...}
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+
+def emit_progress(
+    callback: Optional[ProgressCallback],
+    event: str,
+    **payload: Any
+) -> None:
+    """
+    Send a progress event to the callback, if one was provided
+
+    Callback failures are logged and swallowed so progress reporting can never
+    break a parse.
+
+    Args:
+        callback: Progress callback (or None)
+        event: Event type ("stage", "items", ...)
+        **payload: Event fields
+    """
+    if callback is None:
+        return
+
+    try:
+        callback({"event": event, **payload})
+    except Exception as e:
+        logger.debug(f"Progress callback failed for '{event}' event: {e}")
+
+
+def emit_items(
+    callback: Optional[ProgressCallback],
+    partial_data: Optional[Dict[str, Any]],
+    **payload: Any
+) -> None:
+    """
+    Normalize a partial extraction result and emit it as an "items" event
+
+    Nothing is emitted when the partial result contains no items.
+
+    Args:
+        callback: Progress callback (or None)
+        partial_data: Raw partial data with any of bid_items/materials/specifications
+        **payload: Extra event fields (page, tile, source, ...)
+    """
+    if callback is None or not partial_data:
+        return
+
+    normalized = OutputNormalizer.normalize_partial(partial_data)
+    if not any(normalized.values()):
+        return
+
+    emit_progress(callback, "items", **normalized, **payload)
@@ -0,0 +1,126 @@
+"""
+LLM Response Cache
+
+In-process LRU memo of raw LLM responses keyed by (prompt version, prompt,
+model, input hash). Plan sets repeat the same details, title blocks and
+typical sheets constantly, so identical tiles and pages are answered locally
+instead of being sent to the provider again.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Union
+
+from ..config import load_parsing_config
+from ..prompts import PROMPT_VERSION
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of LLM response text
+    """
+
+    def __init__(self, max_entries: int = 512, enabled: bool = True):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum cached responses before least-recently-used eviction
+            enabled: When False, get() always misses and set() is a no-op
+        """
+        self.max_entries = max_entries
+        self.enabled = enabled and max_entries > 0
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(prompt_name: str, model: str, *payloads: Union[str, bytes]) -> str:
+        """
+        Build a cache key for a request
+
+        Args:
+            prompt_name: Name of the prompt used (e.g. "tile_extraction")
+            model: Model identifier
+            *payloads: Per-call inputs (base64 images, PDF bytes, text)
+
+        Returns:
+            Hex digest identifying the request
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{PROMPT_VERSION}|{prompt_name}|{model}".encode("utf-8"))
+
+        for payload in payloads:
+            if isinstance(payload, str):
+                payload = payload.encode("utf-8")
+            digest.update(b"|")
+            digest.update(hashlib.sha256(payload).digest())
+
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            Cached response text or None
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            response = self._entries.get(key)
+            if response is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        logger.debug(f"Response cache hit ({key[:12]})")
+        return response
+
+    def set(self, key: str, response: str) -> None:
+        """
+        Store a response
+
+        Only store responses that parsed successfully, so a malformed answer
+        is retried rather than replayed.
+
+        Args:
+            key: Key from make_key()
+            response: Raw response text
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached responses"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_config = load_parsing_config()
+
+# Shared by all parsers in the process
+response_cache = ResponseCache(
+    max_entries=_config.response_cache_size,
+    enabled=_config.enable_response_cache,
+)
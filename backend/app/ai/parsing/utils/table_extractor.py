@@ -0,0 +1,471 @@
+"""
+Native-Text Table Extraction
+
+Extracts schedules, bid tabs and material lists from the text layer of
+vector (CAD-exported) PDFs using pdfplumber word and ruling-line geometry,
+without rendering pages or calling a vision model.
+
+Words are clustered into rows by vertical position and into cells by
+horizontal gaps and vertical rulings. A row whose cells read like column
+headers (QTY / DESCRIPTION / UNIT / ...) starts a table; the header cells
+define the columns every following row is assigned to.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from statistics import median
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Header aliases per output field, checked in order (so "UNIT PRICE" is a
+# price column rather than a unit column, and "ITEM DESCRIPTION" a description)
+HEADER_ALIASES: List[Tuple[str, str]] = [
+    ("unit_price", r"(BID )?UNIT (PRICE|COST)|PRICE|RATE"),
+    ("total", r"(TOTAL|EXTENDED|EXT)( (PRICE|COST|AMOUNT))?|AMOUNT"),
+    ("quantity", r"(EST |ESTIMATED |APPROX )?(QTY|QTYS|QUANTITY|QUANTITIES|QUAN|QUANT)|COUNT|NO REQ D|REQ D"),
+    ("unit", r"UNITS?|UOM|U M|UM"),
+    ("description", r"(ITEM |MATERIAL |WORK |BID ITEM )?(DESCRIPTION|DESC)|MATERIAL|PRODUCT|NAME"),
+    ("item_number", r"(BID )?ITEM( NO| NUMBER| #)?|NO|#|MARK|TAG|LINE( NO)?|SYM|SYMBOL"),
+]
+
+_COMPILED_ALIASES = [(name, re.compile(rf"^(?:{pattern})$")) for name, pattern in HEADER_ALIASES]
+
+# Columns that describe a material further (door/window schedules etc.)
+_EXTRA_COLUMN_MAX_LENGTH = 24
+
+_QUANTITY_WITH_UNIT = re.compile(r"^([\d,]+(?:\.\d+)?)\s*([A-Za-z]{1,4})$")
+
+
+@dataclass
+class _Cell:
+    """Adjacent words of one row that belong together"""
+    text: str
+    x0: float
+    x1: float
+
+
+@dataclass
+class _Row:
+    """Words sharing a baseline"""
+    top: float
+    bottom: float
+    cells: List[_Cell]
+
+
+@dataclass
+class _Column:
+    """A table column defined by a header cell"""
+    field: str
+    header: str
+    x0: float
+    x1: float
+
+
+@dataclass
+class PageTables:
+    """Tables found on one page"""
+    page_number: int
+    has_text: bool = False
+    table_count: int = 0
+    word_count: int = 0
+    table_word_count: int = 0
+    bid_items: List[Dict[str, Any]] = field(default_factory=list)
+    materials: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def has_structure(self) -> bool:
+        """Whether the page yielded at least one table with rows"""
+        return self.table_count > 0
+
+    @property
+    def non_table_fraction(self) -> float:
+        """Share of the page's words outside its tables (callouts, notes, title block)"""
+        if not self.word_count:
+            return 0.0
+        return 1 - self.table_word_count / self.word_count
+
+
+class TableExtractor:
+    """Finds tables in the text layer of PDF pages"""
+
+    def __init__(self, row_tolerance: float = 0.5, cell_gap: float = 0.8):
+        """
+        Initialize the extractor
+
+        Args:
+            row_tolerance: Max vertical offset between words of a row, as a
+                fraction of the median word height
+            cell_gap: Min horizontal gap that separates two cells, as a
+                fraction of the median word height
+        """
+        self.row_tolerance = row_tolerance
+        self.cell_gap = cell_gap
+        self.pdfplumber_available = self._check_pdfplumber()
+
+    def _check_pdfplumber(self) -> bool:
+        """Check if pdfplumber is available"""
+        try:
+            import pdfplumber
+            return True
+        except ImportError:
+            logger.warning("pdfplumber not available")
+            return False
+
+    def extract(
+        self,
+        pdf_path: Path,
+        max_pages: Optional[int] = None,
+        pages: Optional[Sequence[int]] = None
+    ) -> List[PageTables]:
+        """
+        Extract tables from the text layer of a PDF
+
+        Args:
+            pdf_path: Path to PDF file
+            max_pages: Maximum pages to scan (None = all)
+            pages: Specific 1-based page numbers to scan (overrides max_pages)
+
+        Returns:
+            One PageTables per scanned page
+        """
+        import pdfplumber
+
+        results = []
+
+        with pdfplumber.open(pdf_path) as pdf:
+            if pages is not None:
+                page_numbers = [p for p in pages if 1 <= p <= len(pdf.pages)]
+            else:
+                count = len(pdf.pages) if max_pages is None else min(max_pages, len(pdf.pages))
+                page_numbers = list(range(1, count + 1))
+
+            for page_number in page_numbers:
+                page = pdf.pages[page_number - 1]
+                try:
+                    results.append(self.extract_page(page, page_number))
+                except Exception as e:
+                    logger.warning(f"Table extraction failed on page {page_number}: {e}")
+                    results.append(PageTables(page_number=page_number))
+                finally:
+                    # Release cached layout objects; plan sheets can be huge
+                    page.flush_cache()
+
+        return results
+
+    def extract_page(self, page: Any, page_number: int) -> PageTables:
+        """
+        Extract tables from one pdfplumber page
+
+        Args:
+            page: pdfplumber page
+            page_number: 1-based page number
+
+        Returns:
+            PageTables for the page
+        """
+        result = PageTables(page_number=page_number)
+
+        words = page.extract_words(keep_blank_chars=False, use_text_flow=False)
+        if not words:
+            return result
+
+        result.has_text = True
+        result.word_count = len(words)
+        heights = [w["bottom"] - w["top"] for w in words if w["bottom"] > w["top"]]
+        word_height = median(heights) if heights else 10.0
+
+        rulings = self._vertical_rulings(page)
+        rows = self._cluster_rows(words, word_height, rulings)
+        table_boxes: List[Tuple[float, float, float, float]] = []
+
+        # Every header row starts a table; tables placed side by side on a
+        # sheet interleave rows, so each one reads only its own column span
+        for index, row in enumerate(rows):
+            columns = self._header_columns(row, rulings)
+            if columns is None:
+                continue
+
+            records = self._read_table(rows, index + 1, columns, word_height)
+            if not records:
+                continue
+
+            result.table_count += 1
+            table_boxes.append((
+                min(columns[0].x0, *(r["_bbox"][0] for r in records)),
+                row.top,
+                max(columns[-1].x1, *(r["_bbox"][2] for r in records)),
+                max(r["_bbox"][3] for r in records),
+            ))
+            fields = {column.field for column in columns}
+            is_bid_schedule = bool(fields & {"unit_price", "total"})
+
+            for record in records:
+                item = self._bid_item(record) if is_bid_schedule else self._material(record)
+                if item is None:
+                    continue
+
+                # pdfplumber coordinates are PDF points with a top-left origin
+                x0, top, x1, bottom = record.pop("_bbox")
+                item["source_page"] = page_number
+                item["source_bbox"] = {
+                    "x": int(x0),
+                    "y": int(top),
+                    "width": max(1, int(round(x1 - x0))),
+                    "height": max(1, int(round(bottom - top))),
+                }
+
+                if is_bid_schedule:
+                    result.bid_items.append(item)
+                else:
+                    result.materials.append(item)
+
+        result.table_word_count = sum(
+            1 for word in words
+            if any(
+                x0 <= (word["x0"] + word["x1"]) / 2 <= x1 and top <= (word["top"] + word["bottom"]) / 2 <= bottom
+                for x0, top, x1, bottom in table_boxes
+            )
+        )
+
+        return result
+
+    def _vertical_rulings(self, page: Any) -> List[float]:
+        """x positions of vertical lines and rectangle edges (table rules)"""
+        positions = set()
+
+        for line in page.lines:
+            if abs(line["x0"] - line["x1"]) < 1 and abs(line["bottom"] - line["top"]) > 4:
+                positions.add(round(line["x0"], 1))
+
+        for rect in page.rects:
+            if rect["bottom"] - rect["top"] > 4:
+                positions.add(round(rect["x0"], 1))
+                positions.add(round(rect["x1"], 1))
+
+        return sorted(positions)
+
+    def _cluster_rows(
+        self,
+        words: List[Dict[str, Any]],
+        word_height: float,
+        rulings: List[float]
+    ) -> List[_Row]:
+        """Group words into rows by vertical center, then into cells"""
+        tolerance = word_height * self.row_tolerance
+        rows: List[List[Dict[str, Any]]] = []
+        centers: List[float] = []
+
+        for word in sorted(words, key=lambda w: (w["top"] + w["bottom"]) / 2):
+            center = (word["top"] + word["bottom"]) / 2
+            if rows and center - centers[-1] <= tolerance:
+                rows[-1].append(word)
+                centers[-1] = sum((w["top"] + w["bottom"]) / 2 for w in rows[-1]) / len(rows[-1])
+            else:
+                rows.append([word])
+                centers.append(center)
+
+        return [
+            _Row(
+                top=min(w["top"] for w in row),
+                bottom=max(w["bottom"] for w in row),
+                cells=self._split_cells(row, word_height, rulings),
+            )
+            for row in rows
+        ]
+
+    def _split_cells(
+        self,
+        words: List[Dict[str, Any]],
+        word_height: float,
+        rulings: List[float]
+    ) -> List[_Cell]:
+        """Merge words of a row into cells unless a wide gap or a ruling separates them"""
+        gap = word_height * self.cell_gap
+        cells: List[_Cell] = []
+
+        for word in sorted(words, key=lambda w: w["x0"]):
+            if cells:
+                last = cells[-1]
+                ruled = any(last.x1 <= x <= word["x0"] for x in rulings)
+                if word["x0"] - last.x1 <= gap and not ruled:
+                    last.text = f"{last.text} {word['text']}"
+                    last.x1 = max(last.x1, word["x1"])
+                    continue
+            cells.append(_Cell(text=word["text"], x0=word["x0"], x1=word["x1"]))
+
+        return cells
+
+    def _header_columns(self, row: _Row, rulings: List[float]) -> Optional[List[_Column]]:
+        """
+        Columns defined by a header row, or None if the row is not a header
+
+        A header needs a quantity column plus a description or item number
+        column, and most of its cells must be recognizable header labels.
+        """
+        labelled = [(cell, self._header_field(cell.text)) for cell in row.cells]
+        fields = [name for _, name in labelled if name]
+
+        if "quantity" not in fields or not ({"description", "item_number"} & set(fields)):
+            return None
+        if len(fields) < max(2, len(row.cells) / 2):
+            return None
+
+        columns = [
+            _Column(
+                field=name or self._extra_field(cell.text),
+                header=cell.text,
+                x0=cell.x0,
+                x1=cell.x1,
+            )
+            for cell, name in labelled
+            if name or len(cell.text) <= _EXTRA_COLUMN_MAX_LENGTH
+        ]
+
+        # Extend each column to the rule (or midpoint) between it and its neighbours
+        for left, right in zip(columns, columns[1:]):
+            between = [x for x in rulings if left.x1 <= x <= right.x0]
+            boundary = between[len(between) // 2] if between else (left.x1 + right.x0) / 2
+            left.x1 = boundary
+            right.x0 = boundary
+
+        return columns
+
+    @staticmethod
+    def _header_field(text: str) -> Optional[str]:
+        """Output field for a header label, or None if it is not a known label"""
+        normalized = re.sub(r"[^A-Z0-9#]+", " ", text.upper()).strip()
+        for name, pattern in _COMPILED_ALIASES:
+            if pattern.match(normalized):
+                return name
+        return None
+
+    @staticmethod
+    def _extra_field(text: str) -> str:
+        """Field name for an unrecognized header (SIZE, TYPE, REMARKS, ...)"""
+        return "extra:" + re.sub(r"\s+", " ", text).strip().title()
+
+    def _read_table(
+        self,
+        rows: List[_Row],
+        start: int,
+        columns: List[_Column],
+        word_height: float
+    ) -> List[Dict[str, Any]]:
+        """
+        Read data rows below a header until the table ends
+
+        Only cells within the table's horizontal extent are read. The table
+        ends at a large vertical gap between its rows or at a new header.
+
+        Returns:
+            Records keyed by column field, each with its "_bbox" as
+            (x0, top, x1, bottom)
+        """
+        left = columns[0].x0 - word_height
+        right = columns[-1].x1 + word_height * 4
+        max_gap = word_height * 3
+
+        records: List[Dict[str, Any]] = []
+        previous_bottom = rows[start - 1].bottom
+
+        for row in rows[start:]:
+            if row.top - previous_bottom > max_gap:
+                break
+
+            cells = [cell for cell in row.cells if cell.x1 >= left and cell.x0 <= right]
+            if not cells:
+                continue
+            if self._header_columns(_Row(row.top, row.bottom, cells), []) is not None:
+                break
+
+            record: Dict[str, Any] = {}
+            for cell in cells:
+                column = self._column_for(cell, columns)
+                record[column.field] = f"{record[column.field]} {cell.text}" if column.field in record else cell.text
+
+            previous_bottom = row.bottom
+            bbox = (min(c.x0 for c in cells), row.top, max(c.x1 for c in cells), row.bottom)
+
+            # A lone description cell right under a record continues its text
+            if records and set(record) == {"description"}:
+                previous = records[-1]
+                previous["description"] = f"{previous.get('description', '')} {record['description']}".strip()
+                x0, top, x1, _ = previous["_bbox"]
+                previous["_bbox"] = (min(x0, bbox[0]), top, max(x1, bbox[2]), row.bottom)
+                continue
+
+            if record.get("description") or record.get("item_number"):
+                record["_bbox"] = bbox
+                records.append(record)
+
+        return records
+
+    @staticmethod
+    def _column_for(cell: _Cell, columns: List[_Column]) -> _Column:
+        """Column overlapping the cell the most (nearest column if none overlaps)"""
+        def overlap(column: _Column) -> float:
+            return min(cell.x1, column.x1) - max(cell.x0, column.x0)
+
+        best = max(columns, key=overlap)
+        if overlap(best) > 0:
+            return best
+
+        center = (cell.x0 + cell.x1) / 2
+        return min(columns, key=lambda c: abs((c.x0 + c.x1) / 2 - center))
+
+    @staticmethod
+    def _split_quantity(record: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        """Quantity and unit of a record, splitting "150 LF" when there is no unit column"""
+        quantity = record.get("quantity")
+        unit = record.get("unit")
+
+        if quantity and not unit:
+            match = _QUANTITY_WITH_UNIT.match(quantity.strip())
+            if match:
+                return match.group(1), match.group(2).upper()
+
+        return quantity, unit
+
+    def _bid_item(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Bid schedule row"""
+        quantity, unit = self._split_quantity(record)
+        return {
+            "item_number": record.get("item_number"),
+            "description": record.get("description"),
+            "quantity": quantity,
+            "unit": unit,
+            "unit_price": record.get("unit_price"),
+        }
+
+    def _material(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Schedule or material list row"""
+        quantity, unit = self._split_quantity(record)
+        extras = [
+            f"{key[len('extra:'):]}: {value}"
+            for key, value in record.items()
+            if key.startswith("extra:")
+        ]
+
+        name = record.get("description")
+        if not name:
+            # Schedules often have no description column: name rows by mark + attributes
+            parts = [record.get("item_number")] + [record[k] for k in record if k.startswith("extra:")]
+            name = " ".join(p for p in parts if p)
+
+        if not name:
+            return None
+
+        return {
+            "name": name,
+            "quantity": quantity,
+            "unit": unit,
+            "category": None,
+            "specification": "; ".join(extras) or None,
+        }
+
+
+# Singleton instance
+table_extractor = TableExtractor()
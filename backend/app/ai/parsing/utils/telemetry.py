@@ -0,0 +1,530 @@
+"""
+Parsing Telemetry
+
+Structured spans for every stage of a parse (analysis, rendering, tiling,
+LLM calls, aggregation, normalization, database save). The current span is
+held in a context variable, so it follows the parse into asyncio tasks and
+into worker threads started with asyncio.to_thread().
+
+Each finished span is:
+- added to the enclosing parse traces, whose breakdown() is attached to
+  ParseResult.metadata["timings"]
+- recorded in the Prometheus metrics served at /metrics
+- passed to registered span exporters (OpenTelemetry when enabled)
+
+LLM calls record bytes sent, tokens in/out, time queued for the LLM budget
+and retries (HTTP requests beyond the first, counted by a client hook).
+"""
+
+import functools
+import inspect
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ..config import load_parsing_config
+
+logger = logging.getLogger(__name__)
+
+try:
+    from opentelemetry import trace as otel_trace
+    OPENTELEMETRY_AVAILABLE = True
+except ImportError:
+    OPENTELEMETRY_AVAILABLE = False
+
+# Span attributes summed per stage in trace breakdowns and metrics
+COUNTER_ATTRIBUTES = (
+    "bytes_sent",
+    "input_tokens",
+    "output_tokens",
+    "http_requests",
+    "retries",
+    "llm_queue_wait_ms",
+    "cpu_queue_wait_ms",
+)
+
+# Histogram buckets (seconds) for stage durations and queue waits
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+_span_ids = itertools.count(1)
+
+
+@dataclass
+class Span:
+    """One timed operation of a parse"""
+    name: str
+    span_id: int
+    parent: Optional["Span"] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    start_time: float = field(default_factory=time.time)
+    duration_ms: Optional[float] = None
+    error: Optional[str] = None
+    # Exporter-specific handles (e.g. the OpenTelemetry span)
+    exporter_state: Dict[str, Any] = field(default_factory=dict, repr=False)
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def set(self, **attributes: Any) -> None:
+        """Set attributes"""
+        with self._lock:
+            self.attributes.update(attributes)
+
+    def add(self, key: str, amount: float = 1) -> None:
+        """Increment a counter attribute (safe from several threads)"""
+        with self._lock:
+            self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent.span_id if self.parent else None,
+            "start_time": self.start_time,
+            "duration_ms": self.duration_ms,
+            "error": self.error,
+            "attributes": dict(self.attributes),
+        }
+
+
+class ParseTrace:
+    """
+    Collects the spans finished while a parse is running
+
+    Traces nest: spans of an inner trace (a strategy run by the selector)
+    are also recorded in the outer one.
+    """
+
+    def __init__(self, name: str, parent: Optional["ParseTrace"] = None):
+        self.name = name
+        self.parent = parent
+        self.spans: List[Span] = []
+        self.duration_ms: Optional[float] = None
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+        if self.parent is not None:
+            self.parent.record(span)
+
+    def breakdown(self) -> Dict[str, Any]:
+        """
+        Per-stage totals of the trace
+
+        Can be called while the trace is still open (total_ms is then the
+        time elapsed so far).
+
+        Returns:
+            Dictionary with total_ms and, per span name, count, total_ms,
+            max_ms and summed counters (bytes, tokens, queue wait, retries)
+        """
+        stages: Dict[str, Dict[str, Any]] = {}
+
+        with self._lock:
+            spans = list(self.spans)
+
+        for span in spans:
+            stage = stages.setdefault(span.name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            duration = span.duration_ms or 0.0
+            stage["count"] += 1
+            stage["total_ms"] += duration
+            stage["max_ms"] = max(stage["max_ms"], duration)
+            if span.error:
+                stage["errors"] = stage.get("errors", 0) + 1
+            for key in COUNTER_ATTRIBUTES:
+                if key in span.attributes:
+                    stage[key] = stage.get(key, 0) + span.attributes[key]
+
+        for stage in stages.values():
+            for key, value in stage.items():
+                if isinstance(value, float):
+                    stage[key] = round(value, 1)
+
+        total_ms = self.duration_ms
+        if total_ms is None:
+            total_ms = (time.perf_counter() - self._start) * 1000
+
+        return {"total_ms": round(total_ms, 1), "stages": stages}
+
+
+class SpanExporter:
+    """
+    Receives spans as they start and end
+
+    Subclass and register with telemetry.add_exporter() to forward spans to
+    a tracing backend.
+    """
+
+    def on_start(self, span: Span) -> None:
+        pass
+
+    def on_end(self, span: Span) -> None:
+        pass
+
+
+class OpenTelemetryExporter(SpanExporter):
+    """
+    Mirrors spans into OpenTelemetry
+
+    Uses the globally configured tracer provider, so spans go wherever the
+    application's OpenTelemetry SDK exports them (OTLP, Jaeger, ...).
+    """
+
+    def __init__(self, tracer_name: str = "dtg.parsing"):
+        self.tracer = otel_trace.get_tracer(tracer_name)
+
+    def on_start(self, span: Span) -> None:
+        parent = span.parent.exporter_state.get("otel") if span.parent else None
+        context = otel_trace.set_span_in_context(parent) if parent is not None else None
+        span.exporter_state["otel"] = self.tracer.start_span(
+            span.name, context=context, start_time=int(span.start_time * 1e9)
+        )
+
+    def on_end(self, span: Span) -> None:
+        otel_span = span.exporter_state.pop("otel", None)
+        if otel_span is None:
+            return
+        for key, value in span.attributes.items():
+            if isinstance(value, (str, bool, int, float)):
+                otel_span.set_attribute(key, value)
+        if span.error:
+            otel_span.set_status(otel_trace.Status(otel_trace.StatusCode.ERROR, span.error))
+        otel_span.end(end_time=int((span.start_time + (span.duration_ms or 0) / 1000) * 1e9))
+
+
+# ---------------------------------------------------------------------------
+# Prometheus metrics
+# ---------------------------------------------------------------------------
+
+class _Metric:
+    """Labelled metric rendered in the Prometheus text format"""
+
+    def __init__(self, name: str, help_text: str, metric_type: str, label_names: Sequence[str]):
+        self.name = name
+        self.help_text = help_text
+        self.metric_type = metric_type
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _labels(self, values: Tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(self.label_names, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.metric_type}"]
+
+
+class Counter(_Metric):
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        super().__init__(name, help_text, "counter", label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        return self.header() + [f"{self.name}{self._labels(k)} {v}" for k, v in sorted(values.items())]
+
+
+class Histogram(_Metric):
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = (), buckets: Sequence[float] = DURATION_BUCKETS):
+        super().__init__(name, help_text, "histogram", label_names)
+        self.buckets = tuple(buckets)
+        # labels -> (bucket counts, sum, count)
+        self._values: Dict[Tuple[str, ...], List[Any]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            entry = self._values.setdefault(labels, [[0] * len(self.buckets), 0.0, 0])
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = {k: (list(v[0]), v[1], v[2]) for k, v in self._values.items()}
+
+        lines = self.header()
+        for labels, (counts, total, count) in sorted(values.items()):
+            for bound, bucket_count in zip(self.buckets, counts):
+                bucket_labels = self._labels(labels, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{bucket_labels} {bucket_count}")
+            inf_labels = self._labels(labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf_labels} {count}")
+            lines.append(f"{self.name}_sum{self._labels(labels)} {round(total, 6)}")
+            lines.append(f"{self.name}_count{self._labels(labels)} {count}")
+        return lines
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class ParsingMetrics:
+    """Prometheus metrics fed by finished spans"""
+
+    def __init__(self):
+        self.stage_duration = Histogram(
+            "parsing_stage_duration_seconds", "Duration of document parsing stages", ["stage"]
+        )
+        self.stage_errors = Counter(
+            "parsing_stage_errors_total", "Parsing stages that raised an exception", ["stage"]
+        )
+        self.llm_tokens = Counter(
+            "parsing_llm_tokens_total", "LLM tokens used by document parsing", ["provider", "direction"]
+        )
+        self.llm_bytes = Counter(
+            "parsing_llm_request_bytes_total", "Request bytes sent to LLM providers", ["provider"]
+        )
+        self.llm_retries = Counter(
+            "parsing_llm_retries_total", "LLM HTTP requests beyond the first per call", ["provider"]
+        )
+        self.queue_wait = Histogram(
+            "parsing_budget_queue_wait_seconds", "Time spent waiting for a resource budget slot", ["budget"]
+        )
+        self._metrics = [
+            self.stage_duration, self.stage_errors, self.llm_tokens,
+            self.llm_bytes, self.llm_retries, self.queue_wait,
+        ]
+
+    def observe_span(self, span: Span) -> None:
+        self.stage_duration.observe((span.duration_ms or 0) / 1000, span.name)
+        if span.error:
+            self.stage_errors.inc(span.name)
+
+        provider = span.attributes.get("provider")
+        if provider:
+            attrs = span.attributes
+            if attrs.get("input_tokens"):
+                self.llm_tokens.inc(provider, "input", amount=attrs["input_tokens"])
+            if attrs.get("output_tokens"):
+                self.llm_tokens.inc(provider, "output", amount=attrs["output_tokens"])
+            if attrs.get("bytes_sent"):
+                self.llm_bytes.inc(provider, amount=attrs["bytes_sent"])
+            if attrs.get("retries"):
+                self.llm_retries.inc(provider, amount=attrs["retries"])
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Telemetry
+# ---------------------------------------------------------------------------
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("parsing_span", default=None)
+_current_trace: ContextVar[Optional[ParseTrace]] = ContextVar("parsing_trace", default=None)
+
+
+class Telemetry:
+    """
+    Span recording, trace collection, metrics and exporters
+    """
+
+    PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.metrics = ParsingMetrics()
+        self.exporters: List[SpanExporter] = []
+
+    def add_exporter(self, exporter: SpanExporter) -> None:
+        """Register a span exporter"""
+        self.exporters.append(exporter)
+
+    def current_span(self) -> Optional[Span]:
+        return _current_span.get()
+
+    def annotate(self, **attributes: Any) -> None:
+        """Set attributes on the current span, if any"""
+        span = _current_span.get()
+        if span is not None:
+            span.set(**attributes)
+
+    def add(self, key: str, amount: float = 1) -> None:
+        """Increment a counter attribute of the current span, if any"""
+        span = _current_span.get()
+        if span is not None:
+            span.add(key, amount)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """
+        Time a block as a span
+
+        Args:
+            name: Stage name (e.g. "image.render")
+            **attributes: Initial span attributes
+
+        Yields:
+            The span (None when telemetry is disabled)
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        span = Span(name=name, span_id=next(_span_ids), parent=_current_span.get(), attributes=attributes)
+        self._notify("on_start", span)
+        token = _current_span.set(span)
+
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            self._finish(span)
+
+    @contextmanager
+    def trace(self, name: str, **attributes: Any) -> Iterator[ParseTrace]:
+        """
+        Collect the spans of a parse
+
+        Args:
+            name: Root span name (e.g. "parse")
+            **attributes: Root span attributes
+
+        Yields:
+            ParseTrace whose breakdown() summarizes the parse
+        """
+        parse_trace = ParseTrace(name, parent=_current_trace.get())
+        token = _current_trace.set(parse_trace)
+
+        try:
+            with self.span(name, **attributes):
+                yield parse_trace
+        finally:
+            parse_trace.duration_ms = (time.perf_counter() - parse_trace._start) * 1000
+            _current_trace.reset(token)
+
+    def traced(self, name: str) -> Callable:
+        """
+        Decorator recording each call of a function (sync or async) as a span
+
+        Args:
+            name: Stage name
+        """
+        def decorator(func: Callable) -> Callable:
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                    with self.span(name):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+
+        return decorator
+
+    def record_queue_wait(self, budget: str, seconds: float) -> None:
+        """Record time spent waiting for a resource budget slot"""
+        if not self.enabled:
+            return
+        self.metrics.queue_wait.observe(seconds, budget)
+        self.add(f"{budget}_queue_wait_ms", round(seconds * 1000, 1))
+
+    def record_llm_usage(self, span: Optional[Span], response: Any) -> None:
+        """
+        Record token usage of a Claude message or OpenAI completion
+
+        Args:
+            span: LLM call span
+            response: Provider response with a usage attribute
+        """
+        usage = getattr(response, "usage", None)
+        if span is None or usage is None:
+            return
+
+        input_tokens = getattr(usage, "input_tokens", None) or getattr(usage, "prompt_tokens", None) or 0
+        output_tokens = getattr(usage, "output_tokens", None) or getattr(usage, "completion_tokens", None) or 0
+        span.add("input_tokens", input_tokens)
+        span.add("output_tokens", output_tokens)
+
+        cache_read = getattr(usage, "cache_read_input_tokens", None)
+        if cache_read:
+            span.add("cache_read_tokens", cache_read)
+
+    def instrument_client(self, client: Any) -> Any:
+        """
+        Count HTTP requests and request bytes of an Anthropic/OpenAI client
+
+        The hook runs in the thread sending the request, so it is attributed
+        to the LLM call span that issued it; requests beyond the first of a
+        call are SDK retries.
+
+        Args:
+            client: anthropic.Anthropic or openai.OpenAI instance
+
+        Returns:
+            The same client
+        """
+        http_client = getattr(client, "_client", None)
+        if http_client is None or not hasattr(http_client, "event_hooks"):
+            return client
+
+        hooks = dict(http_client.event_hooks)
+        hooks["request"] = list(hooks.get("request", [])) + [self._on_http_request]
+        http_client.event_hooks = hooks
+        return client
+
+    def _on_http_request(self, request: Any) -> None:
+        span = _current_span.get()
+        if span is None:
+            return
+        span.add("http_requests")
+        content = getattr(request, "content", None)
+        if content:
+            span.add("bytes_sent", len(content))
+
+    def _finish(self, span: Span) -> None:
+        span.duration_ms = round((time.perf_counter() - span._start) * 1000, 2)
+        if span.attributes.get("http_requests", 0) > 1:
+            span.set(retries=span.attributes["http_requests"] - 1)
+
+        parse_trace = _current_trace.get()
+        if parse_trace is not None:
+            parse_trace.record(span)
+
+        self.metrics.observe_span(span)
+        self._notify("on_end", span)
+
+    def _notify(self, event: str, span: Span) -> None:
+        for exporter in self.exporters:
+            try:
+                getattr(exporter, event)(span)
+            except Exception as e:
+                logger.debug(f"Span exporter {type(exporter).__name__} failed: {e}")
+
+
+_config = load_parsing_config()
+
+# Singleton instance
+telemetry = Telemetry(enabled=_config.enable_telemetry)
+
+if _config.enable_opentelemetry:
+    if OPENTELEMETRY_AVAILABLE:
+        telemetry.add_exporter(OpenTelemetryExporter())
+    else:
+        logger.warning("ENABLE_OPENTELEMETRY is set but opentelemetry-api is not installed")
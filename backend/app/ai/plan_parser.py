@@ -1,16 +1,35 @@
+import asyncio
 import logging
 import os
+from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Optional
-import json
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.ai.config import anthropic_client, openai_client, is_ai_available
 from app.ai.ocr_service import ocr_service
 from app.ai.parsing.config import load_parsing_config, get_strategy_config
 from app.ai.parsing.strategy_selector import StrategySelector
+from app.ai.parsing.strategies.pdf_table_strategy import PDFTableStrategy
+from app.ai.parsing.prompts import STINE_TAKEOFF_INSTRUCTION, STINE_TAKEOFF_PROMPT, cached_system_prompt
+from app.ai.parsing.schema import PlanExtraction
+from app.ai.parsing.structured_output import (
+    PLAN_EXTRACTION_TOOL,
+    message_output_text,
+    parse_json_response,
+    tool_request_kwargs,
+)
+from app.ai.parsing.utils.concurrency import cpu_budget, llm_budget
+from app.ai.parsing.utils import pdf_pages
+from app.ai.parsing.utils.incremental_json import IncrementalItemParser
+from app.ai.parsing.utils.progress import ProgressCallback, emit_items, emit_progress
+from app.ai.parsing.utils.response_cache import response_cache
+from app.ai.parsing.utils.telemetry import telemetry
 
 logger = logging.getLogger(__name__)
 
+# Page images sent to Claude in one legacy vision request
+MAX_CLAUDE_PAGES = 5
+
 
 class PlanParser:
     """
@@ -27,15 +46,19 @@ class PlanParser:
             parsing_config = load_parsing_config()
             config_dict = get_strategy_config(parsing_config)
             self.strategy_selector = StrategySelector(config_dict)
+            self.table_strategy = PDFTableStrategy(config_dict)
             logger.info("Multi-strategy parsing system initialized")
         except Exception as e:
             logger.warning(f"Failed to initialize multi-strategy system: {e}")
             self.strategy_selector = None
+            self.table_strategy = None
 
     async def parse_plan_with_claude(
         self,
         pdf_path: Path,
-        max_pages: int = 5
+        max_pages: int = 5,
+        progress_callback: Optional[ProgressCallback] = None,
+        pages: Optional[List[int]] = None
     ) -> Dict:
         """
         Parse construction plan using Claude Vision API (legacy method)
@@ -43,9 +66,14 @@ class PlanParser:
         Note: Uses whatever model is set in CLAUDE_MODEL env var
         Default: claude-sonnet-4-5-20250929
 
+        When a progress callback is given the response is streamed and each
+        extracted item is emitted as soon as its JSON object is complete.
+
         Args:
             pdf_path: Path to PDF plan
             max_pages: Maximum pages to analyze
+            progress_callback: Optional callback receiving stage and partial-item events
+            pages: Specific 1-based page numbers to analyze (overrides max_pages)
 
         Returns:
             Dictionary with extracted data
@@ -68,9 +96,24 @@ class PlanParser:
             logger.info("[CLAUDE PARSE] Step 1: Converting PDF pages to images...")
             images = []
             total_size_mb = 0
-            for page_num in range(1, min(max_pages + 1, 6)):
+            if pages is not None:
+                requested = list(pages)
+            else:
+                last_page = max_pages
+                if max_pages > MAX_CLAUDE_PAGES:
+                    last_page = min(max_pages, await cpu_budget.run(pdf_pages.page_count, pdf_path))
+                requested = list(range(1, last_page + 1))
+            page_numbers = requested[:MAX_CLAUDE_PAGES]
+            skipped_pages = requested[MAX_CLAUDE_PAGES:]
+            if skipped_pages:
+                logger.warning(
+                    f"[CLAUDE PARSE]   Only {MAX_CLAUDE_PAGES} pages fit one request; "
+                    f"pages {skipped_pages} are not analyzed"
+                )
+            for page_num in page_numbers:
                 logger.info(f"[CLAUDE PARSE]   Converting page {page_num}...")
-                img_base64 = ocr_service.pdf_page_to_base64(pdf_path, page_num)
+                emit_progress(progress_callback, "stage", stage="rendering", page=page_num)
+                img_base64 = await cpu_budget.run(ocr_service.pdf_page_to_base64, pdf_path, page_num)
                 if img_base64:
                     images.append(img_base64)
                     img_size_mb = len(img_base64) * 3 / 4 / 1024 / 1024
@@ -88,86 +131,9 @@ class PlanParser:
 
             logger.info(f"[CLAUDE PARSE] Step 1 Complete: {len(images)} pages, total payload: {total_size_mb:.2f}MB")
 
-            # Create prompt for Claude - optimized for lumber yard material takeoffs
-            # Uses EXACT Stine catalog naming conventions for accurate matching
-            prompt = """
-You are a lumber yard estimator analyzing construction plan documents for STINE Home + Yard.
-Extract a COMPLETE material takeoff using STINE's EXACT product naming format.
-
-CRITICAL NAMING FORMAT - Use these EXACT patterns:
-LUMBER (use "Pine #2" prefix):
-- "Pine #2 (2x4-8 Nominal)" for 2x4 8-foot boards
-- "Pine #2 (2x4-10 Nominal)" for 2x4 10-foot boards  
-- "Pine #2 (2x4-12 Nominal)" for 2x4 12-foot boards
-- "Pine #2 (2x4-14 Nominal)" for 2x4 14-foot boards
-- "Pine #2 (2x4-16 Nominal)" for 2x4 16-foot boards
-- "Pine #2 (2x6-8 Nominal)" through "Pine #2 (2x6-20 Nominal)"
-- "Pine #2 (2x8-10 Nominal)" through "Pine #2 (2x8-16 Nominal)"
-- "Pine #2 (2x10-12 Nominal)" through "Pine #2 (2x10-16 Nominal)"
-- "Pine #2 (2x12-14 Nominal)" for headers/beams
-
-STUDS (use "Stud-" prefix):
-- "Stud- Spruce Pine Fir (2x4-116-5/8 Nominal)" for 9-foot studs
-- "Stud- Spruce, Pine, Fir (2x4-140-5/8 Nominal)" for 11-foot studs
-- "Stud Spruce (2x6-116-5/8 Nominal)" for 2x6 studs
-
-TREATED LUMBER:
-- "Pine #2 PRIME TREATED (2x4-14 Nominal)" for treated plates
-- "Pine #2 PRIME TREATED (2x6-14 Nominal)" for treated sills
-
-SHEATHING:
-- "OSB 7/16\" Rated Sheathing (48x96x7/16)" for wall sheathing
-- "OSB 7/16\" Radiant Barrier (48x96x7/16)" for roof sheathing
-- "OSB 10' Wind (48x121-1/8x7/16)" for 10-foot panels
-
-ROOFING:
-- "Roof Tamko Hert Wthrwd" for shingles (unit: BDL)
-- "Stine ProFelt Plus Synthetic Felt" for underlayment (unit: RL)
-- "Drip Edge 26ga" for drip edge
-- "Vent Ridge Shngle Over" for ridge vent
-
-SIDING:
-- "Hardie Lap Siding 6 1/4 Smooth" for lap siding
-- "Hardie Trim 4/4x3.5x12 Smooth" for trim
-- "Hardie Soffit Vented 16x12 Smooth" for vented soffit
-- "Hardie Soffit Non-Vented 16x12 Smooth" for solid soffit
-
-HARDWARE:
-- "Simpson 18 Ga. Galvanized Steel Hurricane Tie H2.5A" for hurricane ties
-- "Simpson ZMax LUS26Z Joist Hanger" for joist hangers
-- "Anchor Bolt HDG 5/8 10\"" for anchor bolts
-
-INSULATION:
-- "Insul R-13 125.94 SqFt 3-1/2x15" for R-13
-- "Insul R-30 58.67 Sq' 9.25x16" for R-30
-
-DRYWALL:
-- "Gypsum 4'x12'x1/2\" Reg" for regular drywall
-- "Gypsum 4'X8'X1/2\" Mold/Moist Resistant Purple" for moisture resistant
-
-Return ONLY valid JSON:
-{
-  "project_info": {"name": "", "lot_number": "", "builder": ""},
-  "materials": [
-    {"name": "Pine #2 (2x4-14 Nominal)", "quantity": 80, "unit": "ea", "category": "Walls"},
-    {"name": "Stud- Spruce Pine Fir (2x4-116-5/8 Nominal)", "quantity": 220, "unit": "ea", "category": "Walls"},
-    {"name": "OSB 7/16\" Radiant Barrier (48x96x7/16)", "quantity": 100, "unit": "ea", "category": "Sheathing"},
-    {"name": "Simpson 18 Ga. Galvanized Steel Hurricane Tie H2.5A", "quantity": 160, "unit": "ea", "category": "Hardware"}
-  ],
-  "bid_items": [],
-  "specifications": []
-}
-
-Extract ALL materials with quantities. A typical house has 50-150 line items.
-"""
-
-            # Build content with multiple images
-            content = [
-                {
-                    "type": "text",
-                    "text": prompt
-                }
-            ]
+            # Build content with multiple images. The Stine naming prompt is a
+            # stable cached system prefix; only the images change per call
+            content = []
 
             for img_base64 in images:
                 content.append({
@@ -179,74 +145,55 @@ Extract ALL materials with quantities. A typical house has 50-150 line items.
                     }
                 })
 
+            content.append({"type": "text", "text": STINE_TAKEOFF_INSTRUCTION})
+
             # Call Claude API - use model from env var or default
             claude_model = os.getenv("CLAUDE_MODEL", "claude-sonnet-4-5-20250929")
             logger.info(f"[CLAUDE PARSE] Step 2: Calling Claude API")
             logger.info(f"[CLAUDE PARSE]   Model: {claude_model}")
             logger.info(f"[CLAUDE PARSE]   Images: {len(images)}")
-            logger.info(f"[CLAUDE PARSE]   Prompt length: {len(prompt)} chars")
-
-            # Add retry logic for connection errors
-            max_retries = 3
-            retry_count = 0
-            last_error = None
-
-            while retry_count < max_retries:
-                try:
-                    logger.info(f"[CLAUDE PARSE]   Sending request (attempt {retry_count + 1}/{max_retries})...")
-                    message = self.anthropic.messages.create(
-                        model=claude_model,
-                        max_tokens=4096,
-                        messages=[{
-                            "role": "user",
-                            "content": content
-                        }],
-                        timeout=120.0  # 2 minute timeout
-                    )
-                    logger.info(f"[CLAUDE PARSE]   API call successful!")
-                    break  # Success, exit retry loop
+            logger.info(f"[CLAUDE PARSE]   Prompt length: {len(STINE_TAKEOFF_PROMPT)} chars (cached prefix)")
+
+            request_kwargs = {
+                "model": claude_model,
+                "max_tokens": 4096,
+                "system": cached_system_prompt(STINE_TAKEOFF_PROMPT),
+                "messages": [{
+                    "role": "user",
+                    "content": content
+                }],
+                "timeout": 120.0,  # 2 minute timeout
+                # Claude answers through a tool so output always follows the schema
+                **tool_request_kwargs(PLAN_EXTRACTION_TOOL),
+            }
 
-                except Exception as api_error:
-                    last_error = api_error
-                    retry_count += 1
-                    error_msg = str(api_error)
-                    logger.error(f"[CLAUDE PARSE]   API Error: {error_msg}")
+            cache_key = response_cache.make_key("stine_takeoff", claude_model, *images)
+            response_text = response_cache.get(cache_key)
+            from_cache = response_text is not None
 
-                    if "Connection" in error_msg or "connection" in error_msg:
-                        if retry_count < max_retries:
-                            logger.warning(f"[CLAUDE PARSE]   Connection error, retrying in 2 seconds...")
-                            import time
-                            time.sleep(2)
-                        else:
-                            logger.error(f"[CLAUDE PARSE] FAILED: Connection failed after {max_retries} attempts")
-                            raise Exception(f"Failed to connect to Claude API after {max_retries} attempts. Check your internet connection.")
-                    else:
-                        # Non-connection error, don't retry
-                        raise
+            if from_cache:
+                logger.info("[CLAUDE PARSE]   Identical pages were parsed before, using cached response")
+            else:
+                message = await self._create_claude_message(request_kwargs, progress_callback)
+                response_text = message_output_text(message, PLAN_EXTRACTION_TOOL["name"])
 
-            # Extract response text
-            response_text = message.content[0].text
             logger.info(f"[CLAUDE PARSE] Step 3: Processing response")
             logger.info(f"[CLAUDE PARSE]   Response length: {len(response_text)} chars")
             logger.info(f"[CLAUDE PARSE]   Response preview: {response_text[:500]}...")
 
-            # Try to parse JSON
-            try:
-                parsed_data = json.loads(response_text)
-                logger.info(f"[CLAUDE PARSE]   JSON parsed directly")
-            except json.JSONDecodeError:
-                logger.info(f"[CLAUDE PARSE]   Direct JSON parse failed, looking for code blocks...")
-                # If not valid JSON, try to extract JSON from markdown code blocks
-                if "```json" in response_text:
-                    json_start = response_text.find("```json") + 7
-                    json_end = response_text.find("```", json_start)
-                    json_str = response_text[json_start:json_end].strip()
-                    parsed_data = json.loads(json_str)
-                    logger.info(f"[CLAUDE PARSE]   JSON extracted from code block")
-                else:
-                    logger.error(f"[CLAUDE PARSE] ERROR: Could not parse JSON from response")
-                    logger.error(f"[CLAUDE PARSE] Full response: {response_text}")
-                    raise ValueError("Could not parse JSON from response")
+            # Parse and validate against the shared extraction schema; complete
+            # items are salvaged if the response was truncated
+            parsed_data = parse_json_response(response_text, PlanExtraction)
+            if parsed_data is None:
+                logger.error(f"[CLAUDE PARSE] ERROR: Could not parse JSON from response")
+                logger.error(f"[CLAUDE PARSE] Full response: {response_text}")
+                raise ValueError("Could not parse JSON from response")
+
+            if from_cache:
+                emit_items(progress_callback, parsed_data, source="cache")
+            elif message.stop_reason != "max_tokens":
+                # Truncated responses are not memoized so the next parse retries them
+                response_cache.set(cache_key, response_text)
 
             # Log extraction results
             bid_items = parsed_data.get("bid_items", [])
@@ -272,11 +219,14 @@ Extract ALL materials with quantities. A typical house has 50-150 line items.
             logger.info(f"[CLAUDE PARSE]   Project Info: {project_info}")
             logger.info("=" * 60)
 
-            return {
+            result = {
                 "success": True,
                 "data": parsed_data,
                 "pages_analyzed": len(images)
             }
+            if skipped_pages:
+                result["pages_skipped"] = skipped_pages
+            return result
 
         except Exception as e:
             error_type = type(e).__name__
@@ -305,10 +255,114 @@ Extract ALL materials with quantities. A typical house has 50-150 line items.
                 "technical_error": f"{error_type}: {error_msg}"
             }
 
+    async def _create_claude_message(
+        self,
+        request_kwargs: Dict[str, Any],
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> Any:
+        """
+        Send the takeoff request to Claude, retrying connection errors
+
+        Args:
+            request_kwargs: Arguments for messages.create()
+            progress_callback: Optional callback; when given the response is streamed
+
+        Returns:
+            Claude message
+        """
+        # Add retry logic for connection errors
+        max_retries = 3
+        retry_count = 0
+        last_error = None
+
+        model = request_kwargs.get("model")
+        with telemetry.span("llm.call", provider="anthropic", model=model, prompt="stine_takeoff") as span:
+            while retry_count < max_retries:
+                try:
+                    logger.info(f"[CLAUDE PARSE]   Sending request (attempt {retry_count + 1}/{max_retries})...")
+                    emit_progress(
+                        progress_callback, "stage",
+                        stage="extracting", attempt=retry_count + 1,
+                        # Items streamed by a failed attempt must be discarded by the client
+                        reset=retry_count > 0,
+                    )
+                    if progress_callback:
+                        message = await llm_budget.run(
+                            self._stream_claude_message, request_kwargs, progress_callback
+                        )
+                    else:
+                        message = await llm_budget.run(self.anthropic.messages.create, **request_kwargs)
+                    telemetry.record_llm_usage(span, message)
+                    logger.info(f"[CLAUDE PARSE]   API call successful!")
+                    break  # Success, exit retry loop
+
+                except Exception as api_error:
+                    last_error = api_error
+                    retry_count += 1
+                    error_msg = str(api_error)
+                    logger.error(f"[CLAUDE PARSE]   API Error: {error_msg}")
+
+                    if "Connection" in error_msg or "connection" in error_msg:
+                        if retry_count < max_retries:
+                            logger.warning(f"[CLAUDE PARSE]   Connection error, retrying in 2 seconds...")
+                            await asyncio.sleep(2)
+                        else:
+                            logger.error(f"[CLAUDE PARSE] FAILED: Connection failed after {max_retries} attempts")
+                            raise Exception(f"Failed to connect to Claude API after {max_retries} attempts. Check your internet connection.")
+                    else:
+                        # Non-connection error, don't retry
+                        raise
+
+        return message
+
+    def _stream_claude_message(
+        self,
+        request_kwargs: Dict[str, Any],
+        progress_callback: ProgressCallback
+    ) -> Any:
+        """
+        Run a streaming Claude request, emitting items as their JSON objects complete
+
+        Blocking; intended to run in a worker thread.
+
+        Args:
+            request_kwargs: Arguments for messages.stream()
+            progress_callback: Callback receiving partial-item events
+
+        Returns:
+            Final Claude message (same shape as messages.create())
+        """
+        item_parser = IncrementalItemParser()
+
+        with self.anthropic.messages.stream(**request_kwargs) as stream:
+            for event in stream:
+                if event.type != "content_block_delta":
+                    continue
+
+                # Tool use streams its input as JSON fragments; plain text
+                # responses stream text deltas. Both carry the same document.
+                if event.delta.type == "input_json_delta":
+                    completed = item_parser.feed(event.delta.partial_json)
+                elif event.delta.type == "text_delta":
+                    completed = item_parser.feed(event.delta.text)
+                else:
+                    continue
+
+                if not completed:
+                    continue
+
+                partial = defaultdict(list)
+                for key, item in completed:
+                    partial[key].append(item)
+                emit_items(progress_callback, partial, source="claude")
+
+            return stream.get_final_message()
+
     async def parse_plan_with_ocr(
         self,
         pdf_path: Path,
-        max_pages: int = 5
+        max_pages: int = 5,
+        pages: Optional[List[int]] = None
     ) -> Dict:
         """
         Fallback: Extract text using OCR and basic parsing
@@ -316,12 +370,13 @@ Extract ALL materials with quantities. A typical house has 50-150 line items.
         Args:
             pdf_path: Path to PDF plan
             max_pages: Maximum pages to process
+            pages: Specific 1-based page numbers to process (overrides max_pages)
 
         Returns:
             Dictionary with extracted text
         """
         try:
-            page_texts = ocr_service.extract_text_from_pdf(pdf_path, max_pages)
+            page_texts = await cpu_budget.run(ocr_service.extract_text_from_pdf, pdf_path, max_pages, pages)
 
             if not page_texts:
                 return {
@@ -349,7 +404,9 @@ Extract ALL materials with quantities. A typical house has 50-150 line items.
         self,
         pdf_path: Path,
         max_pages: int = 5,
-        use_ai: bool = True
+        use_ai: bool = True,
+        progress_callback: Optional[ProgressCallback] = None,
+        pages: Optional[List[int]] = None
     ) -> Dict:
         """
         Parse construction plan using best available method
@@ -358,25 +415,146 @@ Extract ALL materials with quantities. A typical house has 50-150 line items.
             pdf_path: Path to PDF plan
             max_pages: Maximum pages to analyze
             use_ai: Whether to use AI (Claude) if available
+            progress_callback: Optional callback receiving stage and partial-item events
+            pages: Specific 1-based page numbers to analyze (overrides max_pages)
 
         Returns:
-            Dictionary with parsed data
+            Dictionary with parsed data and the per-stage breakdown of the
+            parse under "timings"
         """
+        with telemetry.trace("parse", document=Path(pdf_path).name, max_pages=max_pages) as parse_trace:
+            result = await self._parse_plan(pdf_path, max_pages, use_ai, progress_callback, pages)
+
+        result["timings"] = parse_trace.breakdown()
+        return result
+
+    async def _parse_plan(
+        self,
+        pdf_path: Path,
+        max_pages: int,
+        use_ai: bool,
+        progress_callback: Optional[ProgressCallback] = None,
+        pages: Optional[List[int]] = None
+    ) -> Dict:
+        """Native-text tables, then Claude for the remaining pages, then OCR"""
         # TEMPORARILY DISABLED: Multi-strategy tiling has extraction issues
         # Using proven legacy Claude method that works reliably
 
+        # Native-text tables first: schedules and bid tabs in vector PDFs are
+        # read locally, and only pages without tables (or with drawing content
+        # beside them) go to vision
+        table_data, page_count, vision_pages = await self._parse_native_tables(
+            pdf_path, max_pages, progress_callback, pages
+        )
+        if vision_pages is None:
+            vision_pages = pages
+        if table_data is not None and not vision_pages:
+            return {
+                "success": True,
+                "data": table_data,
+                "pages_analyzed": page_count,
+                "method": "pdf_table"
+            }
+
         ai_status = is_ai_available()
 
         # Try Claude first if available and requested
         if use_ai and ai_status["claude"]:
             logger.info("Parsing plan with Claude Vision (proven method)")
-            result = await self.parse_plan_with_claude(pdf_path, max_pages)
+            result = await self.parse_plan_with_claude(
+                pdf_path, max_pages, progress_callback, pages=vision_pages
+            )
             if result["success"]:
+                if table_data is not None:
+                    self._merge_table_items(table_data, result["data"])
+                    result["pages_analyzed"] += page_count - len(vision_pages)
+                    result["method"] = "pdf_table+claude"
                 return result
 
+        # Items read from tables beat raw OCR text for the remaining pages
+        if table_data is not None:
+            logger.info("Vision parsing unavailable, returning native-text tables only")
+            return {
+                "success": True,
+                "data": table_data,
+                "pages_analyzed": page_count - len(vision_pages),
+                "method": "pdf_table"
+            }
+
         # Fallback to OCR
         logger.info("Falling back to OCR parsing")
-        return await self.parse_plan_with_ocr(pdf_path, max_pages)
+        emit_progress(progress_callback, "stage", stage="ocr", reset=True)
+        return await self.parse_plan_with_ocr(pdf_path, max_pages, pages=vision_pages)
+
+    @staticmethod
+    def _merge_table_items(table_data: Dict[str, Any], data: Dict[str, Any]) -> None:
+        """
+        Put table items ahead of vision items, dropping vision duplicates
+
+        Table pages with drawing content are also read by vision, which
+        returns their schedule rows again; the text-layer reading wins.
+        """
+        def material_key(item: Dict[str, Any]) -> Tuple[str, str]:
+            return (
+                " ".join(str(item.get("name") or "").lower().split()),
+                str(item.get("unit") or "").lower(),
+            )
+
+        def bid_item_key(item: Dict[str, Any]) -> str:
+            return " ".join(str(item.get("item_number") or item.get("description") or "").lower().split())
+
+        for key, key_func in (("bid_items", bid_item_key), ("materials", material_key)):
+            seen = {key_func(item) for item in table_data[key]}
+            data[key] = table_data[key] + [
+                item for item in data.get(key, []) or [] if key_func(item) not in seen
+            ]
+
+    async def _parse_native_tables(
+        self,
+        pdf_path: Path,
+        max_pages: int,
+        progress_callback: Optional[ProgressCallback] = None,
+        pages: Optional[List[int]] = None
+    ) -> Tuple[Optional[Dict[str, Any]], int, Optional[List[int]]]:
+        """
+        Read tables from the PDF text layer before any page is rasterized
+
+        Args:
+            pdf_path: Path to PDF plan
+            max_pages: Maximum pages to analyze
+            progress_callback: Optional callback receiving stage and partial-item events
+            pages: Specific 1-based page numbers to analyze (overrides max_pages)
+
+        Returns:
+            Tuple of (table data or None if no page has a table, pages scanned,
+            pages that still need vision or None)
+        """
+        if self.table_strategy is None or not self.table_strategy.is_available():
+            return None, 0, None
+
+        try:
+            emit_progress(progress_callback, "stage", stage="table_extraction")
+            page_tables = await self.table_strategy.extract_pages(pdf_path, max_pages, pages)
+        except Exception as e:
+            logger.warning(f"Native-text table extraction failed, using vision: {e}")
+            return None, 0, None
+
+        structured = [page for page in page_tables if page.has_structure]
+        if not structured:
+            return None, len(page_tables), None
+
+        table_data = self.table_strategy.combine(structured)
+        emit_items(progress_callback, table_data, source="pdf_table")
+
+        # Table pages with drawing content beside their tables go to vision too
+        vision_pages = [page.page_number for page in page_tables if self.table_strategy.needs_vision(page)]
+        logger.info(
+            f"Native-text tables on {len(structured)}/{len(page_tables)} pages: "
+            f"{len(table_data['bid_items'])} bid items, {len(table_data['materials'])} materials; "
+            f"{len(vision_pages)} pages left for vision"
+        )
+
+        return table_data, len(page_tables), vision_pages
 
 
 # Singleton instance
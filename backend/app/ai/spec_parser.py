@@ -8,7 +8,6 @@ Different from plan parsing:
 - Specs: Text extraction + LLM (dense text, hierarchical structure)
 """
 
-import json
 import logging
 import os
 import time
@@ -16,6 +15,15 @@ from pathlib import Path
 from typing import Dict, Any, Optional
 
 from app.ai.config import anthropic_client, openai_client, is_ai_available
+from app.ai.parsing.schema import SpecificationExtraction
+from app.ai.parsing.structured_output import (
+    OPENAI_JSON_MODE,
+    SPECIFICATION_TOOL,
+    message_output_text,
+    parse_json_response,
+    tool_request_kwargs,
+)
+from app.ai.parsing.utils.concurrency import cpu_budget, llm_budget
 from app.ai.parsing.utils.text_extraction import text_extractor
 
 logger = logging.getLogger(__name__)
@@ -53,8 +61,8 @@ class SpecificationParser:
 
         try:
             # Step 1: Extract text from PDF
-            page_texts, extraction_method = self.text_extractor.extract_text(
-                pdf_path, max_pages=max_pages
+            page_texts, extraction_method = await cpu_budget.run(
+                self.text_extractor.extract_text, pdf_path, max_pages=max_pages
             )
 
             if not page_texts:
@@ -261,20 +269,22 @@ Return ONLY the JSON, no other text."""
         try:
             claude_model = os.getenv("CLAUDE_MODEL", "claude-sonnet-4-5-20250929")
 
-            message = self.anthropic.messages.create(
+            message = await llm_budget.run(
+                self.anthropic.messages.create,
                 model=claude_model,
                 max_tokens=16000,
                 temperature=0.0,
                 messages=[{
                     "role": "user",
                     "content": prompt
-                }]
+                }],
+                **tool_request_kwargs(SPECIFICATION_TOOL)
             )
 
-            response_text = message.content[0].text
+            response_text = message_output_text(message, SPECIFICATION_TOOL["name"])
 
-            # Parse JSON response
-            return self._parse_json_response(response_text)
+            # Parse and validate against the specification schema
+            return parse_json_response(response_text, SpecificationExtraction)
 
         except Exception as e:
             logger.error(f"Claude structuring failed: {e}")
@@ -285,7 +295,8 @@ Return ONLY the JSON, no other text."""
         try:
             openai_model = os.getenv("OPENAI_MODEL", "gpt-4o")
 
-            response = self.openai.chat.completions.create(
+            response = await llm_budget.run(
+                self.openai.chat.completions.create,
                 model=openai_model,
                 messages=[{
                     "role": "user",
@@ -293,46 +304,18 @@ Return ONLY the JSON, no other text."""
                 }],
                 max_tokens=16000,
                 temperature=0.0,
+                response_format=OPENAI_JSON_MODE,
             )
 
             response_text = response.choices[0].message.content
 
-            # Parse JSON response
-            return self._parse_json_response(response_text)
+            # Parse and validate against the specification schema
+            return parse_json_response(response_text, SpecificationExtraction)
 
         except Exception as e:
             logger.error(f"OpenAI structuring failed: {e}")
             return None
 
-    def _parse_json_response(self, text: str) -> Optional[Dict[str, Any]]:
-        """Parse JSON from LLM response, handling markdown code blocks"""
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            # Try extracting from markdown
-            if "```json" in text:
-                json_start = text.find("```json") + 7
-                json_end = text.find("```", json_start)
-                if json_end > json_start:
-                    json_str = text[json_start:json_end].strip()
-                    try:
-                        return json.loads(json_str)
-                    except json.JSONDecodeError:
-                        pass
-            elif "```" in text:
-                # Try generic code block
-                json_start = text.find("```") + 3
-                json_end = text.find("```", json_start)
-                if json_end > json_start:
-                    json_str = text[json_start:json_end].strip()
-                    try:
-                        return json.loads(json_str)
-                    except json.JSONDecodeError:
-                        pass
-
-            logger.warning("Could not parse JSON from LLM response")
-            return None
-
 
 # Singleton instance
 spec_parser = SpecificationParser()
@@ -1,14 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import json
 import logging
 
-from app.core.database import get_db
+from app.core.database import get_db, SessionLocal
 from app.core.dependencies import get_current_user
 from app.models.user import User
 from app.models.project import Project, ProjectDocument
-from app.models.estimation import TakeoffItem
 from app.services.file_storage import file_storage
+from app.services.takeoff_persistence import takeoff_persistence
+from app.services.addendum_delta import PLAN_DOC_TYPES, addendum_delta
 from app.ai.config import is_ai_available
+from app.ai.batch_parser import BatchDocument, batch_parser
 from app.ai.plan_parser import plan_parser
 from app.ai.spec_parser import spec_parser
 from app.ai.ocr_service import ocr_service
@@ -20,41 +27,23 @@ from app.api.v1.schemas.ai import (
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Document types the plan parser accepts
+PARSEABLE_DOC_TYPES = ["plan", "spec", "plan_and_spec", "addendum"]
 
-@router.get("/status", response_model=ParseStatusResponse)
-async def get_ai_status(current_user: User = Depends(get_current_user)):
-    """
-    Check status of AI services
-    """
-    ai_status = is_ai_available()
-
-    return {
-        "claude_available": ai_status["claude"],
-        "openai_available": ai_status["openai"],
-        "ocr_available": ocr_service.tesseract_available,
-        "message": "AI services configured" if ai_status["any"] else "No AI services configured. Add API keys to .env file."
-    }
+# Response headers that keep proxies from buffering progress events
+STREAM_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
 
 
-@router.post("/projects/{project_id}/documents/{document_id}/parse", response_model=ParsePlanResponse)
-async def parse_plan_document(
+def _load_parseable_document(
+    db: Session,
     project_id: str,
     document_id: str,
-    max_pages: int = 5,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Parse a plan document using AI vision models
-
-    This endpoint analyzes construction plans and extracts:
-    - Bid items with quantities and units
-    - Specifications and material requirements
-    - Project information
-
-    **max_pages**: Number of pages to analyze (1-10, default: 5)
-    """
-    # Verify project ownership
+    current_user: User
+) -> Tuple[ProjectDocument, Path]:
+    """Verify project ownership and return the document with its file path"""
     project = db.query(Project).filter(
         Project.id == project_id,
         Project.company_id == current_user.company_id
@@ -66,7 +55,6 @@ async def parse_plan_document(
             detail="Project not found"
         )
 
-    # Get document
     document = db.query(ProjectDocument).filter(
         ProjectDocument.id == document_id,
         ProjectDocument.project_id == project_id
@@ -78,15 +66,12 @@ async def parse_plan_document(
             detail="Document not found"
         )
 
-    # Allow parsing of plan, spec, plan_and_spec, and addendum documents
-    allowed_types = ["plan", "spec", "plan_and_spec", "addendum"]
-    if document.doc_type not in allowed_types:
+    if document.doc_type not in PARSEABLE_DOC_TYPES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Can only parse documents of type: {', '.join(allowed_types)}"
+            detail=f"Can only parse documents of type: {', '.join(PARSEABLE_DOC_TYPES)}"
         )
 
-    # Get file path
     file_path = file_storage.get_file_path(document.file_path)
 
     if not file_path.exists():
@@ -95,40 +80,144 @@ async def parse_plan_document(
             detail="Document file not found on disk"
         )
 
-    # Validate max_pages
+    return document, file_path
+
+
+def _validate_max_pages(max_pages: int) -> None:
     if max_pages < 1 or max_pages > 10:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="max_pages must be between 1 and 10"
         )
 
-    # Parse the plan
-    try:
-        result = await plan_parser.parse_plan(file_path, max_pages=max_pages)
-
-        if not result["success"]:
-            return {
-                "success": False,
-                "document_id": document_id,
-                "method": result.get("method", "unknown"),
-                "error": result.get("error", "Unknown error")
-            }
-
-        # Determine method used
-        method = result.get("method", "unknown")
 
+def _parse_response(result: Dict[str, Any], document_id: str, max_pages: int) -> Dict[str, Any]:
+    """Shape a plan_parser result as the `/parse` response"""
+    if not result.get("success", False):
         return {
-            "success": True,
+            "success": False,
             "document_id": document_id,
-            "pages_analyzed": result.get("pages_analyzed", max_pages),
-            "method": method,
-            "strategy": result.get("strategy"),
-            "confidence": result.get("confidence"),
-            "processing_time_ms": result.get("processing_time_ms"),
-            "metadata": result.get("metadata"),
-            "data": result.get("data")
+            "method": result.get("method", "unknown"),
+            "error": result.get("error", "Unknown error")
         }
 
+    return {
+        "success": True,
+        "document_id": document_id,
+        "pages_analyzed": result.get("pages_analyzed", max_pages),
+        "method": result.get("method", "unknown"),
+        "strategy": result.get("strategy"),
+        "confidence": result.get("confidence"),
+        "processing_time_ms": result.get("processing_time_ms"),
+        "metadata": result.get("metadata"),
+        "data": result.get("data")
+    }
+
+
+async def _run_with_progress(
+    run: Callable[[Callable[[Dict[str, Any]], None]], Awaitable[Dict[str, Any]]]
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run a parse coroutine and yield its progress events as they arrive
+
+    The final event is {"event": "result", "result": ...} or {"event": "error", ...}.
+    Progress callbacks may fire from worker threads, so events are handed to
+    the event loop thread-safely.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def callback(event: Dict[str, Any]) -> None:
+        loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    task = asyncio.create_task(run(callback))
+    task.add_done_callback(lambda _: loop.call_soon_threadsafe(queue.put_nowait, None))
+
+    try:
+        while True:
+            event = await queue.get()
+            if event is None:
+                break
+            yield event
+
+        try:
+            yield {"event": "result", "result": task.result()}
+        except Exception as e:
+            logger.error(f"[PARSE] Streaming parse failed: {str(e)}")
+            yield {"event": "error", "error": str(e)}
+    finally:
+        # Client went away mid-parse
+        if not task.done():
+            task.cancel()
+
+
+def _format_event(event: Dict[str, Any], fmt: str) -> str:
+    """Serialize a progress event as an SSE frame or an NDJSON line"""
+    payload = json.dumps(event, default=str)
+    if fmt == "ndjson":
+        return payload + "\n"
+    return f"event: {event.get('event', 'message')}\ndata: {payload}\n\n"
+
+
+def _stream_response(events: AsyncIterator[Dict[str, Any]], fmt: str) -> StreamingResponse:
+    """Wrap an event iterator in a streaming HTTP response"""
+    async def body():
+        async for event in events:
+            yield _format_event(event, fmt)
+
+    media_type = "application/x-ndjson" if fmt == "ndjson" else "text/event-stream"
+    return StreamingResponse(body(), media_type=media_type, headers=STREAM_HEADERS)
+
+
+def _validate_stream_format(fmt: str) -> None:
+    if fmt not in ("sse", "ndjson"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="format must be 'sse' or 'ndjson'"
+        )
+
+
+@router.get("/status", response_model=ParseStatusResponse)
+async def get_ai_status(current_user: User = Depends(get_current_user)):
+    """
+    Check status of AI services
+    """
+    ai_status = is_ai_available()
+
+    return {
+        "claude_available": ai_status["claude"],
+        "openai_available": ai_status["openai"],
+        "ocr_available": ocr_service.tesseract_available,
+        "message": "AI services configured" if ai_status["any"] else "No AI services configured. Add API keys to .env file."
+    }
+
+
+@router.post("/projects/{project_id}/documents/{document_id}/parse", response_model=ParsePlanResponse)
+async def parse_plan_document(
+    project_id: str,
+    document_id: str,
+    max_pages: int = 5,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Parse a plan document using AI vision models
+
+    This endpoint analyzes construction plans and extracts:
+    - Bid items with quantities and units
+    - Specifications and material requirements
+    - Project information
+
+    **max_pages**: Number of pages to analyze (1-10, default: 5)
+    """
+    _, file_path = _load_parseable_document(db, project_id, document_id, current_user)
+    _validate_max_pages(max_pages)
+
+    # Parse the plan
+    try:
+        result = await plan_parser.parse_plan(file_path, max_pages=max_pages)
+        return _parse_response(result, document_id, max_pages)
+
     except Exception as e:
         logger.error(f"Failed to parse document: {str(e)}")
         raise HTTPException(
@@ -142,6 +231,8 @@ async def parse_and_save_plan_document(
     project_id: str,
     document_id: str,
     max_pages: int = 5,
+    run_id: Optional[str] = None,
+    replace_previous: bool = False,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -153,41 +244,16 @@ async def parse_and_save_plan_document(
     2. Saves bid items to the database
     3. Saves takeoff items to the database
     4. Returns summary of saved items
-    """
-    # Verify project ownership
-    logger.info(f"[PARSE] Step 1/4: Verifying project access...")
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.company_id == current_user.company_id
-    ).first()
 
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
-        )
-
-    # Get document
-    logger.info(f"[PARSE] Step 2/4: Loading document...")
-    document = db.query(ProjectDocument).filter(
-        ProjectDocument.id == document_id,
-        ProjectDocument.project_id == project_id
-    ).first()
-
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found"
-        )
-
-    # Get file path
-    file_path = file_storage.get_file_path(document.file_path)
-
-    if not file_path.exists():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document file not found on disk"
-        )
+    Items are bulk-inserted in one statement. Saves are idempotent per
+    (document, parse run): pass the same `run_id` when retrying, otherwise the
+    run is keyed by a hash of the extracted items. Set `replace_previous` to
+    drop items saved by earlier parses of this document.
+    """
+    # Verify project ownership and load the document
+    logger.info(f"[PARSE] Steps 1-2/4: Verifying project access and loading document...")
+    document, file_path = _load_parseable_document(db, project_id, document_id, current_user)
+    _validate_max_pages(max_pages)
 
     # Parse the document
     logger.info(f"[PARSE] Step 3/4: Parsing with AI (this may take 30-60 seconds)...")
@@ -205,7 +271,6 @@ async def parse_and_save_plan_document(
 
     # Extract parsed data
     parsed_data = parse_result.get("data")
-    items_saved = 0
 
     # Count what we extracted
     bid_items = parsed_data.get("bid_items", []) if parsed_data else []
@@ -229,49 +294,12 @@ async def parse_and_save_plan_document(
     try:
         logger.info(f"[PARSE] Step 4/4: Saving {len(bid_items) + len(materials)} items to database...")
 
-        # Save bid items as takeoff items
-        if bid_items:
-            for item in bid_items:
-                # Ensure qty is never null - default to 0 if not provided
-                qty_value = item.get("quantity")
-                if qty_value is None:
-                    qty_value = 0
-                
-                takeoff = TakeoffItem(
-                    project_id=project_id,
-                    label=item.get("description", "Unknown item"),
-                    qty=qty_value,
-                    unit=item.get("unit", "") or "",
-                    notes=f"Item #{item.get('item_number', 'N/A')}"
-                )
-                db.add(takeoff)
-                items_saved += 1
-
-        # Save materials as takeoff items
-        if materials:
-            for mat in materials:
-                # Ensure qty is never null - default to 0 if not provided
-                qty_value = mat.get("quantity")
-                if qty_value is None:
-                    qty_value = 0
-                
-                category = mat.get("category", "")
-                
-                takeoff = TakeoffItem(
-                    project_id=project_id,
-                    label=mat.get("name", "Unknown material"),
-                    qty=qty_value,
-                    unit=mat.get("unit", "ea") or "ea",
-                    category=category,
-                    notes="Extracted from plan by AI"
-                )
-                db.add(takeoff)
-                items_saved += 1
-                logger.info(f"[PARSE]   Added: {mat.get('name')} x {qty_value} {mat.get('unit', 'ea')} [{category}]")
+        save_result = takeoff_persistence.save_parsed_items(
+            db, project_id, document, parsed_data,
+            run_id=run_id, replace_previous=replace_previous
+        )
+        items_saved = save_result["items_saved"]
 
-        # Mark document as parsed
-        document.is_parsed = "true"
-        
         # Commit all changes
         db.commit()
         logger.info(f"[PARSE] SUCCESS! Saved {items_saved} items to database")
@@ -280,6 +308,9 @@ async def parse_and_save_plan_document(
             "success": True,
             "message": f"Successfully parsed and saved {items_saved} items",
             "items_saved": items_saved,
+            "parse_run_key": save_result["parse_run_key"],
+            "duplicate": save_result["duplicate"],
+            "items_replaced": save_result["replaced"],
             "extraction_details": {
                 "bid_items_found": len(bid_items),
                 "materials_found": len(materials),
@@ -298,6 +329,166 @@ async def parse_and_save_plan_document(
         )
 
 
+@router.post("/projects/{project_id}/documents/{document_id}/parse/stream")
+async def stream_parse_plan_document(
+    project_id: str,
+    document_id: str,
+    max_pages: int = 5,
+    format: str = "sse",
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Parse a plan document and stream progress as it happens
+
+    Emits Server-Sent Events (or NDJSON lines with **format=ndjson**):
+    - **stage**: pipeline stage changes (rendering, extracting, tile progress, ...)
+    - **items**: normalized partial `bid_items` / `materials` / `specifications`
+      as each tile, page or streamed item completes. A stage event with
+      `reset: true` means earlier partial items should be discarded.
+    - **result**: the same payload `/parse` returns
+    - **error**: parsing failed
+
+    **max_pages**: Number of pages to analyze (1-10, default: 5)
+    """
+    _validate_stream_format(format)
+    _, file_path = _load_parseable_document(db, project_id, document_id, current_user)
+    _validate_max_pages(max_pages)
+
+    async def events():
+        async for event in _run_with_progress(
+            lambda callback: plan_parser.parse_plan(
+                file_path, max_pages=max_pages, progress_callback=callback
+            )
+        ):
+            if event["event"] == "result":
+                event = {"event": "result", **_parse_response(event["result"], document_id, max_pages)}
+            yield event
+
+    return _stream_response(events(), format)
+
+
+@router.post("/projects/{project_id}/documents/{document_id}/parse-and-save/stream")
+async def stream_parse_and_save_plan_document(
+    project_id: str,
+    document_id: str,
+    max_pages: int = 5,
+    format: str = "sse",
+    run_id: Optional[str] = None,
+    replace_previous: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Parse a plan document, streaming progress, then save the extracted items
+
+    Emits the same events as `/parse/stream`, followed by a **saved** event
+    with the number of takeoff items written.
+
+    **max_pages**: Number of pages to analyze (1-10, default: 5)
+    """
+    _validate_stream_format(format)
+    _, file_path = _load_parseable_document(db, project_id, document_id, current_user)
+    _validate_max_pages(max_pages)
+
+    async def events():
+        parse_result = None
+
+        async for event in _run_with_progress(
+            lambda callback: plan_parser.parse_plan(
+                file_path, max_pages=max_pages, progress_callback=callback
+            )
+        ):
+            if event["event"] == "result":
+                parse_result = event["result"]
+                event = {"event": "result", **_parse_response(parse_result, document_id, max_pages)}
+            yield event
+
+        if not parse_result or not parse_result.get("success", False):
+            return
+
+        parsed_data = parse_result.get("data") or {}
+        yield {"event": "stage", "stage": "saving"}
+
+        # The request-scoped session is closed once the response starts streaming
+        save_db = SessionLocal()
+        try:
+            document = save_db.query(ProjectDocument).filter(
+                ProjectDocument.id == document_id
+            ).first()
+            save_result = takeoff_persistence.save_parsed_items(
+                save_db, project_id, document, parsed_data,
+                run_id=run_id, replace_previous=replace_previous
+            )
+            save_db.commit()
+            logger.info(f"[PARSE] SUCCESS! Saved {save_result['items_saved']} items to database")
+            yield {
+                "event": "saved",
+                "items_saved": save_result["items_saved"],
+                "parse_run_key": save_result["parse_run_key"],
+                "duplicate": save_result["duplicate"],
+                "items_replaced": save_result["replaced"],
+            }
+        except Exception as e:
+            save_db.rollback()
+            logger.error(f"[PARSE] Failed to save parsed data: {str(e)}")
+            yield {"event": "error", "error": f"Failed to save parsed data: {str(e)}"}
+        finally:
+            save_db.close()
+
+    return _stream_response(events(), format)
+
+
+@router.post("/projects/{project_id}/documents/{document_id}/parse-addendum")
+async def parse_addendum_document(
+    project_id: str,
+    document_id: str,
+    save: bool = True,
+    run_id: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Parse an addendum incrementally against the plan set already parsed
+
+    Each page is fingerprinted (text-layer hash plus perceptual hash) and
+    matched to the sheets of earlier parsed plan documents. Only changed and
+    new pages are parsed, and the result is returned as a takeoff delta:
+    - **added**: items not in the existing takeoff
+    - **removed**: items of revised sheets that the addendum no longer shows
+    - **changed**: existing items whose quantity differs
+
+    **save**: Apply the delta to the takeoff (set false for a preview)
+    """
+    document, file_path = _load_parseable_document(db, project_id, document_id, current_user)
+
+    if document.doc_type not in PLAN_DOC_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Can only diff documents of type: {', '.join(PLAN_DOC_TYPES)}"
+        )
+
+    try:
+        result = await addendum_delta.parse_addendum(
+            db, project_id, document, file_path, save=save, run_id=run_id
+        )
+        # Fingerprints are stored even for previews so later diffs skip rendering
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"[ADDENDUM] Failed to parse addendum: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to parse addendum: {str(e)}"
+        )
+
+    return {
+        "success": not result["pages_failed"],
+        "document_id": document_id,
+        **result,
+    }
+
+
 @router.post("/projects/{project_id}/documents/{document_id}/parse-spec")
 async def parse_specification_document(
     project_id: str,
@@ -395,3 +586,150 @@ async def parse_specification_document(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to parse specification: {str(e)}"
         )
+
+
+@router.post("/projects/{project_id}/parse-all")
+async def parse_all_project_documents(
+    project_id: str,
+    max_pages: int = 5,
+    spec_max_pages: int = 50,
+    include_parsed: bool = False,
+    save: bool = True,
+    replace_previous: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Parse every document of a bid package in one operation
+
+    Plans, addenda and plan/spec sets go through the plan parser; specifications
+    go through the specification parser. Documents are parsed concurrently
+    under shared LLM and CPU budgets, items found on several documents are
+    merged, and the consolidated takeoff is saved.
+
+    **include_parsed**: Also re-parse documents that were already parsed
+    **save**: Save the consolidated takeoff (set false for a dry run)
+    **replace_previous**: Drop items saved by earlier parses of these documents
+    """
+    # Verify project ownership
+    project = db.query(Project).filter(
+        Project.id == project_id,
+        Project.company_id == current_user.company_id
+    ).first()
+
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+
+    if max_pages < 1 or max_pages > 10:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="max_pages must be between 1 and 10"
+        )
+
+    if spec_max_pages < 1 or spec_max_pages > 100:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="spec_max_pages must be between 1 and 100"
+        )
+
+    query = db.query(ProjectDocument).filter(ProjectDocument.project_id == project_id)
+    if not include_parsed:
+        query = query.filter(ProjectDocument.is_parsed != "true")
+    documents = query.order_by(ProjectDocument.uploaded_at).all()
+
+    reports = []
+    batch = []
+    documents_by_id = {}
+
+    for document in documents:
+        document_id = str(document.id)
+
+        if document.doc_type not in PARSEABLE_DOC_TYPES:
+            reports.append({
+                "document_id": document_id,
+                "file_name": document.file_name,
+                "doc_type": document.doc_type,
+                "status": "skipped",
+                "error": f"Document type '{document.doc_type}' cannot be parsed",
+            })
+            continue
+
+        file_path = file_storage.get_file_path(document.file_path)
+        if not file_path.exists():
+            reports.append({
+                "document_id": document_id,
+                "file_name": document.file_name,
+                "doc_type": document.doc_type,
+                "status": "failed",
+                "error": "Document file not found on disk",
+            })
+            continue
+
+        documents_by_id[document_id] = document
+        batch.append(BatchDocument(
+            document_id=document_id,
+            doc_type=document.doc_type,
+            file_path=file_path,
+            file_name=document.file_name,
+        ))
+
+    if not batch:
+        return {
+            "success": True,
+            "message": "No documents to parse",
+            "documents": reports,
+            "items_saved": 0,
+        }
+
+    result = await batch_parser.parse_documents(
+        batch, max_pages=max_pages, spec_max_pages=spec_max_pages
+    )
+    reports = result["documents"] + reports
+    takeoff = result["takeoff"]
+    items_saved = 0
+
+    if save:
+        # Each consolidated item is stored against the document its quantity came from
+        items_by_document = {
+            document_id: {"bid_items": [], "materials": []}
+            for document_id in result["parsed"]
+        }
+        for key in ("bid_items", "materials"):
+            for item in takeoff[key]:
+                items_by_document[item["source_document_id"]][key].append(item)
+
+        try:
+            for document_id, items in items_by_document.items():
+                save_result = takeoff_persistence.save_parsed_items(
+                    db, project_id, documents_by_id[document_id], items,
+                    replace_previous=replace_previous
+                )
+                items_saved += save_result["items_saved"]
+
+            for document_id in result["specifications"]:
+                documents_by_id[document_id].is_parsed = "true"
+
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"[BATCH PARSE] Failed to save consolidated takeoff: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to save parsed data: {str(e)}"
+            )
+
+    return {
+        "success": any(report["status"] == "parsed" for report in reports),
+        "documents": reports,
+        "items_saved": items_saved,
+        "takeoff": {
+            "bid_items": takeoff["bid_items"],
+            "materials": takeoff["materials"],
+        },
+        "duplicates_removed": takeoff["duplicates_removed"],
+        "specifications": result["specifications"],
+        "processing_time_ms": result["processing_time_ms"],
+    }
@@ -3,11 +3,12 @@ from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 from pathlib import Path
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.models.user import User
 from app.models.project import Project, ProjectDocument
-from app.services.file_storage import file_storage
+from app.services.file_storage import file_storage, FileTooLargeError
 from app.api.v1.schemas.document import (
     DocumentUploadResponse,
     DocumentListResponse,
@@ -18,7 +19,7 @@ router = APIRouter()
 
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {".pdf", ".PDF"}
-MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
+MAX_FILE_SIZE = settings.MAX_UPLOAD_SIZE
 
 
 def validate_file(file: UploadFile) -> None:
@@ -72,7 +73,12 @@ async def upload_project_document(
 
     # Save file to disk
     try:
-        file_path = await file_storage.save_file(file, doc_type, project_id)
+        file_path = await file_storage.save_file(file, doc_type, project_id, max_size=MAX_FILE_SIZE)
+    except FileTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -13,7 +13,7 @@ from app.models.project import Project
 from app.models.estimation import TakeoffItem, Estimate
 from app.models.company import Company, CompanyRates
 from app.models.material import Material
-from app.services.material_matcher import match_takeoff_to_materials
+from app.services.material_matcher import match_takeoff_incrementally
 from app.services.quote_pdf_generator import generate_quote_pdf
 
 router = APIRouter()
@@ -25,6 +25,7 @@ class EstimateGenerationRequest(BaseModel):
     project_id: UUID4
     match_threshold: int = 70
     auto_accept_high_confidence: bool = True  # Auto-accept matches >= 0.8
+    force_rematch: bool = False  # Ignore applied matches and match every item again
     apply_overhead: bool = True
     apply_profit: bool = True
 
@@ -117,14 +118,16 @@ async def generate_estimate(
                 errors=["No takeoff items to estimate"]
             )
 
-        # Match takeoff items to materials
+        # Match takeoff items to materials (items unchanged since their
+        # applied or manual match keep it)
         logger.info(f"Matching {len(takeoff_items)} takeoff items to materials...")
-        matches_dict = match_takeoff_to_materials(
+        matches_dict = match_takeoff_incrementally(
             db=db,
             company_id=str(current_user.company_id),
             takeoff_items=takeoff_items,
-            threshold=request.match_threshold
-        )
+            threshold=request.match_threshold,
+            force=request.force_rematch
+        )["matches"]
 
         # Calculate costs
         line_items = []
@@ -442,12 +445,12 @@ async def export_estimate_pdf(
         ).all()
 
         # Match items to materials and build line items
-        matches_dict = match_takeoff_to_materials(
+        matches_dict = match_takeoff_incrementally(
             db=db,
             company_id=str(current_user.company_id),
             takeoff_items=takeoff_items,
             threshold=70
-        )
+        )["matches"]
 
         line_items = []
         for item in takeoff_items:
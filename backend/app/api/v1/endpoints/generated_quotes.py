@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 from typing import List, Optional
 from uuid import UUID
 from decimal import Decimal
@@ -17,7 +17,9 @@ from app.models.company import Company
 from app.models.estimation import GeneratedQuote, GeneratedQuoteLineItem, TakeoffItem
 from app.models.material import Material
 from app.models.project import Project
+from app.services.material_matcher import MaterialMatcher
 from app.services.quote_pdf_generator import QuotePDFGenerator
+from app.services.takeoff_queries import takeoffs_with_materials
 from app.api.v1.schemas.generated_quote import (
     GeneratedQuoteCreate,
     GeneratedQuoteUpdate,
@@ -31,6 +33,10 @@ from app.api.v1.schemas.generated_quote import (
 
 router = APIRouter()
 
+# Matching used to price takeoff items that have no material yet
+QUOTE_MATCH_THRESHOLD = 70
+QUOTE_MATCH_CONFIDENCE = 0.7
+
 
 def generate_quote_number() -> str:
     """Generate a unique quote number"""
@@ -40,14 +46,19 @@ def generate_quote_number() -> str:
 
 
 def calculate_quote_totals(db: Session, quote_id: UUID) -> dict:
-    """Calculate subtotal, tax, and total for a quote"""
-    line_items = db.query(GeneratedQuoteLineItem).filter(
+    """Calculate subtotal, tax, and total for a quote (line items summed in SQL)"""
+    subtotal_query = select(
+        func.coalesce(func.sum(GeneratedQuoteLineItem.total_price), 0)
+    ).where(
         GeneratedQuoteLineItem.generated_quote_id == quote_id
-    ).all()
-    
-    subtotal = sum(item.total_price for item in line_items)
-    quote = db.query(GeneratedQuote).filter(GeneratedQuote.id == quote_id).first()
-    tax_rate = quote.tax_rate if quote else Decimal("0")
+    ).scalar_subquery()
+
+    row = db.query(GeneratedQuote.tax_rate, subtotal_query).filter(
+        GeneratedQuote.id == quote_id
+    ).first()
+
+    tax_rate, subtotal = row if row else (None, Decimal("0"))
+    tax_rate = tax_rate or Decimal("0")
     tax_amount = subtotal * tax_rate
     total = subtotal + tax_amount
     
@@ -159,7 +170,8 @@ async def generate_quote_from_takeoffs(
     Generate a quote from takeoff items.
     
     This takes takeoff items extracted from plans and creates a customer-facing quote
-    by matching items to the material catalog for pricing.
+    by matching items to the material catalog for pricing. Items already matched
+    (applied or manual) keep their material; the rest go through the material matcher.
     """
     # Verify project exists and belongs to user's company
     project = db.query(Project).filter(
@@ -210,22 +222,34 @@ async def generate_quote_from_takeoffs(
     )
     
     db.add(quote)
-    db.commit()
-    db.refresh(quote)
+    db.flush()
+
+    # Price each takeoff item from the catalog: reuse the material already
+    # matched to the item, and match the rest in one matcher pass
+    material_ids = {t.matched_material_id for t in takeoff_items if t.matched_material_id}
+    materials_by_id = {}
+    if material_ids:
+        materials_by_id = {
+            m.id: m for m in db.query(Material).filter(
+                Material.company_id == current_user.company_id,
+                Material.id.in_(material_ids)
+            ).all()
+        }
+
+    unmatched = [t for t in takeoff_items if t.matched_material_id not in materials_by_id]
+    matches_dict = {}
+    if unmatched:
+        matcher = MaterialMatcher(db, str(current_user.company_id))
+        matches_dict = matcher.match_multiple_items(unmatched, threshold=QUOTE_MATCH_THRESHOLD)
 
     # Create line items from takeoff items
-    # Try to match each takeoff item to a material in the catalog for pricing
-    line_number = 1
-    current_category = None
-    
-    for takeoff in takeoff_items:
-        # Try to find matching material by description
-        material = db.query(Material).filter(
-            Material.company_id == current_user.company_id,
-            Material.is_active == True
-        ).filter(
-            Material.description.ilike(f"%{takeoff.label}%")
-        ).first()
+    line_rows = []
+    for line_number, takeoff in enumerate(takeoff_items, start=1):
+        material = materials_by_id.get(takeoff.matched_material_id)
+        if material is None:
+            matches = matches_dict.get(str(takeoff.id))
+            if matches and matches[0]["confidence"] >= QUOTE_MATCH_CONFIDENCE:
+                material = matches[0]["material"]
         
         # Use material pricing if found, otherwise use placeholder
         if material:
@@ -239,26 +263,23 @@ async def generate_quote_from_takeoffs(
             unit = takeoff.unit
             category = None
         
-        total_price = takeoff.qty * unit_price
-        
-        line_item = GeneratedQuoteLineItem(
-            generated_quote_id=quote.id,
-            takeoff_item_id=takeoff.id,
-            material_id=material.id if material else None,
-            line_number=line_number,
-            category=category,
-            quantity=takeoff.qty,
-            unit=unit,
-            product_code=product_code,
-            description=takeoff.label,
-            unit_price=unit_price,
-            total_price=total_price,
-            notes=takeoff.notes
-        )
-        db.add(line_item)
-        line_number += 1
-    
-    db.commit()
+        line_rows.append({
+            "generated_quote_id": quote.id,
+            "takeoff_item_id": takeoff.id,
+            "material_id": material.id if material else None,
+            "line_number": line_number,
+            "category": category,
+            "quantity": takeoff.qty,
+            "unit": unit,
+            "product_code": product_code,
+            "description": takeoff.label,
+            "unit_price": unit_price,
+            "total_price": takeoff.qty * unit_price,
+            "notes": takeoff.notes
+        })
+
+    # One multi-row INSERT for all line items
+    db.bulk_insert_mappings(GeneratedQuoteLineItem, line_rows)
     
     # Recalculate totals
     totals = calculate_quote_totals(db, quote.id)
@@ -606,10 +627,7 @@ async def generate_quote_pdf_from_takeoffs(
         )
     
     # Get matched takeoff items
-    takeoff_items = db.query(TakeoffItem).filter(
-        TakeoffItem.project_id == project_id,
-        TakeoffItem.matched_material_id.isnot(None)
-    ).all()
+    takeoff_items = takeoffs_with_materials(db, project_id, matched_only=True).all()
     
     if not takeoff_items:
         raise HTTPException(
@@ -624,17 +642,14 @@ async def generate_quote_pdf_from_takeoffs(
     line_items = []
     subtotal = Decimal("0")
     
-    for item in takeoff_items:
-        # Get material info
-        material = db.query(Material).filter(Material.id == item.matched_material_id).first()
-        
+    for item, product_code in takeoff_items:
         qty = float(item.qty) if item.qty else 0
         unit_price = float(item.unit_price) if item.unit_price else 0
         line_total = float(item.total_price) if item.total_price else 0
         
         line_items.append({
             "quantity": qty,
-            "product_code": material.product_code if material else "",
+            "product_code": product_code or "",
             "description": item.label,
             "unit_price": unit_price,
             "unit": item.unit or "ea",
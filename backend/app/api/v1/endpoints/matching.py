@@ -1,16 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Dict, Optional
-from pydantic import BaseModel, UUID4
+from typing import Iterator, List, Dict, Optional
+from pydantic import BaseModel, Field, UUID4
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.models.user import User
 from app.models.estimation import TakeoffItem
-from app.services.material_matcher import MaterialMatcher, match_takeoff_to_materials
+from app.services.material_matcher import (
+    MaterialMatcher,
+    match_takeoff_incrementally,
+    match_takeoff_to_materials,
+)
+from app.services.match_memory import match_memory
 
 router = APIRouter()
 
+# Largest item list accepted by /match/batch
+MAX_BATCH_ITEMS = 5000
+
 
 # Schemas
 class MatchRequest(BaseModel):
@@ -38,11 +48,55 @@ class MatchResponse(BaseModel):
     total_matches: int
 
 
+class BatchMatchItem(BaseModel):
+    id: Optional[str] = None  # Caller's reference, echoed back
+    description: str
+    quantity: Optional[float] = None
+    unit: Optional[str] = None
+    category_hint: Optional[str] = None
+
+
+class BatchMatchRequest(BaseModel):
+    items: List[BatchMatchItem] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
+    threshold: int = 70
+    top_k: int = Field(5, ge=1, le=20)
+    stream: bool = False  # Return NDJSON, one line per item
+
+
+class BatchMatchResult(BaseModel):
+    index: int
+    id: Optional[str] = None
+    matches: List[MaterialMatchResponse]
+    total_matches: int
+
+
+class BatchMatchResponse(BaseModel):
+    results: List[BatchMatchResult]
+    total_items: int
+    matched: int
+
+
 class ProjectMatchRequest(BaseModel):
     project_id: UUID4
     threshold: int = 70
 
 
+def _match_response(match: Dict) -> MaterialMatchResponse:
+    """Response schema for one matcher result"""
+    material = match["material"]
+    return MaterialMatchResponse(
+        material_id=material.id,
+        product_code=material.product_code,
+        description=material.description,
+        unit_price=float(material.unit_price),
+        unit=material.unit,
+        category=material.category,
+        confidence=match["confidence"],
+        match_type=match["match_type"],
+        reasoning=match["reasoning"]
+    )
+
+
 @router.post("/match", response_model=MatchResponse)
 def match_description_to_materials(
     request: MatchRequest,
@@ -65,20 +119,7 @@ def match_description_to_materials(
     )
 
     # Convert to response format
-    match_responses = []
-    for match in matches:
-        material = match["material"]
-        match_responses.append(MaterialMatchResponse(
-            material_id=material.id,
-            product_code=material.product_code,
-            description=material.description,
-            unit_price=float(material.unit_price),
-            unit=material.unit,
-            category=material.category,
-            confidence=match["confidence"],
-            match_type=match["match_type"],
-            reasoning=match["reasoning"]
-        ))
+    match_responses = [_match_response(match) for match in matches]
 
     return MatchResponse(
         matches=match_responses,
@@ -86,6 +127,90 @@ def match_description_to_materials(
     )
 
 
+@router.post("/match/batch", response_model=BatchMatchResponse)
+def match_descriptions_batch(
+    request: BatchMatchRequest,
+    http_request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Match a list of descriptions to materials in one request
+
+    The catalog, match memory and indexes are loaded once and semantic
+    scores are computed for the whole list together. Returns the top_k
+    matches per item, in input order.
+
+    With "stream": true (or an Accept: application/x-ndjson header) results
+    are streamed as NDJSON, one BatchMatchResult per line, as items are
+    matched.
+    """
+    matcher = MaterialMatcher(db, str(current_user.company_id))
+    matcher.preload()
+
+    items = [item.model_dump() for item in request.items]
+    results = matcher.iter_matches(items, threshold=request.threshold, limit=request.top_k)
+
+    def batch_results() -> Iterator[BatchMatchResult]:
+        for index, (item, matches) in enumerate(zip(request.items, results)):
+            match_responses = [_match_response(match) for match in matches]
+            yield BatchMatchResult(
+                index=index,
+                id=item.id,
+                matches=match_responses,
+                total_matches=len(match_responses)
+            )
+
+    if request.stream or "application/x-ndjson" in http_request.headers.get("accept", ""):
+        # The matcher holds everything it needs, so no database access
+        # happens while the response streams
+        return StreamingResponse(
+            (result.model_dump_json() + "\n" for result in batch_results()),
+            media_type="application/x-ndjson"
+        )
+
+    batch = list(batch_results())
+    return BatchMatchResponse(
+        results=batch,
+        total_items=len(batch),
+        matched=sum(1 for result in batch if result.matches)
+    )
+
+
+def _takeoff_rows(db: Session, project_id: str, *extra_columns) -> List:
+    """Takeoff items of a project, projected to the columns matching needs"""
+    return db.query(
+        TakeoffItem.id,
+        TakeoffItem.label,
+        TakeoffItem.qty,
+        TakeoffItem.unit,
+        TakeoffItem.category,
+        TakeoffItem.notes,
+        TakeoffItem.matched_material_id,
+        TakeoffItem.match_confidence,
+        TakeoffItem.match_source,
+        TakeoffItem.match_fingerprint,
+        *extra_columns
+    ).filter(
+        TakeoffItem.project_id == project_id
+    ).all()
+
+
+def _material_row(cache: Dict, material) -> Dict:
+    """Serialized material fields, computed once per material"""
+    key = material.id
+    if key not in cache:
+        cache[key] = {
+            "material_id": str(material.id),
+            "product_code": material.product_code,
+            "description": material.description,
+            "unit_price": float(material.unit_price),
+            "unit": material.unit,
+            "category": material.category
+        }
+    return cache[key]
+
+
 @router.post("/match/project", response_model=Dict)
 def match_project_takeoffs(
     request: ProjectMatchRequest,
@@ -97,10 +222,8 @@ def match_project_takeoffs(
 
     Returns suggested matches for each takeoff item.
     """
-    # Get all takeoff items for the project
-    takeoff_items = db.query(TakeoffItem).filter(
-        TakeoffItem.project_id == str(request.project_id)
-    ).all()
+    # Get all takeoff items for the project (only the columns matching uses)
+    takeoff_items = _takeoff_rows(db, str(request.project_id))
 
     if not takeoff_items:
         return {
@@ -130,17 +253,14 @@ def match_project_takeoffs(
     med_conf = sum(1 for matches in matches_dict.values() if matches and 0.6 <= matches[0]["confidence"] < 0.8)
     low_conf = sum(1 for matches in matches_dict.values() if matches and matches[0]["confidence"] < 0.6)
 
-    # Format matches for response
+    # Format matches for response; each material is serialized once
+    material_rows = {}
     formatted_matches = {}
-    for item_id, matches in matches_dict.items():
-        # Find the takeoff item
-        item = next((i for i in takeoff_items if str(i.id) == item_id), None)
-        if not item:
-            continue
-
+    for item in takeoff_items:
+        item_id = str(item.id)
         formatted_matches[item_id] = {
             "takeoff_item": {
-                "id": str(item.id),
+                "id": item_id,
                 "label": item.label,
                 "qty": float(item.qty) if item.qty else 0,
                 "unit": item.unit,
@@ -148,17 +268,12 @@ def match_project_takeoffs(
             },
             "matches": [
                 {
-                    "material_id": str(match["material"].id),
-                    "product_code": match["material"].product_code,
-                    "description": match["material"].description,
-                    "unit_price": float(match["material"].unit_price),
-                    "unit": match["material"].unit,
-                    "category": match["material"].category,
+                    **_material_row(material_rows, match["material"]),
                     "confidence": match["confidence"],
                     "match_type": match["match_type"],
                     "reasoning": match["reasoning"]
                 }
-                for match in matches
+                for match in matches_dict.get(item_id, [])
             ]
         }
 
@@ -198,6 +313,7 @@ def get_matching_categories(
 def apply_matches_to_project(
     project_id: str,
     threshold: int = 50,
+    force: bool = False,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -208,6 +324,14 @@ def apply_matches_to_project(
     - matched_material_id
     - unit_price (from matched material)
     - total_price (qty * unit_price)
+
+    Applied matches are remembered so the same labels match directly on
+    later takeoffs.
+
+    Only items whose label, unit, category or notes changed, or that were
+    matched against an older catalog, are matched again; manual choices
+    are kept. Pass force=true to rematch everything (e.g. after changing
+    the threshold).
     
     Returns summary with total estimated cost.
     """
@@ -224,10 +348,8 @@ def apply_matches_to_project(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    # Get all takeoff items for the project
-    takeoff_items = db.query(TakeoffItem).filter(
-        TakeoffItem.project_id == project_id
-    ).all()
+    # Get all takeoff items for the project (only the columns matching uses)
+    takeoff_items = _takeoff_rows(db, project_id, TakeoffItem.unit_price, TakeoffItem.total_price)
 
     if not takeoff_items:
         return {
@@ -236,37 +358,68 @@ def apply_matches_to_project(
             "matched": 0,
             "unmatched": 0,
             "subtotal": 0,
+            "rematched": 0,
             "items": []
         }
 
-    # Match all items
-    matches_dict = match_takeoff_to_materials(
+    # Match the items that changed (all of them with force)
+    incremental = match_takeoff_incrementally(
         db=db,
         company_id=str(current_user.company_id),
         takeoff_items=takeoff_items,
-        threshold=threshold
+        threshold=threshold,
+        force=force
     )
+    matches_dict = incremental["matches"]
+    rematched = incremental["rematched"]
+    fingerprints = incremental["fingerprints"]
 
-    # Apply matches and calculate totals
+    # Build the updates and response rows in one pass
     matched_count = 0
     unmatched_count = 0
     subtotal = Decimal("0")
     items_result = []
+    updates = []
+    accepted = []
 
     for item in takeoff_items:
         item_id = str(item.id)
-        matches = matches_dict.get(item_id, [])
+        matches = matches_dict.get(item_id)
+        changed = item_id in rematched
         
         if matches:
             # Use best match
             best_match = matches[0]
             material = best_match["material"]
+            # Rounded as stored (Numeric(15, 2)) so unchanged rows compare equal
+            total_price = (item.qty * material.unit_price).quantize(Decimal("0.01"))
+
+            if changed:
+                updates.append({
+                    "id": item.id,
+                    "matched_material_id": material.id,
+                    "unit_price": material.unit_price,
+                    "total_price": total_price,
+                    "match_confidence": round(best_match["confidence"], 3),
+                    "match_source": "auto",
+                    "match_fingerprint": fingerprints[item_id]
+                })
+                # Only confident fresh matches are learned; a memory hit
+                # re-applied by a rematch is not a new acceptance
+                if (
+                    best_match["match_type"] != "memory"
+                    and best_match["confidence"] >= settings.MATCH_MEMORY_MIN_CONFIDENCE
+                ):
+                    accepted.append((item.label, item.unit, material.id, best_match["confidence"]))
+            elif item.unit_price != material.unit_price or item.total_price != total_price:
+                # Kept match, but the quantity or price moved since
+                updates.append({
+                    "id": item.id,
+                    "unit_price": material.unit_price,
+                    "total_price": total_price
+                })
             
-            item.matched_material_id = material.id
-            item.unit_price = material.unit_price
-            item.total_price = item.qty * material.unit_price
-            
-            subtotal += item.total_price
+            subtotal += total_price
             matched_count += 1
             
             items_result.append({
@@ -278,15 +431,22 @@ def apply_matches_to_project(
                 "matched_material": material.description,
                 "product_code": material.product_code,
                 "unit_price": float(material.unit_price),
-                "total_price": float(item.total_price),
+                "total_price": float(total_price),
                 "confidence": best_match["confidence"],
                 "status": "matched"
             })
         else:
             # No match found
-            item.matched_material_id = None
-            item.unit_price = Decimal("0")
-            item.total_price = Decimal("0")
+            if changed:
+                updates.append({
+                    "id": item.id,
+                    "matched_material_id": None,
+                    "unit_price": Decimal("0"),
+                    "total_price": Decimal("0"),
+                    "match_confidence": None,
+                    "match_source": None,
+                    "match_fingerprint": fingerprints[item_id]
+                })
             unmatched_count += 1
             
             items_result.append({
@@ -303,6 +463,10 @@ def apply_matches_to_project(
                 "status": "unmatched"
             })
 
+    # One executemany UPDATE per column set, keyed by primary key
+    if updates:
+        db.bulk_update_mappings(TakeoffItem, updates)
+    match_memory.record(db, str(current_user.company_id), accepted)
     db.commit()
 
     return {
@@ -312,5 +476,6 @@ def apply_matches_to_project(
         "matched": matched_count,
         "unmatched": unmatched_count,
         "subtotal": float(subtotal),
+        "rematched": len(rematched),
         "items": items_result
     }
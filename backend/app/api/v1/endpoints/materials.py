@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from decimal import Decimal
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
+from app.core.pagination import COUNT_MODES, SortKey, count_rows, keyset_page, response_columns, set_page_headers
 from app.models.user import User
 from app.models.material import Material
+from app.services.catalog_search import catalog_search
 from pydantic import BaseModel, UUID4
 
 router = APIRouter()
@@ -53,13 +55,33 @@ class MaterialResponse(MaterialBase):
         from_attributes = True
 
 
+class MaterialSearchResponse(BaseModel):
+    items: List[MaterialResponse]
+    next_cursor: Optional[str] = None
+
+
+class MaterialSuggestion(BaseModel):
+    id: UUID4
+    product_code: str
+    description: str
+    category: str
+    unit: str
+    unit_price: Decimal
+
+    class Config:
+        from_attributes = True
+
+
 @router.get("/", response_model=List[MaterialResponse])
 def list_materials(
+    response: Response,
     category: Optional[str] = None,
     search: Optional[str] = None,
     is_active: bool = True,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    count: str = Query("none", pattern=COUNT_MODES),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -70,6 +92,9 @@ def list_materials(
     - category: Filter by category (Foundation, Walls, Roofing, etc.)
     - search: Search in product_code or description
     - is_active: Show only active materials (default: true)
+
+    Ordered by product_code. The cursor for the next page is returned in
+    the X-Next-Cursor header; count=exact|estimated adds X-Total-Count.
     """
     query = db.query(Material).filter(
         Material.company_id == current_user.company_id
@@ -79,16 +104,19 @@ def list_materials(
         query = query.filter(Material.category == category)
 
     if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            (Material.product_code.ilike(search_term)) |
-            (Material.description.ilike(search_term))
-        )
+        query = query.filter(catalog_search.contains_condition(search))
 
     if is_active is not None:
         query = query.filter(Material.is_active == is_active)
 
-    materials = query.offset(skip).limit(limit).all()
+    materials, next_cursor = keyset_page(
+        query.options(response_columns(Material, MaterialResponse)),
+        [SortKey(Material.product_code, "product_code"), SortKey(Material.id, "id")],
+        cursor,
+        limit,
+        offset=skip
+    )
+    set_page_headers(response, next_cursor, count_rows(db, query, count))
     return materials
 
 
@@ -107,6 +135,52 @@ def list_categories(
     }
 
 
+@router.get("/search", response_model=MaterialSearchResponse)
+def search_materials(
+    q: str = Query(..., min_length=1),
+    mode: str = Query("contains", pattern="^(contains|prefix|fulltext)$"),
+    category: Optional[str] = None,
+    is_active: Optional[bool] = True,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Search the catalog
+
+    Modes:
+    - contains: product_code or description contains q (default)
+    - prefix: product_code or description starts with q
+    - fulltext: ranked word search over code, description and manufacturer
+
+    Pass next_cursor from the response as cursor to fetch the next page.
+    """
+    materials, next_cursor = catalog_search.search(
+        db,
+        current_user.company_id,
+        q,
+        mode=mode,
+        category=category,
+        is_active=is_active,
+        limit=limit,
+        cursor=cursor
+    )
+
+    return {"items": materials, "next_cursor": next_cursor}
+
+
+@router.get("/typeahead", response_model=List[MaterialSuggestion])
+def typeahead_materials(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Suggestions for a partially typed product code or description (active materials)"""
+    return catalog_search.typeahead(db, current_user.company_id, q, limit=limit)
+
+
 @router.get("/{material_id}", response_model=MaterialResponse)
 def get_material(
     material_id: str,
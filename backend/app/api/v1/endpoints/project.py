@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 from typing import Optional
@@ -7,12 +7,15 @@ from datetime import date, timedelta
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
+from app.core.pagination import COUNT_MODES, SortKey, count_rows, keyset_page, response_columns, set_page_headers
 from app.models.user import User
 from app.models.company import Company
 from app.models.project import Project, ProjectDocument, BidItem, ProjectBidItem
 from app.models.estimation import TakeoffItem
 from app.models.material import Material
 from app.services.quote_pdf_generator import QuotePDFGenerator
+from app.services.match_memory import match_memory
+from app.services.takeoff_queries import takeoffs_with_materials
 from app.api.v1.schemas.project import (
     ProjectCreate,
     ProjectUpdate,
@@ -65,13 +68,18 @@ async def create_project(
 async def list_projects(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
+    count: str = Query("exact", pattern=COUNT_MODES),
     type: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    List all projects for the current user's company
+    List all projects for the current user's company, newest first
     Optional filtering by project type
+
+    Pass next_cursor from the response as cursor to fetch the next page.
+    count=estimated uses the planner's row estimate, count=none skips it.
     """
     query = db.query(Project).filter(Project.company_id == current_user.company_id)
 
@@ -80,14 +88,21 @@ async def list_projects(
         query = query.filter(Project.type == type)
 
     # Get total count
-    total = query.count()
+    total = count_rows(db, query, count)
 
     # Get paginated results
-    projects = query.offset(skip).limit(limit).all()
+    projects, next_cursor = keyset_page(
+        query.options(response_columns(Project, ProjectResponse)),
+        [SortKey(Project.created_at, "created_at", descending=True), SortKey(Project.id, "id", descending=True)],
+        cursor,
+        limit,
+        offset=skip
+    )
 
     return {
         "total": total,
-        "projects": projects
+        "projects": projects,
+        "next_cursor": next_cursor
     }
 
 
@@ -299,11 +314,18 @@ async def add_project_bid_item(
 @router.get("/{project_id}/takeoffs")
 async def list_project_takeoffs(
     project_id: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    count: str = Query("none", pattern=COUNT_MODES),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    List all takeoff items for a project
+    List takeoff items for a project, in creation order
+
+    All items by default; with limit, one page at a time (the next cursor
+    is returned in the X-Next-Cursor header).
     """
     # Verify project ownership
     project = db.query(Project).filter(
@@ -317,9 +339,30 @@ async def list_project_takeoffs(
             detail="Project not found"
         )
 
-    takeoffs = db.query(TakeoffItem).filter(
-        TakeoffItem.project_id == project_id
-    ).all()
+    query = takeoffs_with_materials(db, project_id, (
+        TakeoffItem.id,
+        TakeoffItem.label,
+        TakeoffItem.notes,
+        TakeoffItem.qty,
+        TakeoffItem.unit,
+        TakeoffItem.source_page,
+        TakeoffItem.source_bbox,
+        TakeoffItem.source_document_id,
+        TakeoffItem.category,
+        TakeoffItem.unit_price,
+        TakeoffItem.total_price,
+        TakeoffItem.matched_material_id,
+        TakeoffItem.created_at
+    ))
+
+    total = count_rows(db, query, count)
+    takeoffs, next_cursor = keyset_page(
+        query,
+        [SortKey(TakeoffItem.created_at, "created_at"), SortKey(TakeoffItem.id, "id")],
+        cursor,
+        limit
+    )
+    set_page_headers(response, next_cursor, total)
 
     # Build response with material info if matched
     result = []
@@ -331,17 +374,14 @@ async def list_project_takeoffs(
             "quantity": float(t.qty) if t.qty else 0,
             "unit": t.unit,
             "source_page": t.source_page,
+            "source_bbox": t.source_bbox,
+            "source_document_id": str(t.source_document_id) if t.source_document_id else None,
             "category": t.category,
             "unit_price": float(t.unit_price) if t.unit_price else None,
             "total_price": float(t.total_price) if t.total_price else None,
             "matched_material_id": str(t.matched_material_id) if t.matched_material_id else None,
-            "product_code": None,
+            "product_code": t.product_code,
         }
-        # Get product code from matched material
-        if t.matched_material_id:
-            material = db.query(Material).filter(Material.id == t.matched_material_id).first()
-            if material:
-                item["product_code"] = material.product_code
         result.append(item)
     
     return result
@@ -376,6 +416,7 @@ async def create_project_takeoff(
         unit=takeoff_data.get("unit", "EA"),
         notes=takeoff_data.get("description", ""),
         source_page=takeoff_data.get("source_page"),
+        source_bbox=takeoff_data.get("source_bbox"),
     )
 
     db.add(takeoff)
@@ -389,6 +430,7 @@ async def create_project_takeoff(
         "quantity": float(takeoff.qty) if takeoff.qty else 0,
         "unit": takeoff.unit,
         "source_page": takeoff.source_page,
+        "source_bbox": takeoff.source_bbox,
         "category": None,
         "quote_status": None,
     }
@@ -435,12 +477,45 @@ async def update_project_takeoff(
         "quantity": "qty",
         "unit": "unit",
         "source_page": "source_page",
+        "source_bbox": "source_bbox",
     }
 
     for frontend_field, model_field in field_mapping.items():
         if frontend_field in takeoff_data:
             setattr(takeoff, model_field, takeoff_data[frontend_field])
 
+    # Manual material override: price the item and remember the choice
+    if "matched_material_id" in takeoff_data:
+        material_id = takeoff_data["matched_material_id"]
+        if material_id:
+            material = db.query(Material).filter(
+                Material.id == material_id,
+                Material.company_id == current_user.company_id
+            ).first()
+
+            if not material:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Material not found"
+                )
+
+            takeoff.matched_material_id = material.id
+            takeoff.unit_price = material.unit_price
+            takeoff.total_price = Decimal(str(takeoff.qty or 0)) * material.unit_price
+            takeoff.match_confidence = 1
+            takeoff.match_source = "manual"
+            takeoff.match_fingerprint = None
+            match_memory.record(
+                db, str(current_user.company_id), [(takeoff.label, takeoff.unit, material.id, 1.0)]
+            )
+        else:
+            takeoff.matched_material_id = None
+            takeoff.unit_price = None
+            takeoff.total_price = None
+            takeoff.match_confidence = None
+            takeoff.match_source = None
+            takeoff.match_fingerprint = None
+
     db.commit()
     db.refresh(takeoff)
 
@@ -451,7 +526,11 @@ async def update_project_takeoff(
         "quantity": float(takeoff.qty) if takeoff.qty else 0,
         "unit": takeoff.unit,
         "source_page": takeoff.source_page,
+        "source_bbox": takeoff.source_bbox,
         "category": None,
+        "unit_price": float(takeoff.unit_price) if takeoff.unit_price else None,
+        "total_price": float(takeoff.total_price) if takeoff.total_price else None,
+        "matched_material_id": str(takeoff.matched_material_id) if takeoff.matched_material_id else None,
         "quote_status": None,
     }
 
@@ -557,10 +636,7 @@ async def generate_quote_pdf_from_takeoffs(
         )
     
     # Get matched takeoff items
-    takeoff_items = db.query(TakeoffItem).filter(
-        TakeoffItem.project_id == project_id,
-        TakeoffItem.matched_material_id.isnot(None)
-    ).all()
+    takeoff_items = takeoffs_with_materials(db, project_id, matched_only=True).all()
     
     if not takeoff_items:
         raise HTTPException(
@@ -575,16 +651,14 @@ async def generate_quote_pdf_from_takeoffs(
     line_items = []
     subtotal = Decimal("0")
     
-    for item in takeoff_items:
-        material = db.query(Material).filter(Material.id == item.matched_material_id).first()
-        
+    for item, product_code in takeoff_items:
         qty = float(item.qty) if item.qty else 0
         unit_price = float(item.unit_price) if item.unit_price else 0
         line_total = float(item.total_price) if item.total_price else 0
         
         line_items.append({
             "quantity": qty,
-            "product_code": material.product_code if material else "",
+            "product_code": product_code or "",
             "description": item.label,
             "unit_price": unit_price,
             "unit": item.unit or "ea",
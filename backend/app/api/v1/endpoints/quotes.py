@@ -8,6 +8,7 @@ from collections import defaultdict
 
 from app.core.database import get_db
 from app.core.security import get_current_user
+from app.core.pagination import COUNT_MODES, SortKey, count_rows, keyset_page, response_columns
 from app.models.user import User
 from app.models.estimation import Quote, TakeoffItem
 from app.models.vendor import Vendor
@@ -81,10 +82,16 @@ async def list_quotes(
     takeoff_item_id: Optional[UUID] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
+    count: str = Query("exact", pattern=COUNT_MODES),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """List all quotes for a project with optional filters"""
+    """
+    List all quotes for a project with optional filters, newest first
+
+    Pass next_cursor from the response as cursor to fetch the next page.
+    """
     # Verify project access
     project = db.query(Project).filter(
         Project.id == project_id,
@@ -106,10 +113,16 @@ async def list_quotes(
     if takeoff_item_id:
         query = query.filter(Quote.takeoff_item_id == takeoff_item_id)
 
-    total = query.count()
-    quotes = query.order_by(Quote.created_at.desc()).offset(skip).limit(limit).all()
+    total = count_rows(db, query, count)
+    quotes, next_cursor = keyset_page(
+        query.options(response_columns(Quote, QuoteResponse)),
+        [SortKey(Quote.created_at, "created_at", descending=True), SortKey(Quote.id, "id", descending=True)],
+        cursor,
+        limit,
+        offset=skip
+    )
 
-    return QuoteListResponse(total=total, quotes=quotes)
+    return QuoteListResponse(total=total, quotes=quotes, next_cursor=next_cursor)
 
 
 @router.get("/projects/{project_id}/quotes/{quote_id}", response_model=QuoteResponse)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, UploadFile, File
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
@@ -7,6 +7,7 @@ import io
 
 from app.core.database import get_db
 from app.core.security import get_current_user
+from app.core.pagination import COUNT_MODES, SortKey, count_rows, keyset_page, response_columns, set_page_headers
 from app.models.user import User
 from app.models.vendor import Vendor
 from app.api.v1.schemas.vendor import (
@@ -38,16 +39,24 @@ async def create_vendor(
 
 @router.get("", response_model=List[VendorResponse])
 async def list_vendors(
+    response: Response,
     category: Optional[str] = Query(None),
     is_active: Optional[bool] = Query(None),
     is_preferred: Optional[bool] = Query(None),
     search: Optional[str] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
+    count: str = Query("none", pattern=COUNT_MODES),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """List all company vendors with optional filters"""
+    """
+    List all company vendors with optional filters, ordered by name
+
+    The cursor for the next page is returned in the X-Next-Cursor header;
+    count=exact|estimated adds X-Total-Count.
+    """
     query = db.query(Vendor).filter(
         Vendor.company_id == current_user.company_id
     )
@@ -66,7 +75,14 @@ async def list_vendors(
             (Vendor.email.ilike(search_term))
         )
 
-    vendors = query.order_by(Vendor.name).offset(skip).limit(limit).all()
+    vendors, next_cursor = keyset_page(
+        query.options(response_columns(Vendor, VendorResponse)),
+        [SortKey(Vendor.name, "name"), SortKey(Vendor.id, "id")],
+        cursor,
+        limit,
+        offset=skip
+    )
+    set_page_headers(response, next_cursor, count_rows(db, query, count))
     return vendors
 
 
@@ -38,8 +38,9 @@ class ProjectResponse(ProjectBase):
 
 class ProjectListResponse(BaseModel):
     """List of projects with pagination"""
-    total: int
+    total: Optional[int] = None
     projects: List[ProjectResponse]
+    next_cursor: Optional[str] = None
 
 
 class ProjectDocumentResponse(BaseModel):
@@ -106,8 +106,9 @@ class QuoteRankingResult(BaseModel):
 
 class QuoteListResponse(BaseModel):
     """List of quotes"""
-    total: int
+    total: Optional[int] = None
     quotes: List[QuoteResponse]
+    next_cursor: Optional[str] = None
 
 
 class QuoteSummary(BaseModel):
@@ -19,6 +19,8 @@ class Settings(BaseSettings):
     # AI APIs
     ANTHROPIC_API_KEY: Optional[str] = None
     OPENAI_API_KEY: Optional[str] = None
+    ANTHROPIC_BASE_URL: Optional[str] = None
+    OPENAI_BASE_URL: Optional[str] = None
 
     # Google Cloud Document AI (optional)
     GOOGLE_APPLICATION_CREDENTIALS: Optional[str] = None
@@ -32,9 +34,15 @@ class Settings(BaseSettings):
     ENABLE_CLAUDE_PARSING: bool = True
     ENABLE_TESSERACT_PARSING: bool = True
 
+    # Material Matching
+    ENABLE_SEMANTIC_MATCHING: bool = True  # TF-IDF vector stage (local, CPU only)
+    SEMANTIC_MATCH_TOP_K: int = 10
+    SEMANTIC_MATCH_WEIGHT: float = 0.5  # Points of similarity added to the fuzzy score
+    MATCH_MEMORY_MIN_CONFIDENCE: float = 0.9  # Automatic matches remembered only at or above this
+
     # File Storage
     UPLOAD_DIR: str = "./uploads"
-    MAX_UPLOAD_SIZE: int = 50 * 1024 * 1024  # 50MB
+    MAX_UPLOAD_SIZE: int = 250 * 1024 * 1024  # 250MB (large plan sets)
 
     # CORS
     CORS_ORIGINS: list = ["http://localhost:3000", "http://localhost:5173"]
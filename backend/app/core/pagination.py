@@ -0,0 +1,201 @@
+"""
+Keyset pagination
+
+Listing endpoints page with opaque cursor tokens instead of OFFSET, so a
+deep page costs the same as the first one: the cursor carries the sort key
+of the last row returned and the next page starts strictly after it.
+
+Endpoints returning a plain list send the next cursor and the optional
+row count in the X-Next-Cursor and X-Total-Count headers; endpoints with
+an envelope return them as next_cursor and total.
+"""
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query, Session, load_only
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+# Accepted values of the count query parameter
+COUNT_MODES = "^(exact|estimated|none)$"
+
+
+@dataclass
+class SortKey:
+    """
+    One column of a keyset ordering
+
+    name is the attribute the value is read from on each result row (the
+    column name, or the label of a computed column).
+    """
+    column: Any
+    name: str
+    descending: bool = False
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return {"u": str(value)}
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "u" in value:
+            return UUID(value["u"])
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "n" in value:
+            return Decimal(value["n"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque token for a sort key"""
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Sort key from a token
+
+    Raises:
+        HTTPException: 400 if the token is malformed or does not fit the ordering
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError("cursor does not match ordering")
+        return [_decode_value(v) for v in values]
+    except (ValueError, TypeError, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def keyset_condition(keys: Sequence[SortKey], values: Sequence[Any]):
+    """
+    Rows strictly after a sort key
+
+    Expands (a, b, c) > (x, y, z) into an OR of prefix equalities so keys
+    may mix ascending and descending directions.
+    """
+    clauses = []
+    for index, key in enumerate(keys):
+        equal = [keys[i].column == values[i] for i in range(index)]
+        after = key.column < values[index] if key.descending else key.column > values[index]
+        clauses.append(and_(*equal, after))
+    return or_(*clauses)
+
+
+def keyset_page(
+    query: Query,
+    keys: Sequence[SortKey],
+    cursor: Optional[str],
+    limit: Optional[int],
+    offset: int = 0
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page of a query ordered by keys
+
+    The last key must be unique (usually the primary key) so the ordering
+    is total.
+
+    Args:
+        query: Filtered query, without ORDER BY, OFFSET or LIMIT
+        keys: Sort keys
+        cursor: Token from the previous page, or None for the first page
+        limit: Page size, or None for all remaining rows
+        offset: Legacy skip, only applied when there is no cursor
+
+    Returns:
+        Tuple of (rows, next page cursor or None on the last page)
+    """
+    if cursor:
+        query = query.filter(keyset_condition(keys, decode_cursor(cursor, len(keys))))
+
+    query = query.order_by(*(key.column.desc() if key.descending else key.column.asc() for key in keys))
+    if offset and not cursor:
+        query = query.offset(offset)
+
+    if limit is None:
+        return query.all(), None
+
+    rows = query.limit(limit + 1).all()
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, encode_cursor([_row_value(rows[-1], key.name) for key in keys])
+
+
+def count_rows(db: Session, query: Query, mode: str = "exact") -> Optional[int]:
+    """
+    Row count of a listing query
+
+    Args:
+        db: Database session
+        query: Filtered query, without ORDER BY, OFFSET or LIMIT
+        mode: exact (COUNT), estimated (planner row estimate on PostgreSQL,
+            exact elsewhere) or none
+
+    Returns:
+        Count, or None for mode none
+    """
+    if mode == "none":
+        return None
+
+    if mode == "estimated" and db.get_bind().dialect.name == "postgresql":
+        compiled = query.statement.compile(dialect=db.get_bind().dialect)
+        plan = db.connection().exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+        ).scalar()
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    return query.order_by(None).count()
+
+
+def set_page_headers(response: Response, next_cursor: Optional[str], total: Optional[int] = None) -> None:
+    """Next cursor and count headers for list-shaped responses"""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    if total is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(total)
+
+
+def response_columns(model: Any, schema: Any):
+    """
+    load_only() option for the model columns a response schema serializes
+
+    Listing queries load just these instead of every column of the row.
+    """
+    fields = schema.model_fields
+    return load_only(*(getattr(model, name) for name in model.__mapper__.column_attrs.keys() if name in fields))
+
+
+def _row_value(row: Any, name: str) -> Any:
+    """Attribute of a result row, looking inside the entity of (entity, extra) rows"""
+    if hasattr(row, name):
+        return getattr(row, name)
+    return getattr(row[0], name)
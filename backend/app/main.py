@@ -1,10 +1,12 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
 
 from app.core.config import settings
 from app.core.database import engine, Base
+from app.core.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+from app.ai.parsing.utils.telemetry import telemetry
 
 # Create FastAPI app
 app = FastAPI(
@@ -20,6 +22,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER],
 )
 
 # Create upload directories
@@ -53,6 +56,12 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics (document parsing stages, LLM usage, queue waits)"""
+    return Response(telemetry.metrics.render(), media_type=telemetry.PROMETHEUS_CONTENT_TYPE)
+
+
 # Import and include routers
 from app.api.v1.endpoints import auth, company, project, document, ai, estimation, equipment, vendor, import_data, quotes, quote_requests, discrepancies, specifications, materials, matching, estimate_generation, generated_quotes
 
@@ -5,7 +5,7 @@ from app.models.estimation import TakeoffItem, Quote, Estimate, HistoricalEstima
 from app.models.equipment import InternalEquipment
 from app.models.vendor import Vendor
 from app.models.specification import SpecificationLibrary, ProjectSpecification
-from app.models.material import Material
+from app.models.material import Material, MaterialMatchMemory
 
 __all__ = [
     "User",
@@ -29,4 +29,5 @@ __all__ = [
     "SpecificationLibrary",
     "ProjectSpecification",
     "Material",
+    "MaterialMatchMemory",
 ]
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, String, DateTime, func, ForeignKey, Numeric, Integer, Text, Date
+from sqlalchemy import Column, String, DateTime, func, ForeignKey, Numeric, Integer, Text, Date, JSON
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
 import uuid
 
 from app.core.database import Base
@@ -16,16 +17,26 @@ class TakeoffItem(Base):
     unit = Column(String, nullable=False)
     category = Column(String)  # Material category: Walls, Roofing, Sheathing, etc.
     source_page = Column(Integer)  # Page number from PDF
+    source_bbox = Column(JSON)  # {x, y, width, height} in PDF points, top-left origin
     notes = Column(String)
+
+    # Parse run that produced this item (NULL for manually entered items)
+    source_document_id = Column(UUID(as_uuid=True), ForeignKey("project_documents.id"))
+    parse_run_key = Column(String, index=True)  # Idempotency key per (document, parse run)
     
     # For matching to material catalog
     matched_material_id = Column(UUID(as_uuid=True), ForeignKey("materials.id"))
     unit_price = Column(Numeric(15, 2))  # Price from matched material
     total_price = Column(Numeric(15, 2))  # qty * unit_price
+    match_confidence = Column(Numeric(4, 3))  # Confidence of the applied match (0-1)
+    match_source = Column(String)  # auto, manual
+    match_fingerprint = Column(String)  # Hash of label/unit/category + catalog revision when auto-matched
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    matched_material = relationship("Material")
+
 
 class Quote(Base):
     __tablename__ = "quotes"
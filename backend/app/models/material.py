@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, func, ForeignKey, Numeric, Text, Boolean
+from sqlalchemy import Column, String, DateTime, func, ForeignKey, Numeric, Text, Boolean, Integer, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 
@@ -42,3 +42,35 @@ class Material(Base):
 
     def __repr__(self):
         return f"<Material {self.product_code}: {self.description} @ ${self.unit_price}/{self.unit}>"
+
+
+class MaterialMatchMemory(Base):
+    """
+    Accepted takeoff-to-material matches
+
+    Remembers which catalog material a company's estimators chose for a
+    takeoff label, so the same label on later takeoffs matches directly.
+    Labels and units are stored normalized (see app.services.match_memory).
+    """
+    __tablename__ = "material_match_memory"
+    __table_args__ = (
+        UniqueConstraint("company_id", "label_key", "unit_key", name="uq_material_match_memory_key"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id"), nullable=False, index=True)
+
+    # Normalized takeoff label and unit ("" when the takeoff had no unit)
+    label_key = Column(String, nullable=False)
+    unit_key = Column(String, nullable=False, default="")
+
+    material_id = Column(UUID(as_uuid=True), ForeignKey("materials.id", ondelete="CASCADE"), nullable=False)
+    accept_count = Column(Integer, nullable=False, default=1)  # Times this match was applied or chosen
+    confidence = Column(Numeric(4, 3), nullable=False, default=1)  # Best confidence it was accepted with (1 = manual)
+    last_accepted_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<MaterialMatchMemory {self.label_key} ({self.unit_key}) -> {self.material_id} x{self.accept_count}>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, func, ForeignKey, Numeric, Date
+from sqlalchemy import Column, String, DateTime, func, ForeignKey, Numeric, Date, JSON
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 
@@ -30,6 +30,7 @@ class ProjectDocument(Base):
     file_name = Column(String)  # Original filename for display
     file_path = Column(String, nullable=False)
     is_parsed = Column(String, default="false")  # Whether AI has parsed this document
+    page_fingerprints = Column(JSON)  # Per-page text/perceptual hashes for addendum diffs
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
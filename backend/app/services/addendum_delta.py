@@ -0,0 +1,471 @@
+"""
+Addendum Delta Service
+
+Parses an addendum against the plan set already parsed for its project.
+Pages are fingerprinted and matched to prior sheets; only changed and new
+pages are parsed, and the result is compared with the existing takeoff to
+produce a delta (added items, removed items, changed quantities) instead of
+appending the whole addendum as new items.
+"""
+
+import asyncio
+import logging
+import re
+import time
+import uuid
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import exists, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.ai.parsing.utils.concurrency import cpu_budget
+from app.ai.parsing.utils.page_fingerprint import CHANGED, NEW, fingerprint_pages, match_pages
+from app.ai.plan_parser import plan_parser
+from app.models.estimation import (
+    BidItemDiscrepancy,
+    GeneratedQuoteLineItem,
+    Quote,
+    TakeoffItem,
+)
+from app.models.project import ProjectDocument
+from app.services.file_storage import file_storage
+from app.services.takeoff_persistence import takeoff_persistence
+
+logger = logging.getLogger(__name__)
+
+# Documents whose pages an addendum can revise
+PLAN_DOC_TYPES = ["plan", "plan_and_spec", "addendum"]
+
+# Quantities closer than this are considered equal
+QUANTITY_TOLERANCE = Decimal("0.005")
+
+
+class AddendumDeltaService:
+    """
+    Diff an addendum against previously parsed plan documents
+    """
+
+    async def ensure_fingerprints(self, document: ProjectDocument) -> List[Dict[str, Any]]:
+        """
+        Fingerprint a document's pages, computing and storing them if missing
+
+        Does not commit; the caller owns the transaction.
+
+        Args:
+            document: Project document with a file on disk
+
+        Returns:
+            Page fingerprints
+        """
+        if document.page_fingerprints:
+            return document.page_fingerprints
+
+        file_path = file_storage.get_file_path(document.file_path)
+        fingerprints = await cpu_budget.run(fingerprint_pages, file_path)
+        document.page_fingerprints = fingerprints
+        return fingerprints
+
+    def prior_documents(self, db: Session, addendum: ProjectDocument) -> List[ProjectDocument]:
+        """
+        Parsed plan documents of the project uploaded before the addendum
+
+        Args:
+            db: Database session
+            addendum: Addendum document
+
+        Returns:
+            Documents, oldest first
+        """
+        query = db.query(ProjectDocument).filter(
+            ProjectDocument.project_id == addendum.project_id,
+            ProjectDocument.id != addendum.id,
+            ProjectDocument.doc_type.in_(PLAN_DOC_TYPES),
+            ProjectDocument.is_parsed == "true",
+        )
+        if addendum.uploaded_at is not None:
+            query = query.filter(ProjectDocument.uploaded_at <= addendum.uploaded_at)
+
+        return query.order_by(ProjectDocument.uploaded_at).all()
+
+    async def parse_addendum(
+        self,
+        db: Session,
+        project_id: str,
+        addendum: ProjectDocument,
+        file_path: Path,
+        save: bool = True,
+        run_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Parse the changed and new pages of an addendum and diff the takeoff
+
+        Args:
+            db: Database session
+            project_id: Project the addendum belongs to
+            addendum: Addendum document
+            file_path: Path of the addendum PDF
+            save: Apply the delta (insert added items, update changed
+                quantities, delete removed items) and mark the addendum parsed
+            run_id: Optional parse run identifier for the inserted items
+
+        Returns:
+            Dictionary with the page report, the delta and counts. Does not
+            commit; the caller owns the transaction.
+        """
+        start_time = time.time()
+
+        # Step 1: Match addendum pages to the sheets already parsed
+        prior_documents = self.prior_documents(db, addendum)
+        prior_sets = []
+        for document in prior_documents:
+            if not file_storage.file_exists(document.file_path) and not document.page_fingerprints:
+                continue
+            prior_sets.append({
+                "document_id": str(document.id),
+                "fingerprints": await self.ensure_fingerprints(document),
+            })
+
+        fingerprints = await self.ensure_fingerprints(addendum)
+        page_matches = match_pages(fingerprints, prior_sets)
+        pages_to_parse = [match["page"] for match in page_matches if match["status"] in (CHANGED, NEW)]
+
+        logger.info(
+            f"[ADDENDUM] {len(page_matches)} pages against {len(prior_sets)} prior documents: "
+            f"{len(pages_to_parse)} changed or new"
+        )
+
+        # Step 2: Parse only the changed and new pages, one page per call so
+        # every item is attributed to its sheet
+        parsed_data, failures = await self._parse_pages(file_path, pages_to_parse)
+
+        # Step 3: Diff against the existing takeoff
+        rows = takeoff_persistence.build_rows(project_id, parsed_data, addendum.id)
+        delta = self.compute_delta(db, project_id, rows, page_matches)
+
+        result = {
+            "pages": page_matches,
+            "pages_parsed": len(pages_to_parse) - len(failures),
+            "pages_failed": failures,
+            "pages_skipped": len(page_matches) - len(pages_to_parse),
+            "delta": {
+                "added": [self._row_summary(row) for row in delta["added"]],
+                "removed": [self._item_summary(item) for item in delta["removed"]],
+                "changed": [
+                    {**self._item_summary(item), "previous_qty": float(item.qty), "qty": float(qty)}
+                    for item, qty in delta["changed"]
+                ],
+                "unchanged": delta["unchanged"],
+            },
+            "items_added": 0,
+            "items_updated": 0,
+            "items_removed": 0,
+        }
+
+        if save and not failures:
+            result.update(self.apply_delta(db, addendum, parsed_data, delta, run_id))
+
+        result["processing_time_ms"] = int((time.time() - start_time) * 1000)
+        return result
+
+    async def _parse_pages(
+        self,
+        file_path: Path,
+        pages: List[int]
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], List[int]]:
+        """
+        Parse pages concurrently (bounded by the shared LLM and CPU budgets)
+
+        Returns:
+            Tuple of (combined bid_items/materials, pages that failed)
+        """
+        results = await asyncio.gather(*(
+            plan_parser.parse_plan(file_path, max_pages=1, pages=[page])
+            for page in pages
+        ))
+
+        combined = {"bid_items": [], "materials": []}
+        failures = []
+
+        for page, result in zip(pages, results):
+            if not result.get("success", False):
+                logger.warning(f"[ADDENDUM] Page {page} failed: {result.get('error')}")
+                failures.append(page)
+                continue
+
+            # OCR text has no items to diff; an empty sheet would remove
+            # everything previously taken off it
+            if result.get("method") == "ocr":
+                logger.warning(f"[ADDENDUM] Page {page} only yielded OCR text, no structured items")
+                failures.append(page)
+                continue
+
+            data = result.get("data") or {}
+            for key in ("bid_items", "materials"):
+                for item in data.get(key, []) or []:
+                    item.setdefault("source_page", page)
+                    combined[key].append(item)
+
+        return combined, failures
+
+    def compute_delta(
+        self,
+        db: Session,
+        project_id: str,
+        rows: List[Dict[str, Any]],
+        page_matches: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Compare parsed rows with the existing takeoff of the revised sheets
+
+        Args:
+            db: Database session
+            project_id: Project ID
+            rows: takeoff_items rows built from the addendum pages
+            page_matches: Page report from match_pages
+
+        Returns:
+            Delta as for diff_rows()
+        """
+        revised_sheets = {
+            (match["prior_document_id"], match["prior_page"])
+            for match in page_matches
+            if match["status"] == CHANGED
+        }
+
+        existing: List[TakeoffItem] = []
+        if revised_sheets:
+            document_ids = {uuid.UUID(str(document_id)) for document_id, _ in revised_sheets}
+            # Rows saved before items recorded their source have no document
+            existing = db.execute(
+                select(TakeoffItem).where(
+                    TakeoffItem.project_id == project_id,
+                    or_(
+                        TakeoffItem.source_document_id.in_(document_ids),
+                        TakeoffItem.source_document_id.is_(None),
+                    ),
+                )
+            ).scalars().all()
+
+        return self.diff_rows(existing, rows, page_matches)
+
+    def diff_rows(
+        self,
+        existing: List[Any],
+        rows: List[Dict[str, Any]],
+        page_matches: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Diff parsed addendum rows against takeoff items
+
+        Rows from a changed page are compared only with the items of the
+        sheet it revises (its matched prior document and page), keyed by
+        normalized label and unit, with quantities totalled per key on the
+        sheet. Rows from new pages (or pages of unknown origin) are added.
+        An item on a revised sheet that the addendum no longer shows is
+        removed; items on other sheets are never touched.
+
+        Items without a page (multi-page vision parses, or rows saved
+        before sources were recorded) cannot be placed on a sheet. A
+        revised row with no item on its sheet falls back to them by key,
+        within its prior document first and then among items without a
+        document. They are updated but never removed, since the addendum
+        may not cover every sheet they were taken from.
+
+        Args:
+            existing: Existing takeoff items (only those on revised sheets,
+                or without a page, are used)
+            rows: takeoff_items rows built from the addendum pages
+            page_matches: Page report from match_pages
+
+        Returns:
+            Dictionary with added rows, removed items, changed (item, qty)
+            pairs and the unchanged count
+        """
+        sheet_of_page = {
+            match["page"]: (match["prior_document_id"], match["prior_page"])
+            for match in page_matches
+            if match["status"] == CHANGED
+        }
+
+        revised_sheets = set(sheet_of_page.values())
+        revised_documents = {document_id for document_id, _ in revised_sheets}
+
+        existing_by_key: Dict[Tuple, List[Any]] = {}
+        pageless_by_key: Dict[Tuple, List[Any]] = {}
+        for item in existing:
+            document_id = str(item.source_document_id) if item.source_document_id else None
+            key = self._key(item.label, item.unit)
+
+            if item.source_page is None:
+                if document_id is None or document_id in revised_documents:
+                    pageless_by_key.setdefault((document_id, key), []).append(item)
+                continue
+
+            sheet = (document_id, item.source_page)
+            if sheet in revised_sheets:
+                existing_by_key.setdefault((sheet, key), []).append(item)
+
+        # One row per key and sheet (revised) or addendum page (new), with
+        # the quantities of repeated rows summed
+        revised: Dict[Tuple, Dict[str, Any]] = {}
+        new: Dict[Tuple, Dict[str, Any]] = {}
+        for row in rows:
+            sheet = sheet_of_page.get(row.get("source_page"))
+            bucket = new if sheet is None else revised
+            group = (sheet or row.get("source_page"), self._key(row["label"], row["unit"]))
+
+            if group in bucket:
+                bucket[group]["qty"] += self._decimal(row["qty"])
+            else:
+                bucket[group] = {**row, "qty": self._decimal(row["qty"])}
+
+        added = list(new.values())
+        removed, changed = [], []
+        unchanged = 0
+
+        # Revised rows with no item on their sheet, totalled per pageless
+        # group they fall back to
+        fallback: Dict[Tuple, Dict[str, Any]] = {}
+
+        for group, row in revised.items():
+            items = existing_by_key.get(group)
+            if not items:
+                (document_id, _), key = group
+                target = next(
+                    (candidate for candidate in ((document_id, key), (None, key)) if candidate in pageless_by_key),
+                    None
+                )
+                if target is None:
+                    added.append(row)
+                elif target in fallback:
+                    fallback[target]["qty"] += row["qty"]
+                else:
+                    fallback[target] = dict(row)
+                continue
+
+            current = sum((Decimal(item.qty) for item in items), Decimal(0))
+            if abs(current - row["qty"]) <= QUANTITY_TOLERANCE:
+                unchanged += 1
+                continue
+
+            # Repeated items on the sheet collapse into the first one
+            changed.append((items[0], row["qty"]))
+            removed.extend(items[1:])
+
+        for group, items in existing_by_key.items():
+            if group not in revised:
+                removed.extend(items)
+
+        for target, row in fallback.items():
+            items = pageless_by_key[target]
+            current = sum((Decimal(item.qty) for item in items), Decimal(0))
+            if abs(current - row["qty"]) <= QUANTITY_TOLERANCE:
+                unchanged += 1
+                continue
+            changed.append((items[0], row["qty"]))
+            removed.extend(items[1:])
+
+        return {"added": added, "removed": removed, "changed": changed, "unchanged": unchanged}
+
+    def apply_delta(
+        self,
+        db: Session,
+        addendum: ProjectDocument,
+        parsed_data: Dict[str, Any],
+        delta: Dict[str, Any],
+        run_id: Optional[str] = None
+    ) -> Dict[str, int]:
+        """
+        Write a delta to the takeoff and mark the addendum parsed
+
+        Removed items already referenced by quotes or discrepancy records are
+        kept. Does not commit; the caller owns the transaction.
+
+        Returns:
+            Dictionary with items_added, items_updated and items_removed
+        """
+        parse_run_key = takeoff_persistence.build_parse_run_key(str(addendum.id), parsed_data, run_id)
+        label = addendum.file_name or "addendum"
+
+        added = delta["added"]
+        if added:
+            db.execute(insert(TakeoffItem).values([
+                {**row, "parse_run_key": parse_run_key} for row in added
+            ]))
+
+        for item, qty in delta["changed"]:
+            item.notes = f"{item.notes or ''} | Qty revised by {label} (was {item.qty})".lstrip(" |")
+            item.qty = qty
+            if item.unit_price is not None:
+                item.total_price = qty * item.unit_price
+
+        removed = 0
+        removable_ids = [item.id for item in delta["removed"]]
+        if removable_ids:
+            referenced = set(db.execute(
+                select(TakeoffItem.id).where(
+                    TakeoffItem.id.in_(removable_ids),
+                    exists().where(Quote.takeoff_item_id == TakeoffItem.id)
+                    | exists().where(GeneratedQuoteLineItem.takeoff_item_id == TakeoffItem.id)
+                    | exists().where(BidItemDiscrepancy.takeoff_item_id == TakeoffItem.id)
+                )
+            ).scalars().all())
+
+            for item in delta["removed"]:
+                if item.id not in referenced:
+                    db.delete(item)
+                    removed += 1
+
+        addendum.is_parsed = "true"
+
+        logger.info(
+            f"[ADDENDUM] Applied delta: {len(added)} added, "
+            f"{len(delta['changed'])} updated, {removed} removed"
+        )
+
+        return {
+            "items_added": len(added),
+            "items_updated": len(delta["changed"]),
+            "items_removed": removed,
+            "parse_run_key": parse_run_key,
+        }
+
+    @staticmethod
+    def _key(label: Any, unit: Any) -> Tuple[str, str]:
+        """Lowercase and collapse whitespace for matching"""
+        def normalize(value: Any) -> str:
+            return re.sub(r"\s+", " ", str(value or "")).strip().lower()
+        return normalize(label), normalize(unit)
+
+    @staticmethod
+    def _decimal(value: Any) -> Decimal:
+        try:
+            return Decimal(str(value).replace(",", ""))
+        except Exception:
+            return Decimal(0)
+
+    @staticmethod
+    def _row_summary(row: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "label": row["label"],
+            "qty": float(AddendumDeltaService._decimal(row["qty"])),
+            "unit": row["unit"],
+            "source_page": row.get("source_page"),
+        }
+
+    @staticmethod
+    def _item_summary(item: TakeoffItem) -> Dict[str, Any]:
+        return {
+            "takeoff_item_id": str(item.id),
+            "label": item.label,
+            "qty": float(item.qty),
+            "unit": item.unit,
+            "source_document_id": str(item.source_document_id) if item.source_document_id else None,
+            "source_page": item.source_page,
+        }
+
+
+# Singleton instance
+addendum_delta = AddendumDeltaService()
@@ -0,0 +1,412 @@
+"""
+Catalog Search Service
+
+Material catalog search for the catalog UI:
+
+- contains: substring match on product code or description
+- prefix: product code or description starting with the query
+- fulltext: ranked word search over code, description and manufacturer
+- typeahead: a few suggestions per keystroke, code prefixes first
+
+On PostgreSQL the queries are served by pg_trgm GIN indexes (substring and
+prefix ILIKE) and a weighted tsvector column with ts_rank_cd ranking, both
+added by migrate_materials_search.py. Other databases (SQLite in tests), and
+full-text search on a database that has not been migrated, use an
+in-process index of the company's catalog instead.
+
+Results page with keyset cursors (app.core.pagination).
+"""
+
+import bisect
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Numeric, cast, func, literal_column, text
+from sqlalchemy.orm import Session
+
+from app.core.pagination import SortKey, decode_cursor, encode_cursor, keyset_page
+from app.models.material import Material
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MODES = ("contains", "prefix", "fulltext")
+
+# Text search configuration of the search_vector column
+TEXT_SEARCH_CONFIG = "english"
+
+# Field weights of the in-process full-text index (mirrors the A/B/C
+# weights of the search_vector column)
+_FIELD_WEIGHTS = (("product_code", 3.0), ("description", 2.0), ("manufacturer", 1.0))
+
+# Company catalogs indexed in process, most recently used last
+_INDEX_ENTRIES = 16
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Precedes each field in the in-process substring haystack
+_FIELD = "\x1f"
+
+
+def _like_pattern(value: str, prefix_only: bool = False) -> str:
+    """LIKE pattern matching value literally (escape % and _)"""
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%" if prefix_only else f"%{escaped}%"
+
+
+def _clean(value: Optional[str]) -> str:
+    """Lowercased text without the in-process haystack separator"""
+    return (value or "").lower().replace(_FIELD, " ")
+
+
+def _tokens(value: Optional[str]) -> List[str]:
+    return _TOKEN_PATTERN.findall((value or "").lower())
+
+
+class _CatalogIndex:
+    """
+    In-memory search structures over one company's catalog
+
+    Entries are stored in (code, id) order, so substring and prefix matches
+    come out of one scan already in result order. The scan is a str.find
+    loop over a single haystack holding every code and description, each
+    field preceded by a separator character.
+    """
+
+    def __init__(self, rows: Sequence[Any]):
+        """
+        Args:
+            rows: (id, product_code, description, manufacturer, category, is_active)
+        """
+        rows = sorted(rows, key=lambda row: ((row.product_code or "").lower(), str(row.id)))
+
+        self.ids = [row.id for row in rows]
+        self.keys = [((row.product_code or "").lower(), str(row.id)) for row in rows]
+        self.categories = [row.category for row in rows]
+        self.active = [bool(row.is_active) for row in rows]
+
+        # Haystack: FIELD code FIELD description per entry; offsets[e] is
+        # where entry e starts
+        parts = []
+        self.offsets = []
+        position = 0
+        for row in rows:
+            part = f"{_FIELD}{_clean(row.product_code)}{_FIELD}{_clean(row.description)}"
+            self.offsets.append(position)
+            parts.append(part)
+            position += len(part)
+        self.haystack = "".join(parts)
+
+        # token -> {entry: weight}
+        self.postings: Dict[str, Dict[int, float]] = {}
+        for entry, row in enumerate(rows):
+            for field, weight in _FIELD_WEIGHTS:
+                for token in _tokens(getattr(row, field)):
+                    postings = self.postings.setdefault(token, {})
+                    postings[entry] = postings.get(entry, 0.0) + weight
+
+    def _allowed(self, entry: int, category: Optional[str], is_active: Optional[bool]) -> bool:
+        if category and self.categories[entry] != category:
+            return False
+        if is_active is not None and self.active[entry] != is_active:
+            return False
+        return True
+
+    def _scan(self, needle: str, start: int, wanted: Callable[[int], bool], limit: Optional[int]) -> List[int]:
+        """Entries from start on whose haystack contains needle, in entry order"""
+        entries = []
+        haystack, offsets = self.haystack, self.offsets
+        position = haystack.find(needle, offsets[start]) if start < len(offsets) else -1
+        while position != -1 and (limit is None or len(entries) < limit):
+            entry = bisect.bisect_right(offsets, position) - 1
+            if wanted(entry):
+                entries.append(entry)
+            # Skip to the next entry; one hit per entry is enough
+            next_start = offsets[entry + 1] if entry + 1 < len(offsets) else len(haystack)
+            position = haystack.find(needle, next_start)
+        return entries
+
+    def ranked(
+        self,
+        query: str,
+        mode: str,
+        category: Optional[str] = None,
+        is_active: Optional[bool] = True,
+        after: Optional[Tuple] = None,
+        limit: Optional[int] = None
+    ) -> List[Tuple[Tuple, Any]]:
+        """
+        Matching entries as (sort key, material ID), in result order
+
+        Sort keys are (code, id) for contains/prefix and (-score, id) for
+        fulltext, matching the SQL orderings.
+
+        Args:
+            after: Only entries sorting after this key (keyset cursor)
+            limit: Stop after this many entries
+        """
+        needle = _clean(query)
+        if not needle:
+            return []
+
+        def wanted(entry: int) -> bool:
+            return self._allowed(entry, category, is_active)
+
+        if mode != "fulltext":
+            start = bisect.bisect_right(self.keys, after) if after else 0
+            entries = self._scan(_FIELD + needle if mode == "prefix" else needle, start, wanted, limit)
+            return [(self.keys[entry], self.ids[entry]) for entry in entries]
+
+        scores: Optional[Dict[int, float]] = None
+        for token in _tokens(needle):
+            postings = self.postings.get(token, {})
+            if scores is None:
+                scores = dict(postings)
+            else:
+                scores = {e: s + postings[e] for e, s in scores.items() if e in postings}
+
+        matches = [
+            ((-round(score, 6), self.keys[entry][1]), self.ids[entry])
+            for entry, score in (scores or {}).items()
+            if wanted(entry)
+        ]
+        matches.sort(key=lambda match: match[0])
+
+        if after:
+            matches = matches[bisect.bisect_right([key for key, _ in matches], after):]
+        return matches[:limit] if limit is not None else matches
+
+
+class CatalogSearchService:
+    """
+    Search a company's material catalog
+    """
+
+    def __init__(self):
+        self._sql_ready: Dict[str, bool] = {}
+        self._indexes: "OrderedDict[str, Tuple[Tuple, _CatalogIndex]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _is_postgres(self, db: Session) -> bool:
+        return db.get_bind().dialect.name == "postgresql"
+
+    def fulltext_ready(self, db: Session) -> bool:
+        """Whether the database has pg_trgm and the materials.search_vector column"""
+        if not self._is_postgres(db):
+            return False
+
+        key = str(db.get_bind().url)
+        if key not in self._sql_ready:
+            row = db.execute(text("""
+                SELECT
+                    EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'),
+                    EXISTS (
+                        SELECT 1 FROM information_schema.columns
+                        WHERE table_name = 'materials' AND column_name = 'search_vector'
+                    )
+            """)).one()
+            self._sql_ready[key] = bool(row[0] and row[1])
+            if not self._sql_ready[key]:
+                logger.warning(
+                    "Catalog search indexes missing (run migrate_materials_search.py); "
+                    "full-text search uses the in-process index"
+                )
+        return self._sql_ready[key]
+
+    @staticmethod
+    def contains_condition(query: str):
+        """Substring match on product code or description (pg_trgm indexable)"""
+        pattern = _like_pattern(query)
+        return Material.product_code.ilike(pattern, escape="\\") | Material.description.ilike(pattern, escape="\\")
+
+    @staticmethod
+    def code_prefix_condition(query: str):
+        """Product code starting with query (served by the lower(product_code) pattern index)"""
+        return func.lower(Material.product_code).like(_like_pattern(query.lower(), prefix_only=True), escape="\\")
+
+    @classmethod
+    def prefix_condition(cls, query: str):
+        """Product code or description starting with query"""
+        pattern = _like_pattern(query, prefix_only=True)
+        return cls.code_prefix_condition(query) | Material.description.ilike(pattern, escape="\\")
+
+    def search(
+        self,
+        db: Session,
+        company_id: Any,
+        query: str,
+        mode: str = "contains",
+        category: Optional[str] = None,
+        is_active: Optional[bool] = True,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Material], Optional[str]]:
+        """
+        Search the catalog
+
+        Args:
+            db: Database session
+            company_id: Company ID
+            query: Search text
+            mode: contains, prefix or fulltext
+            category: Optional category filter
+            is_active: Active filter (None for all)
+            limit: Page size
+            cursor: Cursor from the previous page
+
+        Returns:
+            Tuple of (materials, next page cursor or None)
+        """
+        query = query.strip()
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+
+        if self._is_postgres(db) and (mode != "fulltext" or self.fulltext_ready(db)):
+            return self._search_sql(db, company_id, query, mode, category, is_active, limit, cursor)
+
+        return self._search_in_process(db, company_id, query, mode, category, is_active, limit, cursor)
+
+    def _search_sql(
+        self,
+        db: Session,
+        company_id: Any,
+        query: str,
+        mode: str,
+        category: Optional[str],
+        is_active: Optional[bool],
+        limit: int,
+        cursor: Optional[str]
+    ) -> Tuple[List[Material], Optional[str]]:
+        filters = [Material.company_id == company_id]
+        if category:
+            filters.append(Material.category == category)
+        if is_active is not None:
+            filters.append(Material.is_active == is_active)
+
+        if mode == "fulltext":
+            tsquery = func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, query)
+            vector = literal_column("materials.search_vector")
+            # Rounded numeric so the cursor value compares exactly
+            rank = func.round(cast(func.ts_rank_cd(vector, tsquery), Numeric), 6)
+
+            rows, next_cursor = keyset_page(
+                db.query(Material, rank.label("rank")).filter(*filters, vector.op("@@")(tsquery)),
+                [SortKey(rank, "rank", descending=True), SortKey(Material.id, "id")],
+                cursor,
+                limit,
+            )
+            return [row[0] for row in rows], next_cursor
+
+        condition = self.prefix_condition(query) if mode == "prefix" else self.contains_condition(query)
+        return keyset_page(
+            db.query(Material).filter(*filters, condition),
+            [SortKey(Material.product_code, "product_code"), SortKey(Material.id, "id")],
+            cursor,
+            limit,
+        )
+
+    def _search_in_process(
+        self,
+        db: Session,
+        company_id: Any,
+        query: str,
+        mode: str,
+        category: Optional[str],
+        is_active: Optional[bool],
+        limit: int,
+        cursor: Optional[str]
+    ) -> Tuple[List[Material], Optional[str]]:
+        after = tuple(decode_cursor(cursor, 2)) if cursor else None
+        matches = self._index(db, company_id).ranked(query, mode, category, is_active, after, limit + 1)
+
+        page = matches[:limit]
+        next_cursor = encode_cursor(list(page[-1][0])) if len(matches) > limit else None
+
+        ids = [material_id for _, material_id in page]
+        if not ids:
+            return [], None
+
+        by_id = {m.id: m for m in db.query(Material).filter(Material.id.in_(ids)).all()}
+        return [by_id[i] for i in ids if i in by_id], next_cursor
+
+    def _index(self, db: Session, company_id: Any) -> _CatalogIndex:
+        """In-process index of a company's catalog, rebuilt when the catalog changes"""
+        signature = tuple(db.query(
+            func.count(Material.id),
+            func.max(func.coalesce(Material.updated_at, Material.created_at))
+        ).filter(Material.company_id == company_id).one())
+        key = str(company_id)
+
+        with self._lock:
+            cached = self._indexes.get(key)
+            if cached and cached[0] == signature:
+                self._indexes.move_to_end(key)
+                return cached[1]
+
+        rows = db.query(
+            Material.id,
+            Material.product_code,
+            Material.description,
+            Material.manufacturer,
+            Material.category,
+            Material.is_active
+        ).filter(Material.company_id == company_id).all()
+        index = _CatalogIndex(rows)
+
+        with self._lock:
+            self._indexes[key] = (signature, index)
+            while len(self._indexes) > _INDEX_ENTRIES:
+                self._indexes.popitem(last=False)
+
+        return index
+
+    def typeahead(self, db: Session, company_id: Any, query: str, limit: int = 10) -> List[Any]:
+        """
+        Suggestions for a partially typed query
+
+        Product codes starting with the query come first, then descriptions
+        containing it (most similar first where pg_trgm is available).
+
+        Returns:
+            Rows with id, product_code, description, category, unit and unit_price
+        """
+        query = query.strip()
+        if not query:
+            return []
+
+        columns = (
+            Material.id,
+            Material.product_code,
+            Material.description,
+            Material.category,
+            Material.unit,
+            Material.unit_price,
+        )
+
+        if not self._is_postgres(db):
+            index = self._index(db, company_id)
+            ids = [i for _, i in index.ranked(query, "prefix", limit=limit)]
+            seen = set(ids)
+            ids += [i for _, i in index.ranked(query, "contains", limit=2 * limit) if i not in seen][:limit - len(ids)]
+            if not ids:
+                return []
+            by_id = {row.id: row for row in db.query(*columns).filter(Material.id.in_(ids)).all()}
+            return [by_id[i] for i in ids if i in by_id]
+
+        code_prefix = self.code_prefix_condition(query)
+        ordering = [code_prefix.desc()]
+        if self.fulltext_ready(db):
+            ordering.append(func.similarity(Material.description, query).desc())
+        ordering.append(Material.product_code)
+
+        return db.query(*columns).filter(
+            Material.company_id == company_id,
+            Material.is_active == True,
+            code_prefix | Material.description.ilike(_like_pattern(query), escape="\\")
+        ).order_by(*ordering).limit(limit).all()
+
+
+# Singleton instance
+catalog_search = CatalogSearchService()
@@ -3,10 +3,17 @@ import uuid
 from pathlib import Path
 from typing import Optional
 from fastapi import UploadFile
-import shutil
 
 from app.core.config import settings
 
+# Uploads are copied in chunks so a large plan set is never held in memory
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+class FileTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured size limit"""
+    pass
+
 
 class FileStorage:
     """
@@ -26,7 +33,8 @@ class FileStorage:
         self,
         file: UploadFile,
         doc_type: str,
-        project_id: str
+        project_id: str,
+        max_size: Optional[int] = None
     ) -> str:
         """
         Save uploaded file to disk
@@ -35,10 +43,16 @@ class FileStorage:
             file: FastAPI UploadFile object
             doc_type: Type of document (plan, spec)
             project_id: Project ID for organization
+            max_size: Maximum size in bytes (default settings.MAX_UPLOAD_SIZE)
 
         Returns:
             Relative file path
+
+        Raises:
+            FileTooLargeError: If the upload exceeds max_size
         """
+        max_size = max_size or settings.MAX_UPLOAD_SIZE
+
         # Determine directory based on doc type
         if doc_type == "plan":
             target_dir = self.plans_dir
@@ -56,9 +70,20 @@ class FileStorage:
         unique_filename = f"{uuid.uuid4()}{file_extension}"
         file_path = project_dir / unique_filename
 
-        # Save file
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Save file chunk by chunk, stopping as soon as the limit is passed
+        written = 0
+        try:
+            with open(file_path, "wb") as buffer:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    written += len(chunk)
+                    if written > max_size:
+                        raise FileTooLargeError(
+                            f"File exceeds the {max_size // (1024 * 1024)}MB upload limit"
+                        )
+                    buffer.write(chunk)
+        except Exception:
+            file_path.unlink(missing_ok=True)
+            raise
 
         # Return relative path from upload dir
         relative_path = file_path.relative_to(self.upload_dir)
@@ -0,0 +1,157 @@
+"""
+Match Memory Service
+
+Learned takeoff-to-material matches. When an estimator picks a material by
+hand, or an automatic match clears MATCH_MEMORY_MIN_CONFIDENCE, the
+(company, label, unit) -> material choice is remembered with an acceptance
+count and confidence, and MaterialMatcher consults the memory before any
+fuzzy scoring. Repeat customers send the same labels job after job
+("Pine #2 (2x4-14 Nominal)"), so most of their takeoff matches from memory
+with a dictionary lookup.
+"""
+
+import logging
+import re
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import case, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.ai.parsing.output_normalizer import OutputNormalizer
+from app.models.material import MaterialMatchMemory
+
+logger = logging.getLogger(__name__)
+
+# (label_key, unit_key) -> (material_id, accept_count, confidence)
+MemoryIndex = Dict[Tuple[str, str], Tuple[str, int, float]]
+
+
+def memory_key(label: Optional[str], unit: Optional[str]) -> Tuple[str, str]:
+    """
+    Normalized (label, unit) key for a takeoff item
+
+    Labels are lowercased with whitespace collapsed; units are mapped to
+    their canonical form so "each" and "EA" share an entry.
+    """
+    label_key = re.sub(r"\s+", " ", label or "").strip().lower()
+    unit_key = (OutputNormalizer.canonical_unit(unit) or "").lower()
+    return label_key, unit_key
+
+
+class MatchMemoryService:
+    """
+    Read and write a company's learned matches
+    """
+
+    def load(self, db: Session, company_id: str) -> MemoryIndex:
+        """
+        Load a company's match memory into a lookup dictionary
+
+        Args:
+            db: Database session
+            company_id: Company ID
+
+        Returns:
+            Dictionary mapping (label_key, unit_key) to (material_id,
+            accept_count, confidence)
+        """
+        rows = db.query(
+            MaterialMatchMemory.label_key,
+            MaterialMatchMemory.unit_key,
+            MaterialMatchMemory.material_id,
+            MaterialMatchMemory.accept_count,
+            MaterialMatchMemory.confidence,
+        ).filter(
+            MaterialMatchMemory.company_id == company_id
+        ).all()
+
+        return {
+            (label_key, unit_key): (
+                str(material_id),
+                accept_count,
+                float(confidence) if confidence is not None else 1.0,
+            )
+            for label_key, unit_key, material_id, accept_count, confidence in rows
+        }
+
+    def record(
+        self,
+        db: Session,
+        company_id: str,
+        matches: Iterable[Tuple[Optional[str], Optional[str], str, float]]
+    ) -> int:
+        """
+        Remember accepted matches
+
+        Callers record manual picks (confidence 1.0) and automatic matches
+        at or above MATCH_MEMORY_MIN_CONFIDENCE only. Accepting the
+        remembered material again increments its count and keeps the higher
+        confidence; accepting a different material replaces the entry and
+        restarts the count. Does not commit; the caller owns the transaction.
+
+        Args:
+            db: Database session
+            company_id: Company ID
+            matches: (label, unit, material_id, confidence) per accepted match
+
+        Returns:
+            Number of entries written
+        """
+        # One row per key; the last choice for a key wins within a batch
+        accepted: Dict[Tuple[str, str], Tuple[str, int, float]] = {}
+        for label, unit, material_id, confidence in matches:
+            key = memory_key(label, unit)
+            if not key[0] or not material_id:
+                continue
+            previous = accepted.get(key)
+            if previous and previous[0] == str(material_id):
+                accepted[key] = (previous[0], previous[1] + 1, max(previous[2], confidence))
+            else:
+                accepted[key] = (str(material_id), 1, confidence)
+
+        if not accepted:
+            return 0
+
+        statement = insert(MaterialMatchMemory).values([
+            {
+                "company_id": company_id,
+                "label_key": label_key,
+                "unit_key": unit_key,
+                "material_id": material_id,
+                "accept_count": count,
+                "confidence": round(confidence, 3),
+            }
+            for (label_key, unit_key), (material_id, count, confidence) in accepted.items()
+        ])
+        table = MaterialMatchMemory.__table__
+        statement = statement.on_conflict_do_update(
+            constraint="uq_material_match_memory_key",
+            set_={
+                "material_id": statement.excluded.material_id,
+                "accept_count": case(
+                    (
+                        table.c.material_id == statement.excluded.material_id,
+                        table.c.accept_count + statement.excluded.accept_count,
+                    ),
+                    else_=statement.excluded.accept_count,
+                ),
+                "confidence": case(
+                    (
+                        table.c.material_id == statement.excluded.material_id,
+                        func.greatest(table.c.confidence, statement.excluded.confidence),
+                    ),
+                    else_=statement.excluded.confidence,
+                ),
+                "last_accepted_at": func.now(),
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(statement)
+
+        logger.info(f"Recorded {len(accepted)} learned matches for company {company_id}")
+        return len(accepted)
+
+
+# Singleton instance
+match_memory = MatchMemoryService()
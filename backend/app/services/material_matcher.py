@@ -2,35 +2,65 @@
 Material Matcher Service
 
 Matches takeoff items from parsed plans to company's material catalog.
-Uses fuzzy string matching and ML-based suggestions.
+Uses fuzzy string matching fused with a local semantic (TF-IDF) index.
 """
 
+import hashlib
 import logging
-from typing import List, Dict, Optional, Tuple
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Iterator, List, Dict, Optional, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from fuzzywuzzy import fuzz, process
 
+from app.ai.parsing.output_normalizer import OutputNormalizer
+from app.core.config import settings
 from app.models.material import Material
 from app.models.estimation import TakeoffItem
+from app.services.match_memory import match_memory, memory_key
+from app.services.product_code_index import ProductCodeIndex
+from app.services.semantic_index import get_semantic_index
 
 logger = logging.getLogger(__name__)
 
+# Companies whose catalog revision is kept in process
+_REVISION_ENTRIES = 64
+
+# company_id -> ((count, last change), revision)
+_revisions: "OrderedDict[str, Tuple[Tuple, str]]" = OrderedDict()
+_revisions_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1024)
+def _unit_key(unit: Optional[str]) -> Optional[str]:
+    """Canonical unit, so "RL", "roll" and "Rolls" compare equal"""
+    canonical = OutputNormalizer.canonical_unit(unit) if unit else None
+    return canonical.upper() if canonical else None
+
 
 class MaterialMatcher:
     """
     Match takeoff items to material catalog
 
     Uses multiple strategies:
-    1. Exact product code match
-    2. Fuzzy description matching
-    3. Category-aware matching
-    4. Unit-aware matching
+    1. Learned match memory (previously accepted matches)
+    2. Exact product code match
+    3. Fuzzy description matching, fused with semantic similarity
+    4. Category-aware matching
+    5. Unit-aware matching
     """
 
     def __init__(self, db: Session, company_id: str):
         self.db = db
         self.company_id = company_id
         self._materials_cache = None
+        self._materials_by_id = None
+        self._memory_cache = None
+        self._code_index = None
+        self._semantic_index = None
+        self._semantic_cache: Dict[str, Dict[str, float]] = {}
 
     def _load_materials(self) -> List[Material]:
         """Load and cache all active materials for the company"""
@@ -41,13 +71,76 @@ class MaterialMatcher:
             ).all()
         return self._materials_cache
 
+    def _load_code_index(self) -> ProductCodeIndex:
+        """Build and cache the product code index over the catalog"""
+        if self._code_index is None:
+            self._code_index = ProductCodeIndex(
+                (material.product_code, material) for material in self._load_materials()
+            )
+        return self._code_index
+
+    def _load_semantic_index(self):
+        """Get the company's semantic index (None when disabled or unavailable)"""
+        if self._semantic_index is None and settings.ENABLE_SEMANTIC_MATCHING:
+            self._semantic_index = get_semantic_index(self.company_id, self._load_materials())
+        return self._semantic_index
+
+    def _semantic_scores(self, description: str) -> Dict[str, float]:
+        """Similarity (0-1) of the top-k semantically closest materials, by material ID"""
+        if description not in self._semantic_cache:
+            index = self._load_semantic_index()
+            results = index.search(description, settings.SEMANTIC_MATCH_TOP_K) if index else []
+            self._semantic_cache[description] = dict(results)
+        return self._semantic_cache[description]
+
+    def _prefetch_semantic_scores(self, descriptions: List[str]) -> None:
+        """Score many descriptions against the catalog in batched matrix products"""
+        index = self._load_semantic_index()
+        pending = [d for d in dict.fromkeys(descriptions) if d not in self._semantic_cache]
+        if not index or not pending:
+            return
+
+        for description, results in zip(pending, index.search_many(pending, settings.SEMANTIC_MATCH_TOP_K)):
+            self._semantic_cache[description] = dict(results)
+
+    def _load_memory(self) -> Dict:
+        """Load and cache the company's learned matches"""
+        if self._memory_cache is None:
+            self._memory_cache = match_memory.load(self.db, self.company_id)
+            self._materials_by_id = {str(m.id): m for m in self._load_materials()}
+        return self._memory_cache
+
+    def _find_memory_match(self, description: str, unit: str = None) -> Optional[Dict]:
+        """Look up a previously accepted match for this label and unit"""
+        memory = self._load_memory()
+        if not memory:
+            return None
+
+        remembered = memory.get(memory_key(description, unit))
+        if remembered is None:
+            return None
+
+        material_id, accept_count, confidence = remembered
+        material = self._materials_by_id.get(material_id)
+        if material is None:
+            # Material was deactivated or removed since it was accepted
+            return None
+
+        return {
+            "material": material,
+            "confidence": confidence,
+            "match_type": "memory",
+            "reasoning": f"Previously accepted {accept_count} time{'s' if accept_count != 1 else ''}"
+        }
+
     def match_item(
         self,
         description: str,
         quantity: float = None,
         unit: str = None,
         category_hint: str = None,
-        threshold: int = 70
+        threshold: int = 70,
+        limit: int = 5
     ) -> List[Dict]:
         """
         Find matching materials for a takeoff item
@@ -58,12 +151,13 @@ class MaterialMatcher:
             unit: Item unit (optional, helps narrow matches)
             category_hint: Category hint from context (optional)
             threshold: Minimum fuzzy match score (0-100)
+            limit: Maximum number of matches to return
 
         Returns:
             List of matches sorted by confidence, each containing:
             - material: Material object
             - confidence: Match confidence (0.0-1.0)
-            - match_type: How it was matched (exact, fuzzy, category)
+            - match_type: How it was matched (memory, exact_code, semantic, fuzzy)
             - reasoning: Why this match was suggested
         """
         materials = self._load_materials()
@@ -74,7 +168,12 @@ class MaterialMatcher:
 
         matches = []
 
-        # Strategy 1: Try exact product code match
+        # Strategy 1: Reuse a match accepted for this label before
+        memory_match = self._find_memory_match(description, unit)
+        if memory_match:
+            return [memory_match]
+
+        # Strategy 2: Try exact product code match
         # Check if description contains a product code pattern
         exact_match = self._find_exact_code_match(description, materials)
         if exact_match:
@@ -86,33 +185,28 @@ class MaterialMatcher:
             })
             return matches  # Exact match found, return immediately
 
-        # Strategy 2: Fuzzy description matching
+        # Strategy 3: Fuzzy description matching
         fuzzy_matches = self._fuzzy_match_description(
             description, materials, unit, category_hint, threshold
         )
         matches.extend(fuzzy_matches)
 
-        # Sort by confidence (descending)
-        matches.sort(key=lambda x: x["confidence"], reverse=True)
+        # Sort by confidence (descending), semantic similarity breaking ties
+        matches.sort(key=lambda x: (x["confidence"], x.get("semantic_similarity", 0.0)), reverse=True)
 
-        # Return top 5 matches
-        return matches[:5]
+        # Return top matches
+        return matches[:limit]
 
     def _find_exact_code_match(
         self,
         description: str,
         materials: List[Material]
     ) -> Optional[Material]:
-        """Try to find exact product code in description"""
-        desc_upper = description.upper().strip()
-
-        for material in materials:
-            # Check if product code appears in description
-            if material.product_code.upper() in desc_upper:
-                logger.info(f"Exact code match: {material.product_code}")
-                return material
-
-        return None
+        """Try to find a product code in description (longest code wins)"""
+        material = self._load_code_index().find(description)
+        if material:
+            logger.info(f"Exact code match: {material.product_code}")
+        return material
 
     def _fuzzy_match_description(
         self,
@@ -125,9 +219,12 @@ class MaterialMatcher:
         """
         Fuzzy match item description to material descriptions
 
-        Uses fuzzywuzzy library for string similarity
+        Uses fuzzywuzzy library for string similarity. Materials among the
+        semantic top-k get their similarity added to the fuzzy score, so a
+        description worded differently from the catalog can still match.
         """
         matches = []
+        semantic_scores = self._semantic_scores(description)
 
         # Normalize description
         desc_normalized = self._normalize_description(description)
@@ -164,19 +261,28 @@ class MaterialMatcher:
                 if mat_lumber_dims and lumber_dims == mat_lumber_dims:
                     best_score = min(100, best_score + 25)
 
+            # Semantic similarity boost (TF-IDF cosine, 0-1)
+            similarity = semantic_scores.get(str(material.id))
+            if similarity:
+                best_score = min(100, round(best_score + 100 * similarity * settings.SEMANTIC_MATCH_WEIGHT))
+
             if best_score >= threshold:
                 # Convert 0-100 score to 0-1 confidence
                 confidence = (best_score / 100.0) - category_penalty
 
                 # Bonus for unit match
-                if unit and material.unit and material.unit.upper() == unit.upper():
+                if unit and material.unit and _unit_key(material.unit) == _unit_key(unit):
                     confidence = min(1.0, confidence + 0.1)
 
                 matches.append({
                     "material": material,
                     "confidence": max(0.0, confidence),
-                    "match_type": "fuzzy",
-                    "reasoning": f"Description similarity: {best_score}%"
+                    "match_type": "semantic" if similarity else "fuzzy",
+                    "semantic_similarity": similarity or 0.0,
+                    "reasoning": (
+                        f"Description similarity: {best_score}% (semantic {similarity:.2f})"
+                        if similarity else f"Description similarity: {best_score}%"
+                    )
                 })
 
         return matches
@@ -222,6 +328,50 @@ class MaterialMatcher:
             return f"{match.group(1)}X{match.group(2)}"
         return None
 
+    def preload(self) -> None:
+        """
+        Load the catalog, match memory and indexes up front
+
+        After this the matcher no longer needs the database session, so it
+        can keep matching while a response streams.
+        """
+        self._load_memory()
+        self._load_code_index()
+        self._load_semantic_index()
+
+    def iter_matches(
+        self,
+        items: List[Dict],
+        threshold: int = 70,
+        limit: int = 5
+    ) -> Iterator[List[Dict]]:
+        """
+        Match a list of descriptions, yielding results item by item
+
+        Semantic scores for the whole list are computed in batched matrix
+        products before the first result is yielded.
+
+        Args:
+            items: Dictionaries with description and optional quantity,
+                unit and category_hint
+            threshold: Minimum fuzzy match score (0-100)
+            limit: Maximum matches per item
+
+        Yields:
+            Matches for each item, in input order (as for match_item)
+        """
+        self._prefetch_semantic_scores([item["description"] for item in items])
+
+        for item in items:
+            yield self.match_item(
+                description=item["description"],
+                quantity=item.get("quantity"),
+                unit=item.get("unit"),
+                category_hint=item.get("category_hint"),
+                threshold=threshold,
+                limit=limit
+            )
+
     def match_multiple_items(
         self,
         takeoff_items: List[TakeoffItem],
@@ -230,24 +380,32 @@ class MaterialMatcher:
         """
         Match multiple takeoff items at once
 
+        Items only need id, label, qty, unit and notes, so column-projected
+        rows work as well as TakeoffItem objects. Items repeating the same
+        label and unit are matched once.
+
         Returns:
             Dictionary mapping takeoff_item.id to list of material matches
         """
         results = {}
+        matched: Dict[Tuple, List[Dict]] = {}
+        self._prefetch_semantic_scores([item.label for item in takeoff_items])
 
         for item in takeoff_items:
             # Try to infer category from notes or label
             category_hint = self._infer_category(item.label, item.notes)
 
-            matches = self.match_item(
-                description=item.label,
-                quantity=float(item.qty) if item.qty else None,
-                unit=item.unit,
-                category_hint=category_hint,
-                threshold=threshold
-            )
+            key = (item.label, item.unit, category_hint)
+            if key not in matched:
+                matched[key] = self.match_item(
+                    description=item.label,
+                    quantity=float(item.qty) if item.qty else None,
+                    unit=item.unit,
+                    category_hint=category_hint,
+                    threshold=threshold
+                )
 
-            results[str(item.id)] = matches
+            results[str(item.id)] = matched[key]
 
         return results
 
@@ -319,3 +477,195 @@ def match_takeoff_to_materials(
     """
     matcher = MaterialMatcher(db, company_id)
     return matcher.match_multiple_items(takeoff_items, threshold)
+
+
+def catalog_revision(db: Session, company_id: str) -> str:
+    """
+    Short hash identifying the current state of a company's active catalog
+
+    Built from the fields matching reads (id, product code, description,
+    category, unit and manufacturer), so adding, deactivating or renaming
+    a material changes it while price edits do not. The hash is cached per
+    company behind the catalog's count and last change, so the rows are
+    only read again after the catalog was edited.
+    """
+    signature = tuple(db.query(
+        func.count(Material.id),
+        func.max(func.coalesce(Material.updated_at, Material.created_at))
+    ).filter(
+        Material.company_id == company_id,
+        Material.is_active == True
+    ).one())
+    key = str(company_id)
+
+    with _revisions_lock:
+        cached = _revisions.get(key)
+        if cached and cached[0] == signature:
+            _revisions.move_to_end(key)
+            return cached[1]
+
+    rows = db.query(
+        Material.id,
+        Material.product_code,
+        Material.description,
+        Material.category,
+        Material.unit,
+        Material.manufacturer,
+    ).filter(
+        Material.company_id == company_id,
+        Material.is_active == True
+    ).order_by(Material.id).all()
+
+    digest = hashlib.sha1()
+    for row in rows:
+        digest.update(("\x1f".join(str(value) for value in row) + "\x1e").encode("utf-8"))
+    revision = digest.hexdigest()[:16]
+
+    with _revisions_lock:
+        _revisions[key] = (signature, revision)
+        while len(_revisions) > _REVISION_ENTRIES:
+            _revisions.popitem(last=False)
+
+    return revision
+
+
+def match_fingerprint(
+    item,
+    revision: str,
+    remembered: Optional[str] = None,
+    threshold: Optional[int] = None
+) -> str:
+    """
+    Fingerprint of the inputs an automatic match of a takeoff item depends on
+
+    Normalized label and unit, category, notes (used for the category
+    hint), the catalog revision and a remembered material for the label
+    and unit that differs from the match, so a manual pick reaches
+    identical lines. The threshold is only part of the fingerprint of an
+    item left unmatched: a lower threshold may find a match, while a match
+    found at one threshold is reused by callers whose threshold its
+    confidence still clears.
+    """
+    label_key, unit_key = memory_key(item.label, item.unit)
+    parts = [
+        label_key,
+        unit_key,
+        (item.category or "").lower(),
+        (item.notes or "").lower(),
+        revision,
+        remembered or "",
+        "" if threshold is None else str(threshold),
+    ]
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def match_takeoff_incrementally(
+    db: Session,
+    company_id: str,
+    takeoff_items: List,
+    threshold: int = 70,
+    force: bool = False
+) -> Dict:
+    """
+    Match only the takeoff items whose inputs changed since their last match
+
+    An item is clean when its stored match_fingerprint equals the current
+    one and a stored match's confidence clears the threshold, or when its
+    material was chosen manually; clean items keep their stored match.
+    Everything else is matched again.
+
+    Args:
+        db: Database session
+        company_id: Company ID
+        takeoff_items: Items (ORM objects or rows) with id, label, qty, unit,
+            category, notes, matched_material_id, match_confidence,
+            match_source and match_fingerprint
+        threshold: Minimum fuzzy match score (0-100)
+        force: Rematch every item, including manual choices
+
+    Returns:
+        Dictionary with:
+        - matches: takeoff item ID -> list of matches (stored matches have
+          match_type "stored" or "manual")
+        - rematched: IDs of the items that were matched again
+        - fingerprints: takeoff item ID -> fingerprint to store with its
+          current match
+    """
+    revision = catalog_revision(db, company_id)
+    memory = match_memory.load(db, company_id)
+    matcher = MaterialMatcher(db, company_id)
+
+    def fingerprint(item, material_id) -> str:
+        # A remembered material only matters when it differs from the match
+        remembered = memory.get(memory_key(item.label, item.unit))
+        if remembered and material_id is not None and remembered[0] == str(material_id):
+            remembered = None
+        return match_fingerprint(
+            item,
+            revision,
+            remembered[0] if remembered else None,
+            None if material_id is not None else threshold
+        )
+
+    materials_by_id = None
+
+    matches = {}
+    dirty = []
+
+    for item in takeoff_items:
+        item_id = str(item.id)
+        manual = item.match_source == "manual"
+        stored = item.matched_material_id is not None
+
+        if force:
+            dirty.append(item)
+            continue
+
+        if not manual:
+            below_threshold = (
+                stored
+                and item.match_confidence is not None
+                and float(item.match_confidence) * 100 < threshold
+            )
+            if below_threshold or item.match_fingerprint != fingerprint(item, item.matched_material_id):
+                dirty.append(item)
+                continue
+
+        if item.matched_material_id is None:
+            matches[item_id] = []
+            continue
+
+        if materials_by_id is None:
+            materials_by_id = {m.id: m for m in matcher._load_materials()}
+
+        material = materials_by_id.get(item.matched_material_id)
+        if material is None:
+            # Chosen material is no longer in the active catalog
+            dirty.append(item)
+            continue
+
+        matches[item_id] = [{
+            "material": material,
+            "confidence": float(item.match_confidence) if item.match_confidence is not None else 1.0,
+            "match_type": "manual" if manual else "stored",
+            "reasoning": "Chosen manually" if manual else "Unchanged since last match"
+        }]
+
+    if dirty:
+        matches.update(matcher.match_multiple_items(dirty, threshold))
+
+    fingerprints = {}
+    for item in takeoff_items:
+        best = matches.get(str(item.id))
+        fingerprints[str(item.id)] = fingerprint(item, best[0]["material"].id if best else None)
+
+    logger.info(
+        f"Incremental match: {len(dirty)} of {len(takeoff_items)} items rematched "
+        f"(catalog {revision}{', forced' if force else ''})"
+    )
+
+    return {
+        "matches": matches,
+        "rematched": {str(item.id) for item in dirty},
+        "fingerprints": fingerprints,
+    }
@@ -0,0 +1,111 @@
+"""
+Product Code Index
+
+Finds catalog product codes inside takeoff descriptions. Codes are kept in
+a dictionary for whole-description lookups and compiled into an
+Aho-Corasick automaton, so every code occurring anywhere in a description
+is found in one pass over the description instead of one substring scan
+per catalog material.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class ProductCodeIndex:
+    """
+    Case-insensitive multi-pattern index of product codes
+
+    When several codes occur in a description the longest one wins (so
+    "OSB-716-RB" beats "OSB-716"), then the one occurring first.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[Optional[str], Any]]):
+        """
+        Build the index
+
+        Args:
+            entries: (product_code, value) pairs; the first value of a
+                duplicated code is kept and blank codes are ignored
+        """
+        self._by_code: Dict[str, Any] = {}
+        for code, value in entries:
+            key = (code or "").strip().upper()
+            if key and key not in self._by_code:
+                self._by_code[key] = value
+
+        self._build_automaton()
+
+    def __len__(self) -> int:
+        return len(self._by_code)
+
+    def _build_automaton(self) -> None:
+        """Compile the codes into goto, failure and output tables"""
+        # State 0 is the root; _longest[s] is the length of the longest code
+        # ending at state s (following failure links), 0 if none
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._longest: List[int] = [0]
+
+        for code in self._by_code:
+            state = 0
+            for char in code:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._longest.append(0)
+                state = next_state
+            self._longest[state] = len(code)
+
+        # Breadth-first so a state's failure target is final before its children
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._longest[child] = max(self._longest[child], self._longest[self._fail[child]])
+                queue.append(child)
+
+    def find(self, text: str) -> Optional[Any]:
+        """
+        Value of the best product code occurring in text
+
+        Args:
+            text: Description to search
+
+        Returns:
+            Value of the longest (then first) code found, or None
+        """
+        if not self._by_code or not text:
+            return None
+
+        text = text.upper().strip()
+
+        # Common case: the description is the code itself
+        if text in self._by_code:
+            return self._by_code[text]
+
+        goto, fail, longest = self._goto, self._fail, self._longest
+        state = 0
+        best_length = 0
+        best_end = 0
+
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            length = longest[state]
+            if length > best_length:
+                best_length = length
+                best_end = position + 1
+
+        if not best_length:
+            return None
+
+        return self._by_code[text[best_end - best_length:best_end]]
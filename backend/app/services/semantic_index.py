@@ -0,0 +1,205 @@
+"""
+Semantic Material Index
+
+Local vector index over a company's material catalog, used by
+MaterialMatcher to find materials whose descriptions mean the same thing
+as a takeoff label even when the wording differs ("joist hanger 2x6" vs
+"Simpson ZMax LUS26Z Joist Hanger").
+
+Descriptions are embedded with TF-IDF over word and character n-grams
+(scikit-learn, CPU only, no network). Catalog vectors are computed once
+per catalog revision and kept in memory; a lookup is one sparse
+matrix-vector product followed by a top-k selection.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from scipy.sparse import hstack
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.preprocessing import normalize
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Catalog indexes kept in memory, most recently used last
+_CACHE_ENTRIES = 16
+_cache: "OrderedDict[str, Tuple[str, SemanticIndex]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+# Descriptions scored per matrix product in search_many (bounds the dense
+# queries x catalog score matrix)
+_QUERY_BATCH = 256
+
+# Abbreviations common in takeoffs and vendor catalogs
+_ABBREVIATIONS = {
+    "insul": "insulation",
+    "batts": "batt",
+    "sqft": "sq ft",
+    "ply": "plywood",
+    "gyp": "gypsum",
+    "galv": "galvanized",
+    "pt": "pressure treated",
+}
+
+
+def _prepare(text: Optional[str]) -> str:
+    """Lowercase, split dimensions ("2x6" -> "2 x 6") and expand abbreviations"""
+    text = (text or "").lower()
+    text = re.sub(r"(\d)\s*x\s*(\d)", r"\1 x \2", text)
+    text = re.sub(r"[^a-z0-9\-/\. ]+", " ", text)
+    words = [_ABBREVIATIONS.get(word, word) for word in text.split()]
+    return " ".join(words)
+
+
+class SemanticIndex:
+    """
+    TF-IDF vectors of catalog materials with top-k cosine lookup
+    """
+
+    def __init__(self, materials: Sequence[Any]):
+        """
+        Embed a catalog
+
+        Args:
+            materials: Material objects (description, category, manufacturer)
+        """
+        if not SKLEARN_AVAILABLE:
+            raise RuntimeError("scikit-learn is not installed")
+
+        self.material_ids = [str(m.id) for m in materials]
+        documents = [
+            _prepare(" ".join(filter(None, [m.description, m.category, m.manufacturer])))
+            for m in materials
+        ]
+
+        # Words carry meaning; character n-grams absorb spelling variants,
+        # plurals and run-together tokens ("ZMax", "LUS26Z")
+        self._word_vectorizer = TfidfVectorizer(
+            analyzer="word", token_pattern=r"[a-z0-9]+", ngram_range=(1, 2), sublinear_tf=True
+        )
+        self._char_vectorizer = TfidfVectorizer(
+            analyzer="char_wb", ngram_range=(3, 5), sublinear_tf=True
+        )
+
+        if any(documents):
+            self._matrix = normalize(hstack([
+                self._word_vectorizer.fit_transform(documents),
+                self._char_vectorizer.fit_transform(documents),
+            ]).tocsr())
+        else:
+            self._matrix = None
+
+    def search(self, text: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Materials most similar to a description
+
+        Args:
+            text: Takeoff description
+            top_k: Number of results
+
+        Returns:
+            (material ID, similarity 0-1) pairs, most similar first
+        """
+        return self.search_many([text], top_k)[0]
+
+    def search_many(self, texts: Sequence[str], top_k: int = 10) -> List[List[Tuple[str, float]]]:
+        """
+        Top-k materials for many descriptions at once
+
+        Queries are embedded together and scored against the catalog with
+        one matrix product per batch of _QUERY_BATCH descriptions.
+
+        Args:
+            texts: Takeoff descriptions
+            top_k: Number of results per description
+
+        Returns:
+            One result list per description, as for search()
+        """
+        if self._matrix is None or not texts:
+            return [[] for _ in texts]
+
+        top_k = min(top_k, self._matrix.shape[0])
+        results = []
+
+        for start in range(0, len(texts), _QUERY_BATCH):
+            prepared = [_prepare(text) for text in texts[start:start + _QUERY_BATCH]]
+            queries = normalize(hstack([
+                self._word_vectorizer.transform(prepared),
+                self._char_vectorizer.transform(prepared),
+            ]).tocsr())
+
+            # (queries x catalog) cosine similarities
+            scores = (queries @ self._matrix.T).toarray()
+            candidates = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+
+            for row, row_candidates in zip(scores, candidates):
+                ranked = row_candidates[np.argsort(-row[row_candidates])]
+                results.append([
+                    (self.material_ids[index], float(row[index]))
+                    for index in ranked
+                    if row[index] > 0
+                ])
+
+        return results
+
+
+def catalog_signature(materials: Sequence[Any]) -> str:
+    """Hash of the fields the index is built from, to detect catalog edits"""
+    digest = hashlib.sha256()
+    for material in sorted(materials, key=lambda m: str(m.id)):
+        digest.update(
+            f"{material.id}\x1f{material.description}\x1f{material.category}\x1f{material.manufacturer}\x1e".encode("utf-8")
+        )
+    return digest.hexdigest()
+
+
+def get_semantic_index(company_id: str, materials: Sequence[Any]) -> Optional[SemanticIndex]:
+    """
+    Catalog index for a company, rebuilt only when the catalog changed
+
+    Args:
+        company_id: Company ID
+        materials: The company's active materials
+
+    Returns:
+        SemanticIndex, or None if scikit-learn is unavailable or the
+        catalog is empty
+    """
+    if not SKLEARN_AVAILABLE or not materials:
+        return None
+
+    signature = catalog_signature(materials)
+
+    with _cache_lock:
+        cached = _cache.get(company_id)
+        if cached and cached[0] == signature:
+            _cache.move_to_end(company_id)
+            return cached[1]
+
+    try:
+        index = SemanticIndex(materials)
+    except ValueError as e:
+        # e.g. no usable words in any description
+        logger.warning(f"Could not build semantic index for company {company_id}: {e}")
+        return None
+
+    logger.info(f"Built semantic index over {len(materials)} materials for company {company_id}")
+
+    with _cache_lock:
+        _cache[company_id] = (signature, index)
+        while len(_cache) > _CACHE_ENTRIES:
+            _cache.popitem(last=False)
+
+    return index
+
@@ -0,0 +1,231 @@
+"""
+Takeoff Persistence Service
+
+Bulk-saves parser output as takeoff items. All rows for a parse run are
+written with a single multi-row INSERT ... RETURNING, and each run is tagged
+with an idempotency key so retried saves never duplicate items.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, exists, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.estimation import (
+    BidItemDiscrepancy,
+    GeneratedQuoteLineItem,
+    Quote,
+    TakeoffItem,
+)
+from app.ai.parsing.utils.telemetry import telemetry
+from app.models.project import ProjectDocument
+
+logger = logging.getLogger(__name__)
+
+
+class TakeoffPersistenceService:
+    """
+    Persist parsed bid items and materials as takeoff items
+
+    A parse run is identified by (document, run key). The run key is either a
+    caller-supplied run id or a hash of the parsed items, so saving the same
+    parser output twice is a no-op.
+    """
+
+    def build_rows(
+        self,
+        project_id: str,
+        parsed_data: Dict[str, Any],
+        document_id: Optional[str] = None,
+        parse_run_key: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Convert parser output into takeoff_items row dictionaries
+
+        Args:
+            project_id: Project the items belong to
+            parsed_data: Normalized parser output (bid_items, materials)
+            document_id: Source document ID
+            parse_run_key: Idempotency key for the parse run
+
+        Returns:
+            List of column dictionaries ready for a bulk insert. Every row
+            has the same keys: a multi-row INSERT takes its column list
+            from the first row.
+        """
+        rows = []
+
+        for item in parsed_data.get("bid_items", []) or []:
+            rows.append({
+                "project_id": project_id,
+                "label": item.get("description") or "Unknown item",
+                "qty": self._quantity(item),
+                "unit": item.get("unit", "") or "",
+                "category": None,
+                "notes": f"Item #{item.get('item_number', 'N/A')}",
+                "source_page": item.get("source_page"),
+                "source_bbox": item.get("source_bbox"),
+                "source_document_id": document_id,
+                "parse_run_key": parse_run_key,
+            })
+
+        for mat in parsed_data.get("materials", []) or []:
+            rows.append({
+                "project_id": project_id,
+                "label": mat.get("name") or "Unknown material",
+                "qty": self._quantity(mat),
+                "unit": mat.get("unit", "ea") or "ea",
+                "category": mat.get("category", ""),
+                "notes": "Extracted from plan by AI",
+                "source_page": mat.get("source_page"),
+                "source_bbox": mat.get("source_bbox"),
+                "source_document_id": document_id,
+                "parse_run_key": parse_run_key,
+            })
+
+        return rows
+
+    @staticmethod
+    def build_parse_run_key(
+        document_id: str,
+        parsed_data: Dict[str, Any],
+        run_id: Optional[str] = None
+    ) -> str:
+        """
+        Build the idempotency key for a (document, parse run) pair
+
+        Args:
+            document_id: Source document ID
+            parsed_data: Parser output, hashed when no run ID is given
+            run_id: Optional caller-supplied parse run identifier
+
+        Returns:
+            Hex digest identifying the parse run
+        """
+        if run_id:
+            source = f"run:{run_id}"
+        else:
+            source = json.dumps(
+                {
+                    "bid_items": parsed_data.get("bid_items", []) or [],
+                    "materials": parsed_data.get("materials", []) or [],
+                },
+                sort_keys=True,
+                default=str
+            )
+
+        return hashlib.sha256(f"{document_id}:{source}".encode("utf-8")).hexdigest()
+
+    @telemetry.traced("db.save_takeoffs")
+    def save_parsed_items(
+        self,
+        db: Session,
+        project_id: str,
+        document: ProjectDocument,
+        parsed_data: Dict[str, Any],
+        run_id: Optional[str] = None,
+        replace_previous: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Bulk-save parsed items for a document and mark it parsed
+
+        Does not commit; the caller owns the transaction.
+
+        Args:
+            db: Database session
+            project_id: Project the items belong to
+            document: Source project document
+            parsed_data: Normalized parser output
+            run_id: Optional parse run identifier (retries should reuse it)
+            replace_previous: Delete items saved by earlier parse runs of this document
+
+        Returns:
+            Dictionary with items_saved, item_ids, parse_run_key, duplicate and replaced
+        """
+        parse_run_key = self.build_parse_run_key(str(document.id), parsed_data, run_id)
+
+        existing_ids = db.execute(
+            select(TakeoffItem.id).where(
+                TakeoffItem.source_document_id == document.id,
+                TakeoffItem.parse_run_key == parse_run_key
+            )
+        ).scalars().all()
+
+        if existing_ids:
+            logger.info(
+                f"[PARSE] Parse run {parse_run_key[:12]} already saved "
+                f"({len(existing_ids)} items), skipping insert"
+            )
+            document.is_parsed = "true"
+            return {
+                "items_saved": 0,
+                "item_ids": [str(item_id) for item_id in existing_ids],
+                "parse_run_key": parse_run_key,
+                "duplicate": True,
+                "replaced": 0,
+            }
+
+        replaced = 0
+        if replace_previous:
+            replaced = self._delete_previous_runs(db, document.id, parse_run_key)
+
+        rows = self.build_rows(project_id, parsed_data, document.id, parse_run_key)
+        item_ids = []
+        if rows:
+            item_ids = db.execute(
+                insert(TakeoffItem).values(rows).returning(TakeoffItem.id)
+            ).scalars().all()
+
+        document.is_parsed = "true"
+        telemetry.annotate(rows=len(item_ids), replaced=replaced)
+
+        logger.info(
+            f"[PARSE] Bulk inserted {len(item_ids)} takeoff items "
+            f"(run {parse_run_key[:12]}, replaced {replaced})"
+        )
+
+        return {
+            "items_saved": len(item_ids),
+            "item_ids": [str(item_id) for item_id in item_ids],
+            "parse_run_key": parse_run_key,
+            "duplicate": False,
+            "replaced": replaced,
+        }
+
+    @staticmethod
+    def _delete_previous_runs(db: Session, document_id, parse_run_key: str) -> int:
+        """
+        Delete takeoff items saved by other parse runs of a document
+
+        Items already referenced by quotes or discrepancy records are kept so
+        historical records stay intact.
+        """
+        referenced = (
+            exists().where(Quote.takeoff_item_id == TakeoffItem.id)
+            | exists().where(GeneratedQuoteLineItem.takeoff_item_id == TakeoffItem.id)
+            | exists().where(BidItemDiscrepancy.takeoff_item_id == TakeoffItem.id)
+        )
+
+        result = db.execute(
+            delete(TakeoffItem)
+            .where(
+                TakeoffItem.source_document_id == document_id,
+                TakeoffItem.parse_run_key != parse_run_key,
+                ~referenced
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount or 0
+
+    @staticmethod
+    def _quantity(item: Dict[str, Any]) -> Any:
+        """Quantity for a parsed item; qty is never null, so default to 0"""
+        qty_value = item.get("quantity")
+        return 0 if qty_value is None else qty_value
+
+
+# Singleton instance
+takeoff_persistence = TakeoffPersistenceService()
@@ -0,0 +1,49 @@
+"""
+Takeoff Queries
+
+Shared query for takeoff items together with their matched material, so
+listings and quote PDFs read both in one round-trip (LEFT OUTER JOIN over
+TakeoffItem.matched_material) instead of one Material query per item.
+"""
+
+from typing import Any, Sequence
+
+from sqlalchemy.orm import Query, Session
+
+from app.models.estimation import TakeoffItem
+from app.models.material import Material
+
+# Material columns most callers need
+DEFAULT_MATERIAL_COLUMNS = (Material.product_code,)
+
+
+def takeoffs_with_materials(
+    db: Session,
+    project_id: Any,
+    takeoff_columns: Sequence[Any] = (TakeoffItem,),
+    material_columns: Sequence[Any] = DEFAULT_MATERIAL_COLUMNS,
+    matched_only: bool = False
+) -> Query:
+    """
+    Takeoff items of a project joined to their matched material
+
+    Material columns are NULL for unmatched items.
+
+    Args:
+        db: Database session
+        project_id: Project ID
+        takeoff_columns: TakeoffItem entity or columns to select
+        material_columns: Material columns to select alongside
+        matched_only: Only items matched to a material
+
+    Returns:
+        Query of rows (takeoff columns..., material columns...), unordered
+    """
+    query = db.query(*takeoff_columns, *material_columns).select_from(TakeoffItem).outerjoin(
+        TakeoffItem.matched_material
+    ).filter(TakeoffItem.project_id == project_id)
+
+    if matched_only:
+        query = query.filter(TakeoffItem.matched_material_id.isnot(None))
+
+    return query
@@ -0,0 +1,7 @@
+"""
+Parsing Benchmarks
+
+Offline replay harness for the parsing pipeline: a local stand-in for the
+Anthropic and OpenAI APIs, a corpus of sample plans with golden takeoffs and
+a runner that reports time, memory, LLM calls and extraction quality.
+"""
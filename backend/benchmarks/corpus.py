@@ -0,0 +1,367 @@
+"""
+Benchmark Corpus
+
+Sample plans with golden takeoffs. Each document is a PDF next to a
+<name>.golden.json file:
+
+    {
+        "bid_items": [{"item_number": "1", "description": "...", "quantity": 120, "unit": "LF"}],
+        "materials": [{"name": "...", "quantity": 4, "unit": "EA"}]
+    }
+
+Real plans (with hand-checked golden files) go in benchmarks/corpus/. A
+synthetic set covering the main document shapes is generated on demand in
+benchmarks/corpus/synthetic/:
+- vector bid schedule (text layer, ruled table with prices)
+- vector door/window schedules over two pages
+- scanned material list (image-only page)
+- scanned 24x36 sheet with a material list in the corner (many tiles)
+
+Usage:
+    python -m benchmarks.corpus          # (re)generate the synthetic set
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+SYNTHETIC_DIR = CORPUS_DIR / "synthetic"
+
+LETTER = (612, 792)
+SHEET_D = (1728, 2592)  # 24x36 in
+
+# (header, width in points)
+Column = Tuple[str, float]
+
+
+@dataclass
+class CorpusDocument:
+    """A sample PDF and its golden takeoff"""
+    name: str
+    pdf_path: Path
+    golden: Dict[str, Any]
+
+    @property
+    def golden_count(self) -> int:
+        return len(self.golden.get("bid_items", [])) + len(self.golden.get("materials", []))
+
+
+def load_documents(directories: Optional[Sequence[Path]] = None) -> List[CorpusDocument]:
+    """
+    Find every PDF with a golden takeoff
+
+    Args:
+        directories: Directories to search (corpus and synthetic set by default)
+
+    Returns:
+        Documents sorted by name
+    """
+    if directories is None:
+        ensure_synthetic_corpus()
+        directories = [CORPUS_DIR, SYNTHETIC_DIR]
+
+    documents = []
+    for directory in directories:
+        for pdf_path in sorted(Path(directory).glob("*.pdf")):
+            golden_path = pdf_path.with_suffix(".golden.json")
+            if not golden_path.exists():
+                logger.warning(f"Skipping {pdf_path.name}: no {golden_path.name}")
+                continue
+            with open(golden_path, "r", encoding="utf-8") as f:
+                documents.append(CorpusDocument(pdf_path.stem, pdf_path, json.load(f)))
+
+    return sorted(documents, key=lambda d: d.name)
+
+
+# ---------------------------------------------------------------------------
+# Synthetic documents
+# ---------------------------------------------------------------------------
+
+BID_SCHEDULE_COLUMNS: List[Column] = [
+    ("ITEM NO.", 50), ("DESCRIPTION", 250), ("QTY", 50), ("UNIT", 45), ("UNIT PRICE", 70), ("TOTAL", 75),
+]
+
+BID_SCHEDULE_ROWS = [
+    ("1", "Mobilization", 1, "LS", 25000.00),
+    ("2", "Clearing and Grubbing", 2.5, "AC", 4200.00),
+    ("3", "Unclassified Excavation", 1850, "CY", 12.50),
+    ("4", "8 in PVC Sanitary Sewer Pipe", 640, "LF", 48.00),
+    ("5", "4 ft Diameter Sanitary Manhole", 6, "EA", 3850.00),
+    ("6", "12 in RCP Storm Drain", 420, "LF", 62.00),
+    ("7", "Curb Inlet Type C", 4, "EA", 2900.00),
+    ("8", "Aggregate Base Course 6 in", 2400, "SY", 9.75),
+    ("9", "Hot Mix Asphalt Surface Course", 310, "TON", 96.00),
+    ("10", "Concrete Curb and Gutter", 980, "LF", 21.50),
+]
+
+DOOR_COLUMNS: List[Column] = [("MARK", 45), ("DESCRIPTION", 230), ("QTY", 45), ("SIZE", 90), ("FINISH", 80)]
+
+DOOR_ROWS = [
+    ("D1", "Hollow Metal Door and Frame", 6, "3'-0\" x 7'-0\"", "Paint"),
+    ("D2", "Solid Core Wood Door", 14, "3'-0\" x 6'-8\"", "Stain"),
+    ("D3", "Aluminum Storefront Door", 2, "6'-0\" x 7'-0\"", "Anodized"),
+    ("D4", "Overhead Coiling Door", 1, "10'-0\" x 10'-0\"", "Galvanized"),
+]
+
+WINDOW_COLUMNS: List[Column] = [("MARK", 45), ("DESCRIPTION", 230), ("QTY", 45), ("SIZE", 90), ("GLAZING", 80)]
+
+WINDOW_ROWS = [
+    ("W1", "Fixed Aluminum Window", 8, "4'-0\" x 5'-0\"", "Insulated"),
+    ("W2", "Single Hung Vinyl Window", 12, "3'-0\" x 4'-0\"", "Low-E"),
+    ("W3", "Clerestory Window", 5, "6'-0\" x 2'-0\"", "Tempered"),
+]
+
+MATERIAL_COLUMNS: List[Column] = [("DESCRIPTION", 300), ("QTY", 70), ("UNIT", 60)]
+
+MATERIAL_ROWS = [
+    ("2x6 SPF Stud 92-5/8 in", 340, "EA"),
+    ("1/2 in Gypsum Board 4x12", 185, "SHT"),
+    ("R-19 Fiberglass Batt Insulation", 2200, "SF"),
+    ("7/16 in OSB Sheathing 4x8", 96, "SHT"),
+    ("Simpson HDU5 Holdown", 12, "EA"),
+    ("16d Common Nails", 50, "LB"),
+    ("Tyvek House Wrap 9x150", 4, "RL"),
+]
+
+
+def ensure_synthetic_corpus(force: bool = False) -> List[Path]:
+    """
+    Generate the synthetic documents if they are missing
+
+    Args:
+        force: Regenerate even if the files exist
+
+    Returns:
+        Paths of the synthetic PDFs
+    """
+    builders = {
+        "bid_schedule_vector": _build_bid_schedule,
+        "door_window_schedule_vector": _build_door_window_schedule,
+        "material_list_scanned": _build_material_list_scanned,
+        "sheet_d_scanned": _build_sheet_d_scanned,
+    }
+
+    SYNTHETIC_DIR.mkdir(parents=True, exist_ok=True)
+    paths = []
+
+    for name, build in builders.items():
+        pdf_path = SYNTHETIC_DIR / f"{name}.pdf"
+        golden_path = pdf_path.with_suffix(".golden.json")
+        if force or not pdf_path.exists() or not golden_path.exists():
+            golden = build(pdf_path)
+            with open(golden_path, "w", encoding="utf-8") as f:
+                json.dump(golden, f, indent=2)
+            logger.info(f"Generated {pdf_path.name}")
+        paths.append(pdf_path)
+
+    return paths
+
+
+def _build_bid_schedule(pdf_path: Path) -> Dict[str, Any]:
+    rows = [
+        (number, description, _fmt(qty), unit, f"{price:,.2f}", f"{qty * price:,.2f}")
+        for number, description, qty, unit, price in BID_SCHEDULE_ROWS
+    ]
+    ops = [("text", 40, 50, 14, "BID SCHEDULE - PROJECT 2025-014 STREET IMPROVEMENTS")]
+    ops += _table_ops(40, 90, BID_SCHEDULE_COLUMNS, rows)
+    write_vector_pdf(pdf_path, [(LETTER, ops)])
+
+    return {"bid_items": [
+        {"item_number": number, "description": description, "quantity": qty, "unit": unit, "unit_price": price}
+        for number, description, qty, unit, price in BID_SCHEDULE_ROWS
+    ], "materials": []}
+
+
+def _build_door_window_schedule(pdf_path: Path) -> Dict[str, Any]:
+    door_ops = [("text", 40, 50, 14, "DOOR SCHEDULE")]
+    door_ops += _table_ops(40, 80, DOOR_COLUMNS, [(m, d, _fmt(q), s, f) for m, d, q, s, f in DOOR_ROWS])
+    window_ops = [("text", 40, 50, 14, "WINDOW SCHEDULE")]
+    window_ops += _table_ops(40, 80, WINDOW_COLUMNS, [(m, d, _fmt(q), s, g) for m, d, q, s, g in WINDOW_ROWS])
+    write_vector_pdf(pdf_path, [(LETTER, door_ops), (LETTER, window_ops)])
+
+    return {"bid_items": [], "materials": [
+        {"name": description, "quantity": qty}
+        for _, description, qty, _, _ in DOOR_ROWS + WINDOW_ROWS
+    ]}
+
+
+def _build_material_list_scanned(pdf_path: Path) -> Dict[str, Any]:
+    ops = [("text", 40, 50, 14, "FRAMING MATERIAL LIST - LOT 12")]
+    ops += _table_ops(40, 90, MATERIAL_COLUMNS, [(d, _fmt(q), u) for d, q, u in MATERIAL_ROWS])
+    write_raster_pdf(pdf_path, [(LETTER, ops)], dpi=150)
+    return _material_golden()
+
+
+def _build_sheet_d_scanned(pdf_path: Path) -> Dict[str, Any]:
+    width, height = SHEET_D
+    ops: List[Tuple] = [("text", 60, 60, 28, "A-101 FLOOR PLAN")]
+    # Drawing: a grid of rooms with dimension strings
+    for col in range(4):
+        for row in range(5):
+            x, y = 120 + col * 300, 200 + row * 380
+            ops += [("rect", x, y, 260, 340), ("text", x + 20, y + 30, 14, f"ROOM {100 + col * 5 + row}")]
+    ops += _table_ops(width - 520, height - 420, MATERIAL_COLUMNS, [(d, _fmt(q), u) for d, q, u in MATERIAL_ROWS])
+    write_raster_pdf(pdf_path, [(SHEET_D, ops)], dpi=100)
+    return _material_golden()
+
+
+def _material_golden() -> Dict[str, Any]:
+    return {"bid_items": [], "materials": [
+        {"name": description, "quantity": qty, "unit": unit} for description, qty, unit in MATERIAL_ROWS
+    ]}
+
+
+def _fmt(value: float) -> str:
+    return f"{value:,.0f}" if float(value).is_integer() else f"{value:,}"
+
+
+def _table_ops(
+    x: float,
+    y: float,
+    columns: List[Column],
+    rows: List[Sequence[str]],
+    size: float = 9,
+    row_height: float = 18,
+) -> List[Tuple]:
+    """Drawing operations of a ruled table (top-left origin, points)"""
+    total_width = sum(width for _, width in columns)
+    height = row_height * (len(rows) + 1)
+    ops: List[Tuple] = []
+
+    for index in range(len(rows) + 2):
+        ops.append(("line", x, y + index * row_height, x + total_width, y + index * row_height))
+
+    left = x
+    for header, width in columns:
+        ops.append(("line", left, y, left, y + height))
+        ops.append(("text", left + 4, y + row_height - 5, size, header))
+        left += width
+    ops.append(("line", left, y, left, y + height))
+
+    for row_index, row in enumerate(rows, start=1):
+        left = x
+        baseline = y + (row_index + 1) * row_height - 5
+        for (_, width), value in zip(columns, row):
+            ops.append(("text", left + 4, baseline, size, str(value)))
+            left += width
+
+    return ops
+
+
+# ---------------------------------------------------------------------------
+# PDF writers
+# ---------------------------------------------------------------------------
+
+def write_vector_pdf(path: Path, pages: List[Tuple[Tuple[float, float], List[Tuple]]]) -> None:
+    """
+    Write a PDF with a real text layer (like a CAD export)
+
+    Args:
+        path: Output path
+        pages: (page size in points, drawing operations) per page; operations
+            are ("text", x, baseline, size, text), ("line", x0, y0, x1, y1)
+            and ("rect", x, y, width, height), top-left origin
+    """
+    objects: List[bytes] = [b"", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+
+    for (width, height), ops in pages:
+        commands = []
+        for op in ops:
+            if op[0] == "text":
+                _, x, baseline, size, text = op
+                commands.append(f"BT /F1 {size} Tf {x:.2f} {height - baseline:.2f} Td ({_pdf_escape(text)}) Tj ET")
+            elif op[0] == "line":
+                _, x0, y0, x1, y1 = op
+                commands.append(f"0.5 w {x0:.2f} {height - y0:.2f} m {x1:.2f} {height - y1:.2f} l S")
+            elif op[0] == "rect":
+                _, x, y, w, h = op
+                commands.append(f"1 w {x:.2f} {height - y - h:.2f} {w:.2f} {h:.2f} re S")
+        stream = "\n".join(commands).encode("latin-1")
+
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {width} {height}] "
+            f"/Contents {content_id} 0 R /Resources << /Font << /F1 3 0 R >> >> >>".encode("latin-1")
+        )
+        page_ids.append(len(objects))
+
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode("latin-1")
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, obj)
+
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+
+    Path(path).write_bytes(bytes(output))
+
+
+def write_raster_pdf(path: Path, pages: List[Tuple[Tuple[float, float], List[Tuple]]], dpi: int = 150) -> None:
+    """
+    Write an image-only PDF (like a scan) from the same drawing operations
+
+    Args:
+        path: Output path
+        pages: See write_vector_pdf()
+        dpi: Scan resolution
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
+    scale = dpi / 72
+    images = []
+
+    for (width, height), ops in pages:
+        image = Image.new("L", (int(width * scale), int(height * scale)), 255)
+        draw = ImageDraw.Draw(image)
+        for op in ops:
+            if op[0] == "text":
+                _, x, baseline, size, text = op
+                font = _raster_font(ImageFont, size * scale)
+                draw.text((x * scale, (baseline - size) * scale), text, fill=0, font=font)
+            elif op[0] == "line":
+                _, x0, y0, x1, y1 = op
+                draw.line([(x0 * scale, y0 * scale), (x1 * scale, y1 * scale)], fill=0, width=max(1, int(scale / 2)))
+            elif op[0] == "rect":
+                _, x, y, w, h = op
+                draw.rectangle([x * scale, y * scale, (x + w) * scale, (y + h) * scale], outline=0, width=max(1, int(scale)))
+        images.append(image)
+
+    images[0].save(path, "PDF", resolution=dpi, save_all=True, append_images=images[1:])
+
+
+def _raster_font(image_font: Any, size: float) -> Any:
+    """Scalable font when Pillow has FreeType, else the built-in bitmap font"""
+    for name in ("DejaVuSans.ttf", "Arial.ttf", "arial.ttf"):
+        try:
+            return image_font.truetype(name, int(size))
+        except OSError:
+            continue
+    try:
+        return image_font.load_default(size=int(size))
+    except TypeError:
+        return image_font.load_default()
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    for generated in ensure_synthetic_corpus(force=True):
+        print(f"✓ {generated}")
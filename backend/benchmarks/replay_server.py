@@ -0,0 +1,587 @@
+"""
+LLM Replay Server
+
+Local HTTP server that stands in for the Anthropic Messages API and the
+OpenAI Chat Completions API, so the parsing pipeline can be benchmarked
+offline, deterministically and for free.
+
+Requests are answered from cassettes: recorded responses keyed by a hash of
+the request body (image and PDF payloads are hashed, so keys stay small).
+- Record mode proxies cache misses to the real provider and saves the
+  response, so a corpus is captured once and replayed afterwards.
+- Without a cassette the server answers according to the miss policy:
+  "oracle" replies with the golden takeoff of the current document (set via
+  POST /_context), "empty" with an empty extraction, "error" with a 404.
+
+Latency and provider errors (429/529) can be injected to measure how the
+pipeline behaves under a slow or flaky provider.
+
+Control endpoints:
+    POST /_context   Golden takeoff for oracle replies
+    POST /_reset     Reset call statistics
+    GET  /_stats     Call statistics since the last reset
+
+Usage:
+    python -m benchmarks.replay_server --port 8765 --latency-ms 800
+    python -m benchmarks.replay_server --record   # needs real API keys
+"""
+
+import argparse
+import base64
+import hashlib
+import io
+import json
+import logging
+import os
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CASSETTE_DIR = Path(__file__).parent / "cassettes"
+
+ANTHROPIC_UPSTREAM = "https://api.anthropic.com"
+OPENAI_UPSTREAM = "https://api.openai.com"
+
+# Strings longer than this (base64 images, PDFs) are replaced by their hash in keys
+_PAYLOAD_HASH_THRESHOLD = 1024
+
+# Request fields that do not change the response
+_VOLATILE_FIELDS = ("stream", "metadata", "user")
+
+# Headers that must not be forwarded to the upstream provider
+_HOP_HEADERS = {"host", "content-length", "connection", "accept-encoding", "transfer-encoding"}
+
+# Characters per SSE delta when synthesizing a streamed response
+_STREAM_CHUNK = 256
+
+
+def request_key(path: str, body: Dict[str, Any]) -> str:
+    """
+    Cassette key of a request
+
+    Args:
+        path: Request path (/v1/messages or /v1/chat/completions)
+        body: Decoded JSON request body
+
+    Returns:
+        Hex digest identifying the request
+    """
+    normalized = {k: v for k, v in body.items() if k not in _VOLATILE_FIELDS}
+    canonical = json.dumps(_hash_payloads(normalized), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{path}|{canonical}".encode("utf-8")).hexdigest()
+
+
+def _hash_payloads(value: Any) -> Any:
+    """Replace large string payloads with their digest"""
+    if isinstance(value, dict):
+        return {k: _hash_payloads(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_hash_payloads(v) for v in value]
+    if isinstance(value, str) and len(value) > _PAYLOAD_HASH_THRESHOLD:
+        return "sha256:" + hashlib.sha256(value.encode("utf-8")).hexdigest()
+    return value
+
+
+class CassetteStore:
+    """
+    Recorded responses on disk, one JSON file per request key
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Load a recorded response, or None if the request was never recorded"""
+        path = self.directory / f"{key}.json"
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, key: str, path: str, body: Dict[str, Any], status: int, response: Dict[str, Any]) -> None:
+        """Record a response together with a readable summary of its request"""
+        cassette = {
+            "request": {
+                "path": path,
+                "model": body.get("model"),
+                "tool": (body.get("tool_choice") or {}).get("name"),
+            },
+            "status": status,
+            "response": response,
+        }
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.directory / f"{key}.json", "w", encoding="utf-8") as f:
+                json.dump(cassette, f, indent=2)
+
+
+class GoldenOracle:
+    """
+    Synthesizes plausible answers from the golden takeoff of a document
+
+    Every extraction request is answered with the full golden takeoff, so
+    oracle runs measure the pipeline itself (rendering, tiling, call count,
+    deduplication of repeated answers) rather than model quality. Region
+    detection answers with the whole page as a single region.
+    """
+
+    def __init__(self):
+        self.context: Dict[str, Any] = {}
+        self._tool_ids = 0
+        self._lock = threading.Lock()
+
+    def set_context(self, context: Dict[str, Any]) -> None:
+        """Set the golden takeoff used for the following requests"""
+        self.context = context or {}
+
+    def extraction(self) -> Dict[str, Any]:
+        """Plan extraction answer"""
+        return {
+            "bid_items": self.context.get("bid_items", []),
+            "materials": self.context.get("materials", []),
+            "specifications": self.context.get("specifications", []),
+            "project_info": self.context.get("project_info", {}),
+        }
+
+    def anthropic(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer a Messages API request"""
+        tool = (body.get("tool_choice") or {}).get("name")
+
+        if tool == "record_regions":
+            width, height = _request_image_size(body)
+            answer = {"regions": [{
+                "label": "full_page", "x": 0, "y": 0,
+                "width": width, "height": height, "confidence": 1.0,
+            }]}
+        elif tool == "record_plan_extraction":
+            answer = self.extraction()
+        else:
+            answer = {}
+
+        if tool:
+            with self._lock:
+                self._tool_ids += 1
+                tool_id = f"toolu_replay_{self._tool_ids:06d}"
+            content = [{"type": "tool_use", "id": tool_id, "name": tool, "input": answer}]
+            stop_reason = "tool_use"
+        else:
+            content = [{"type": "text", "text": json.dumps(answer)}]
+            stop_reason = "end_turn"
+
+        return {
+            "id": f"msg_replay_{hashlib.sha1(json.dumps(content).encode()).hexdigest()[:16]}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "replay"),
+            "content": content,
+            "stop_reason": stop_reason,
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": _estimate_tokens(body),
+                "output_tokens": _estimate_tokens(content),
+            },
+        }
+
+    def openai(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer a Chat Completions request"""
+        content = json.dumps(self.extraction())
+        return {
+            "id": f"chatcmpl-replay-{hashlib.sha1(content.encode()).hexdigest()[:16]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "replay"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": _estimate_tokens(body),
+                "completion_tokens": _estimate_tokens(content),
+                "total_tokens": _estimate_tokens(body) + _estimate_tokens(content),
+            },
+        }
+
+
+def _estimate_tokens(value: Any) -> int:
+    """Rough token count (4 characters per token, payloads hashed)"""
+    text = value if isinstance(value, str) else json.dumps(_hash_payloads(value))
+    return max(1, len(text) // 4)
+
+
+def _request_image_size(body: Dict[str, Any]) -> Tuple[int, int]:
+    """Pixel size of the first image in a Messages API request"""
+    for message in body.get("messages", []):
+        content = message.get("content")
+        if not isinstance(content, list):
+            continue
+        for block in content:
+            source = block.get("source") if isinstance(block, dict) else None
+            if block.get("type") == "image" and source and source.get("data"):
+                try:
+                    from PIL import Image
+                    image = Image.open(io.BytesIO(base64.b64decode(source["data"])))
+                    return image.size
+                except Exception as e:
+                    logger.warning(f"Could not read request image size: {e}")
+    return 1000, 1000
+
+
+class ReplayState:
+    """
+    Shared state of the server: cassettes, oracle, fault injection and stats
+    """
+
+    def __init__(
+        self,
+        cassettes: CassetteStore,
+        record: bool = False,
+        on_miss: str = "oracle",
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        error_rate: float = 0,
+        error_status: int = 529,
+        seed: Optional[int] = None,
+        anthropic_upstream: str = ANTHROPIC_UPSTREAM,
+        openai_upstream: str = OPENAI_UPSTREAM,
+    ):
+        self.cassettes = cassettes
+        self.record = record
+        self.on_miss = on_miss
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.anthropic_upstream = anthropic_upstream.rstrip("/")
+        self.openai_upstream = openai_upstream.rstrip("/")
+        self.oracle = GoldenOracle()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset call statistics"""
+        with self._lock:
+            self.stats: Dict[str, Any] = {
+                "requests": 0,
+                "by_endpoint": {},
+                "by_tool": {},
+                "cassette_hits": 0,
+                "recorded": 0,
+                "oracle": 0,
+                "misses": 0,
+                "injected_errors": 0,
+                "input_tokens": 0,
+                "output_tokens": 0,
+            }
+
+    def count(self, path: str, body: Dict[str, Any], outcome: str) -> None:
+        """Record one request in the statistics"""
+        tool = (body.get("tool_choice") or {}).get("name") or "none"
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["by_endpoint"][path] = self.stats["by_endpoint"].get(path, 0) + 1
+            self.stats["by_tool"][tool] = self.stats["by_tool"].get(tool, 0) + 1
+            self.stats[outcome] += 1
+
+    def count_usage(self, response: Dict[str, Any]) -> None:
+        """Add the token usage of a response to the statistics"""
+        usage = response.get("usage") or {}
+        with self._lock:
+            self.stats["input_tokens"] += usage.get("input_tokens", usage.get("prompt_tokens", 0))
+            self.stats["output_tokens"] += usage.get("output_tokens", usage.get("completion_tokens", 0))
+
+    def delay(self) -> None:
+        """Sleep for the configured provider latency"""
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+        seconds = max(0.0, self.latency_ms + jitter) / 1000
+        if seconds:
+            time.sleep(seconds)
+
+    def inject_error(self) -> bool:
+        """Decide whether this request fails with a provider error"""
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Copy of the current statistics"""
+        with self._lock:
+            return json.loads(json.dumps(self.stats))
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """HTTP handler speaking enough of both provider APIs for the parsers"""
+
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def state(self) -> ReplayState:
+        return self.server.state
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(format % args)
+
+    def do_GET(self) -> None:
+        if self.path == "/_stats":
+            self._send_json(200, self.state.snapshot())
+        elif self.path == "/_health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self) -> None:
+        body = self._read_json()
+
+        if self.path == "/_context":
+            self.state.oracle.set_context(body)
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/_reset":
+            self.state.reset()
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/v1/messages":
+            self._handle_provider("anthropic", body)
+        elif self.path == "/v1/chat/completions":
+            self._handle_provider("openai", body)
+        else:
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+
+    def _handle_provider(self, provider: str, body: Dict[str, Any]) -> None:
+        """Answer a provider API request from cassettes, upstream or the oracle"""
+        state = self.state
+        state.delay()
+
+        if state.inject_error():
+            state.count(self.path, body, "injected_errors")
+            self._send_error(provider, state.error_status, "Injected provider error")
+            return
+
+        if provider == "openai" and body.get("stream"):
+            self._send_error(provider, 400, "Streaming chat completions are not supported by the replay server")
+            return
+
+        key = request_key(self.path, body)
+        cassette = state.cassettes.load(key)
+
+        if cassette is not None:
+            state.count(self.path, body, "cassette_hits")
+            status, response = cassette["status"], cassette["response"]
+        elif state.record:
+            status, response = self._forward(provider, body)
+            if status == 200:
+                state.cassettes.save(key, self.path, body, status, response)
+                state.count(self.path, body, "recorded")
+            else:
+                state.count(self.path, body, "misses")
+        elif state.on_miss == "oracle":
+            state.count(self.path, body, "oracle")
+            oracle = state.oracle
+            status, response = 200, oracle.anthropic(body) if provider == "anthropic" else oracle.openai(body)
+        elif state.on_miss == "empty":
+            state.count(self.path, body, "oracle")
+            empty = GoldenOracle()
+            status, response = 200, empty.anthropic(body) if provider == "anthropic" else empty.openai(body)
+        else:
+            state.count(self.path, body, "misses")
+            self._send_error(provider, 404, f"No cassette for request {key}")
+            return
+
+        if status == 200:
+            state.count_usage(response)
+
+        if provider == "anthropic" and body.get("stream") and status == 200:
+            self._send_message_stream(response)
+        else:
+            self._send_json(status, response)
+
+    def _forward(self, provider: str, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """Send a request to the real provider (record mode)"""
+        upstream = self.state.anthropic_upstream if provider == "anthropic" else self.state.openai_upstream
+        # Streams are recorded as complete messages and re-streamed on replay
+        payload = dict(body, stream=False) if body.get("stream") else body
+        headers = {k: v for k, v in self.headers.items() if k.lower() not in _HOP_HEADERS}
+
+        request = urllib.request.Request(
+            upstream + self.path,
+            data=json.dumps(payload).encode("utf-8"),
+            headers=headers,
+            method="POST",
+        )
+
+        try:
+            with urllib.request.urlopen(request, timeout=600) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            try:
+                return e.code, json.loads(e.read())
+            except ValueError:
+                return e.code, {"error": {"message": str(e)}}
+
+    def _send_message_stream(self, message: Dict[str, Any]) -> None:
+        """Replay a complete message as Messages API server-sent events"""
+        events = [("message_start", {
+            "type": "message_start",
+            "message": dict(message, content=[], stop_reason=None, stop_sequence=None,
+                            usage=dict(message.get("usage", {}), output_tokens=0)),
+        })]
+
+        for index, block in enumerate(message.get("content", [])):
+            if block.get("type") == "tool_use":
+                start = dict(block, input={})
+                text = json.dumps(block.get("input", {}))
+                delta_type, delta_field = "input_json_delta", "partial_json"
+            else:
+                start = dict(block, text="")
+                text = block.get("text", "")
+                delta_type, delta_field = "text_delta", "text"
+
+            events.append(("content_block_start", {"type": "content_block_start", "index": index, "content_block": start}))
+            for offset in range(0, len(text), _STREAM_CHUNK):
+                events.append(("content_block_delta", {
+                    "type": "content_block_delta",
+                    "index": index,
+                    "delta": {"type": delta_type, delta_field: text[offset:offset + _STREAM_CHUNK]},
+                }))
+            events.append(("content_block_stop", {"type": "content_block_stop", "index": index}))
+
+        events.append(("message_delta", {
+            "type": "message_delta",
+            "delta": {"stop_reason": message.get("stop_reason"), "stop_sequence": message.get("stop_sequence")},
+            "usage": {"output_tokens": message.get("usage", {}).get("output_tokens", 0)},
+        }))
+        events.append(("message_stop", {"type": "message_stop"}))
+
+        payload = "".join(f"event: {name}\ndata: {json.dumps(data)}\n\n" for name, data in events).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_error(self, provider: str, status: int, message: str) -> None:
+        """Send an error in the provider's error format"""
+        if provider == "anthropic":
+            error_type = {429: "rate_limit_error", 529: "overloaded_error", 404: "not_found_error"}.get(status, "api_error")
+            self._send_json(status, {"type": "error", "error": {"type": error_type, "message": message}})
+        else:
+            self._send_json(status, {"error": {"message": message, "type": "server_error", "code": status}})
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return {}
+
+    def _send_json(self, status: int, data: Dict[str, Any]) -> None:
+        payload = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class ReplayServer:
+    """
+    Replay server running in a background thread
+
+    Usage:
+        with ReplayServer(ReplayState(CassetteStore(DEFAULT_CASSETTE_DIR))) as server:
+            os.environ["ANTHROPIC_BASE_URL"] = server.url
+            os.environ["OPENAI_BASE_URL"] = server.url + "/v1"
+    """
+
+    def __init__(self, state: ReplayState, host: str = "127.0.0.1", port: int = 0):
+        self.state = state
+        self.httpd = ThreadingHTTPServer((host, port), ReplayHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.state = state
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "ReplayServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """Command line options shared by the server and the benchmark runner"""
+    parser.add_argument("--cassettes", type=Path, default=DEFAULT_CASSETTE_DIR, help="Cassette directory")
+    parser.add_argument("--record", action="store_true", help="Proxy misses to the real provider and record them")
+    parser.add_argument("--on-miss", choices=["oracle", "empty", "error"], default="oracle",
+                        help="Answer for requests without a cassette")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Simulated provider latency per call")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Random +/- latency jitter")
+    parser.add_argument("--error-rate", type=float, default=0, help="Fraction of calls failing with --error-status")
+    parser.add_argument("--error-status", type=int, default=529, help="Injected error status (429 or 529)")
+    parser.add_argument("--seed", type=int, default=1234, help="Seed for jitter and error injection")
+
+
+def state_from_arguments(args: argparse.Namespace) -> ReplayState:
+    """Build server state from parsed command line options"""
+    return ReplayState(
+        CassetteStore(args.cassettes),
+        record=args.record,
+        on_miss=args.on_miss,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+        anthropic_upstream=os.getenv("REPLAY_ANTHROPIC_UPSTREAM", ANTHROPIC_UPSTREAM),
+        openai_upstream=os.getenv("REPLAY_OPENAI_UPSTREAM", OPENAI_UPSTREAM),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay server for the Anthropic and OpenAI APIs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = ReplayServer(state_from_arguments(args), args.host, args.port)
+
+    print(f"Replay server listening on {server.url}")
+    print(f"  ANTHROPIC_BASE_URL={server.url}")
+    print(f"  OPENAI_BASE_URL={server.url}/v1")
+
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
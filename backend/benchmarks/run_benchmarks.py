@@ -0,0 +1,339 @@
+"""
+Parsing Benchmark Runner
+
+Runs the parsing pipeline end to end over the benchmark corpus against the
+local replay server and reports, per document and entry point:
+- wall time, CPU time and peak RSS of the parse
+- LLM calls (total and per page) and estimated tokens
+- precision / recall / F1 and quantity accuracy against the golden takeoff
+
+Every case runs in a fresh process so timings and memory are not skewed by
+earlier cases (warm caches, already-imported modules, leaked images).
+
+Entry points:
+    selector     StrategySelector.parse_with_fallback (multi-strategy path)
+    tiling       ClaudeTilingStrategy.parse (coarse scan + tiles)
+    plan_parser  PlanParser.parse_plan (path used by the upload endpoints)
+
+Usage:
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --latency-ms 800 --jitter-ms 300 --error-rate 0.05
+    python -m benchmarks.run_benchmarks --output benchmarks/results/baseline.json
+    python -m benchmarks.run_benchmarks --baseline benchmarks/results/baseline.json
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.corpus import CorpusDocument, load_documents
+from benchmarks.replay_server import ReplayServer, add_server_arguments, state_from_arguments
+from benchmarks.scoring import DEFAULT_MATCH_THRESHOLD, score_takeoff
+
+logger = logging.getLogger(__name__)
+
+TARGETS = ["selector", "tiling", "plan_parser"]
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Changes smaller than these are noise, not regressions
+_MIN_TIME_DELTA_S = 0.25
+_MIN_RSS_DELTA_MB = 20
+_MIN_F1_DELTA = 0.02
+
+
+def run_case(target: str, pdf_path: str, max_pages: int, env: Dict[str, str], queue: Any) -> None:
+    """
+    Parse one document in a fresh process and report measurements
+
+    Args:
+        target: Entry point name (see TARGETS)
+        pdf_path: Document to parse
+        max_pages: Maximum pages to parse
+        env: Environment pointing the app at the replay server
+        queue: Receives the measurement dictionary
+    """
+    os.environ.update(env)
+    logging.basicConfig(level=os.getenv("BENCHMARK_LOG_LEVEL", "WARNING"))
+
+    import asyncio
+
+    from app.ai.parsing.config import get_strategy_config, load_parsing_config
+
+    config = get_strategy_config(load_parsing_config())
+    path = Path(pdf_path)
+
+    if target == "selector":
+        from app.ai.parsing.strategy_selector import StrategySelector
+        run = StrategySelector(config).parse_with_fallback(path, max_pages)
+    elif target == "tiling":
+        from app.ai.parsing.strategies.claude_tiling_strategy import ClaudeTilingStrategy
+        run = ClaudeTilingStrategy(config).parse(path, max_pages)
+    else:
+        from app.ai.plan_parser import PlanParser
+        run = PlanParser().parse_plan(path, max_pages)
+
+    baseline_rss = _peak_rss()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    try:
+        result = asyncio.run(run)
+        error = None
+    except Exception as e:
+        result, error = None, f"{type(e).__name__}: {e}"
+
+    wall_time = time.perf_counter() - wall_start
+    cpu_time = time.process_time() - cpu_start
+    peak_rss = _peak_rss()
+
+    if isinstance(result, dict):
+        success, data = result.get("success", False), result.get("data")
+        method, error = result.get("method"), error or result.get("error")
+    elif result is not None:
+        success, data = result.success, result.data
+        method = (result.metadata or {}).get("method") or result.strategy_used.value
+        error = error or result.error
+    else:
+        success, data, method = False, None, None
+
+    queue.put({
+        "success": success,
+        "method": method,
+        "error": error,
+        "data": {"bid_items": (data or {}).get("bid_items", []), "materials": (data or {}).get("materials", [])},
+        "wall_time_s": round(wall_time, 3),
+        "cpu_time_s": round(cpu_time, 3),
+        "peak_rss_mb": peak_rss,
+        "rss_growth_mb": round(peak_rss - baseline_rss, 1) if peak_rss is not None else None,
+    })
+
+
+def _peak_rss() -> Optional[float]:
+    """Peak resident set size of this process in MB (None where unsupported)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _control(server_url: str, path: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Call a replay server control endpoint"""
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    request = urllib.request.Request(
+        server_url + path, data=data, method="POST" if data is not None else "GET",
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return json.loads(response.read())
+
+
+def _page_count(pdf_path: Path, max_pages: int) -> int:
+    from PyPDF2 import PdfReader
+    return max(1, min(len(PdfReader(str(pdf_path)).pages), max_pages))
+
+
+def benchmark_document(
+    document: CorpusDocument,
+    target: str,
+    server_url: str,
+    args: argparse.Namespace
+) -> Dict[str, Any]:
+    """
+    Benchmark one document with one entry point
+
+    Returns:
+        Measurements, call statistics and scores of the case
+    """
+    _control(server_url, "/_reset", {})
+    _control(server_url, "/_context", document.golden)
+
+    env = {
+        "ANTHROPIC_API_KEY": os.getenv("BENCHMARK_ANTHROPIC_API_KEY", "replay-key"),
+        "OPENAI_API_KEY": os.getenv("BENCHMARK_OPENAI_API_KEY", "replay-key"),
+        "ANTHROPIC_BASE_URL": server_url,
+        "OPENAI_BASE_URL": server_url + "/v1",
+        # Cache hits would hide LLM calls and make runs order-dependent
+        "ENABLE_RESPONSE_CACHE": "true" if args.response_cache else "false",
+    }
+
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=run_case, args=(target, str(document.pdf_path), args.max_pages, env, queue))
+    process.start()
+
+    try:
+        measurement = queue.get(timeout=args.timeout)
+    except Exception:
+        measurement = {"success": False, "error": f"No result within {args.timeout}s", "data": None}
+    process.join(timeout=10)
+    if process.is_alive():
+        process.kill()
+
+    stats = _control(server_url, "/_stats")
+    pages = _page_count(document.pdf_path, args.max_pages)
+    data = measurement.pop("data")
+
+    return {
+        "document": document.name,
+        "target": target,
+        "pages": pages,
+        **measurement,
+        "llm_calls": stats["requests"],
+        "llm_calls_per_page": round(stats["requests"] / pages, 2),
+        "llm_calls_by_tool": stats["by_tool"],
+        "injected_errors": stats["injected_errors"],
+        "input_tokens": stats["input_tokens"],
+        "output_tokens": stats["output_tokens"],
+        **score_takeoff(data, document.golden, args.match_threshold),
+    }
+
+
+def compare_to_baseline(
+    results: List[Dict[str, Any]],
+    baseline: List[Dict[str, Any]],
+    tolerance: float
+) -> List[str]:
+    """
+    Find regressions against a previous run
+
+    Args:
+        results: Cases of this run
+        baseline: Cases of the baseline run
+        tolerance: Allowed relative increase of time and memory
+
+    Returns:
+        One message per regression
+    """
+    previous = {(case["document"], case["target"]): case for case in baseline}
+    regressions = []
+
+    for case in results:
+        base = previous.get((case["document"], case["target"]))
+        if base is None:
+            continue
+        name = f"{case['document']}/{case['target']}"
+
+        for metric, floor in (("wall_time_s", _MIN_TIME_DELTA_S), ("cpu_time_s", _MIN_TIME_DELTA_S),
+                              ("peak_rss_mb", _MIN_RSS_DELTA_MB)):
+            before, after = base.get(metric), case.get(metric)
+            if before is None or after is None:
+                continue
+            if after > before * (1 + tolerance) and after - before > floor:
+                regressions.append(f"{name}: {metric} {before} -> {after}")
+
+        if case.get("llm_calls", 0) > base.get("llm_calls", 0):
+            regressions.append(f"{name}: llm_calls {base.get('llm_calls')} -> {case.get('llm_calls')}")
+
+        if case.get("f1", 0) < base.get("f1", 0) - _MIN_F1_DELTA:
+            regressions.append(f"{name}: f1 {base.get('f1')} -> {case.get('f1')}")
+
+        if base.get("success") and not case.get("success"):
+            regressions.append(f"{name}: no longer succeeds ({case.get('error')})")
+
+    return regressions
+
+
+def print_report(results: List[Dict[str, Any]]) -> None:
+    """Print a summary table of the cases"""
+    header = (
+        f"{'document':<30} {'target':<12} {'ok':<3} {'method':<18} {'wall s':>7} {'cpu s':>7} "
+        f"{'rss MB':>7} {'calls':>6} {'/page':>6} {'P':>5} {'R':>5} {'F1':>5} {'qty':>5}"
+    )
+    print(header)
+    print("-" * len(header))
+
+    for case in results:
+        print(
+            f"{case['document'][:30]:<30} {case['target']:<12} {'✓' if case.get('success') else '✗':<3} "
+            f"{str(case.get('method') or '-')[:18]:<18} {case.get('wall_time_s', 0):>7.2f} "
+            f"{case.get('cpu_time_s', 0):>7.2f} {case.get('peak_rss_mb') or 0:>7.0f} "
+            f"{case['llm_calls']:>6} {case['llm_calls_per_page']:>6.1f} {case['precision']:>5.2f} "
+            f"{case['recall']:>5.2f} {case['f1']:>5.2f} {case['quantity_accuracy']:>5.2f}"
+        )
+        if case.get("error") and not case.get("success"):
+            print(f"    error: {case['error']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the parsing pipeline offline")
+    parser.add_argument("--targets", nargs="+", choices=TARGETS, default=TARGETS)
+    parser.add_argument("--documents", nargs="+", help="Only these corpus documents (by name)")
+    parser.add_argument("--corpus", nargs="+", type=Path, help="Corpus directories (default: corpus + synthetic)")
+    parser.add_argument("--max-pages", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=900, help="Seconds allowed per case")
+    parser.add_argument("--response-cache", action="store_true", help="Keep the in-process LLM response cache on")
+    parser.add_argument("--match-threshold", type=int, default=DEFAULT_MATCH_THRESHOLD)
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Fail on regressions against this results file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative time/memory increase")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    documents = load_documents(args.corpus)
+    if args.documents:
+        documents = [d for d in documents if d.name in args.documents]
+    if not documents:
+        print("No benchmark documents found")
+        return 1
+
+    results = []
+    with ReplayServer(state_from_arguments(args)) as server:
+        logger.info(f"Replay server on {server.url} ({len(documents)} documents, targets: {', '.join(args.targets)})")
+        for document in documents:
+            for target in args.targets:
+                logger.info(f"→ {document.name} / {target}")
+                results.append(benchmark_document(document, target, server.url, args))
+
+    print()
+    print_report(results)
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "settings": {
+            "max_pages": args.max_pages,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "error_rate": args.error_rate,
+            "on_miss": args.on_miss,
+            "response_cache": args.response_cache,
+        },
+        "cases": results,
+    }
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare_to_baseline(results, json.load(f)["cases"], args.tolerance)
+        if regressions:
+            print(f"\n✗ {len(regressions)} regressions against {args.baseline}:")
+            for message in regressions:
+                print(f"  - {message}")
+            return 1
+        print(f"\n✓ No regressions against {args.baseline}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Takeoff Scoring
+
+Precision and recall of an extracted takeoff against a golden takeoff.
+Items are paired one-to-one by fuzzy label match (bid item description or
+material name), best pairs first; a paired item also counts toward quantity
+accuracy when its quantity is within 1% of the golden quantity.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from fuzzywuzzy import fuzz
+
+DEFAULT_MATCH_THRESHOLD = 85
+QUANTITY_TOLERANCE = 0.01
+
+
+def takeoff_items(data: Optional[Dict[str, Any]]) -> List[Tuple[str, Optional[float]]]:
+    """
+    Labels and quantities of every item of an extraction
+
+    Args:
+        data: Extraction with bid_items and materials
+
+    Returns:
+        (lowercase label, quantity) per item with a label
+    """
+    items = []
+    for item in (data or {}).get("bid_items", []):
+        items.append((item.get("description"), item.get("quantity")))
+    for item in (data or {}).get("materials", []):
+        items.append((item.get("name"), item.get("quantity")))
+
+    return [
+        (str(label).strip().lower(), _number(quantity))
+        for label, quantity in items
+        if label and str(label).strip()
+    ]
+
+
+def score_takeoff(
+    predicted: Optional[Dict[str, Any]],
+    golden: Dict[str, Any],
+    threshold: int = DEFAULT_MATCH_THRESHOLD
+) -> Dict[str, Any]:
+    """
+    Score an extraction against the golden takeoff
+
+    Args:
+        predicted: Extracted data
+        golden: Golden takeoff
+        threshold: Minimum fuzzy ratio (0-100) for two labels to match
+
+    Returns:
+        Dictionary with precision, recall, f1, quantity_accuracy and counts
+    """
+    predicted_items = takeoff_items(predicted)
+    golden_items = takeoff_items(golden)
+
+    candidates = []
+    for p_index, (p_label, _) in enumerate(predicted_items):
+        for g_index, (g_label, _) in enumerate(golden_items):
+            ratio = fuzz.token_sort_ratio(p_label, g_label)
+            if ratio >= threshold:
+                candidates.append((ratio, p_index, g_index))
+
+    matched_predicted, matched_golden = set(), set()
+    quantity_matches = 0
+
+    for _, p_index, g_index in sorted(candidates, reverse=True):
+        if p_index in matched_predicted or g_index in matched_golden:
+            continue
+        matched_predicted.add(p_index)
+        matched_golden.add(g_index)
+        if _quantity_matches(predicted_items[p_index][1], golden_items[g_index][1]):
+            quantity_matches += 1
+
+    true_positives = len(matched_golden)
+    precision = true_positives / len(predicted_items) if predicted_items else (1.0 if not golden_items else 0.0)
+    recall = true_positives / len(golden_items) if golden_items else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+
+    return {
+        "precision": round(precision, 4),
+        "recall": round(recall, 4),
+        "f1": round(f1, 4),
+        "quantity_accuracy": round(quantity_matches / true_positives, 4) if true_positives else 0.0,
+        "true_positives": true_positives,
+        "predicted": len(predicted_items),
+        "expected": len(golden_items),
+    }
+
+
+def _quantity_matches(predicted: Optional[float], expected: Optional[float]) -> bool:
+    if expected is None:
+        return True
+    if predicted is None:
+        return False
+    return abs(predicted - expected) <= QUANTITY_TOLERANCE * max(abs(expected), 1.0)
+
+
+def _number(value: Any) -> Optional[float]:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(str(value).replace(",", "").replace("$", ""))
+    except ValueError:
+        return None
@@ -0,0 +1,39 @@
+"""
+Migration script to add page_fingerprints column to project_documents table.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+from app.core.database import engine
+
+def migrate():
+    """Add page fingerprint column to project_documents table"""
+
+    with engine.connect() as conn:
+        # Check existing columns
+        result = conn.execute(text("""
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_name = 'project_documents'
+        """))
+        existing_columns = [row[0] for row in result.fetchall()]
+        print(f"Existing columns: {existing_columns}")
+
+        # Add page_fingerprints column (per-page hashes used to diff addenda)
+        if 'page_fingerprints' not in existing_columns:
+            print("Adding page_fingerprints column...")
+            conn.execute(text("ALTER TABLE project_documents ADD COLUMN page_fingerprints JSON"))
+            print("  ✓ page_fingerprints column added")
+        else:
+            print("  - page_fingerprints column already exists")
+
+        conn.commit()
+        print("\nMigration complete!")
+
+if __name__ == "__main__":
+    print("Running migration: Add page_fingerprints column to project_documents")
+    print("=" * 60)
+    migrate()
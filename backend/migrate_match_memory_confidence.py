@@ -0,0 +1,40 @@
+"""
+Migration script to add the confidence column to material_match_memory table.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+from app.core.database import engine
+
+def migrate():
+    """Add confidence column to material_match_memory table"""
+
+    with engine.connect() as conn:
+        # Check existing columns
+        result = conn.execute(text("""
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_name = 'material_match_memory'
+        """))
+        existing_columns = [row[0] for row in result.fetchall()]
+        print(f"Existing columns: {existing_columns}")
+
+        if "confidence" not in existing_columns:
+            print("Adding confidence column...")
+            conn.execute(text(
+                "ALTER TABLE material_match_memory ADD COLUMN confidence NUMERIC(4, 3) NOT NULL DEFAULT 1"
+            ))
+            print("  ✓ confidence column added")
+        else:
+            print("  - confidence column already exists")
+
+        conn.commit()
+        print("\nMigration complete!")
+
+if __name__ == "__main__":
+    print("Running migration: Add confidence to material_match_memory")
+    print("=" * 60)
+    migrate()
@@ -0,0 +1,83 @@
+"""
+Migration script to add catalog search indexes to the materials table.
+
+- pg_trgm GIN indexes on product_code and description (ILIKE '%term%')
+- search_vector tsvector column (weighted code/description/manufacturer)
+  with a GIN index for ranked full-text search
+- (company_id, lower(product_code)) pattern index for prefix lookups
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+from app.core.database import engine
+
+SEARCH_VECTOR = """
+    setweight(to_tsvector('simple'::regconfig, coalesce(product_code, '')), 'A') ||
+    setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B') ||
+    setweight(to_tsvector('english'::regconfig, coalesce(manufacturer, '')), 'C')
+"""
+
+INDEXES = [
+    ("ix_materials_product_code_trgm",
+     "CREATE INDEX ix_materials_product_code_trgm ON materials USING gin (product_code gin_trgm_ops)"),
+    ("ix_materials_description_trgm",
+     "CREATE INDEX ix_materials_description_trgm ON materials USING gin (description gin_trgm_ops)"),
+    ("ix_materials_search_vector",
+     "CREATE INDEX ix_materials_search_vector ON materials USING gin (search_vector)"),
+    ("ix_materials_company_code_prefix",
+     "CREATE INDEX ix_materials_company_code_prefix ON materials (company_id, lower(product_code) text_pattern_ops)"),
+]
+
+def migrate():
+    """Add search column and indexes to materials table"""
+
+    with engine.connect() as conn:
+        print("Enabling pg_trgm extension...")
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        print("  ✓ pg_trgm enabled")
+
+        # Check existing columns
+        result = conn.execute(text("""
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_name = 'materials'
+        """))
+        existing_columns = [row[0] for row in result.fetchall()]
+
+        if "search_vector" not in existing_columns:
+            print("Adding search_vector column...")
+            conn.execute(text(
+                f"ALTER TABLE materials ADD COLUMN search_vector tsvector "
+                f"GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED"
+            ))
+            print("  ✓ search_vector column added")
+        else:
+            print("  - search_vector column already exists")
+
+        # Check existing indexes
+        result = conn.execute(text("""
+            SELECT indexname
+            FROM pg_indexes
+            WHERE tablename = 'materials'
+        """))
+        existing_indexes = [row[0] for row in result.fetchall()]
+
+        for name, statement in INDEXES:
+            if name not in existing_indexes:
+                print(f"Creating {name}...")
+                conn.execute(text(statement))
+                print(f"  ✓ {name} created")
+            else:
+                print(f"  - {name} already exists")
+
+        conn.execute(text("ANALYZE materials"))
+        conn.commit()
+        print("\nMigration complete!")
+
+if __name__ == "__main__":
+    print("Running migration: Add catalog search indexes to materials")
+    print("=" * 60)
+    migrate()
@@ -0,0 +1,45 @@
+"""
+Migration script to add match tracking columns to takeoff_items table.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+from app.core.database import engine
+
+def migrate():
+    """Add incremental matching columns to takeoff_items table"""
+
+    with engine.connect() as conn:
+        # Check existing columns
+        result = conn.execute(text("""
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_name = 'takeoff_items'
+        """))
+        existing_columns = [row[0] for row in result.fetchall()]
+        print(f"Existing columns: {existing_columns}")
+
+        columns = [
+            ("match_confidence", "NUMERIC(4, 3)"),
+            ("match_source", "VARCHAR"),
+            ("match_fingerprint", "VARCHAR"),
+        ]
+
+        for name, column_type in columns:
+            if name not in existing_columns:
+                print(f"Adding {name} column...")
+                conn.execute(text(f"ALTER TABLE takeoff_items ADD COLUMN {name} {column_type}"))
+                print(f"  ✓ {name} column added")
+            else:
+                print(f"  - {name} column already exists")
+
+        conn.commit()
+        print("\nMigration complete!")
+
+if __name__ == "__main__":
+    print("Running migration: Add match tracking columns to takeoff_items")
+    print("=" * 60)
+    migrate()
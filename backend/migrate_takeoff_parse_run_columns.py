@@ -0,0 +1,54 @@
+"""
+Migration script to add source_document_id and parse_run_key columns to takeoff_items table.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+from app.core.database import engine
+
+def migrate():
+    """Add parse run tracking columns to takeoff_items table"""
+
+    with engine.connect() as conn:
+        # Check existing columns
+        result = conn.execute(text("""
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_name = 'takeoff_items'
+        """))
+        existing_columns = [row[0] for row in result.fetchall()]
+        print(f"Existing columns: {existing_columns}")
+
+        # Add source_document_id column
+        if 'source_document_id' not in existing_columns:
+            print("Adding source_document_id column...")
+            conn.execute(text("ALTER TABLE takeoff_items ADD COLUMN source_document_id UUID REFERENCES project_documents(id)"))
+            print("  ✓ source_document_id column added")
+        else:
+            print("  - source_document_id column already exists")
+
+        # Add parse_run_key column
+        if 'parse_run_key' not in existing_columns:
+            print("Adding parse_run_key column...")
+            conn.execute(text("ALTER TABLE takeoff_items ADD COLUMN parse_run_key VARCHAR"))
+            print("  ✓ parse_run_key column added")
+        else:
+            print("  - parse_run_key column already exists")
+
+        # Index used by the idempotency check and replace-previous deletes
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_takeoff_items_parse_run_key
+            ON takeoff_items (parse_run_key)
+        """))
+        print("  ✓ ix_takeoff_items_parse_run_key index ready")
+
+        conn.commit()
+        print("\nMigration complete!")
+
+if __name__ == "__main__":
+    print("Running migration: Add parse run columns to takeoff_items")
+    print("=" * 60)
+    migrate()
@@ -0,0 +1,39 @@
+"""
+Migration script to add source_bbox column to takeoff_items table.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+from app.core.database import engine
+
+def migrate():
+    """Add source location column to takeoff_items table"""
+
+    with engine.connect() as conn:
+        # Check existing columns
+        result = conn.execute(text("""
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_name = 'takeoff_items'
+        """))
+        existing_columns = [row[0] for row in result.fetchall()]
+        print(f"Existing columns: {existing_columns}")
+
+        # Add source_bbox column (page box in PDF points for click-to-highlight)
+        if 'source_bbox' not in existing_columns:
+            print("Adding source_bbox column...")
+            conn.execute(text("ALTER TABLE takeoff_items ADD COLUMN source_bbox JSON"))
+            print("  ✓ source_bbox column added")
+        else:
+            print("  - source_bbox column already exists")
+
+        conn.commit()
+        print("\nMigration complete!")
+
+if __name__ == "__main__":
+    print("Running migration: Add source_bbox column to takeoff_items")
+    print("=" * 60)
+    migrate()
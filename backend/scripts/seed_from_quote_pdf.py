@@ -10,6 +10,7 @@ from decimal import Decimal
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import pdfplumber
+from sqlalchemy import insert
 from app.core.database import SessionLocal
 from app.models.user import User
 from app.models.material import Material
@@ -109,18 +110,20 @@ def seed_materials(materials: list, company_id: str):
         deleted = db.query(Material).filter(Material.company_id == company_id).delete()
         print(f"Deleted {deleted} existing materials")
         
-        # Add new materials
-        for mat in materials:
-            material = Material(
-                company_id=company_id,
-                product_code=mat['product_code'],
-                description=mat['description'],
-                category=mat['category'],
-                unit_price=mat['unit_price'],
-                unit=mat['unit'],
-                is_active=True
-            )
-            db.add(material)
+        # Add new materials in a single bulk insert
+        if materials:
+            db.execute(insert(Material).values([
+                {
+                    "company_id": company_id,
+                    "product_code": mat['product_code'],
+                    "description": mat['description'],
+                    "category": mat['category'],
+                    "unit_price": mat['unit_price'],
+                    "unit": mat['unit'],
+                    "is_active": True,
+                }
+                for mat in materials
+            ]))
         
         db.commit()
         print(f"Seeded {len(materials)} materials")
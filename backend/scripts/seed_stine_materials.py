@@ -10,6 +10,7 @@ from decimal import Decimal
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from app.core.database import SessionLocal
 from app.models.company import Company
@@ -152,20 +153,20 @@ def seed_stine_materials():
             {"code": "012704", "desc": "Flashing Tape PS 4\"x100' Window Wrap", "price": 28.79, "unit": "RL", "category": "Miscellaneous"},
         ]
 
-        # Insert materials
-        materials_created = 0
-        for mat in materials_data:
-            material = Material(
-                company_id=company.id,
-                product_code=mat["code"],
-                description=mat["desc"],
-                unit_price=Decimal(str(mat["price"])),
-                unit=mat["unit"],
-                category=mat["category"],
-                is_active=True
-            )
-            db.add(material)
-            materials_created += 1
+        # Insert materials in a single bulk insert
+        db.execute(insert(Material).values([
+            {
+                "company_id": company.id,
+                "product_code": mat["code"],
+                "description": mat["desc"],
+                "unit_price": Decimal(str(mat["price"])),
+                "unit": mat["unit"],
+                "category": mat["category"],
+                "is_active": True,
+            }
+            for mat in materials_data
+        ]))
+        materials_created = len(materials_data)
 
         db.commit()
 
@@ -0,0 +1,144 @@
+"""
+Regression tests for diffing addendum pages against the existing takeoff
+
+Run with: python test_addendum_delta.py (or pytest)
+"""
+
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+import sys
+import uuid
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.ai.parsing.utils.page_fingerprint import CHANGED, NEW
+from app.services.addendum_delta import addendum_delta
+
+PLAN_ID = str(uuid.uuid4())
+ADDENDUM_ID = str(uuid.uuid4())
+
+
+def existing_item(label, qty, page, unit="EA", document_id=PLAN_ID):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        label=label,
+        qty=Decimal(qty),
+        unit=unit,
+        source_document_id=uuid.UUID(document_id) if document_id else None,
+        source_page=page,
+    )
+
+
+def parsed_row(label, qty, page, unit="EA"):
+    return {
+        "label": label,
+        "qty": qty,
+        "unit": unit,
+        "source_page": page,
+        "source_document_id": ADDENDUM_ID,
+    }
+
+
+def changed_page(page, prior_page):
+    return {"page": page, "status": CHANGED, "prior_document_id": PLAN_ID, "prior_page": prior_page}
+
+
+def new_page(page):
+    return {"page": page, "status": NEW, "prior_document_id": None, "prior_page": None}
+
+
+def test_new_page_rows_are_added():
+    """A row on a new sheet never overwrites an item on another sheet"""
+    existing = [existing_item("Pine #2 2x4-14", 100, page=3)]
+    delta = addendum_delta.diff_rows(existing, [parsed_row("Pine #2 2x4-14", 10, page=9)], [new_page(9)])
+
+    assert [row["qty"] for row in delta["added"]] == [Decimal(10)]
+    assert delta["changed"] == []
+    assert delta["removed"] == []
+
+
+def test_changed_page_only_diffs_its_own_sheet():
+    """A revised page is compared with the sheet it replaces, not other sheets"""
+    on_sheet_3 = existing_item("Pine #2 2x4-14", 100, page=3)
+    on_sheet_4 = existing_item("Pine #2 2x4-14", 60, page=4)
+    rows = [parsed_row("Pine #2 2x4-14", 10, page=2)]
+
+    delta = addendum_delta.diff_rows([on_sheet_4], rows, [changed_page(2, prior_page=4)])
+
+    assert delta["changed"] == [(on_sheet_4, Decimal(10))]
+    assert on_sheet_3 not in delta["removed"]
+    assert delta["added"] == []
+
+
+def test_changed_page_item_missing_from_sheet_is_added():
+    """An item first appearing on a revised sheet is added, even if other sheets have it"""
+    delta = addendum_delta.diff_rows([], [parsed_row("Pine #2 2x4-14", 10, page=2)], [changed_page(2, prior_page=4)])
+
+    assert len(delta["added"]) == 1
+    assert delta["changed"] == []
+
+
+def test_repeated_rows_are_summed_per_sheet():
+    """Rows with the same key on one sheet are totalled, not dropped"""
+    item = existing_item("OSB 7/16 4x8", 120, page=5)
+    rows = [
+        parsed_row("OSB 7/16 4x8", 80, page=1),
+        parsed_row("osb  7/16 4x8", 40, page=1),
+    ]
+
+    delta = addendum_delta.diff_rows([item], rows, [changed_page(1, prior_page=5)])
+
+    assert delta["unchanged"] == 1
+    assert delta["changed"] == []
+    assert delta["added"] == []
+
+
+def test_item_dropped_from_revised_sheet_is_removed():
+    kept = existing_item("Pine #2 2x4-14", 100, page=3)
+    dropped = existing_item("Tyvek HomeWrap 9x150", 2, page=3, unit="RL")
+    rows = [parsed_row("Pine #2 2x4-14", 100, page=1)]
+
+    delta = addendum_delta.diff_rows([kept, dropped], rows, [changed_page(1, prior_page=3)])
+
+    assert delta["removed"] == [dropped]
+    assert delta["unchanged"] == 1
+
+
+def test_pageless_items_are_revised_by_key():
+    """Items from a multi-page vision parse have no page but are still revised, not duplicated"""
+    item = existing_item("Pine #2 2x4-14", 100, page=None)
+    untouched = existing_item("OSB 7/16 4x8", 40, page=None)
+    rows = [parsed_row("Pine #2 2x4-14", 120, page=2)]
+
+    delta = addendum_delta.diff_rows([item, untouched], rows, [changed_page(2, prior_page=4)])
+
+    assert delta["changed"] == [(item, Decimal(120))]
+    assert delta["added"] == []
+    assert delta["removed"] == []
+
+
+def test_items_without_document_are_revised_by_key():
+    """Rows saved before sources were recorded match on label and unit"""
+    item = existing_item("Pine #2 2x4-14", 100, page=None, document_id=None)
+    rows = [
+        parsed_row("Pine #2 2x4-14", 100, page=2),
+        parsed_row("Tyvek HomeWrap 9x150", 2, page=2, unit="RL"),
+    ]
+
+    delta = addendum_delta.diff_rows([item], rows, [changed_page(2, prior_page=4)])
+
+    assert delta["unchanged"] == 1
+    assert [row["label"] for row in delta["added"]] == ["Tyvek HomeWrap 9x150"]
+    assert delta["changed"] == []
+
+
+if __name__ == "__main__":
+    test_new_page_rows_are_added()
+    test_changed_page_only_diffs_its_own_sheet()
+    test_changed_page_item_missing_from_sheet_is_added()
+    test_repeated_rows_are_summed_per_sheet()
+    test_item_dropped_from_revised_sheet_is_removed()
+    test_pageless_items_are_revised_by_key()
+    test_items_without_document_are_revised_by_key()
+    print("All addendum delta tests passed")
@@ -0,0 +1,116 @@
+"""
+Regression tests for incremental takeoff matching
+
+Run with: python test_material_matcher.py (or pytest)
+"""
+
+from pathlib import Path
+from types import SimpleNamespace
+import sys
+import uuid
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services import material_matcher
+from app.services.material_matcher import match_fingerprint, match_takeoff_incrementally
+
+REVISION = "catalog-1"
+PINE = SimpleNamespace(id=uuid.uuid4(), description="Pine #2 2x4-14", unit="EA")
+
+
+class FakeMatcher:
+    """Stands in for MaterialMatcher; finds Pine only at thresholds up to 60"""
+
+    calls = []
+
+    def __init__(self, db, company_id):
+        pass
+
+    def _load_materials(self):
+        return [PINE]
+
+    def match_multiple_items(self, items, threshold):
+        FakeMatcher.calls.append((sorted(str(item.id) for item in items), threshold))
+        if threshold > 60:
+            return {str(item.id): [] for item in items}
+        return {
+            str(item.id): [{"material": PINE, "confidence": 0.6, "match_type": "fuzzy"}]
+            for item in items
+        }
+
+
+def takeoff_item(**stored):
+    fields = {
+        "id": uuid.uuid4(),
+        "label": "2x4 stud 14ft",
+        "unit": "EA",
+        "qty": 10,
+        "category": "Walls",
+        "notes": None,
+        "matched_material_id": None,
+        "match_confidence": None,
+        "match_source": None,
+        "match_fingerprint": None,
+    }
+    fields.update(stored)
+    return SimpleNamespace(**fields)
+
+
+def run_incremental(items, threshold, memory=None):
+    patched = {
+        "catalog_revision": lambda db, company_id: REVISION,
+        "MaterialMatcher": FakeMatcher,
+        "match_memory": SimpleNamespace(load=lambda db, company_id: memory or {}),
+    }
+    originals = {name: getattr(material_matcher, name) for name in patched}
+    FakeMatcher.calls = []
+    try:
+        for name, value in patched.items():
+            setattr(material_matcher, name, value)
+        return match_takeoff_incrementally(None, "company-1", items, threshold=threshold)
+    finally:
+        for name, value in originals.items():
+            setattr(material_matcher, name, value)
+
+
+def test_unmatched_item_is_rematched_at_lower_threshold():
+    """No match at 70 does not mean no match at 50"""
+    item = takeoff_item()
+    item.match_fingerprint = run_incremental([item], threshold=70)["fingerprints"][str(item.id)]
+
+    assert run_incremental([item], threshold=70)["rematched"] == set()
+
+    result = run_incremental([item], threshold=50)
+    assert result["rematched"] == {str(item.id)}
+    assert result["matches"][str(item.id)][0]["material"] is PINE
+
+
+def test_low_confidence_match_is_not_reused_at_higher_threshold():
+    """A match stored at 50 with confidence 0.6 does not satisfy a caller asking for 70"""
+    item = takeoff_item()
+    stored = run_incremental([item], threshold=50)
+    item.matched_material_id = PINE.id
+    item.match_confidence = 0.6
+    item.match_source = "auto"
+    item.match_fingerprint = stored["fingerprints"][str(item.id)]
+
+    assert run_incremental([item], threshold=50)["rematched"] == set()
+    assert run_incremental([item], threshold=70)["rematched"] == {str(item.id)}
+
+
+def test_remembered_material_invalidates_other_matches():
+    """A manual pick for the same label and unit reaches lines matched to another material"""
+    item = takeoff_item(matched_material_id=PINE.id, match_confidence=0.6, match_source="auto")
+    item.match_fingerprint = match_fingerprint(item, REVISION)
+
+    assert run_incremental([item], threshold=50)["rematched"] == set()
+
+    memory = {("2x4 stud 14ft", "ea"): (str(uuid.uuid4()), 1, 1.0)}
+    assert run_incremental([item], threshold=50, memory=memory)["rematched"] == {str(item.id)}
+
+
+if __name__ == "__main__":
+    test_unmatched_item_is_rematched_at_lower_threshold()
+    test_low_confidence_match_is_not_reused_at_higher_threshold()
+    test_remembered_material_invalidates_other_matches()
+    print("All material matcher tests passed")
@@ -0,0 +1,56 @@
+"""
+Regression tests for bulk-saving parsed takeoff items
+
+Run with: python test_takeoff_persistence.py (or pytest)
+"""
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql
+
+from app.models.estimation import TakeoffItem
+from app.services.takeoff_persistence import takeoff_persistence
+
+# Bid items come first, as the parser returns them
+MIXED_PARSE = {
+    "bid_items": [
+        {"item_number": "201-01", "description": "Clearing and Grubbing", "quantity": 1, "unit": "LS"},
+    ],
+    "materials": [
+        {"name": "Pine #2 2x4-14", "quantity": 80, "unit": "EA", "category": "Walls"},
+        {"name": "OSB 7/16 4x8", "quantity": 40, "unit": "EA", "category": "Roof"},
+    ],
+}
+
+
+def build_mixed_rows():
+    return takeoff_persistence.build_rows("project-1", MIXED_PARSE, "document-1", "run-1")
+
+
+def test_rows_share_columns():
+    """A multi-row INSERT takes its columns from the first row"""
+    rows = build_mixed_rows()
+    assert len(rows) == 3
+    assert len({frozenset(row) for row in rows}) == 1
+
+
+def test_bulk_insert_keeps_material_category():
+    """Material categories survive when bid items come first"""
+    rows = build_mixed_rows()
+    compiled = insert(TakeoffItem).values(rows).compile(dialect=postgresql.dialect())
+
+    categories = [
+        value for name, value in sorted(compiled.params.items())
+        if name == "category" or name.startswith("category_m")
+    ]
+    assert categories == [None, "Walls", "Roof"]
+
+
+if __name__ == "__main__":
+    test_rows_share_columns()
+    test_bulk_insert_keeps_material_category()
+    print("All takeoff persistence tests passed")
@@ -24,6 +24,8 @@ interface TakeoffItem {
   quantity: number;
   unit: string;
   source_page?: number;
+  source_bbox?: { x: number; y: number; width: number; height: number } | null;
+  source_document_id?: string | null;
   category?: string;
   quote_status?: string;
   matched_material_id?: string;